@@ -14,7 +14,7 @@ from datetime import datetime, timedelta
 import pandas as pd
 from typing import Dict, Any, Optional
 
-from utils.performance.indicator_factory import calculate_indicators
+from utils.backtest.prepared_dataset import prepared_indicators
 from utils.backtest_suite import ComprehensiveBacktestSuite
 from data_collector import DataCollector
 
@@ -78,7 +78,7 @@ class DashboardIntegration:
                 return False
             
             # Calculate indicators
-            data_with_indicators = calculate_indicators(data, product_id)
+            data_with_indicators = prepared_indicators(data, product_id)
             logger.info(f"Prepared {len(data_with_indicators)} rows with indicators")
             
             # Run comprehensive backtest
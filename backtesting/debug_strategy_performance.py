@@ -15,7 +15,7 @@ from typing import Dict, Any
 # Add project root to path
 sys.path.append('.')
 
-from utils.performance.indicator_factory import IndicatorFactory
+from utils.backtest.prepared_dataset import prepared_indicators
 from utils.backtest.strategy_vectorizer import VectorizedStrategyAdapter
 from utils.backtest.backtest_engine import BacktestEngine
 from data_collector import DataCollector
@@ -263,8 +263,7 @@ class StrategyPerformanceDebugger:
             return {'error': 'No data available'}
         
         # Calculate indicators
-        indicator_factory = IndicatorFactory()
-        indicators_df = indicator_factory.calculate_all_indicators(df, "BTC-USD")
+        indicators_df = prepared_indicators(df, "BTC-USD")
         
         # Analyze market conditions
         market_conditions = self.analyze_market_conditions(df)
@@ -103,9 +103,8 @@ class IntervalOptimizer:
                 return {}
             
             # Add indicators to the data
-            from utils.performance.indicator_factory import IndicatorFactory
-            indicator_factory = IndicatorFactory()
-            data_with_indicators = indicator_factory.calculate_all_indicators(resampled_df, product)
+            from utils.backtest.prepared_dataset import prepared_indicators
+            data_with_indicators = prepared_indicators(resampled_df, product, f"{interval_minutes}MIN")
             
             # Run backtest
             logger.info(f"Running backtest: {product} @ {interval_minutes}min with {strategy}")
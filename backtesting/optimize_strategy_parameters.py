@@ -15,7 +15,7 @@ from typing import Dict, Any, List
 # Add project root to path
 sys.path.append('.')
 
-from utils.performance.indicator_factory import IndicatorFactory
+from utils.backtest.prepared_dataset import prepared_indicators
 from utils.backtest.strategy_vectorizer import VectorizedStrategyAdapter
 from utils.backtest.backtest_engine import BacktestEngine
 
@@ -38,8 +38,7 @@ class StrategyParameterOptimizer:
             df = df.tail(720)  # Last 30 days
             
             # Calculate indicators
-            indicator_factory = IndicatorFactory()
-            indicators_df = indicator_factory.calculate_all_indicators(df, "BTC-USD")
+            indicators_df = prepared_indicators(df, "BTC-USD")
             
             # Combine data
             combined_df = pd.concat([df, indicators_df], axis=1)
@@ -12,12 +12,12 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
 # Import our backtesting infrastructure
 from utils.backtest_suite import ComprehensiveBacktestSuite
-from utils.performance.indicator_factory import IndicatorFactory
+from utils.backtest.prepared_dataset import PreparedDatasetStore
 from data_collector import DataCollector
 from coinbase_client import CoinbaseClient
 from backtesting.sync_to_gcs import GCSBacktestSync
@@ -29,9 +29,10 @@ logger = logging.getLogger(__name__)
 class MonthlyStabilityAnalyzer:
     """Monthly parameter stability and walk-forward analysis"""
     
-    def __init__(self, sync_to_gcs: bool = False):
+    def __init__(self, sync_to_gcs: bool = False, max_workers: Optional[int] = None):
         """Initialize monthly stability analyzer"""
         self.sync_to_gcs = sync_to_gcs
+        self.max_workers = max_workers or os.cpu_count()
         self.results_dir = Path("./reports/monthly")
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
@@ -40,7 +41,7 @@ class MonthlyStabilityAnalyzer:
             coinbase_client = CoinbaseClient()
             self.data_collector = DataCollector(coinbase_client, gcs_bucket_name=None)
             self.backtest_suite = ComprehensiveBacktestSuite()
-            self.indicator_factory = IndicatorFactory()
+            self.prepared_datasets = PreparedDatasetStore()
             
             if sync_to_gcs:
                 self.gcs_sync = GCSBacktestSync()
@@ -129,7 +130,7 @@ class MonthlyStabilityAnalyzer:
                 return {'error': f'No parameter grid for {strategy}'}
             
             # Add indicators
-            data_with_indicators = self.indicator_factory.calculate_all_indicators(data, product)
+            data_with_indicators = self.prepared_datasets.prepare(data, product, "ONE_HOUR")
             
             # Run walk-forward analysis
             walk_forward_results = self.backtest_suite.run_walk_forward_analysis(
@@ -137,9 +138,10 @@ class MonthlyStabilityAnalyzer:
                 strategy_name=strategy,
                 param_grid=param_grid,
                 product_id=product,
-                train_days=30,  # 30 days training
-                test_days=7,    # 7 days testing
-                step_days=7     # Move forward 7 days each time
+                train_period_days=30,  # 30 days training
+                test_period_days=7,    # 7 days testing
+                step_days=7,           # Move forward 7 days each time
+                max_workers=self.max_workers
             )
             
             if 'error' in walk_forward_results:
@@ -488,11 +490,11 @@ class MonthlyStabilityAnalyzer:
             logger.error(f"Failed to save results: {e}")
             return ""
 
-def run_monthly_stability(sync_gcs: bool = False) -> bool:
+def run_monthly_stability(sync_gcs: bool = False, max_workers: Optional[int] = None) -> bool:
     """Run monthly stability analysis (called from main.py scheduler)"""
     try:
         # Initialize analyzer
-        analyzer = MonthlyStabilityAnalyzer(sync_to_gcs=sync_gcs)
+        analyzer = MonthlyStabilityAnalyzer(sync_to_gcs=sync_gcs, max_workers=max_workers)
         
         # Run stability analysis
         logger.info("🚀 Starting monthly stability analysis...")
@@ -527,11 +529,14 @@ def main():
     parser.add_argument('--days', type=int, default=90,
                        help='Number of days to analyze (default: 90)')
     
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for walk-forward periods (default: all cores)')
+    
     args = parser.parse_args()
     
     try:
         # Initialize analyzer
-        analyzer = MonthlyStabilityAnalyzer(sync_to_gcs=args.sync_gcs)
+        analyzer = MonthlyStabilityAnalyzer(sync_to_gcs=args.sync_gcs, max_workers=args.workers)
         
         # Run stability analysis
         logger.info("🚀 Starting monthly stability analysis...")
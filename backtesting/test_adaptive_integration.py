@@ -22,7 +22,9 @@ sys.path.append('.')
 
 from utils.backtest.adaptive_backtest_engine import AdaptiveBacktestEngine
 from utils.backtest.market_regime_analyzer import MarketRegimeAnalyzer
+from utils.performance.indicator_factory import calculate_indicators
 from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
+from strategies.performance_tracker import HybridPerformanceTracker
 from utils.trading.capital_manager import CapitalManager
 from config import Config
 
@@ -125,7 +127,8 @@ class AdaptiveIntegrationTest:
                 self.config,
                 llm_analyzer=llm_analyzer_wrapper,
                 news_sentiment_analyzer=self.mock_news_analyzer,
-                volatility_analyzer=self.mock_volatility_analyzer
+                volatility_analyzer=self.mock_volatility_analyzer,
+                performance_tracker=HybridPerformanceTracker(data_dir=None)
             )
             
             self.live_capital_manager = CapitalManager(self.config)
@@ -195,48 +198,8 @@ class AdaptiveIntegrationTest:
     def add_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Add technical indicators to test data"""
         try:
-            # Simple Moving Averages
-            data['sma_20'] = data['close'].rolling(20).mean()
-            data['sma_50'] = data['close'].rolling(50).mean()
-            
-            # Exponential Moving Averages
-            data['ema_12'] = data['close'].ewm(span=12).mean()
-            data['ema_26'] = data['close'].ewm(span=26).mean()
-            
-            # RSI
-            delta = data['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            data['rsi_14'] = 100 - (100 / (1 + rs))
-            
-            # MACD
-            data['macd'] = data['ema_12'] - data['ema_26']
-            data['macd_signal'] = data['macd'].ewm(span=9).mean()
-            
-            # Bollinger Bands
-            bb_period = 20
-            bb_std = 2
-            data['bb_middle_20'] = data['close'].rolling(bb_period).mean()
-            bb_std_dev = data['close'].rolling(bb_period).std()
-            data['bb_upper_20'] = data['bb_middle_20'] + (bb_std_dev * bb_std)
-            data['bb_lower_20'] = data['bb_middle_20'] - (bb_std_dev * bb_std)
-            
-            # Volume indicators
-            data['volume_sma_20'] = data['volume'].rolling(20).mean()
-            
-            # ATR (simplified)
-            high_low = data['high'] - data['low']
-            high_close = np.abs(data['high'] - data['close'].shift())
-            low_close = np.abs(data['low'] - data['close'].shift())
-            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            data['atr'] = true_range.rolling(14).mean()
-            
-            # Stochastic
-            low_14 = data['low'].rolling(14).min()
-            high_14 = data['high'].rolling(14).max()
-            data['stoch_k'] = 100 * ((data['close'] - low_14) / (high_14 - low_14))
-            data['stoch_d'] = data['stoch_k'].rolling(3).mean()
+            # Shared indicator columns (sma_20/50, ema_12/26, rsi_14, macd, bb_*_20, atr, stoch_k/d, ...)
+            data = calculate_indicators(data)
             
             # Fill NaN values
             data = data.fillna(method='bfill').fillna(method='ffill')
@@ -339,9 +302,10 @@ class AdaptiveIntegrationTest:
                     technical_indicators = self.prepare_technical_indicators_for_live_bot(row)
                     
                     # Get decision from live AdaptiveStrategyManager
-                    signal = self.live_adaptive_manager.get_combined_signal(
-                        market_data, technical_indicators, {}
-                    )
+                    with self.live_adaptive_manager.dry_run():
+                        signal = self.live_adaptive_manager.get_combined_signal(
+                            market_data, technical_indicators, {}
+                        )
                     
                     # Extract market regime
                     market_regime = getattr(self.live_adaptive_manager, 'current_market_regime', 'ranging')
@@ -472,9 +436,10 @@ class AdaptiveIntegrationTest:
                 technical_indicators = self.prepare_technical_indicators_for_live_bot(row)
                 
                 # Get signal to trigger regime detection
-                signal = self.live_adaptive_manager.get_combined_signal(
-                    market_data, technical_indicators, {}
-                )
+                with self.live_adaptive_manager.dry_run():
+                    signal = self.live_adaptive_manager.get_combined_signal(
+                        market_data, technical_indicators, {}
+                    )
                 
                 regime = getattr(self.live_adaptive_manager, 'current_market_regime', 'ranging')
                 live_regimes.append(regime)
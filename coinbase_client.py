@@ -3,14 +3,26 @@ Client for interacting with Coinbase Advanced Trade API using the official coinb
 """
 
 import logging
+import threading
 import time
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from coinbase.rest import RESTClient
-from config import COINBASE_API_KEY, COINBASE_API_SECRET
+from config import (
+    COINBASE_API_KEY, COINBASE_API_SECRET,
+    COINBASE_PUBLIC_RATE_PER_SECOND, COINBASE_PRIVATE_RATE_PER_SECOND,
+    COINBASE_MAX_RETRIES, COINBASE_BACKOFF_BASE_SECONDS, COINBASE_BACKOFF_MAX_SECONDS,
+    PRICE_SNAPSHOT_TTL_SECONDS
+)
+from utils.rate_limiter import EndpointRateLimiter, backoff_delay
 
 logger = logging.getLogger(__name__)
 
+# Endpoint classes with separate request budgets: market data reads vs account and order calls
+PUBLIC_ENDPOINT = "public"
+PRIVATE_ENDPOINT = "private"
+
 class CoinbaseClient:
     """Client for interacting with Coinbase Advanced Trade API"""
     
@@ -19,7 +31,19 @@ class CoinbaseClient:
         self.api_key = api_key
         self.api_secret = api_secret
         self.last_request_time = 0
-        self.min_request_interval = 0.1  # Minimum 100ms between requests
+        self.rate_limiter = EndpointRateLimiter({
+            PUBLIC_ENDPOINT: COINBASE_PUBLIC_RATE_PER_SECOND,
+            PRIVATE_ENDPOINT: COINBASE_PRIVATE_RATE_PER_SECOND
+        })
+        self.min_request_interval = 1.0 / COINBASE_PRIVATE_RATE_PER_SECOND  # Sustained spacing of private calls
+        self.max_retries = COINBASE_MAX_RETRIES
+        self.backoff_base = COINBASE_BACKOFF_BASE_SECONDS
+        self.backoff_max = COINBASE_BACKOFF_MAX_SECONDS
+        
+        # Short-lived price snapshot: product_id -> (price, monotonic fetch time)
+        self.price_snapshot_ttl = PRICE_SNAPSHOT_TTL_SECONDS
+        self._price_snapshot: Dict[str, tuple] = {}
+        self._price_snapshot_lock = threading.RLock()
         
         if not self.api_key or not self.api_secret:
             raise ValueError("Coinbase API key and secret are required")
@@ -32,24 +56,73 @@ class CoinbaseClient:
             # Don't raise - allow graceful degradation
             self.client = None
     
-    def _rate_limit(self):
-        """Implement basic rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
-        
+    def _rate_limit(self, endpoint: str = PRIVATE_ENDPOINT):
+        """Wait for a permit from the endpoint's token bucket"""
+        self.rate_limiter.acquire(endpoint)
         self.last_request_time = time.time()
     
+    def _call_api(self, endpoint: str, func: Callable, *args, **kwargs):
+        """
+        Call the REST client within the endpoint budget
+        
+        Rate-limited calls (HTTP 429) pause the whole endpoint class for a jittered
+        exponential backoff, or the server's Retry-After, and are retried up to max_retries.
+        Other errors are raised to the caller.
+        """
+        attempt = 0
+        while True:
+            self._rate_limit(endpoint)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not self._is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, self._get_retry_after(e))
+                attempt += 1
+                logger.warning(f"Rate limited on {endpoint} endpoint, retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                self.rate_limiter.throttle(endpoint, delay)
+    
+    @staticmethod
+    def _is_rate_limit_error(error) -> bool:
+        """Check whether an exception is an HTTP 429 / rate limit rejection"""
+        response = getattr(error, 'response', None)
+        if getattr(response, 'status_code', None) == 429:
+            return True
+        error_str = str(error).lower()
+        return 'rate limit' in error_str or 'too many requests' in error_str
+    
+    @staticmethod
+    def _get_retry_after(error) -> Optional[float]:
+        """Get the Retry-After delay in seconds from a rejected request, if the server sent one"""
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            retry_after = headers.get('Retry-After')
+        except Exception:
+            return None
+        if retry_after is None:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    
+    def get_rate_limit_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Get permits granted, wait time and throttles per endpoint class"""
+        return self.rate_limiter.get_metrics()
+    
     def _handle_api_error(self, error, operation: str):
         """Handle common API errors"""
         error_str = str(error).lower()
         
-        if 'rate limit' in error_str:
-            logger.warning(f"Rate limit hit during {operation}, waiting 60 seconds...")
-            time.sleep(60)  # Wait 1 minute for rate limit reset
+        if self._is_rate_limit_error(error):
+            # Backoff already happened in _call_api; do not stall the bot here
+            logger.warning(f"Rate limit persisted during {operation} after retries: {error}")
             return "rate_limit"
         elif 'connection' in error_str or 'timeout' in error_str:
             logger.warning(f"Connection issue during {operation}: {error}")
@@ -68,8 +141,7 @@ class CoinbaseClient:
             return []
             
         try:
-            self._rate_limit()
-            response = self.client.get_accounts()
+            response = self._call_api(PRIVATE_ENDPOINT, self.client.get_accounts)
             accounts = []
             
             # Handle response object instead of dict
@@ -145,9 +217,112 @@ class CoinbaseClient:
             return 0.0
     
     def get_product_price(self, product_id: str) -> Dict:
-        """Get current price for a product (e.g., 'BTC-USD')"""
+        """Get current price for a product (e.g., 'BTC-USD'), served from the price snapshot when fresh"""
+        # Refresh every product seen so far in the same round trip
+        with self._price_snapshot_lock:
+            product_ids = [product_id] + [pid for pid in self._price_snapshot if pid != product_id]
+        prices = self.get_prices_bulk(product_ids)
+        return {"price": prices.get(product_id, 0.0)}
+    
+    def get_prices_bulk(self, product_ids: List[str], max_age: Optional[float] = None) -> Dict[str, float]:
+        """
+        Get current prices for several products with at most one best bid/ask request
+        
+        Prices younger than max_age (default: PRICE_SNAPSHOT_TTL_SECONDS) come from the
+        snapshot; the rest are fetched together. Products missing from the bulk response
+        fall back to a single-product request.
+        
+        Args:
+            product_ids: Trading pairs (e.g., ['BTC-EUR', 'ETH-EUR'])
+            max_age: Maximum snapshot age in seconds
+            
+        Returns:
+            Dict of product_id -> price (0.0 if unavailable)
+        """
+        if max_age is None:
+            max_age = self.price_snapshot_ttl
+        
+        # Hold the lock while fetching so concurrent callers share one round trip
+        with self._price_snapshot_lock:
+            now = time.monotonic()
+            prices = {}
+            missing = []
+            for product_id in dict.fromkeys(product_ids):
+                cached = self._price_snapshot.get(product_id)
+                if cached and now - cached[1] <= max_age:
+                    prices[product_id] = cached[0]
+                else:
+                    missing.append(product_id)
+            
+            if missing:
+                quotes = self.get_best_bid_ask_bulk(missing)
+                fetched_at = time.monotonic()
+                for product_id in missing:
+                    price = quotes.get(product_id, {}).get("price", 0.0)
+                    if price <= 0:
+                        price = self._fetch_product_price(product_id)
+                    if price > 0:
+                        self._price_snapshot[product_id] = (price, fetched_at)
+                    prices[product_id] = price
+        
+        return prices
+    
+    def get_best_bid_ask_bulk(self, product_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Get best bid and ask for several products in one request
+        
+        Args:
+            product_ids: Trading pairs (e.g., ['BTC-EUR', 'ETH-EUR'])
+            
+        Returns:
+            Dict of product_id -> {"bid", "ask", "price"} where price is the mid price
+        """
+        if not product_ids:
+            return {}
+        
         try:
-            response = self.client.get_product(product_id=product_id)
+            response = self._call_api(PUBLIC_ENDPOINT, self.client.get_best_bid_ask, product_ids=list(product_ids))
+            
+            # Handle response object instead of dict
+            if isinstance(response, dict):
+                pricebooks = response.get("pricebooks", [])
+            else:
+                pricebooks = getattr(response, 'pricebooks', [])
+            
+            quotes = {}
+            for book in pricebooks:
+                if isinstance(book, dict):
+                    product_id = book.get("product_id")
+                    bid = self._first_level_price(book.get("bids", []))
+                    ask = self._first_level_price(book.get("asks", []))
+                else:
+                    product_id = getattr(book, 'product_id', None)
+                    bid = self._first_level_price(getattr(book, 'bids', []))
+                    ask = self._first_level_price(getattr(book, 'asks', []))
+                
+                mid = (bid + ask) / 2 if bid > 0 and ask > 0 else max(bid, ask)
+                if product_id and mid > 0:
+                    quotes[product_id] = {"bid": bid, "ask": ask, "price": mid}
+            
+            return quotes
+            
+        except Exception as e:
+            logger.warning(f"Error getting best bid/ask for {', '.join(product_ids)}: {e}")
+            return {}
+    
+    @staticmethod
+    def _first_level_price(levels) -> float:
+        """Get the price of the top order book level (dict or object), 0.0 if empty"""
+        if not levels:
+            return 0.0
+        level = levels[0]
+        price = level.get("price", 0) if isinstance(level, dict) else getattr(level, 'price', 0)
+        return float(price)
+    
+    def _fetch_product_price(self, product_id: str) -> float:
+        """Get the last trade price for a single product directly from the API"""
+        try:
+            response = self._call_api(PUBLIC_ENDPOINT, self.client.get_product, product_id=product_id)
             # Handle response object instead of dict
             if hasattr(response, 'price'):
                 price = response.price
@@ -158,15 +333,14 @@ class CoinbaseClient:
             
             # Ensure price is converted to float for consistent type handling
             try:
-                price_float = float(price)
-                return {"price": price_float}
+                return float(price)
             except (ValueError, TypeError):
                 logger.warning(f"Could not convert price '{price}' to float for {product_id}")
-                return {"price": 0.0}
+                return 0.0
                 
         except Exception as e:
             logger.error(f"Error getting product price for {product_id}: {e}")
-            return {"price": 0.0}
+            return 0.0
     
     def _get_precision_limits(self) -> Dict[str, int]:
         """Get precision limits for different trading pairs"""
@@ -220,7 +394,9 @@ class CoinbaseClient:
             if side.upper() == "BUY":
                 # For buy orders, specify quote size (fiat amount) - round to 2 decimal places
                 rounded_size = round(size, 2)
-                response = self.client.market_order_buy(
+                response = self._call_api(
+                    PRIVATE_ENDPOINT,
+                    self.client.market_order_buy,
                     client_order_id=client_order_id,
                     product_id=product_id,
                     quote_size=str(rounded_size)
@@ -239,7 +415,9 @@ class CoinbaseClient:
                 
                 logger.info(f"SELL order: {product_id} - Original: {size:.12f}, Rounded: {rounded_size:.12f} ({precision} decimals)")
                 
-                response = self.client.market_order_sell(
+                response = self._call_api(
+                    PRIVATE_ENDPOINT,
+                    self.client.market_order_sell,
                     client_order_id=client_order_id,
                     product_id=product_id,
                     base_size=str(rounded_size)
@@ -503,7 +681,9 @@ class CoinbaseClient:
             else:
                 end_timestamp = int(end_time)
                 
-            response = self.client.get_candles(
+            response = self._call_api(
+                PUBLIC_ENDPOINT,
+                self.client.get_candles,
                 product_id=product_id,
                 start=start_timestamp,
                 end=end_timestamp,
@@ -535,7 +715,7 @@ class CoinbaseClient:
         """Get 24h stats for a product"""
         try:
             # Get product details which include stats
-            response = self.client.get_product(product_id=product_id)
+            response = self._call_api(PUBLIC_ENDPOINT, self.client.get_product, product_id=product_id)
             
             # Handle response object instead of dict
             if hasattr(response, '__dict__'):
@@ -566,7 +746,7 @@ class CoinbaseClient:
     def get_product_order_book(self, product_id: str, level: int = 1) -> Dict:
         """Get order book for a product"""
         try:
-            response = self.client.get_product_book(product_id=product_id, limit=level)
+            response = self._call_api(PUBLIC_ENDPOINT, self.client.get_product_book, product_id=product_id, limit=level)
             
             # Handle response object
             if hasattr(response, 'pricebook'):
@@ -640,88 +820,6 @@ class CoinbaseClient:
                 "asks": [[str(price * 1.001), "1.0"]]
             }
     
-    def get_price_changes(self, product_id: str) -> Dict[str, float]:
-        """
-        Get price changes for different time periods (1h, 4h, 24h, 5d)
-        
-        Args:
-            product_id: Trading pair (e.g., 'BTC-USD')
-            
-        Returns:
-            Dict with price changes as percentages
-        """
-        try:
-            current_price = self.get_product_price(product_id).get('price', 0.0)
-            if not current_price:
-                return {"1h": 0.0, "4h": 0.0, "24h": 0.0, "5d": 0.0}
-            
-            # current_price is already a float from get_product_price
-            now = datetime.now(timezone.utc)
-            changes = {}
-            
-            # Define time periods
-            periods = {
-                "1h": timedelta(hours=1),
-                "4h": timedelta(hours=4), 
-                "24h": timedelta(hours=24),
-                "5d": timedelta(days=5)
-            }
-            
-            for period_name, period_delta in periods.items():
-                try:
-                    # Calculate start time
-                    start_time = now - period_delta
-                    
-                    # Get historical data
-                    # Use appropriate granularity based on time period
-                    if period_name in ["1h", "4h"]:
-                        granularity = "ONE_HOUR"
-                    elif period_name == "24h":
-                        granularity = "ONE_HOUR"
-                    else:  # 5d
-                        granularity = "ONE_DAY"
-                    
-                    # Format timestamps - remove timezone info before adding 'Z'
-                    start_str = start_time.replace(tzinfo=None).isoformat() + 'Z'
-                    end_str = now.replace(tzinfo=None).isoformat() + 'Z'
-                    
-                    historical_data = self.get_market_data(
-                        product_id=product_id,
-                        granularity=granularity,
-                        start_time=start_str,
-                        end_time=end_str
-                    )
-                    
-                    if historical_data and len(historical_data) > 0:
-                        # Get the earliest candle (closest to our target time)
-                        # Candles are typically returned in reverse chronological order
-                        historical_candle = historical_data[-1] if isinstance(historical_data[-1], dict) else historical_data[-1].__dict__
-                        
-                        # Extract the opening price from the historical candle
-                        if isinstance(historical_candle, dict):
-                            historical_price = float(historical_candle.get('low', historical_candle.get('open', current_price)))
-                        else:
-                            historical_price = float(getattr(historical_candle, 'low', getattr(historical_candle, 'open', current_price)))
-                        
-                        # Calculate percentage change
-                        if historical_price > 0:
-                            change_percent = ((current_price - historical_price) / historical_price) * 100
-                            changes[period_name] = round(change_percent, 2)
-                        else:
-                            changes[period_name] = 0.0
-                    else:
-                        changes[period_name] = 0.0
-                        
-                except Exception as e:
-                    logger.warning(f"Error calculating {period_name} change for {product_id}: {e}")
-                    changes[period_name] = 0.0
-            
-            return changes
-            
-        except Exception as e:
-            logger.error(f"Error getting price changes for {product_id}: {e}")
-            return {"1h": 0.0, "4h": 0.0, "24h": 0.0, "5d": 0.0}
-
     def get_portfolio(self) -> Dict[str, Any]:
         """Get complete portfolio data from Coinbase"""
         try:
@@ -786,6 +884,13 @@ class CoinbaseClient:
                             portfolio[currency]["amount"] = balance
                             portfolio[currency]["initial_amount"] = balance  # Set initial amount to current balance
             
+            # Get current prices for all held currencies and trading pairs in one request
+            priced_pairs = [
+                f"{currency}-{base_currency}" for currency in sorted(crypto_currencies)
+                if currency != base_currency and not (currency == 'USD' and base_currency == 'EUR')
+            ]
+            bulk_prices = self.get_prices_bulk(list(dict.fromkeys(priced_pairs + list(trading_pairs))))
+            
             # Get current prices for all crypto currencies
             total_value = 0
             for currency in crypto_currencies:
@@ -800,8 +905,7 @@ class CoinbaseClient:
                         continue
                     
                     try:
-                        price_data = self.get_product_price(f"{currency}-{base_currency}")
-                        price = price_data.get("price", 0.0)  # Already a float from get_product_price
+                        price = bulk_prices.get(f"{currency}-{base_currency}", 0.0)
                         portfolio[currency][f"last_price_{base_currency.lower()}"] = price
                         
                         # Calculate value
@@ -17,6 +17,23 @@ class Config:
         self.COINBASE_API_KEY = os.getenv("COINBASE_API_KEY")
         self.COINBASE_API_SECRET = os.getenv("COINBASE_API_SECRET")
 
+        # Coinbase API request budgets (Advanced Trade allows 10 req/s public, 30 req/s private)
+        self.COINBASE_PUBLIC_RATE_PER_SECOND = float(os.getenv("COINBASE_PUBLIC_RATE_PER_SECOND", "10"))
+        self.COINBASE_PRIVATE_RATE_PER_SECOND = float(os.getenv("COINBASE_PRIVATE_RATE_PER_SECOND", "30"))
+        self.COINBASE_MAX_RETRIES = int(os.getenv("COINBASE_MAX_RETRIES", "3"))  # Retries after HTTP 429
+        self.COINBASE_BACKOFF_BASE_SECONDS = float(os.getenv("COINBASE_BACKOFF_BASE_SECONDS", "0.5"))
+        self.COINBASE_BACKOFF_MAX_SECONDS = float(os.getenv("COINBASE_BACKOFF_MAX_SECONDS", "30"))
+        self.PRICE_SNAPSHOT_TTL_SECONDS = float(os.getenv("PRICE_SNAPSHOT_TTL_SECONDS", "30"))  # Reuse bulk-fetched prices within a cycle
+
+        # Streaming market data (WebSocket ticker + trades kept in memory)
+        self.MARKET_STREAM_ENABLED = os.getenv("MARKET_STREAM_ENABLED", "false").lower() == "true"
+        self.MARKET_STREAM_URL = os.getenv("MARKET_STREAM_URL", "wss://advanced-trade-ws.coinbase.com")
+        self.MARKET_STREAM_REPLAY_FILE = os.getenv("MARKET_STREAM_REPLAY_FILE", "")  # Replay recorded messages instead of the live feed
+        self.MARKET_STREAM_MAX_AGE_SECONDS = float(os.getenv("MARKET_STREAM_MAX_AGE_SECONDS", "15"))  # Older tickers fall back to REST
+
+        # Backtesting
+        self.BACKTEST_CACHE_DIR = os.getenv("BACKTEST_CACHE_DIR", "")  # Reuse results of identical backtests (empty disables)
+
         # Google Cloud settings
         self.GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT")
         self.GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
@@ -34,6 +51,12 @@ class Config:
         self.RISK_LEVEL = os.getenv("RISK_LEVEL", "medium")
         self.SIMULATION_MODE = os.getenv("SIMULATION_MODE", "false").lower() == "true"
 
+        # Concurrent per-pair analysis (Phase 1 of the trading cycle)
+        self.CONCURRENT_ANALYSIS_ENABLED = os.getenv("CONCURRENT_ANALYSIS_ENABLED", "true").lower() == "true"
+        self.ANALYSIS_MAX_WORKERS = int(os.getenv("ANALYSIS_MAX_WORKERS", "4"))
+        self.ANALYSIS_RATE_PER_MINUTE = float(os.getenv("ANALYSIS_RATE_PER_MINUTE", "12"))  # Sustained pair analyses (LLM calls) per minute
+        self.ANALYSIS_BURST = int(os.getenv("ANALYSIS_BURST", "4"))  # Analyses allowed to start at once
+
         # Trading Style Configuration
         self.TRADING_STYLE = os.getenv("TRADING_STYLE", "day_trading")  # day_trading, swing_trading, long_term
         self.TRADING_TIMEFRAME = os.getenv("TRADING_TIMEFRAME", "short_term")  # short_term, medium_term, long_term
@@ -151,6 +174,19 @@ config = Config()
 # Coinbase API credentials
 COINBASE_API_KEY = config.COINBASE_API_KEY
 COINBASE_API_SECRET = config.COINBASE_API_SECRET
+COINBASE_PUBLIC_RATE_PER_SECOND = config.COINBASE_PUBLIC_RATE_PER_SECOND
+COINBASE_PRIVATE_RATE_PER_SECOND = config.COINBASE_PRIVATE_RATE_PER_SECOND
+COINBASE_MAX_RETRIES = config.COINBASE_MAX_RETRIES
+COINBASE_BACKOFF_BASE_SECONDS = config.COINBASE_BACKOFF_BASE_SECONDS
+COINBASE_BACKOFF_MAX_SECONDS = config.COINBASE_BACKOFF_MAX_SECONDS
+PRICE_SNAPSHOT_TTL_SECONDS = config.PRICE_SNAPSHOT_TTL_SECONDS
+MARKET_STREAM_ENABLED = config.MARKET_STREAM_ENABLED
+MARKET_STREAM_URL = config.MARKET_STREAM_URL
+MARKET_STREAM_REPLAY_FILE = config.MARKET_STREAM_REPLAY_FILE
+MARKET_STREAM_MAX_AGE_SECONDS = config.MARKET_STREAM_MAX_AGE_SECONDS
+
+# Backtesting
+BACKTEST_CACHE_DIR = config.BACKTEST_CACHE_DIR
 
 # Google Cloud settings
 GOOGLE_CLOUD_PROJECT = config.GOOGLE_CLOUD_PROJECT
@@ -171,6 +207,10 @@ SIMULATION_MODE = config.SIMULATION_MODE
 TRADING_STYLE = config.TRADING_STYLE
 TRADING_TIMEFRAME = config.TRADING_TIMEFRAME
 EXPECTED_HOLDING_PERIOD = config.EXPECTED_HOLDING_PERIOD
+CONCURRENT_ANALYSIS_ENABLED = config.CONCURRENT_ANALYSIS_ENABLED
+ANALYSIS_MAX_WORKERS = config.ANALYSIS_MAX_WORKERS
+ANALYSIS_RATE_PER_MINUTE = config.ANALYSIS_RATE_PER_MINUTE
+ANALYSIS_BURST = config.ANALYSIS_BURST
 
 # Portfolio settings
 MAX_TRADE_PERCENTAGE = config.MAX_TRADE_PERCENTAGE
@@ -1,7 +1,6 @@
 import pandas as pd
 import logging
-import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 from coinbase_client import CoinbaseClient
 import os
@@ -9,15 +8,39 @@ from google.cloud import storage
 import pyarrow.parquet as pq
 import pyarrow as pa
 from pathlib import Path
+from utils.candle_store import CandleStore, GRANULARITY_SECONDS
+from utils.indicator_engine import IndicatorEngine
+from utils.performance.indicator_factory import IndicatorFactory, get_indicator_periods
 
 logger = logging.getLogger(__name__)
 
+# Horizons reported in market_data['price_changes']
+PRICE_CHANGE_PERIODS = {
+    "1h": timedelta(hours=1),
+    "4h": timedelta(hours=4),
+    "24h": timedelta(hours=24),
+    "5d": timedelta(days=5)
+}
+
+# Hourly lookback shared with the strategy analysis, long enough for every horizon
+PRICE_CHANGE_DAYS_BACK = 7
+
 class DataCollector:
     """Collects and processes market data from Coinbase"""
     
-    def __init__(self, coinbase_client: CoinbaseClient, gcs_bucket_name: Optional[str] = None):
+    def __init__(self, coinbase_client: CoinbaseClient, gcs_bucket_name: Optional[str] = None,
+                 candle_store: Optional[CandleStore] = None, market_state=None,
+                 market_state_max_age: float = 15.0, indicator_engine: Optional[IndicatorEngine] = None):
         """Initialize the data collector with a Coinbase client"""
         self.client = coinbase_client
+        # Candles already downloaded, shared by every pair analysed through this collector
+        self.candle_store = candle_store or CandleStore()
+        # Indicator state per (pair, trading style), advanced only by new candles
+        self.indicator_engine = indicator_engine or IndicatorEngine()
+        self.indicator_factory = IndicatorFactory()
+        # Optional market_stream.MarketStateStore: streamed prices/candles are used instead of REST when fresh
+        self.market_state = market_state
+        self.market_state_max_age = market_state_max_age
         # Use the existing GOOGLE_CLOUD_PROJECT from .env, fallback to GCP_PROJECT_ID, then default
         project_id = os.getenv('GOOGLE_CLOUD_PROJECT') or os.getenv('GCP_PROJECT_ID', 'ai-crypto-bot')
         self.gcs_bucket_name = gcs_bucket_name or f"{project_id}-backtest-data"
@@ -47,91 +70,17 @@ class DataCollector:
             DataFrame with historical market data
         """
         try:
-            # Calculate start and end times
-            end_time = datetime.now()
-            start_time = end_time - timedelta(days=days_back)
-            
-            # Convert to unix timestamps (seconds since epoch)
-            start_timestamp = int(start_time.timestamp())
-            end_timestamp = int(end_time.timestamp())
-            
-            # Format timestamps - remove timezone info before adding 'Z'
-            start_str = start_time.replace(tzinfo=None).isoformat() + "Z"
-            end_str = end_time.replace(tzinfo=None).isoformat() + "Z"
-            
-            # Use the wrapper method that properly handles the response
-            candles = self.client.get_market_data(
-                product_id=product_id,
-                granularity=granularity,
-                start_time=start_str,
-                end_time=end_str
+            df = self.candle_store.get_candles(
+                product_id,
+                granularity,
+                days_back,
+                fetch=lambda start, end: self._fetch_candles_local_first(product_id, granularity, start, end)
             )
             
-            if not candles:
-                logger.warning(f"No historical data available for {product_id}")
-                return pd.DataFrame()
-            
-            # Convert candle objects to list of dictionaries
-            data = []
-            for candle in candles:
-                try:
-                    if hasattr(candle, '__dict__'):
-                        # Object format - try multiple attribute names
-                        timestamp = None
-                        if hasattr(candle, 'start'):
-                            timestamp = int(candle.start)
-                        elif hasattr(candle, 'time'):
-                            timestamp = int(candle.time)
-                        elif hasattr(candle, 'timestamp'):
-                            timestamp = int(candle.timestamp)
-                        else:
-                            # Skip this candle if no timestamp found
-                            logger.warning(f"Candle object missing timestamp attribute: {dir(candle)}")
-                            continue
-                            
-                        row = {
-                            'time': timestamp,
-                            'low': float(getattr(candle, 'low', 0)),
-                            'high': float(getattr(candle, 'high', 0)),
-                            'open': float(getattr(candle, 'open', 0)),
-                            'close': float(getattr(candle, 'close', 0)),
-                            'volume': float(getattr(candle, 'volume', 0))
-                        }
-                    else:
-                        # Dict format (fallback)
-                        row = {
-                            'time': int(candle.get('start', candle.get('time', candle.get('timestamp', 0)))),
-                            'low': float(candle.get('low', 0)),
-                            'high': float(candle.get('high', 0)),
-                            'open': float(candle.get('open', 0)),
-                            'close': float(candle.get('close', 0)),
-                            'volume': float(candle.get('volume', 0))
-                        }
-                    
-                    # Only add if we have a valid timestamp
-                    if row['time'] > 0:
-                        data.append(row)
-                        
-                except Exception as e:
-                    logger.warning(f"Error processing candle data: {e}, candle: {candle}")
-                    continue
-            
-            # Create DataFrame
-            if not data:
+            if df.empty:
                 logger.warning(f"No valid candle data retrieved for {product_id}")
                 # Return empty DataFrame with correct structure
                 return pd.DataFrame(columns=['low', 'high', 'open', 'close', 'volume'])
-                
-            df = pd.DataFrame(data)
-            
-            # Convert timestamp to datetime
-            df['time'] = pd.to_datetime(df['time'], unit='s')
-            
-            # Sort by time
-            df = df.sort_values('time')
-            
-            # Set time as index
-            df.set_index('time', inplace=True)
             
             logger.info(f"Retrieved {len(df)} candles for {product_id}")
             return df
@@ -140,6 +89,115 @@ class DataCollector:
             logger.error(f"Error getting historical data for {product_id}: {e}")
             return pd.DataFrame()
     
+    def _fetch_candles_local_first(self, product_id: str, granularity: str, start_timestamp: int, end_timestamp: int) -> pd.DataFrame:
+        """Serve candles from the market stream when it has seen every trade in the range, otherwise from REST"""
+        if self.market_state is not None and granularity in GRANULARITY_SECONDS:
+            try:
+                if self.market_state.covers(product_id, start_timestamp):
+                    candles = self.market_state.get_candles(product_id, granularity, start_timestamp, end_timestamp)
+                    if not candles.empty:
+                        return candles
+            except Exception as e:
+                logger.warning(f"Streamed candles unavailable for {product_id}: {e}")
+        
+        return self._fetch_candles(product_id, granularity, start_timestamp, end_timestamp)
+    
+    def _get_streamed_price(self, product_id: str) -> Optional[float]:
+        """Get a fresh price from the market stream, if one is running"""
+        if self.market_state is None:
+            return None
+        return self.market_state.get_price(product_id, max_age=self.market_state_max_age)
+    
+    def _fetch_candles(self, product_id: str, granularity: str, start_timestamp: int, end_timestamp: int) -> pd.DataFrame:
+        """
+        Download candles between two unix timestamps
+        
+        Args:
+            product_id: Trading pair (e.g., 'BTC-USD')
+            granularity: Time interval (e.g., 'ONE_HOUR', 'ONE_DAY')
+            start_timestamp: Start of the range (seconds since epoch)
+            end_timestamp: End of the range (seconds since epoch)
+            
+        Returns:
+            DataFrame indexed by candle start time (empty if nothing was returned)
+        """
+        # Format timestamps as UTC ISO strings
+        start_str = datetime.fromtimestamp(start_timestamp, tz=timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        end_str = datetime.fromtimestamp(end_timestamp, tz=timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        
+        # Use the wrapper method that properly handles the response
+        candles = self.client.get_market_data(
+            product_id=product_id,
+            granularity=granularity,
+            start_time=start_str,
+            end_time=end_str
+        )
+        
+        if not candles:
+            logger.warning(f"No historical data available for {product_id}")
+            return pd.DataFrame()
+        
+        # Convert candle objects to list of dictionaries
+        data = []
+        for candle in candles:
+            try:
+                if hasattr(candle, '__dict__'):
+                    # Object format - try multiple attribute names
+                    timestamp = None
+                    if hasattr(candle, 'start'):
+                        timestamp = int(candle.start)
+                    elif hasattr(candle, 'time'):
+                        timestamp = int(candle.time)
+                    elif hasattr(candle, 'timestamp'):
+                        timestamp = int(candle.timestamp)
+                    else:
+                        # Skip this candle if no timestamp found
+                        logger.warning(f"Candle object missing timestamp attribute: {dir(candle)}")
+                        continue
+                        
+                    row = {
+                        'time': timestamp,
+                        'low': float(getattr(candle, 'low', 0)),
+                        'high': float(getattr(candle, 'high', 0)),
+                        'open': float(getattr(candle, 'open', 0)),
+                        'close': float(getattr(candle, 'close', 0)),
+                        'volume': float(getattr(candle, 'volume', 0))
+                    }
+                else:
+                    # Dict format (fallback)
+                    row = {
+                        'time': int(candle.get('start', candle.get('time', candle.get('timestamp', 0)))),
+                        'low': float(candle.get('low', 0)),
+                        'high': float(candle.get('high', 0)),
+                        'open': float(candle.get('open', 0)),
+                        'close': float(candle.get('close', 0)),
+                        'volume': float(candle.get('volume', 0))
+                    }
+                
+                # Only add if we have a valid timestamp
+                if row['time'] > 0:
+                    data.append(row)
+                    
+            except Exception as e:
+                logger.warning(f"Error processing candle data: {e}, candle: {candle}")
+                continue
+        
+        if not data:
+            return pd.DataFrame()
+            
+        df = pd.DataFrame(data)
+        
+        # Convert timestamp to datetime
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        
+        # Sort by time
+        df = df.sort_values('time')
+        
+        # Set time as index
+        df.set_index('time', inplace=True)
+        
+        return df
+    
     def get_current_price(self, product_id: str) -> float:
         """
         Get current price for a product
@@ -151,6 +209,10 @@ class DataCollector:
             Current price as float
         """
         try:
+            streamed_price = self._get_streamed_price(product_id)
+            if streamed_price:
+                return streamed_price
+            
             price_data = self.client.get_product_price(product_id)
             return float(price_data.get("price", 0))
         except Exception as e:
@@ -168,12 +230,14 @@ class DataCollector:
             Dictionary with current market data and price changes
         """
         try:
-            # Get current price
-            price_data = self.client.get_product_price(product_id)
-            price = float(price_data.get("price", 0))
+            # Get current price (streamed ticker when available)
+            price = self._get_streamed_price(product_id)
+            if not price:
+                price_data = self.client.get_product_price(product_id)
+                price = float(price_data.get("price", 0))
             
-            # Get price changes for different time periods
-            price_changes = self.client.get_price_changes(product_id)
+            # Price changes from the cached candle series (no extra API calls)
+            price_changes = self.get_price_changes(product_id, price)
             
             return {
                 "product_id": product_id,
@@ -190,23 +254,73 @@ class DataCollector:
                 "price_changes": {"1h": 0.0, "4h": 0.0, "24h": 0.0, "5d": 0.0}
             }
     
-    def calculate_indicators(self, historical_data: pd.DataFrame, trading_style: str = "day_trading") -> Dict[str, Any]:
+    def get_price_changes(self, product_id: str, current_price: Optional[float] = None) -> Dict[str, float]:
         """
-        Calculate technical indicators from historical data optimized for trading style
+        Get price changes for 1h, 4h, 24h and 5d from the cached hourly candles
         
         Args:
-            historical_data: DataFrame with OHLCV data
-            trading_style: Trading style (day_trading, swing_trading, long_term)
+            product_id: Trading pair (e.g., 'BTC-USD')
+            current_price: Current price (fetched from the ticker if not given)
             
         Returns:
-            Dictionary with calculated indicators
+            Dict with price changes as percentages
         """
+        try:
+            if current_price is None:
+                current_price = self.get_current_price(product_id)
+            
+            historical_data = self.get_historical_data(product_id, "ONE_HOUR", days_back=PRICE_CHANGE_DAYS_BACK)
+            return self.calculate_price_changes(historical_data, current_price)
+            
+        except Exception as e:
+            logger.error(f"Error getting price changes for {product_id}: {e}")
+            return {period: 0.0 for period in PRICE_CHANGE_PERIODS}
+    
+    def calculate_price_changes(self, historical_data: pd.DataFrame, current_price: float,
+                                now: Optional[datetime] = None) -> Dict[str, float]:
+        """
+        Calculate price changes against the open of the first candle inside each period
+        
+        Args:
+            historical_data: DataFrame with OHLCV data indexed by candle start time (UTC)
+            current_price: Current price
+            now: Reference time as naive UTC (defaults to the current time)
+            
+        Returns:
+            Dict with price changes as percentages (0.0 where history is missing)
+        """
+        changes = {period: 0.0 for period in PRICE_CHANGE_PERIODS}
+        if historical_data.empty or not current_price:
+            return changes
+        
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        candle_starts = historical_data.index
+        opens = historical_data['open'].to_numpy()
+        
+        for period_name, period_delta in PRICE_CHANGE_PERIODS.items():
+            position = candle_starts.searchsorted(pd.Timestamp(now - period_delta).floor("s"))
+            if position >= len(opens):
+                continue
+            
+            historical_price = float(opens[position])
+            if historical_price > 0:
+                changes[period_name] = round(((current_price - historical_price) / historical_price) * 100, 2)
+        
+        return changes
+    
+    def calculate_indicators(self, historical_data: pd.DataFrame, trading_style: str = "day_trading",
+                             product_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Calculate technical indicators from historical data optimized for trading style
         
+        With a product_id, the indicator engine keeps per-pair state and only applies
+        candles it has not seen yet, also as the lookback slides forward, using the
+        same arithmetic as the pandas formulas.
+        
         Args:
             historical_data: DataFrame with OHLCV data
             trading_style: Trading style (day_trading, swing_trading, long_term)
+            product_id: Trading pair the candles belong to (enables incremental updates)
             
         Returns:
             Dictionary with calculated indicators
@@ -215,97 +329,19 @@ class DataCollector:
             return {}
         
         try:
-            indicators = {}
-            
             # Determine optimal periods based on trading style
-            if trading_style == "day_trading":
-                # Day trading: Use shorter periods for faster signals
-                rsi_period = 14
-                bb_period = 4  # 4-hour Bollinger Bands for day trading
-                sma_short = 10  # 10-hour SMA
-                sma_long = 20   # 20-hour SMA
-                macd_fast, macd_slow, macd_signal = 8, 17, 9  # Faster MACD for day trading
-            elif trading_style == "swing_trading":
-                # Swing trading: Medium periods
-                rsi_period = 14
-                bb_period = 20
-                sma_short = 20
-                sma_long = 50
-                macd_fast, macd_slow, macd_signal = 12, 26, 9
-            else:  # long_term
-                # Long-term: Longer periods for smoother signals
-                rsi_period = 21
-                bb_period = 50
-                sma_short = 50
-                sma_long = 200
-                macd_fast, macd_slow, macd_signal = 12, 26, 9
-            
-            # Simple Moving Averages (optimized for trading style)
-            if len(historical_data) >= sma_short:
-                indicators['sma_short'] = historical_data['close'].rolling(window=sma_short).mean().iloc[-1]
-            if len(historical_data) >= sma_long:
-                indicators['sma_long'] = historical_data['close'].rolling(window=sma_long).mean().iloc[-1]
-            
-            # Legacy SMA values for backward compatibility
-            if len(historical_data) >= 20:
-                indicators['sma_20'] = historical_data['close'].rolling(window=20).mean().iloc[-1]
-            if len(historical_data) >= 50:
-                indicators['sma_50'] = historical_data['close'].rolling(window=50).mean().iloc[-1]
-            
-            # RSI (Relative Strength Index) - optimized period
-            if len(historical_data) >= rsi_period + 1:
-                delta = historical_data['close'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-                rs = gain / loss
-                indicators['rsi'] = 100 - (100 / (1 + rs)).iloc[-1]
-            
-            # MACD (optimized for trading style)
-            if len(historical_data) >= macd_slow:
-                exp1 = historical_data['close'].ewm(span=macd_fast).mean()
-                exp2 = historical_data['close'].ewm(span=macd_slow).mean()
-                macd = exp1 - exp2
-                signal = macd.ewm(span=macd_signal).mean()
-                indicators['macd'] = macd.iloc[-1]
-                indicators['macd_signal'] = signal.iloc[-1]
-                indicators['macd_histogram'] = (macd - signal).iloc[-1]
-            
-            # Bollinger Bands (optimized for trading style - KEY CHANGE FOR DAY TRADING)
-            if len(historical_data) >= bb_period:
-                if trading_style == "day_trading":
-                    # For day trading: Use 4-period BB on hourly data = 4-hour timeframe
-                    logger.info(f"Using {bb_period}-period Bollinger Bands for day trading (4-hour timeframe)")
-                
-                sma_bb = historical_data['close'].rolling(window=bb_period).mean()
-                std_bb = historical_data['close'].rolling(window=bb_period).std()
-                indicators['bb_upper'] = (sma_bb + (std_bb * 2)).iloc[-1]
-                indicators['bb_lower'] = (sma_bb - (std_bb * 2)).iloc[-1]
-                indicators['bb_middle'] = sma_bb.iloc[-1]
-                
-                # Add Bollinger Band width for volatility assessment
-                indicators['bb_width'] = ((indicators['bb_upper'] - indicators['bb_lower']) / indicators['bb_middle']) * 100
-                
-                # Add Bollinger Band position (where price is relative to bands)
-                current_price = historical_data['close'].iloc[-1]
-                bb_position = (current_price - indicators['bb_lower']) / (indicators['bb_upper'] - indicators['bb_lower'])
-                indicators['bb_position'] = bb_position  # 0 = at lower band, 1 = at upper band, 0.5 = at middle
-            
-            # Additional day trading specific indicators
-            if trading_style == "day_trading":
-                # Stochastic RSI for better overbought/oversold signals in day trading
-                if 'rsi' in indicators and len(historical_data) >= 14:
-                    rsi_series = 100 - (100 / (1 + (delta.where(delta > 0, 0)).rolling(window=14).mean() / 
-                                                (-delta.where(delta < 0, 0)).rolling(window=14).mean()))
-                    rsi_min = rsi_series.rolling(window=14).min()
-                    rsi_max = rsi_series.rolling(window=14).max()
-                    stoch_rsi = ((rsi_series - rsi_min) / (rsi_max - rsi_min)) * 100
-                    indicators['stoch_rsi'] = stoch_rsi.iloc[-1] if not stoch_rsi.empty else 50
-                
-                # Volume-weighted average price (VWAP) approximation
-                if 'volume' in historical_data.columns and len(historical_data) >= 20:
-                    typical_price = (historical_data['high'] + historical_data['low'] + historical_data['close']) / 3
-                    vwap = (typical_price * historical_data['volume']).rolling(window=20).sum() / historical_data['volume'].rolling(window=20).sum()
-                    indicators['vwap'] = vwap.iloc[-1]
+            periods = get_indicator_periods(trading_style)
+            rsi_period = periods['rsi_period']
+            bb_period = periods['bb_period']
+            
+            if product_id is not None and self.indicator_engine is not None:
+                indicators = self.indicator_engine.get_indicators(product_id, trading_style, historical_data)
+            else:
+                indicators = self._calculate_indicators_full(historical_data, trading_style)
+            
+            if trading_style == "day_trading" and 'bb_upper' in indicators:
+                # For day trading: Use 4-period BB on hourly data = 4-hour timeframe
+                logger.info(f"Using {bb_period}-period Bollinger Bands for day trading (4-hour timeframe)")
             
             # Current price
             indicators['current_price'] = historical_data['close'].iloc[-1]
@@ -328,6 +364,10 @@ class DataCollector:
             logger.error(f"Error calculating indicators: {e}")
             return {}
     
+    def _calculate_indicators_full(self, historical_data: pd.DataFrame, trading_style: str) -> Dict[str, Any]:
+        """Recompute every indicator over the whole frame (reference for the incremental engine)"""
+        return self.indicator_factory.calculate_latest(historical_data, trading_style)
+    
     # ===== BACKTESTING INFRASTRUCTURE METHODS =====
     
     def fetch_bulk_historical_data(self, product_id: str, start_date: datetime, end_date: datetime, 
@@ -368,9 +408,7 @@ class DataCollector:
                 current_end = min(current_start + timedelta(hours=chunk_hours), end_date)
                 
                 try:
-                    # Rate limiting: 10 requests per second
-                    time.sleep(0.1)
-                    
+                    # Request pacing is handled by the CoinbaseClient token buckets
                     # Format timestamps - remove timezone info before adding 'Z'
                     start_str = current_start.replace(tzinfo=None).isoformat() + "Z"
                     end_str = current_end.replace(tzinfo=None).isoformat() + "Z"
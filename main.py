@@ -9,6 +9,8 @@ from datetime import datetime, timezone, timedelta
 import os
 import sys
 from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 # Windows-compatible file locking
 try:
@@ -28,11 +30,14 @@ from utils.trading.capital_manager import CapitalManager
 from utils.trading.opportunity_manager import OpportunityManager
 from utils.trading.trade_cooldown import TradeCooldownManager
 from utils.dashboard.dashboard_updater import DashboardUpdater
+from utils.dashboard.decision_registry import DecisionRegistry
 from utils.dashboard.webserver_sync import WebServerSync
 from utils.trading.tax_report import TaxReportGenerator
 from utils.logger import get_supervisor_logger, log_bot_shutdown
 from utils.notification_service import NotificationService
 from utils.cleanup_manager import CleanupManager
+from utils.rate_limiter import TokenBucket
+from market_stream import MarketStateStore, MarketStream, ReplayServer
 from daily_report import DailyReportGenerator
 
 # Import performance tracking
@@ -43,6 +48,8 @@ except ImportError:
     PERFORMANCE_TRACKING_AVAILABLE = False
 
 from config import TRADING_PAIRS, DECISION_INTERVAL_MINUTES, WEBSERVER_SYNC_ENABLED, SIMULATION_MODE, RISK_LEVEL, TRADING_STYLE, TRADING_TIMEFRAME, EXPECTED_HOLDING_PERIOD, Config
+from config import CONCURRENT_ANALYSIS_ENABLED, ANALYSIS_MAX_WORKERS, ANALYSIS_RATE_PER_MINUTE, ANALYSIS_BURST
+from config import MARKET_STREAM_ENABLED, MARKET_STREAM_URL, MARKET_STREAM_REPLAY_FILE, MARKET_STREAM_MAX_AGE_SECONDS
 
 # Configure logging with daily rotation
 # Setup improved logging
@@ -154,7 +161,19 @@ class TradingBot:
         self.config = Config()
         self.coinbase_client = CoinbaseClient()
         self.llm_analyzer = LLMAnalyzer()
-        self.data_collector = DataCollector(self.coinbase_client)
+        
+        # Optional streaming market data: DataCollector reads prices/candles from memory when fresh
+        self.market_stream = None
+        self.replay_server = None
+        market_state = None
+        if MARKET_STREAM_ENABLED:
+            market_state = MarketStateStore()
+            self.market_stream = MarketStream(TRADING_PAIRS, market_state, url=MARKET_STREAM_URL)
+        self.data_collector = DataCollector(
+            self.coinbase_client,
+            market_state=market_state,
+            market_state_max_age=MARKET_STREAM_MAX_AGE_SECONDS
+        )
         
         logger.info(f"✅ LLM analyzer initialized: {self.llm_analyzer is not None}")
         
@@ -192,13 +211,23 @@ class TradingBot:
         self.trade_logger = TradeLogger()
         
         # Initialize dashboard updater (local data only)
-        self.dashboard_updater = DashboardUpdater()
+        self.decision_registry = DecisionRegistry()
+        self.dashboard_updater = DashboardUpdater(decision_registry=self.decision_registry)
         
         # Initialize adaptive regime monitor
         from utils.dashboard.adaptive_regime_monitor import AdaptiveRegimeMonitor
         self.regime_monitor = AdaptiveRegimeMonitor()
+        self._regime_monitor_lock = threading.Lock()
         logger.info("✅ Adaptive regime monitor initialized")
         
+        # Shared rate limiter for per-pair analysis (replaces fixed sleeps between pairs)
+        self.analysis_rate_limiter = TokenBucket(
+            rate=ANALYSIS_RATE_PER_MINUTE / 60.0,
+            capacity=max(1, ANALYSIS_BURST),
+            name="pair_analysis"
+        )
+        self.last_analysis_latencies: Dict[str, float] = {}
+        
         # Initialize performance tracker
         self.performance_tracker = None
         if PERFORMANCE_TRACKING_AVAILABLE:
@@ -262,9 +291,41 @@ class TradingBot:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
+        self.stop_market_stream()
+        if hasattr(self, "portfolio"):
+            self.portfolio.flush()
+        if hasattr(self, "strategy_manager"):
+            self.strategy_manager.performance_tracker.flush()
+        if hasattr(self, "trade_logger"):
+            self.trade_logger.compact()
         self.record_shutdown_time()
         sys.exit(0)
     
+    def start_market_stream(self):
+        """Connect the market stream (to the replay server when MARKET_STREAM_REPLAY_FILE is set)"""
+        if not self.market_stream or self.market_stream.is_running:
+            return
+        try:
+            if MARKET_STREAM_REPLAY_FILE:
+                self.replay_server = ReplayServer(MARKET_STREAM_REPLAY_FILE)
+                self.market_stream.url = self.replay_server.start()
+            self.market_stream.start()
+        except Exception as e:
+            # REST polling keeps working without the stream
+            logger.error(f"Failed to start market stream, falling back to REST polling: {e}")
+            self.stop_market_stream()
+    
+    def stop_market_stream(self):
+        """Disconnect the market stream and stop the replay server"""
+        if self.market_stream:
+            self.market_stream.stop()
+        if self.replay_server:
+            try:
+                self.replay_server.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping replay server: {e}")
+            self.replay_server = None
+    
     
     def sync_to_webserver(self):
         """Centralized web server sync - only place where web server sync happens"""
@@ -607,7 +668,7 @@ class TradingBot:
             
             # Get historical data for technical indicators (use ONE_HOUR granularity)
             historical_data = self.data_collector.get_historical_data(product_id, "ONE_HOUR", days_back=7)
-            technical_indicators = self.data_collector.calculate_indicators(historical_data)
+            technical_indicators = self.data_collector.calculate_indicators(historical_data, product_id=product_id)
             
             # Add current price to technical indicators
             technical_indicators['current_price'] = market_data.get('current_price', 0)
@@ -615,15 +676,16 @@ class TradingBot:
             # Get current portfolio state
             portfolio_data = self.portfolio.to_dict()
             
-            # Get combined signal from all strategies
-            combined_signal = self.strategy_manager.get_combined_signal(
+            # Run every strategy once; the evaluation carries both the combined signal and
+            # the individual strategy signals used for detailed reporting (one LLM call per pair)
+            evaluation = self.strategy_manager.evaluate_strategies(
                 market_data, technical_indicators, portfolio_data
             )
+            combined_signal = evaluation.combined_signal
+            individual_strategies = evaluation.strategy_signals
             
-            # Get individual strategy analysis for detailed reporting
-            individual_strategies = self.strategy_manager.analyze_all_strategies(
-                market_data, technical_indicators, portfolio_data
-            )
+            # Regime and weights used for this product (the manager's attributes are shared across concurrent workers)
+            market_regime = evaluation.market_regime
             
             # Format result to match expected structure
             result = {
@@ -636,8 +698,8 @@ class TradingBot:
                 "current_price": technical_indicators.get('current_price', 0),
                 "indicators": technical_indicators,
                 "strategy_details": {
-                    "market_regime": getattr(self.strategy_manager, 'current_market_regime', 'sideways'),
-                    "strategy_weights": self.strategy_manager.strategy_weights,
+                    "market_regime": market_regime,
+                    "strategy_weights": evaluation.strategy_weights,
                     "individual_strategies": {
                         name: {
                             "action": signal.action,
@@ -661,18 +723,19 @@ class TradingBot:
             
             # Update regime monitor with current regime and thresholds
             try:
-                current_regime = getattr(self.strategy_manager, 'current_market_regime', 'ranging')
+                current_regime = market_regime
                 # Get active thresholds from adaptive strategy manager
                 if hasattr(self.strategy_manager, 'adaptive_thresholds'):
                     active_thresholds = self.strategy_manager.adaptive_thresholds.get(current_regime, {})
                 else:
                     active_thresholds = {}
                 
-                self.regime_monitor.update_regime(
-                    regime=current_regime,
-                    market_data={"price_changes": market_data.get("price_changes", {}), "indicators": technical_indicators},
-                    active_thresholds=active_thresholds
-                )
+                with self._regime_monitor_lock:
+                    self.regime_monitor.update_regime(
+                        regime=current_regime,
+                        market_data={"price_changes": market_data.get("price_changes", {}), "indicators": technical_indicators},
+                        active_thresholds=active_thresholds
+                    )
             except Exception as e:
                 logger.debug(f"Failed to update regime monitor: {e}")
             
@@ -732,9 +795,6 @@ class TradingBot:
                 execution_status = result.get('execution_status', 'unknown')
                 logger.info(f"Decision for {product_id}: {decision} (confidence: {confidence}%) - Execution: {execution_status}")
                 
-                # Add delay between API calls to avoid rate limiting
-                time.sleep(2)
-                
             except Exception as e:
                 logger.error(f"Error processing {product_id}: {e}")
                 results[product_id] = {
@@ -801,6 +861,66 @@ class TradingBot:
         logger.info(f"Trading cycle completed at {datetime.now()}")
         return results
     
+    def _analyze_pair_rate_limited(self, product_id: str) -> Dict[str, Any]:
+        """Analyze one trading pair once the shared rate limiter grants a permit"""
+        waited = self.analysis_rate_limiter.acquire()
+        start = time.perf_counter()
+        
+        try:
+            logger.info(f"📊 Analyzing {product_id}...")
+            analysis_result = self._execute_multi_strategy_analysis(product_id)
+        except Exception as e:
+            logger.error(f"Error analyzing {product_id}: {e}")
+            analysis_result = {
+                "action": "HOLD",
+                "confidence": 0,
+                "reasoning": f"Analysis error: {str(e)}",
+                "product_id": product_id,
+                "timestamp": datetime.now().isoformat(),
+                "execution_status": "error",
+                "trade_executed": False
+            }
+        
+        latency = time.perf_counter() - start
+        self.last_analysis_latencies[product_id] = latency
+        
+        action = analysis_result.get('action', 'UNKNOWN')
+        confidence = analysis_result.get('confidence', 0)
+        logger.info(f"Analysis for {product_id}: {action} (confidence: {confidence:.1f}%) "
+                   f"in {latency:.2f}s (rate-limit wait {waited:.2f}s)")
+        return analysis_result
+    
+    def _analyze_all_pairs(self, product_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run multi-strategy analysis for every trading pair
+        
+        Pairs are fanned out over a bounded worker pool when concurrent analysis is
+        enabled; otherwise they run one after another. Both paths share the same
+        token-bucket rate limiter and return results keyed in product_ids order.
+        """
+        product_ids = list(product_ids)
+        self.last_analysis_latencies = {}
+        cycle_start = time.perf_counter()
+        
+        max_workers = min(max(1, ANALYSIS_MAX_WORKERS), len(product_ids)) if product_ids else 1
+        
+        if CONCURRENT_ANALYSIS_ENABLED and max_workers > 1:
+            logger.info(f"Analyzing {len(product_ids)} pairs concurrently ({max_workers} workers)")
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pair-analysis") as executor:
+                analyses = list(executor.map(self._analyze_pair_rate_limited, product_ids))
+        else:
+            analyses = [self._analyze_pair_rate_limited(product_id) for product_id in product_ids]
+        
+        trading_analyses = dict(zip(product_ids, analyses))
+        
+        total_time = time.perf_counter() - cycle_start
+        latency_summary = ", ".join(
+            f"{product_id}={self.last_analysis_latencies.get(product_id, 0):.2f}s" for product_id in product_ids
+        )
+        logger.info(f"⏱️  Analysis phase completed in {total_time:.2f}s (per pair: {latency_summary})")
+        
+        return trading_analyses
+    
     def _save_result(self, product_id: str, result: Dict):
         """Save trading result to a JSON file with market data and price changes"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -812,8 +932,8 @@ class TradingBot:
             current_price_data = self.data_collector.client.get_product_price(product_id)
             current_price = float(current_price_data.get("price", 0))
             
-            # Calculate price changes by looking at historical files
-            price_changes = self._calculate_price_changes(product_id, current_price)
+            # Price changes from the candles already cached for this pair
+            price_changes = self.data_collector.get_price_changes(product_id, current_price)
             
             # Add market data to result
             result["market_data"] = {
@@ -837,6 +957,9 @@ class TradingBot:
         with open(filename, 'w') as f:
             json.dump(result, f, indent=2, default=str)
         
+        # Index the decision so the dashboard doesn't have to scan data/
+        self.decision_registry.record(product_id, result, filename)
+        
         logger.info(f"Saved result with market data to {filename}")
     
     def _log_trade_decision(self, product_id: str, decision_result: Dict[str, Any], trade_result: Dict[str, Any]) -> None:
@@ -1568,85 +1691,6 @@ class TradingBot:
             })
             return execution_result
 
-    def _calculate_price_changes(self, product_id: str, current_price: float) -> Dict[str, float]:
-        """Calculate price changes using Coinbase historical candle data"""
-        changes = {"1h": 0.0, "4h": 0.0, "24h": 0.0, "5d": 0.0}
-        
-        try:
-            from datetime import datetime, timedelta
-            
-            now = datetime.now(timezone.utc)
-            
-            # Time periods to calculate
-            periods = {
-                "1h": {"delta": timedelta(hours=1), "granularity": "ONE_HOUR"},
-                "4h": {"delta": timedelta(hours=4), "granularity": "ONE_HOUR"}, 
-                "24h": {"delta": timedelta(hours=24), "granularity": "ONE_HOUR"},
-                "5d": {"delta": timedelta(days=5), "granularity": "ONE_DAY"}
-            }
-            
-            for period_name, config in periods.items():
-                try:
-                    # Calculate start time
-                    start_time = now - config["delta"]
-                    
-                    # Format timestamps - remove timezone info and add 'Z' for UTC
-                    start_str = start_time.replace(tzinfo=None).isoformat() + 'Z'
-                    end_str = now.replace(tzinfo=None).isoformat() + 'Z'
-                    
-                    # Get historical candle data from Coinbase
-                    historical_data = self.data_collector.client.get_market_data(
-                        product_id=product_id,
-                        granularity=config["granularity"],
-                        start_time=start_str,
-                        end_time=end_str
-                    )
-                    
-                    if historical_data and len(historical_data) > 0:
-                        # Get the earliest candle (closest to our target time)
-                        # Candles are returned as list of dicts or objects
-                        historical_candle = historical_data[-1]  # Last item is earliest
-                        
-                        # Extract historical price from candle
-                        if isinstance(historical_candle, dict):
-                            # Try different price fields
-                            historical_price = (
-                                historical_candle.get('open') or 
-                                historical_candle.get('close') or 
-                                historical_candle.get('low') or 
-                                historical_candle.get('high')
-                            )
-                        else:
-                            # Handle object response
-                            historical_price = (
-                                getattr(historical_candle, 'open', None) or
-                                getattr(historical_candle, 'close', None) or
-                                getattr(historical_candle, 'low', None) or
-                                getattr(historical_candle, 'high', None)
-                            )
-                        
-                        if historical_price and float(historical_price) > 0:
-                            historical_price = float(historical_price)
-                            # Calculate percentage change
-                            change_percent = ((current_price - historical_price) / historical_price) * 100
-                            changes[period_name] = round(change_percent, 2)
-                            logger.info(f"Calculated {period_name} change for {product_id}: {current_price} vs {historical_price} = {change_percent:.2f}%")
-                        else:
-                            logger.warning(f"No valid historical price found for {period_name} change calculation")
-                    else:
-                        logger.warning(f"No historical data returned for {period_name} change calculation")
-                        
-                except Exception as e:
-                    logger.warning(f"Error calculating {period_name} change for {product_id}: {e}")
-                    continue
-            
-            logger.info(f"Final calculated price changes for {product_id}: {changes}")
-            
-        except Exception as e:
-            logger.error(f"Error calculating price changes for {product_id}: {e}")
-        
-        return changes
-    
     def run_trading_cycle(self):
         """Execute one complete trading cycle with opportunity prioritization (Phase 1)"""
         try:
@@ -1658,34 +1702,9 @@ class TradingBot:
             
             # Phase 1: Analyze all trading pairs first (no execution yet)
             logger.info("🔍 Phase 1: Analyzing all trading opportunities...")
-            trading_analyses = {}
-            
-            for product_id in self.config.TRADING_PAIRS:
-                try:
-                    logger.info(f"📊 Analyzing {product_id}...")
-                    
-                    # Execute multi-strategy analysis (no trading yet)
-                    analysis_result = self._execute_multi_strategy_analysis(product_id)
-                    trading_analyses[product_id] = analysis_result
-                    
-                    action = analysis_result.get('action', 'UNKNOWN')
-                    confidence = analysis_result.get('confidence', 0)
-                    logger.info(f"Analysis for {product_id}: {action} (confidence: {confidence:.1f}%)")
-                    
-                    # Add delay between API calls to avoid rate limiting (increased to 5s for Gemini API)
-                    time.sleep(5)
-                    
-                except Exception as e:
-                    logger.error(f"Error analyzing {product_id}: {e}")
-                    trading_analyses[product_id] = {
-                        "action": "HOLD",
-                        "confidence": 0,
-                        "reasoning": f"Analysis error: {str(e)}",
-                        "product_id": product_id,
-                        "timestamp": datetime.now().isoformat(),
-                        "execution_status": "error",
-                        "trade_executed": False
-                    }
+            # Execute multi-strategy analysis for all pairs (no trading yet); pacing for the
+            # Gemini API comes from the shared token-bucket limiter instead of fixed sleeps
+            trading_analyses = self._analyze_all_pairs(self.config.TRADING_PAIRS)
             
             # Phase 2: Rank opportunities and allocate capital
             logger.info("🎯 Phase 2: Ranking opportunities and allocating capital...")
@@ -1781,10 +1800,6 @@ class TradingBot:
                     # Save results for dashboard
                     self._save_result(product_id, {**analysis_result, **trade_result})
                     
-                    # Add delay between trades
-                    if allocated_amount > 0:
-                        time.sleep(2)
-                    
                 except Exception as e:
                     logger.error(f"Error executing trade for {product_id}: {e}")
                     continue
@@ -1829,9 +1844,6 @@ class TradingBot:
                 # Save results for dashboard
                 self._save_result(product_id, {**decision_result, **trade_result})
                 
-                # Add delay between API calls to avoid rate limiting
-                time.sleep(2)
-                
             except Exception as e:
                 logger.error(f"Error processing {product_id}: {e}")
                 continue
@@ -1840,6 +1852,9 @@ class TradingBot:
         """Start scheduled trading at regular intervals"""
         logger.info(f"Starting scheduled trading every {DECISION_INTERVAL_MINUTES} minutes")
         
+        # Streamed prices and candles replace REST polling where fresh
+        self.start_market_stream()
+        
         # Run once immediately
         self.run_trading_cycle()
         
@@ -1900,6 +1915,13 @@ class TradingBot:
     def update_local_dashboard(self):
         """Update local dashboard data only (no web server sync)"""
         try:
+            # Fold journaled trades into trade_history.json, which the dashboard reads directly
+            self.trade_logger.compact()
+            # Write price refreshes and exchange syncs coalesced during the cycle
+            self.portfolio.flush()
+            # Write the strategy performance summary once for the cycle's decisions
+            self.strategy_manager.performance_tracker.flush()
+            
             # Get trading data
             trading_data = {
                 "recent_trades": self.trade_logger.get_recent_trades(10),
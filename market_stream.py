@@ -0,0 +1,370 @@
+"""
+Streaming market data from the Coinbase Advanced Trade WebSocket feed
+
+Keeps the latest ticker and 1-minute candles per pair in memory so the data
+collector can serve prices and recent candles without REST calls. A file-based
+replay server stands in for the exchange when testing offline.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+import websockets
+
+from utils.candle_store import GRANULARITY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Public Advanced Trade market data feed
+DEFAULT_STREAM_URL = "wss://advanced-trade-ws.coinbase.com"
+DEFAULT_CHANNELS = ["ticker", "market_trades"]
+
+# One week of 1-minute candles per pair
+MAX_MINUTE_CANDLES = 7 * 24 * 60
+
+def _parse_time(value: Any) -> Optional[float]:
+    """Convert an ISO timestamp (up to nanosecond precision) or epoch value to unix seconds"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return pd.Timestamp(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+class MarketStateStore:
+    """Thread-safe in-memory ticker and 1-minute candle state per product"""
+
+    def __init__(self, max_candles: int = MAX_MINUTE_CANDLES):
+        self.max_candles = max_candles
+        self._tickers: Dict[str, Dict[str, float]] = {}
+        # product_id -> OrderedDict(minute_start -> [open, high, low, close, volume])
+        self._minutes: Dict[str, "OrderedDict[int, List[float]]"] = {}
+        # First minute whose trades were all received (the first minute is usually partial)
+        self._coverage_start: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.messages_processed = 0
+        self.trades_processed = 0
+        self.last_message_time = 0.0
+
+    def handle_message(self, message: Union[str, bytes, Dict]):
+        """Apply one raw WebSocket message (ticker and market_trades channels)"""
+        try:
+            data = json.loads(message) if isinstance(message, (str, bytes)) else message
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed stream message: {e}")
+            return
+
+        channel = data.get("channel")
+        message_time = _parse_time(data.get("timestamp")) or time.time()
+
+        with self._lock:
+            self.messages_processed += 1
+            self.last_message_time = time.time()
+
+            for event in data.get("events", []) or []:
+                if channel == "ticker":
+                    for ticker in event.get("tickers", []) or []:
+                        self._apply_ticker(ticker, message_time)
+                elif channel == "market_trades":
+                    # Snapshots only carry the most recent trades, so they never start coverage
+                    is_snapshot = event.get("type") == "snapshot"
+                    for trade in event.get("trades", []) or []:
+                        self._apply_trade(trade, is_snapshot)
+
+    def _apply_ticker(self, ticker: Dict, message_time: float):
+        """Store the latest ticker (caller holds the lock)"""
+        product_id = ticker.get("product_id")
+        try:
+            price = float(ticker.get("price", 0))
+        except (TypeError, ValueError):
+            return
+        if not product_id or price <= 0:
+            return
+
+        self._tickers[product_id] = {
+            "price": price,
+            "best_bid": float(ticker.get("best_bid") or 0),
+            "best_ask": float(ticker.get("best_ask") or 0),
+            "volume_24h": float(ticker.get("volume_24_h") or 0),
+            "price_percent_chg_24h": float(ticker.get("price_percent_chg_24_h") or 0),
+            "exchange_time": message_time,
+            "time": time.time()  # Receive time, used for freshness checks
+        }
+
+    def _apply_trade(self, trade: Dict, is_snapshot: bool = False):
+        """Fold a trade into its 1-minute candle (caller holds the lock)"""
+        product_id = trade.get("product_id")
+        trade_time = _parse_time(trade.get("time"))
+        try:
+            price = float(trade.get("price", 0))
+            size = float(trade.get("size", 0))
+        except (TypeError, ValueError):
+            return
+        if not product_id or trade_time is None or price <= 0:
+            return
+
+        minute = int(trade_time // 60) * 60
+        minutes = self._minutes.setdefault(product_id, OrderedDict())
+        if product_id not in self._coverage_start and not is_snapshot:
+            # The first live minute may have started before the subscription
+            self._coverage_start[product_id] = minute + 60
+
+        candle = minutes.get(minute)
+        if candle is None:
+            out_of_order = bool(minutes) and minute < next(reversed(minutes))
+            minutes[minute] = [price, price, price, price, size]
+            if out_of_order:
+                # Late trade for an older minute: keep minutes ordered
+                minutes = OrderedDict(sorted(minutes.items()))
+                self._minutes[product_id] = minutes
+            while len(minutes) > self.max_candles:
+                minutes.popitem(last=False)
+                if product_id in self._coverage_start:
+                    self._coverage_start[product_id] = max(self._coverage_start[product_id], next(iter(minutes)))
+        else:
+            candle[1] = max(candle[1], price)
+            candle[2] = min(candle[2], price)
+            candle[3] = price
+            candle[4] += size
+
+        self.trades_processed += 1
+
+    def get_ticker(self, product_id: str) -> Optional[Dict[str, float]]:
+        """Get the latest ticker for a product"""
+        with self._lock:
+            ticker = self._tickers.get(product_id)
+            return dict(ticker) if ticker else None
+
+    def get_price(self, product_id: str, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Get the latest streamed price
+
+        Args:
+            product_id: Trading pair (e.g., 'BTC-EUR')
+            max_age: Maximum ticker age in seconds (None accepts any age)
+
+        Returns:
+            Price, or None if no fresh ticker is available
+        """
+        ticker = self.get_ticker(product_id)
+        if not ticker:
+            return None
+        if max_age is not None and time.time() - ticker["time"] > max_age:
+            return None
+        return ticker["price"]
+
+    def covers(self, product_id: str, start_timestamp: float) -> bool:
+        """Check whether every trade since start_timestamp has been streamed"""
+        with self._lock:
+            coverage_start = self._coverage_start.get(product_id)
+        return coverage_start is not None and coverage_start <= start_timestamp
+
+    def get_candles(self, product_id: str, granularity: str = "ONE_MINUTE",
+                    start_timestamp: Optional[float] = None, end_timestamp: Optional[float] = None) -> pd.DataFrame:
+        """
+        Get streamed candles, aggregated from 1-minute candles to the requested granularity
+
+        Args:
+            product_id: Trading pair (e.g., 'BTC-EUR')
+            granularity: Candle granularity (e.g., 'ONE_MINUTE', 'ONE_HOUR')
+            start_timestamp: Earliest candle start (unix seconds)
+            end_timestamp: Latest candle start (unix seconds)
+
+        Returns:
+            DataFrame with OHLCV columns indexed by candle start time (same layout as DataCollector)
+        """
+        candle_seconds = GRANULARITY_SECONDS.get(granularity)
+        if candle_seconds is None:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+
+        with self._lock:
+            rows = [(minute, *values) for minute, values in self._minutes.get(product_id, {}).items()]
+
+        if not rows:
+            return pd.DataFrame()
+
+        minutes = pd.DataFrame(rows, columns=['time', 'open', 'high', 'low', 'close', 'volume'])
+        minutes['time'] = (minutes['time'] // candle_seconds) * candle_seconds
+        candles = minutes.groupby('time', sort=True).agg(
+            open=('open', 'first'), high=('high', 'max'), low=('low', 'min'),
+            close=('close', 'last'), volume=('volume', 'sum')
+        )
+
+        if start_timestamp is not None:
+            candles = candles[candles.index >= (int(start_timestamp) // candle_seconds) * candle_seconds]
+        if end_timestamp is not None:
+            candles = candles[candles.index <= end_timestamp]
+
+        candles.index = pd.to_datetime(candles.index, unit='s')
+        candles.index.name = 'time'
+        return candles[['low', 'high', 'open', 'close', 'volume']]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get stream state metrics"""
+        with self._lock:
+            return {
+                "products": sorted(set(self._tickers) | set(self._minutes)),
+                "messages_processed": self.messages_processed,
+                "trades_processed": self.trades_processed,
+                "seconds_since_last_message": round(time.time() - self.last_message_time, 1) if self.last_message_time else None
+            }
+
+class MarketStream:
+    """Background WebSocket subscription that feeds a MarketStateStore"""
+
+    def __init__(self, product_ids: List[str], store: Optional[MarketStateStore] = None,
+                 url: str = DEFAULT_STREAM_URL, channels: Optional[List[str]] = None,
+                 record_path: Optional[str] = None):
+        """
+        Args:
+            product_ids: Trading pairs to subscribe to
+            store: State store to update (a new one is created if omitted)
+            url: WebSocket endpoint (a ReplayServer URL for offline runs)
+            channels: Public channels to subscribe to
+            record_path: Optional JSONL file receiving every raw message, replayable later
+        """
+        self.product_ids = list(product_ids)
+        self.store = store or MarketStateStore()
+        self.url = url
+        self.channels = channels or list(DEFAULT_CHANNELS)
+        self.record_path = Path(record_path) if record_path else None
+        self._record_lock = threading.Lock()
+        self.client = None
+
+    def _on_message(self, message: str):
+        if self.record_path:
+            with self._record_lock:
+                with open(self.record_path, 'a') as f:
+                    f.write(message.rstrip("\n") + "\n")
+        self.store.handle_message(message)
+
+    def start(self):
+        """Open the connection and subscribe (messages are handled on the client's thread)"""
+        if self.client is not None:
+            return
+
+        from coinbase.websocket import WSClient
+
+        # Public channels only: no credentials needed
+        self.client = WSClient(api_key=None, api_secret=None, base_url=self.url,
+                               on_message=self._on_message, retry=True)
+        self.client.open()
+        self.client.subscribe(product_ids=self.product_ids, channels=self.channels)
+        logger.info(f"📡 Market stream subscribed to {', '.join(self.channels)} for {', '.join(self.product_ids)}")
+
+    def stop(self):
+        """Close the connection"""
+        if self.client is None:
+            return
+        try:
+            self.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing market stream: {e}")
+        finally:
+            self.client = None
+        logger.info("📡 Market stream stopped")
+
+    @property
+    def is_running(self) -> bool:
+        return self.client is not None
+
+class ReplayServer:
+    """
+    Local WebSocket server replaying recorded feed messages
+
+    Each line of the replay file is one raw message as sent by the exchange (the
+    format written by MarketStream's record_path). Every connecting client gets the
+    full file once it has sent its first subscription message.
+    """
+
+    def __init__(self, path: str, host: str = "127.0.0.1", port: int = 0, interval: float = 0.0):
+        """
+        Args:
+            path: JSONL file with recorded messages
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            interval: Seconds to wait between messages
+        """
+        self.path = Path(path)
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.messages_sent = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handler(self, websocket, *args):
+        try:
+            await asyncio.wait_for(websocket.recv(), timeout=5)
+        except (asyncio.TimeoutError, websockets.exceptions.ConnectionClosed):
+            pass
+
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    await websocket.send(line)
+                except websockets.exceptions.ConnectionClosed:
+                    return
+                self.messages_sent += 1
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+
+        await websocket.wait_closed()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(websockets.serve(self._handler, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the server URL"""
+        if not self.path.exists():
+            raise FileNotFoundError(f"Replay file not found: {self.path}")
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="market-replay", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("Replay server did not start")
+
+        logger.info(f"📼 Replaying {self.path} on {self.url}")
+        return self.url
+
+    def stop(self):
+        """Stop the server"""
+        if not self._loop:
+            return
+
+        async def _shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(_shutdown(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._loop.close()
+        self._loop = None
@@ -3,7 +3,7 @@ Trading Strategies Package
 Multi-strategy framework for AI crypto trading bot
 """
 
-from .base_strategy import BaseStrategy, TradingSignal
+from .base_strategy import BaseStrategy, TradingSignal, StrategyEvaluation, BatchSignals, BatchEvaluation
 from .trend_following import TrendFollowingStrategy
 from .mean_reversion import MeanReversionStrategy
 from .momentum import MomentumStrategy
@@ -12,6 +12,9 @@ from .strategy_manager import StrategyManager
 __all__ = [
     'BaseStrategy',
     'TradingSignal',
+    'StrategyEvaluation',
+    'BatchSignals',
+    'BatchEvaluation',
     'TrendFollowingStrategy',
     'MeanReversionStrategy',
     'MomentumStrategy',
@@ -5,7 +5,11 @@ Market-regime aware strategy selection with hierarchical decision making
 
 import logging
 from typing import Dict, List, Optional
-from .base_strategy import BaseStrategy, TradingSignal
+import threading
+import numpy as np
+import pandas as pd
+from .base_strategy import (BaseStrategy, TradingSignal, StrategyEvaluation, BatchSignals, BatchEvaluation,
+                            batch_column, HOLD, SELL)
 from .strategy_manager import StrategyManager
 
 class AdaptiveStrategyManager(StrategyManager):
@@ -14,12 +18,19 @@ class AdaptiveStrategyManager(StrategyManager):
     Phase 1: Hierarchical strategy selection instead of democratic voting
     """
     
-    def __init__(self, config, llm_analyzer=None, news_sentiment_analyzer=None, volatility_analyzer=None):
-        super().__init__(config, llm_analyzer, news_sentiment_analyzer, volatility_analyzer)
+    def __init__(self, config, llm_analyzer=None, news_sentiment_analyzer=None, volatility_analyzer=None,
+                 performance_tracker=None):
+        super().__init__(config, llm_analyzer, news_sentiment_analyzer, volatility_analyzer,
+                         performance_tracker=performance_tracker)
         
         # Ensure logger is set (for tests that patch parent __init__)
         if not hasattr(self, 'logger'):
             self.logger = logging.getLogger(__name__)
+        if not hasattr(self, 'strategy_run_counts'):
+            self.strategy_run_counts = {}
+            self._run_counts_lock = threading.Lock()
+        if not hasattr(self, '_dry_run_state'):
+            self._dry_run_state = threading.local()
         
         # Market regime specific strategy priorities
         self.regime_strategy_priority = {
@@ -113,6 +124,37 @@ class AdaptiveStrategyManager(StrategyManager):
             self.logger.info(f"Market regime detection failed: {e}, defaulting to 'ranging'")
             return "ranging"
     
+    def detect_market_regime_batch(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        detect_market_regime_enhanced for every row of a batch frame
+        
+        Args:
+            frame: Batch frame (see BaseStrategy.analyze_batch) with change_7d for the bear filter
+            
+        Returns:
+            Array of regime labels
+        """
+        change_24h = np.abs(batch_column(frame, 'change_24h', 0))
+        change_5d = np.abs(batch_column(frame, 'change_5d', 0))
+        change_7d = batch_column(frame, 'change_7d', 0)
+        bb_upper = batch_column(frame, 'bb_upper', 0)
+        bb_lower = batch_column(frame, 'bb_lower', 0)
+        bb_middle = batch_column(frame, 'bb_middle', 1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_width_pct = np.where(bb_middle > 0, ((bb_upper - bb_lower) / bb_middle) * 100, 2.0)
+        
+        bear_market = change_7d < -5
+        large_move = (change_24h > 4) | (change_5d > 8)
+        quiet = change_24h < 1.5
+        return np.select(
+            [bear_market & quiet & (bb_width_pct < 3), bear_market,
+             large_move & (bb_width_pct > 4), large_move,
+             quiet & (bb_width_pct < 2), bb_width_pct > 5],
+            ["bear_ranging", "volatile", "volatile", "trending", "ranging", "volatile"],
+            "ranging"
+        ).astype(object)
+    
     def get_adaptive_threshold(self, strategy_name: str, action: str, market_regime: str) -> float:
         """Get adaptive confidence threshold for strategy/action/regime combination"""
         
@@ -219,22 +261,34 @@ class AdaptiveStrategyManager(StrategyManager):
         """
         Override parent method to use adaptive strategy selection
         """
+        return self.evaluate_strategies(market_data, technical_indicators, portfolio).combined_signal
+    
+    def evaluate_strategies(self, market_data: Dict, technical_indicators: Dict, portfolio: Optional[Dict] = None) -> StrategyEvaluation:
+        """
+        Adaptive evaluation: run every strategy once, detect the regime and combine hierarchically
+        """
         
         # Validate inputs (same as parent)
         if not isinstance(technical_indicators, dict):
             self.logger.error(f"Invalid technical_indicators type: {type(technical_indicators)}")
-            return TradingSignal(
-                action="HOLD",
-                confidence=0,
-                reasoning="Invalid technical indicators format"
+            return StrategyEvaluation(
+                combined_signal=TradingSignal(
+                    action="HOLD",
+                    confidence=0,
+                    reasoning="Invalid technical indicators format"
+                ),
+                market_regime=getattr(self, 'current_market_regime', 'ranging')
             )
         
         if not isinstance(market_data, dict):
             self.logger.error(f"Invalid market_data type: {type(market_data)}")
-            return TradingSignal(
-                action="HOLD",
-                confidence=0,
-                reasoning="Invalid market data format"
+            return StrategyEvaluation(
+                combined_signal=TradingSignal(
+                    action="HOLD",
+                    confidence=0,
+                    reasoning="Invalid market data format"
+                ),
+                market_regime=getattr(self, 'current_market_regime', 'ranging')
             )
         
         # Get signals from all strategies
@@ -247,8 +301,9 @@ class AdaptiveStrategyManager(StrategyManager):
         self.current_market_regime = market_regime
         
         # Use adaptive signal combination instead of democratic voting
+        strategy_weights = dict(self.strategy_weights)
         combined_signal = self._combine_strategy_signals_adaptive(
-            strategy_signals, self.strategy_weights, market_regime
+            strategy_signals, strategy_weights, market_regime
         )
         
         # Record decision for performance tracking (same as parent)
@@ -256,7 +311,7 @@ class AdaptiveStrategyManager(StrategyManager):
             current_price = market_data.get('price', 0)
             product_id = market_data.get('product_id', 'Unknown')
             
-            if current_price > 0 and product_id != 'Unknown':
+            if not self._in_dry_run() and current_price > 0 and product_id != 'Unknown':
                 self.performance_tracker.record_decision(
                     product_id=product_id,
                     strategy_signals=strategy_signals,
@@ -269,4 +324,100 @@ class AdaptiveStrategyManager(StrategyManager):
         except Exception as e:
             self.logger.info(f"Failed to record decision for performance tracking: {e}")
         
-        return combined_signal
+        return StrategyEvaluation(
+            combined_signal=combined_signal,
+            strategy_signals=strategy_signals,
+            market_regime=market_regime,
+            strategy_weights=strategy_weights
+        )
+    
+    def evaluate_batch(self, frame: pd.DataFrame) -> Optional[BatchEvaluation]:
+        """
+        Column-wise evaluate_strategies for backtests
+        
+        Every strategy is analyzed once over the whole frame and the hierarchical
+        combination of _combine_strategy_signals_adaptive is applied per regime
+        with array masks. Decisions are not recorded in the performance tracker.
+        
+        Args:
+            frame: Batch frame, one row per evaluation (see BaseStrategy.analyze_batch)
+            
+        Returns:
+            BatchEvaluation, or None when a strategy has no columnar form and the
+            caller has to evaluate row by row
+        """
+        strategy_signals: Dict[str, BatchSignals] = {}
+        for name, strategy in self.strategies.items():
+            signals = strategy.analyze_batch(frame)
+            if signals is None:
+                self.logger.debug(f"{name} strategy has no batch evaluation")
+                return None
+            strategy_signals[name] = signals
+        
+        size = len(frame)
+        market_regime = self.detect_market_regime_batch(frame)
+        if size:
+            self.current_market_regime = market_regime[-1]
+        
+        # HOLD rows keep the average confidence of all strategies
+        action = np.full(size, HOLD, dtype=np.int8)
+        confidence = (sum(signals.confidence for signals in strategy_signals.values()) / len(strategy_signals)
+                      if strategy_signals else np.zeros(size))
+        position_size_multiplier = np.ones(size)
+        primary_strategy = np.full(size, "", dtype=object)
+        reason_code = np.zeros(size, dtype=np.int16)
+        reasons: List[str] = []
+        thresholds = {name: np.zeros(size) for name in strategy_signals}
+        
+        for regime in map(str, np.unique(market_regime)):
+            rows = market_regime == regime
+            strategy_priority = self.regime_strategy_priority.get(regime,
+                                                                  ["llm_strategy", "trend_following", "mean_reversion", "momentum"])
+            secondaries = [strategy_signals[name] for name in strategy_priority[1:3] if name in strategy_signals]
+            
+            for name, signals in strategy_signals.items():
+                thresholds[name][rows] = np.where(signals.action[rows] == SELL,
+                                                  self.get_adaptive_threshold(name, "SELL", regime),
+                                                  self.get_adaptive_threshold(name, "BUY", regime))
+            
+            undecided = rows.copy()
+            for name in strategy_priority:
+                if name not in strategy_signals:
+                    continue
+                signals = strategy_signals[name]
+                threshold = thresholds[name]
+                
+                confirmation_bonus = np.zeros(size, dtype=np.int64)
+                veto_penalty = np.zeros(size, dtype=np.int64)
+                for secondary in secondaries:
+                    agrees = secondary.action == signals.action
+                    confirmation_bonus += np.where(agrees, 5, 0)
+                    veto_penalty += np.where(~agrees & (secondary.action != HOLD) & (secondary.confidence > 60), 10, 0)
+                
+                final_confidence = np.maximum(0, np.minimum(95, signals.confidence + confirmation_bonus - veto_penalty))
+                decided = undecided & (signals.confidence >= threshold) & (final_confidence >= threshold)
+                
+                action[decided] = signals.action[decided]
+                confidence[decided] = final_confidence[decided]
+                position_size_multiplier[decided] = signals.position_size_multiplier[decided]
+                primary_strategy[decided] = name
+                reason_code[decided] = len(reasons)
+                reasons.append(f"Adaptive {regime} market strategy: {name}")
+                undecided &= ~decided
+            
+            reason_code[undecided] = len(reasons)
+            reasons.append(f"No strategy meets adaptive thresholds in {regime} market")
+        
+        return BatchEvaluation(
+            combined_signal=BatchSignals(
+                action=action,
+                confidence=confidence,
+                reason_code=reason_code,
+                position_size_multiplier=position_size_multiplier,
+                reasons=tuple(reasons)
+            ),
+            strategy_signals=strategy_signals,
+            market_regime=market_regime,
+            primary_strategy=primary_strategy,
+            thresholds=thresholds
+        )
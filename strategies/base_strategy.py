@@ -4,9 +4,16 @@ Base Strategy Class for Multi-Strategy Trading Framework
 
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
+import numpy as np
+import pandas as pd
+
+# Action codes used by analyze_batch
+HOLD, BUY, SELL = 0, 1, 2
+ACTIONS = ("HOLD", "BUY", "SELL")
+
 @dataclass
 class TradingSignal:
     """Trading signal with confidence and reasoning"""
@@ -17,6 +24,57 @@ class TradingSignal:
     stop_loss: Optional[float] = None
     take_profit: Optional[float] = None
 
+@dataclass
+class StrategyEvaluation:
+    """Combined signal together with the per-strategy signals it was built from"""
+    combined_signal: TradingSignal
+    strategy_signals: Dict[str, TradingSignal] = field(default_factory=dict)
+    market_regime: str = "sideways"
+    strategy_weights: Dict[str, float] = field(default_factory=dict)  # Weights the signals were combined with
+
+@dataclass
+class BatchSignals:
+    """
+    Signals for every row of a frame, as parallel arrays
+
+    reason_code indexes into reasons, which holds the leading text of the
+    reasoning analyze() gives for the same decision.
+    """
+    action: np.ndarray  # HOLD/BUY/SELL codes
+    confidence: np.ndarray
+    reason_code: np.ndarray
+    position_size_multiplier: np.ndarray
+    reasons: Tuple[str, ...]
+
+    def action_labels(self) -> np.ndarray:
+        """Actions as "HOLD"/"BUY"/"SELL" strings"""
+        return np.asarray(ACTIONS, dtype=object)[self.action]
+
+    def reasoning(self) -> np.ndarray:
+        """Reason text for every row"""
+        return np.asarray(self.reasons, dtype=object)[self.reason_code]
+
+@dataclass
+class BatchEvaluation:
+    """Column-wise counterpart of StrategyEvaluation"""
+    combined_signal: BatchSignals
+    strategy_signals: Dict[str, BatchSignals]
+    market_regime: np.ndarray  # Regime label per row
+    primary_strategy: np.ndarray  # Strategy that decided each row ("" when none qualified)
+    thresholds: Dict[str, np.ndarray] = field(default_factory=dict)  # Adaptive threshold per strategy and row
+
+def batch_column(frame: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    """
+    Float column of a batch frame with missing values replaced by default
+
+    A missing column or NaN stands for a key that is absent from the
+    market_data/technical_indicators dictionaries passed to analyze().
+    """
+    if name not in frame.columns:
+        return np.full(len(frame), default, dtype=np.float64)
+    values = frame[name].to_numpy(dtype=np.float64)
+    return np.where(np.isnan(values), default, values)
+
 class BaseStrategy(ABC):
     """Base class for all trading strategies"""
     
@@ -58,6 +116,24 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def analyze_batch(self, frame: pd.DataFrame) -> Optional[BatchSignals]:
+        """
+        Evaluate analyze() for every row of a frame at once
+
+        Each row holds the flat inputs of one analyze() call: price and
+        price changes (change_1h, change_4h, change_24h, change_5d, in
+        percent), volume and volume_average from market_data, and
+        current_price, rsi, macd_histogram, bb_upper, bb_lower and bb_middle
+        from the technical indicators.
+
+        Args:
+            frame: One row per analyze() call
+
+        Returns:
+            BatchSignals, or None if the strategy only supports analyze()
+        """
+        return None
+    
     def is_applicable(self, 
                      market_data: Dict,
                      portfolio: Dict) -> bool:
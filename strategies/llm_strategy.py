@@ -4,12 +4,16 @@ Enhanced for Phase 3 with news sentiment integration
 """
 
 import logging
-from typing import Dict
-from .base_strategy import BaseStrategy, TradingSignal
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from .base_strategy import BaseStrategy, TradingSignal, BatchSignals, ACTIONS
 
 class LLMStrategy(BaseStrategy):
     """Strategy that uses LLM analysis for trading decisions with Phase 3 enhancements"""
     
+    BATCH_REASONS = ("Enhanced LLM analysis", "LLM analyzer not available")
+    
     def __init__(self, config, llm_analyzer=None, news_sentiment_analyzer=None):
         super().__init__("llm_strategy", config)
         self.llm_analyzer = llm_analyzer
@@ -67,6 +71,44 @@ class LLMStrategy(BaseStrategy):
                 reasoning=f"Enhanced LLM analysis error: {str(e)}"
             )
     
+    def analyze_batch(self, frame: pd.DataFrame) -> Optional[BatchSignals]:
+        """
+        Evaluate analyze() for every row of a frame (see BaseStrategy.analyze_batch)
+        
+        Only available when the LLM analyzer has an analyze_market_batch method
+        (the backtest simulator); a live analyzer makes one request per row.
+        News sentiment is fetched once for frame.attrs['product_id'].
+        """
+        size = len(frame)
+        if not self.llm_analyzer:
+            return BatchSignals(
+                action=np.zeros(size, dtype=np.int8),
+                confidence=np.full(size, 50.0),
+                reason_code=np.ones(size, dtype=np.int8),
+                position_size_multiplier=np.ones(size),
+                reasons=self.BATCH_REASONS
+            )
+        
+        analyze_market_batch = getattr(self.llm_analyzer, 'analyze_market_batch', None)
+        if not callable(analyze_market_batch):
+            return None
+        
+        news_sentiment = self._get_news_sentiment({'product_id': frame.attrs.get('product_id', 'BTC-EUR')})
+        llm_result = analyze_market_batch(frame)
+        action = np.asarray(llm_result['decision'], dtype=np.int8)
+        
+        # Sentiment adjustment per action (_convert_llm_result_with_sentiment)
+        adjustments = np.array([self._calculate_sentiment_adjustment(name, news_sentiment) for name in ACTIONS])
+        confidence = np.asarray(llm_result['confidence'], dtype=np.float64) + adjustments[action]
+        
+        return BatchSignals(
+            action=action,
+            confidence=np.maximum(0, np.minimum(100, confidence)),
+            reason_code=np.zeros(size, dtype=np.int8),
+            position_size_multiplier=np.ones(size),
+            reasons=self.BATCH_REASONS
+        )
+    
     def _get_news_sentiment(self, market_data: Dict) -> Dict:
         """Get news sentiment for the asset (Phase 3)"""
         
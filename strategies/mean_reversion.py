@@ -3,15 +3,24 @@ Mean Reversion Strategy
 Identifies oversold/overbought conditions and trades against the trend
 """
 
-from .base_strategy import BaseStrategy, TradingSignal
+from .base_strategy import BaseStrategy, TradingSignal, BatchSignals, batch_column, HOLD, BUY, SELL
 from typing import Dict
 import numpy as np
+import pandas as pd
 
 class MeanReversionStrategy(BaseStrategy):
     """
     Mean reversion strategy using RSI, Bollinger Bands, and price deviation
     """
     
+    # Reason codes of analyze_batch
+    BATCH_REASONS = (
+        "Mean reversion BUY signal",
+        "Mean reversion SELL signal",
+        "No clear mean reversion signal",
+        "Analysis error"
+    )
+    
     def __init__(self, config):
         super().__init__("MeanReversion", config)
         
@@ -96,6 +105,66 @@ class MeanReversionStrategy(BaseStrategy):
                 reasoning=f"Analysis error: {str(e)}"
             )
     
+    def analyze_batch(self, frame: pd.DataFrame) -> BatchSignals:
+        """Evaluate analyze() for every row of a frame (see BaseStrategy.analyze_batch)"""
+        rsi = batch_column(frame, 'rsi', 50)
+        price = batch_column(frame, 'price', 0)
+        upper = batch_column(frame, 'bb_upper', 0)
+        lower = batch_column(frame, 'bb_lower', 0)
+        middle = batch_column(frame, 'bb_middle', 0)
+        
+        # RSI signal (_analyze_rsi_reversion): strong_buy=2 ... strong_sell=-2
+        rsi_conditions = [rsi <= self.rsi_extreme_oversold, rsi <= self.rsi_oversold,
+                          rsi >= self.rsi_extreme_overbought, rsi >= self.rsi_overbought]
+        rsi_value = np.select(rsi_conditions, [2, 1, -2, -1], 0)
+        rsi_strength = np.select(rsi_conditions, [0.9, 0.7, 0.9, 0.7], 0.2)
+        
+        # Bollinger signal (_analyze_bollinger_reversion)
+        has_bands = (price != 0) & (upper != 0) & (lower != 0) & (middle != 0)
+        band_width = upper - lower
+        # Flat bands divide by zero in analyze(), which then returns an error signal
+        errors = has_bands & (band_width == 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            below_deviation = (lower - price) / band_width
+            above_deviation = (price - upper) / band_width
+            distance_from_middle = np.abs(price - middle) / band_width
+        below = has_bands & (price < lower)
+        above = has_bands & ~below & (price > upper)
+        band_conditions = [below & (below_deviation > self.bollinger_threshold), below,
+                           above & (above_deviation > self.bollinger_threshold), above, has_bands]
+        bollinger_value = np.select(band_conditions[:4], [2, 1, -2, -1], 0)
+        bollinger_strength = np.select(band_conditions, [
+            np.minimum(0.9, 0.6 + below_deviation * 2), 0.6,
+            np.minimum(0.9, 0.6 + above_deviation * 2), 0.6,
+            np.maximum(0.1, 0.4 - distance_from_middle)
+        ], 0.0)
+        
+        # Weighted combination (_combine_signals)
+        combined_value = (rsi_value * 0.6) + (bollinger_value * 0.4)
+        strength = (rsi_strength * 0.6) + (bollinger_strength * 0.4)
+        strong_buy = combined_value >= 1.5
+        buy = ~strong_buy & (combined_value >= 0.5)
+        strong_sell = ~strong_buy & ~buy & (combined_value <= -1.5)
+        sell = ~strong_buy & ~buy & ~strong_sell & (combined_value <= -0.5)
+        strong = strong_buy | strong_sell
+        
+        # Decision (_generate_decision) and position size (_calculate_position_size)
+        base_confidence = strength * 80
+        action = np.select([strong_buy | buy, strong_sell | sell], [BUY, SELL], HOLD)
+        confidence = np.where(action != HOLD, np.minimum(95, base_confidence + 15), np.maximum(20, base_confidence))
+        confidence = np.where(strong, np.minimum(95, confidence + 10), confidence)
+        reason_code = np.select([action == BUY, action == SELL], [0, 1], 2)
+        multiplier = np.select([strong, buy | sell],
+                               [np.minimum(1.5, 0.8 + strength * 0.7), np.minimum(1.2, 0.6 + strength * 0.6)], 0.5)
+        
+        return BatchSignals(
+            action=np.where(errors, HOLD, action).astype(np.int8),
+            confidence=np.where(errors, 0.0, confidence),
+            reason_code=np.where(errors, 3, reason_code).astype(np.int8),
+            position_size_multiplier=np.where(errors, 1.0, multiplier),
+            reasons=self.BATCH_REASONS
+        )
+    
     def _analyze_rsi_reversion(self, rsi: float) -> Dict:
         """Analyze RSI for mean reversion signals"""
         
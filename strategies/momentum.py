@@ -3,15 +3,25 @@ Momentum Strategy
 Identifies and trades with strong price momentum and breakouts
 """
 
-from .base_strategy import BaseStrategy, TradingSignal
+from .base_strategy import BaseStrategy, TradingSignal, BatchSignals, batch_column, HOLD, BUY, SELL
 from typing import Dict
 import numpy as np
+import pandas as pd
 
 class MomentumStrategy(BaseStrategy):
     """
     Momentum strategy using price velocity, volume, and breakout patterns
     """
     
+    # Reason codes of analyze_batch
+    BATCH_REASONS = (
+        "Strong bullish momentum detected",
+        "Bullish momentum but RSI overbought",
+        "Strong bearish momentum detected",
+        "Bearish momentum but RSI oversold",
+        "Weak momentum"
+    )
+    
     def __init__(self, config):
         super().__init__("Momentum", config)
         
@@ -103,6 +113,79 @@ class MomentumStrategy(BaseStrategy):
                 reasoning=f"Analysis error: {str(e)}"
             )
     
+    def analyze_batch(self, frame: pd.DataFrame) -> BatchSignals:
+        """
+        Evaluate analyze() for every row of a frame (see BaseStrategy.analyze_batch)
+        
+        MACD is part of the flat indicator layout, so as in analyze() with those
+        dictionaries, technical momentum comes from RSI alone.
+        """
+        rsi = batch_column(frame, 'rsi', 50)
+        change_columns = [name for name in ('change_1h', 'change_4h', 'change_24h', 'change_5d') if name in frame.columns]
+        has_changes = frame[change_columns].notna().any(axis=1).to_numpy() if change_columns else np.zeros(len(frame), dtype=bool)
+        
+        # Price momentum (_analyze_price_momentum)
+        weighted_momentum = ((batch_column(frame, 'change_1h', 0) / 100 * 0.5) +
+                             (batch_column(frame, 'change_4h', 0) / 100 * 0.3) +
+                             (batch_column(frame, 'change_24h', 0) / 100 * 0.2))
+        abs_momentum = np.abs(weighted_momentum)
+        price_strength = np.select(
+            [abs_momentum >= self.strong_momentum_threshold, abs_momentum >= self.momentum_threshold],
+            [np.minimum(0.9, 0.6 + (abs_momentum - self.strong_momentum_threshold) * 10),
+             np.minimum(0.7, 0.4 + (abs_momentum - self.momentum_threshold) * 10)],
+            abs_momentum * 10)
+        price_score = np.where(has_changes, np.sign(weighted_momentum) * price_strength, 0.0)
+        
+        # Volume momentum (_analyze_volume_momentum): only strong/moderate volume amplifies price momentum
+        current_volume = batch_column(frame, 'volume', 0)
+        average_volume = batch_column(frame, 'volume_average', 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = current_volume / average_volume
+        high_volume = (average_volume != 0) & (volume_ratio >= self.volume_multiplier_threshold)
+        volume_strength = np.where(volume_ratio >= 2.0, np.minimum(0.9, 0.6 + (volume_ratio - 2.0) * 0.1),
+                                   0.6 + (volume_ratio - self.volume_multiplier_threshold) * 0.2)
+        volume_multiplier = np.where(high_volume, 1.0 + (volume_strength - 0.4), 1.0)
+        
+        # Technical momentum (_analyze_technical_momentum)
+        rsi_momentum = np.select(
+            [(rsi >= 50) & (rsi <= 80), (rsi >= 20) & (rsi <= 50)],
+            [np.minimum(0.8, (rsi - 50) / 30 * 0.8), -np.minimum(0.8, (50 - rsi) / 30 * 0.8)], 0.0)
+        technical_strength = np.minimum(0.9, np.abs(rsi_momentum))
+        technical_score = np.select([rsi_momentum > 0.3, rsi_momentum < -0.3],
+                                    [technical_strength, -technical_strength], 0.0)
+        
+        # Combined momentum (_combine_momentum_signals)
+        combined_score = (price_score * 0.4 * volume_multiplier) + (technical_score * 0.3)
+        strength = np.minimum(0.95, np.abs(combined_score))
+        strong_bullish = combined_score > 0.4
+        bullish = combined_score > 0.2
+        strong_bearish = combined_score < -0.4
+        bearish = combined_score < -0.2
+        strong = strong_bullish | strong_bearish
+        
+        # Decision (_generate_momentum_decision) and position size
+        base_confidence = strength * 70 + 20
+        bonus = np.where(strong, 15, 10)
+        buy = bullish & ~(rsi > 85)
+        sell = bearish & ~(rsi < 15)
+        blocked = (bullish & ~buy) | (bearish & ~sell)
+        
+        action = np.select([buy, sell], [BUY, SELL], HOLD)
+        confidence = np.select([buy | sell, blocked],
+                               [np.minimum(95, base_confidence + bonus), base_confidence * 0.6],
+                               np.maximum(25, base_confidence * 0.7))
+        reason_code = np.select([buy, bullish, sell, bearish], [0, 1, 2, 3], 4)
+        multiplier = np.select([strong, bullish | bearish],
+                               [np.minimum(1.8, 1.0 + strength * 0.8), np.minimum(1.4, 0.8 + strength * 0.6)], 0.6)
+        
+        return BatchSignals(
+            action=action.astype(np.int8),
+            confidence=confidence,
+            reason_code=reason_code.astype(np.int8),
+            position_size_multiplier=multiplier,
+            reasons=self.BATCH_REASONS
+        )
+    
     def _analyze_price_momentum(self, price_changes: Dict) -> Dict:
         """Analyze price momentum across timeframes"""
         
@@ -5,10 +5,14 @@ Tracks accuracy and performance of rule-based vs LLM strategies
 
 import json
 import logging
+import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, asdict, fields
 import os
+import threading
+import numpy as np
+import pandas as pd
 
 @dataclass
 class StrategyPerformance:
@@ -40,24 +44,245 @@ class DecisionRecord:
     profit_loss_4h: Optional[float] = None
     profit_loss_24h: Optional[float] = None
 
+# Outcome horizons: (DecisionRecord field suffix, seconds after the decision)
+OUTCOME_HORIZONS = (('1h', 3600), ('4h', 4 * 3600), ('24h', 24 * 3600))
+
+# Candles used to resolve outcomes; the trading cycle fetches the same window,
+# so they are normally served from the DataCollector candle cache
+OUTCOME_CANDLE_GRANULARITY = 'ONE_HOUR'
+OUTCOME_CANDLE_SECONDS = 3600
+OUTCOME_CANDLE_DAYS = 7
+
+# Window of the performance metrics behind get_adaptive_weights
+RECENT_PERFORMANCE_DAYS = 7
+
+class DecisionRecordStore:
+    """
+    Append-only SQLite store for DecisionRecords
+    
+    Recording a decision is a single INSERT. Rows are indexed by
+    (evaluated, product_id, decision_time), so outcome updates only read the
+    pending rows whose horizons are due, and opening the store does not load
+    the history into memory.
+    """
+    
+    COLUMNS = tuple(field.name for field in fields(DecisionRecord))
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        
+        columns = ", ".join(f"{name} {self._column_type(name)}" for name in self.COLUMNS)
+        with self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS decisions ("
+                f"id INTEGER PRIMARY KEY, decision_time REAL NOT NULL, "
+                f"evaluated INTEGER NOT NULL DEFAULT 0, {columns})"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_pending "
+                               "ON decisions (evaluated, product_id, decision_time)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_time ON decisions (decision_time)")
+    
+    @staticmethod
+    def _column_type(name: str) -> str:
+        if name in ('timestamp', 'product_id', 'strategy_name', 'action'):
+            return "TEXT"
+        return "INTEGER" if name == 'was_correct' else "REAL"
+    
+    def append(self, records: Iterable[DecisionRecord]):
+        """Insert records (one transaction)"""
+        rows = [(datetime.fromisoformat(record.timestamp).timestamp(),
+                 int(record.was_correct is not None)) + self._values(record)
+                for record in records]
+        placeholders = ", ".join("?" * (len(self.COLUMNS) + 2))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO decisions (decision_time, evaluated, {', '.join(self.COLUMNS)}) "
+                f"VALUES ({placeholders})", rows
+            )
+    
+    def pending(self, now: float) -> List[Tuple[int, DecisionRecord]]:
+        """
+        Unevaluated records with at least one outcome horizon due at `now`
+        
+        Returns:
+            (row id, record) pairs ordered by product and decision time
+        """
+        conditions = " OR ".join(f"(price_after_{suffix} IS NULL AND decision_time <= ?)"
+                                 for suffix, _ in OUTCOME_HORIZONS)
+        first_due = now - OUTCOME_HORIZONS[0][1]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(self.COLUMNS)} FROM decisions "
+                f"WHERE evaluated = 0 AND decision_time <= ? AND ({conditions}) "
+                f"ORDER BY product_id, decision_time",
+                (first_due, *(now - seconds for _, seconds in OUTCOME_HORIZONS))
+            ).fetchall()
+        return [(row[0], self._record(row[1:])) for row in rows]
+    
+    def update(self, updates: Iterable[Tuple[int, DecisionRecord]]):
+        """Write back outcome fields of records returned by pending()"""
+        outcome_columns = [name for name in self.COLUMNS if name.startswith(('price_after_', 'profit_loss_'))]
+        outcome_columns.append('was_correct')
+        assignments = ", ".join(f"{name} = ?" for name in outcome_columns)
+        rows = [tuple(self._values(record, outcome_columns)) + (int(record.price_after_24h is not None), row_id)
+                for row_id, record in updates]
+        with self._lock, self._conn:
+            self._conn.executemany(f"UPDATE decisions SET {assignments}, evaluated = ? WHERE id = ?", rows)
+    
+    def records(self, since: Optional[datetime] = None, strategy_name: Optional[str] = None) -> List[DecisionRecord]:
+        """Records in decision order, optionally after `since` and for one strategy"""
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("decision_time > ?")
+            params.append(since.timestamp())
+        if strategy_name is not None:
+            conditions.append("strategy_name = ?")
+            params.append(strategy_name)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM decisions{where} ORDER BY decision_time, id", params
+            ).fetchall()
+        return [self._record(row) for row in rows]
+    
+    def accuracy_counts(self) -> Dict[str, Tuple[int, int]]:
+        """(evaluated, correct) record counts per strategy"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT strategy_name, COUNT(*), SUM(was_correct) FROM decisions "
+                "WHERE was_correct IS NOT NULL GROUP BY strategy_name"
+            ).fetchall()
+        return {name: (evaluated, int(correct or 0)) for name, evaluated, correct in rows}
+    
+    def hourly_counts(self, since: float) -> List[Tuple[str, str, int, int, int, float]]:
+        """
+        (strategy, product, hour, decisions, correct, confidence sum) for
+        records decided after since, grouped by hour of decision
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT strategy_name, product_id, CAST(decision_time / 3600 AS INTEGER) AS hour, "
+                "COUNT(*), COALESCE(SUM(was_correct = 1), 0), SUM(confidence) FROM decisions "
+                "WHERE decision_time > ? GROUP BY strategy_name, product_id, hour", (since,)
+            ).fetchall()
+    
+    def count(self) -> int:
+        """Number of stored records"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    def _values(self, record: DecisionRecord, columns: Optional[Iterable[str]] = None) -> tuple:
+        values = []
+        for name in columns or self.COLUMNS:
+            value = getattr(record, name)
+            if isinstance(value, bool) or name == 'was_correct':
+                value = None if value is None else int(value)
+            elif value is not None and not isinstance(value, (str, int, float)):
+                value = str(value)
+            values.append(value)
+        return tuple(values)
+    
+    def _record(self, row: tuple) -> DecisionRecord:
+        record = DecisionRecord(**dict(zip(self.COLUMNS, row)))
+        if record.was_correct is not None:
+            record.was_correct = bool(record.was_correct)
+        return record
+
+class RollingDecisionStats:
+    """
+    Hourly ring buffers of decision counts per (strategy, product)
+    
+    Each key holds `hours` slots of [decisions, correct, confidence sum]
+    tagged with the hour they belong to; a slot is reset when a newer hour
+    reuses it. Windowed totals are a sum over the slots, independent of the
+    length of the decision history.
+    """
+    
+    DECISIONS, CORRECT, CONFIDENCE = range(3)
+    
+    def __init__(self, hours: int):
+        self.hours = hours
+        self._slots: Dict[Tuple[str, str], np.ndarray] = {}
+        self._slot_hours: Dict[Tuple[str, str], np.ndarray] = {}
+    
+    def add(self, strategy_name: str, product_id: str, decision_time: float,
+            decisions: int = 0, correct: int = 0, confidence: float = 0.0):
+        """Add counts to the hour bucket of decision_time"""
+        key = (strategy_name, product_id)
+        if key not in self._slots:
+            self._slots[key] = np.zeros((self.hours, 3))
+            self._slot_hours[key] = np.full(self.hours, -1, dtype=np.int64)
+        
+        hour = int(decision_time // 3600)
+        slot = hour % self.hours
+        slot_hours = self._slot_hours[key]
+        if slot_hours[slot] != hour:
+            if slot_hours[slot] > hour:
+                return  # Older than the ring
+            self._slots[key][slot] = 0
+            slot_hours[slot] = hour
+        self._slots[key][slot] += (decisions, correct, confidence)
+    
+    def totals(self, since: float) -> Dict[str, np.ndarray]:
+        """[decisions, correct, confidence sum] per strategy for hours from since on"""
+        first_hour = int(since // 3600)
+        totals: Dict[str, np.ndarray] = {}
+        for key, slots in self._slots.items():
+            strategy_name = key[0]
+            total = slots[self._slot_hours[key] >= first_hour].sum(axis=0)
+            totals[strategy_name] = totals[strategy_name] + total if strategy_name in totals else total
+        return totals
+
 class HybridPerformanceTracker:
-    """Track performance of hybrid framework strategies"""
+    """
+    Track performance of hybrid framework strategies
+    
+    With data_dir=None the tracker keeps everything in memory (an in-memory
+    SQLite store, no strategy_performance.json, no legacy migration), for
+    backtests and simulations that must not touch the live performance data.
+    """
     
-    def __init__(self, data_dir: str = "data/performance"):
+    def __init__(self, data_dir: Optional[str] = "data/performance"):
         self.data_dir = data_dir
         self.logger = logging.getLogger(__name__)
         
-        # Ensure data directory exists
-        os.makedirs(data_dir, exist_ok=True)
+        if data_dir is None:
+            self.performance_file = None
+            self.decisions_db = ":memory:"
+            self.decisions_file = None
+        else:
+            # Ensure data directory exists
+            os.makedirs(data_dir, exist_ok=True)
+            
+            self.performance_file = os.path.join(data_dir, "strategy_performance.json")
+            self.decisions_db = os.path.join(data_dir, "decision_records.db")
+            self.decisions_file = os.path.join(data_dir, "decision_records.json")  # Legacy JSON list, migrated on load
         
-        self.performance_file = os.path.join(data_dir, "strategy_performance.json")
-        self.decisions_file = os.path.join(data_dir, "decision_records.json")
+        # Serializes record/save when several pairs are analyzed concurrently
+        self._lock = threading.RLock()
         
         # Load existing data
         self.strategy_performance = self._load_performance_data()
-        self.decision_records = self._load_decision_records()
-        
-        self.logger.info(f"Performance tracker initialized with {len(self.decision_records)} historical records")
+        # strategy_performance changes not yet written; flushed at the cycle boundary
+        self._performance_dirty = False
+        self.store = DecisionRecordStore(self.decisions_db)
+        self._migrate_decision_records()
+        self.total_records = self.store.count()
+        
+        # Aggregates maintained as decisions and outcomes arrive
+        self._accuracy_counts = {name: list(counts) for name, counts in self.store.accuracy_counts().items()}
+        self.recent_stats = RollingDecisionStats(hours=RECENT_PERFORMANCE_DAYS * 24 + 1)
+        self._load_recent_stats()
+        
+        self.logger.info(f"Performance tracker initialized with {self.total_records} historical records")
     
     def record_decision(self, 
                        product_id: str,
@@ -66,7 +291,18 @@ class HybridPerformanceTracker:
                        current_price: float):
         """Record a trading decision for performance tracking"""
         
+        with self._lock:
+            self._record_decision_locked(product_id, strategy_signals, final_decision, current_price)
+    
+    def _record_decision_locked(self,
+                                product_id: str,
+                                strategy_signals: Dict[str, any],
+                                final_decision: Dict[str, any],
+                                current_price: float):
+        """Append decision records to the store (caller holds the lock)"""
+        
         timestamp = datetime.now().isoformat()
+        records = []
         
         # Record individual strategy decisions
         for strategy_name, signal in strategy_signals.items():
@@ -89,7 +325,7 @@ class HybridPerformanceTracker:
                 price_at_decision=current_price
             )
             
-            self.decision_records.append(decision_record)
+            records.append(decision_record)
             
             # Update strategy performance stats
             self._update_strategy_performance(strategy_name, signal)
@@ -104,89 +340,181 @@ class HybridPerformanceTracker:
             price_at_decision=current_price
         )
         
-        self.decision_records.append(combined_record)
+        records.append(combined_record)
         
-        # Save updated records
-        self._save_decision_records()
-        self._save_performance_data()
+        # Append the new records; the history is not rewritten
+        self.store.append(records)
+        self.total_records += len(records)
+        decision_time = datetime.fromisoformat(timestamp).timestamp()
+        for record in records:
+            self.recent_stats.add(record.strategy_name, product_id, decision_time,
+                                  decisions=1, confidence=record.confidence)
+        self._performance_dirty = True
         
         self.logger.debug(f"Recorded decision for {product_id}: {len(strategy_signals)} strategies + combined")
     
-    def update_decision_outcomes(self, data_collector=None):
+    def update_decision_outcomes(self, data_collector=None, now: Optional[datetime] = None):
         """Update decision outcomes based on price movements
         
+        Only unevaluated records with a due horizon are read from the store. The
+        price after each horizon is the close of the candle containing
+        decision time + horizon, looked up for all pending records of a product
+        at once. Records older than the candle window fall back to the current
+        price (one request per product).
+        
         Args:
-            data_collector: DataCollector instance for fetching current prices
+            data_collector: DataCollector instance for fetching candles and current prices
+            now: Evaluation time (defaults to datetime.now())
         """
         
-        current_time = datetime.now()
+        if not data_collector:
+            return
+        
+        now = now or datetime.now()
+        pending = self.store.pending(now.timestamp())
+        if not pending:
+            self.flush()
+            return
+        
         updated_count = 0
         
         # Group records by product_id to minimize API calls
-        products_to_update = {}
+        products_to_update: Dict[str, List[Tuple[int, DecisionRecord]]] = {}
+        for row_id, record in pending:
+            products_to_update.setdefault(record.product_id, []).append((row_id, record))
         
-        for i, record in enumerate(self.decision_records):
-            if record.was_correct is not None:
-                continue  # Already evaluated
-            
-            decision_time = datetime.fromisoformat(record.timestamp)
-            time_elapsed = current_time - decision_time
-            
-            # Update prices at different intervals
-            if time_elapsed >= timedelta(hours=1) and record.price_after_1h is None:
-                if record.product_id not in products_to_update:
-                    products_to_update[record.product_id] = []
-                products_to_update[record.product_id].append((i, '1h'))
-            
-            if time_elapsed >= timedelta(hours=4) and record.price_after_4h is None:
-                if record.product_id not in products_to_update:
-                    products_to_update[record.product_id] = []
-                products_to_update[record.product_id].append((i, '4h'))
-            
-            if time_elapsed >= timedelta(hours=24) and record.price_after_24h is None:
-                if record.product_id not in products_to_update:
-                    products_to_update[record.product_id] = []
-                products_to_update[record.product_id].append((i, '24h'))
-        
-        # Fetch current prices and update records
-        if data_collector and products_to_update:
-            for product_id, updates in products_to_update.items():
-                try:
+        changed = []
+        for product_id, updates in products_to_update.items():
+            try:
+                records = [record for _, record in updates]
+                candles = self._load_outcome_candles(data_collector, product_id)
+                uncovered = self._resolve_outcomes_from_candles(records, candles, now)
+                
+                # Records older than the candle window: current price, as before candles were used
+                if uncovered:
                     current_price = data_collector.get_current_price(product_id)
                     if current_price > 0:
-                        for record_idx, timeframe in updates:
-                            record = self.decision_records[record_idx]
-                            
-                            # Update price for the timeframe
-                            if timeframe == '1h':
-                                record.price_after_1h = current_price
-                                record.profit_loss_1h = ((current_price - record.price_at_decision) / record.price_at_decision) * 100
-                            elif timeframe == '4h':
-                                record.price_after_4h = current_price
-                                record.profit_loss_4h = ((current_price - record.price_at_decision) / record.price_at_decision) * 100
-                            elif timeframe == '24h':
-                                record.price_after_24h = current_price
-                                record.profit_loss_24h = ((current_price - record.price_at_decision) / record.price_at_decision) * 100
-                                
-                                # Evaluate correctness after 24h
-                                record.was_correct = self._evaluate_decision_accuracy(record)
-                                if record.was_correct is not None:
-                                    updated_count += 1
-                            
-                except Exception as e:
-                    self.logger.error(f"Error fetching price for {product_id}: {e}")
+                        for record in uncovered:
+                            time_elapsed = now - datetime.fromisoformat(record.timestamp)
+                            for suffix, seconds in OUTCOME_HORIZONS:
+                                if time_elapsed >= timedelta(seconds=seconds) and getattr(record, f'price_after_{suffix}') is None:
+                                    self._set_outcome_price(record, suffix, current_price)
+                
+                for row_id, record in updates:
+                    # Evaluate correctness after 24h
+                    if record.price_after_24h is not None:
+                        record.was_correct = self._evaluate_decision_accuracy(record)
+                        if record.was_correct is not None:
+                            updated_count += 1
+                    changed.append((row_id, record))
+                    
+            except Exception as e:
+                self.logger.error(f"Error resolving outcomes for {product_id}: {e}")
+        
+        if changed:
+            self.store.update(changed)
         
         if updated_count > 0:
-            self._save_decision_records()
-            self._recalculate_accuracy_rates()
+            with self._lock:
+                for _, record in changed:
+                    if record.was_correct is not None:
+                        self._add_outcome(record)
+                self._apply_accuracy_rates()
+                self._performance_dirty = True
             self.logger.info(f"Updated outcomes for {updated_count} decisions")
+        
+        self.flush()
+    
+    def flush(self) -> bool:
+        """
+        Write strategy_performance.json if it changed since the last write
+        
+        Recording a decision only appends to the store and marks the summary
+        dirty, so the decisions of a cycle coalesce into one write here.
+        
+        Returns:
+            True if a write happened
+        """
+        
+        with self._lock:
+            if not self._performance_dirty:
+                return False
+            self._save_performance_data()
+            return True
+    
+    def _load_outcome_candles(self, data_collector, product_id: str) -> Optional[pd.DataFrame]:
+        """Hourly candles for outcome resolution, or None when unavailable"""
+        
+        get_historical_data = getattr(data_collector, 'get_historical_data', None)
+        if not callable(get_historical_data):
+            return None
+        
+        try:
+            candles = get_historical_data(product_id, OUTCOME_CANDLE_GRANULARITY, days_back=OUTCOME_CANDLE_DAYS)
+        except Exception as e:
+            self.logger.warning(f"Candles unavailable for {product_id} outcomes: {e}")
+            return None
+        
+        if not isinstance(candles, pd.DataFrame) or candles.empty or 'close' not in candles.columns:
+            return None
+        return candles
+    
+    def _resolve_outcomes_from_candles(self, records: List[DecisionRecord], candles: Optional[pd.DataFrame],
+                                       now: datetime) -> List[DecisionRecord]:
+        """
+        Fill price_after_* from the candle containing decision time + horizon
+        
+        A horizon is filled once its candle has closed. Gaps (hours without
+        trades) use the last close before the target time.
+        
+        Returns:
+            Records with a due horizon that lies before the first candle
+        """
+        
+        if candles is None:
+            return records
+        
+        index = pd.DatetimeIndex(candles.index)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        order = np.argsort(index.asi8, kind='stable')
+        starts = ((index[order] - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+        closes = pd.to_numeric(candles['close'], errors='coerce').to_numpy(dtype=np.float64)[order]
+        now_ts = now.timestamp()
+        
+        decision_times = np.array([datetime.fromisoformat(record.timestamp).timestamp() for record in records])
+        uncovered = np.zeros(len(records), dtype=bool)
+        
+        for suffix, seconds in OUTCOME_HORIZONS:
+            target = decision_times + seconds
+            missing = np.array([getattr(record, f'price_after_{suffix}') is None for record in records])
+            due = missing & (target <= now_ts)
+            
+            position = np.searchsorted(starts, target, side='right') - 1
+            candle = np.maximum(position, 0)
+            closed = starts[candle] + OUTCOME_CANDLE_SECONDS <= now_ts
+            in_window = (position >= 0) & (target < starts[-1] + OUTCOME_CANDLE_SECONDS)
+            
+            resolved = due & in_window & closed & (closes[candle] > 0)
+            uncovered |= due & (position < 0)
+            
+            for i in np.flatnonzero(resolved):
+                self._set_outcome_price(records[i], suffix, float(closes[candle[i]]))
+        
+        return [record for record, is_uncovered in zip(records, uncovered) if is_uncovered]
+    
+    @staticmethod
+    def _set_outcome_price(record: DecisionRecord, suffix: str, price: float):
+        """Set price_after_<suffix> and the matching profit_loss_<suffix>"""
+        setattr(record, f'price_after_{suffix}', price)
+        setattr(record, f'profit_loss_{suffix}', ((price - record.price_at_decision) / record.price_at_decision) * 100)
     
     def get_performance_summary(self) -> Dict:
         """Get performance summary for all strategies"""
         
         summary = {
             "last_updated": datetime.now().isoformat(),
-            "total_decisions": len(self.decision_records),
+            "total_decisions": self.total_records,
             "strategies": {}
         }
         
@@ -216,10 +544,7 @@ class HybridPerformanceTracker:
         """Get performance for recent decisions"""
         
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_records = [
-            r for r in self.decision_records 
-            if datetime.fromisoformat(r.timestamp) > cutoff_time
-        ]
+        recent_records = self.store.records(since=cutoff_time)
         
         strategy_stats = {}
         
@@ -245,7 +570,7 @@ class HybridPerformanceTracker:
     def _load_performance_data(self) -> Dict[str, StrategyPerformance]:
         """Load strategy performance data"""
         
-        if not os.path.exists(self.performance_file):
+        if self.performance_file is None or not os.path.exists(self.performance_file):
             return {}
         
         try:
@@ -262,29 +587,31 @@ class HybridPerformanceTracker:
             self.logger.error(f"Error loading performance data: {e}")
             return {}
     
-    def _load_decision_records(self) -> List[DecisionRecord]:
-        """Load decision records"""
+    def _migrate_decision_records(self):
+        """Move records from the legacy decision_records.json list into the store"""
         
-        if not os.path.exists(self.decisions_file):
-            return []
+        if self.decisions_file is None or not os.path.exists(self.decisions_file):
+            return
         
         try:
             with open(self.decisions_file, 'r') as f:
                 data = json.load(f)
             
-            records = []
-            for record_data in data:
-                records.append(DecisionRecord(**record_data))
-            
-            return records
+            records = [DecisionRecord(**record_data) for record_data in data]
+            self.store.append(records)
+            os.replace(self.decisions_file, self.decisions_file + ".migrated")
+            self.logger.info(f"Migrated {len(records)} decision records to {self.decisions_db}")
             
         except Exception as e:
-            self.logger.error(f"Error loading decision records: {e}")
-            return []
+            self.logger.error(f"Error migrating decision records: {e}")
     
     def _save_performance_data(self):
         """Save strategy performance data"""
         
+        if self.performance_file is None:
+            self._performance_dirty = False
+            return
+        
         try:
             data = {}
             for name, performance in self.strategy_performance.items():
@@ -301,6 +628,7 @@ class HybridPerformanceTracker:
             
             with open(self.performance_file, 'w') as f:
                 json.dump(data, f, indent=2, default=str)
+            self._performance_dirty = False
                 
         except Exception as e:
             self.logger.error(f"Error saving performance data: {e}")
@@ -312,38 +640,6 @@ class HybridPerformanceTracker:
             except:
                 pass  # If even minimal save fails, just log and continue
     
-    def _save_decision_records(self):
-        """Save decision records"""
-        
-        try:
-            data = []
-            for record in self.decision_records:
-                # Convert dataclass to dict and ensure JSON serializable
-                record_dict = asdict(record)
-                
-                # Handle any non-serializable values
-                for key, value in record_dict.items():
-                    if value is None:
-                        continue
-                    # Convert any non-serializable objects to strings
-                    if not isinstance(value, (str, int, float, bool, list, dict)):
-                        record_dict[key] = str(value)
-                
-                data.append(record_dict)
-            
-            with open(self.decisions_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-                
-        except Exception as e:
-            self.logger.error(f"Error saving decision records: {e}")
-            # Try to save with minimal data to prevent complete failure
-            try:
-                minimal_data = [{"error": "Failed to serialize decision records", "timestamp": datetime.now().isoformat()}]
-                with open(self.decisions_file, 'w') as f:
-                    json.dump(minimal_data, f, indent=2)
-            except:
-                pass  # If even minimal save fails, just log and continue
-    
     def _update_strategy_performance(self, strategy_name: str, signal):
         """Update performance stats for a strategy"""
         
@@ -485,47 +781,47 @@ class HybridPerformanceTracker:
             self.logger.error(f"Error calculating adaptive weights: {e}")
             return base_weights
     
-    def _get_recent_performance_metrics(self, days: int = 7) -> Dict:
-        """Get performance metrics for recent period"""
+    def _get_recent_performance_metrics(self, days: int = RECENT_PERFORMANCE_DAYS) -> Dict:
+        """Get performance metrics for recent period (from the rolling counters)"""
         
-        cutoff_time = datetime.now() - timedelta(days=days)
-        recent_records = [
-            r for r in self.decision_records 
-            if datetime.fromisoformat(r.timestamp) > cutoff_time
-        ]
+        since = (datetime.now() - timedelta(days=days)).timestamp()
+        if days > RECENT_PERFORMANCE_DAYS:
+            return self._get_performance_metrics_from_store(since)
         
-        if not recent_records:
-            return {}
+        with self._lock:
+            totals = self.recent_stats.totals(since)
         
-        # Group by strategy
         strategy_metrics = {}
-        
-        for record in recent_records:
-            strategy = record.strategy_name
-            if strategy not in strategy_metrics:
+        for strategy, (decisions, correct, confidence_sum) in totals.items():
+            if decisions > 0:
                 strategy_metrics[strategy] = {
-                    'total_decisions': 0,
-                    'correct_decisions': 0,
-                    'confidence_sum': 0,
-                    'avg_confidence': 0,
-                    'accuracy_rate': 0
+                    'total_decisions': int(decisions),
+                    'correct_decisions': int(correct),
+                    'avg_confidence': confidence_sum / decisions,
+                    'accuracy_rate': correct / decisions
                 }
-            
-            metrics = strategy_metrics[strategy]
+        
+        return strategy_metrics
+    
+    def _get_performance_metrics_from_store(self, since: float) -> Dict:
+        """Performance metrics per strategy for records decided after since (scans the store)"""
+        
+        strategy_metrics = {}
+        for record in self.store.records(since=datetime.fromtimestamp(since)):
+            metrics = strategy_metrics.setdefault(record.strategy_name, {
+                'total_decisions': 0,
+                'correct_decisions': 0,
+                'confidence_sum': 0
+            })
             metrics['total_decisions'] += 1
             metrics['confidence_sum'] += record.confidence
-            
             if record.was_correct is True:
                 metrics['correct_decisions'] += 1
         
-        # Calculate final metrics
-        for strategy, metrics in strategy_metrics.items():
-            if metrics['total_decisions'] > 0:
-                metrics['avg_confidence'] = metrics['confidence_sum'] / metrics['total_decisions']
-                metrics['accuracy_rate'] = metrics['correct_decisions'] / metrics['total_decisions']
-            
-            # Remove intermediate calculation fields
-            del metrics['confidence_sum']
+        for metrics in strategy_metrics.values():
+            confidence_sum = metrics.pop('confidence_sum')
+            metrics['avg_confidence'] = confidence_sum / metrics['total_decisions']
+            metrics['accuracy_rate'] = metrics['correct_decisions'] / metrics['total_decisions']
         
         return strategy_metrics
     
@@ -582,17 +878,38 @@ class HybridPerformanceTracker:
         
         return insights
     
-    def _recalculate_accuracy_rates(self):
-        """Recalculate accuracy rates based on evaluated decisions"""
+    def _load_recent_stats(self):
+        """Fill the rolling counters from records inside the recent window"""
+        
+        since = (datetime.now() - timedelta(days=RECENT_PERFORMANCE_DAYS, hours=1)).timestamp()
+        for strategy_name, product_id, hour, decisions, correct, confidence_sum in self.store.hourly_counts(since):
+            self.recent_stats.add(strategy_name, product_id, hour * 3600,
+                                  decisions=decisions, correct=correct, confidence=confidence_sum)
+    
+    def _add_outcome(self, record: DecisionRecord):
+        """Count a newly evaluated record in the accuracy aggregates (caller holds the lock)"""
+        
+        counts = self._accuracy_counts.setdefault(record.strategy_name, [0, 0])
+        counts[0] += 1
+        counts[1] += int(record.was_correct)
+        if record.was_correct:
+            self.recent_stats.add(record.strategy_name, record.product_id,
+                                  datetime.fromisoformat(record.timestamp).timestamp(), correct=1)
+    
+    def _apply_accuracy_rates(self):
+        """Copy the accuracy aggregates into strategy_performance"""
         
-        for strategy_name in self.strategy_performance:
-            strategy_records = [r for r in self.decision_records if r.strategy_name == strategy_name]
-            evaluated_records = [r for r in strategy_records if r.was_correct is not None]
+        for strategy_name, performance in self.strategy_performance.items():
+            evaluated_count, correct_count = self._accuracy_counts.get(strategy_name, (0, 0))
             
-            if evaluated_records:
-                correct_count = sum(1 for r in evaluated_records if r.was_correct)
-                accuracy_rate = correct_count / len(evaluated_records)
-                self.strategy_performance[strategy_name].accuracy_rate = accuracy_rate
-                self.strategy_performance[strategy_name].correct_decisions = correct_count
+            if evaluated_count:
+                performance.accuracy_rate = correct_count / evaluated_count
+                performance.correct_decisions = correct_count
+    
+    def _recalculate_accuracy_rates(self):
+        """Rebuild accuracy rates from every evaluated record in the store"""
         
-        self._save_performance_data()
+        with self._lock:
+            self._accuracy_counts = {name: list(counts) for name, counts in self.store.accuracy_counts().items()}
+            self._apply_accuracy_rates()
+            self._save_performance_data()
@@ -4,19 +4,44 @@ Coordinates multiple trading strategies and selects the best signals
 """
 
 import logging
+import threading
+from contextlib import contextmanager
 from typing import Dict, List, Optional
-from .base_strategy import BaseStrategy, TradingSignal
+from .base_strategy import BaseStrategy, TradingSignal, StrategyEvaluation
 from .trend_following import TrendFollowingStrategy
 from .mean_reversion import MeanReversionStrategy
 from .momentum import MomentumStrategy
 from .performance_tracker import HybridPerformanceTracker
 
+# Nesting depth of dry_run() blocks on the current thread
+_dry_run_threads = threading.local()
+
+class _DryRunFilter(logging.Filter):
+    """Drops records below WARNING logged by a thread that is inside dry_run()"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or not getattr(_dry_run_threads, 'depth', 0)
+
+_DRY_RUN_FILTER = _DryRunFilter()
+
+def _install_dry_run_filter(logger: logging.Logger):
+    """Attach the dry_run() filter to a logger once"""
+    if _DRY_RUN_FILTER not in logger.filters:
+        logger.addFilter(_DRY_RUN_FILTER)
+
 class StrategyManager:
     """
     Manages multiple trading strategies and combines their signals
     """
     
-    def __init__(self, config, llm_analyzer=None, news_sentiment_analyzer=None, volatility_analyzer=None):
+    def __init__(self, config, llm_analyzer=None, news_sentiment_analyzer=None, volatility_analyzer=None,
+                 performance_tracker: Optional[HybridPerformanceTracker] = None):
+        """
+        Args:
+            performance_tracker: Tracker decisions are recorded in; the live tracker
+                under data/performance is created when omitted. Backtests pass
+                HybridPerformanceTracker(data_dir=None) to stay in memory.
+        """
         self.config = config
         self.logger = logging.getLogger("supervisor")  # Use supervisor logger for consistency
         
@@ -71,8 +96,17 @@ class StrategyManager:
         # Market regime detection
         self.current_market_regime = "sideways"  # bull, bear, sideways
         
+        # Number of times each strategy has been run (one LLM call per llm_strategy run)
+        self.strategy_run_counts: Dict[str, int] = {name: 0 for name in self.strategies}
+        self._run_counts_lock = threading.Lock()
+        
         # Initialize performance tracker (Phase 2)
-        self.performance_tracker = HybridPerformanceTracker()
+        self.performance_tracker = performance_tracker if performance_tracker is not None else HybridPerformanceTracker()
+        
+        # Threads evaluating in dry_run() skip decision recording and INFO logging
+        self._dry_run_state = threading.local()
+        _install_dry_run_filter(self.logger)
+        _install_dry_run_filter(self.performance_tracker.logger)
         
         self.logger.info(f"Strategy Manager initialized with {len(self.strategies)} strategies")
         self.logger.info(f"Base strategy weights: {self.base_strategy_weights}")
@@ -148,6 +182,9 @@ class StrategyManager:
         strategy_signals = {}
         
         for name, strategy in self.strategies.items():
+            with self._run_counts_lock:
+                self.strategy_run_counts[name] = self.strategy_run_counts.get(name, 0) + 1
+            
             try:
                 signal = strategy.analyze(market_data, mapped_indicators, portfolio)
                 strategy_signals[name] = signal
@@ -170,23 +207,43 @@ class StrategyManager:
                           technical_indicators: Dict,
                           portfolio: Dict) -> TradingSignal:
         """Get combined signal from all strategies"""
+        return self.evaluate_strategies(market_data, technical_indicators, portfolio).combined_signal
+    
+    def evaluate_strategies(self,
+                            market_data: Dict,
+                            technical_indicators: Dict,
+                            portfolio: Dict) -> StrategyEvaluation:
+        """
+        Run every strategy once and combine their signals
+        
+        Returns:
+            StrategyEvaluation with the combined signal, the per-strategy signals it
+            was built from, and the market regime and weights used, so callers can
+            report on individual strategies without analyzing them a second time
+        """
         
         # Validate inputs
         if not isinstance(technical_indicators, dict):
             self.logger.error(f"Invalid technical_indicators type: {type(technical_indicators)}, "
                             f"value: {technical_indicators}")
-            return TradingSignal(
-                action="HOLD",
-                confidence=0,
-                reasoning="Invalid technical indicators format"
+            return StrategyEvaluation(
+                combined_signal=TradingSignal(
+                    action="HOLD",
+                    confidence=0,
+                    reasoning="Invalid technical indicators format"
+                ),
+                market_regime=self.current_market_regime
             )
         
         if not isinstance(market_data, dict):
             self.logger.error(f"Invalid market_data type: {type(market_data)}")
-            return TradingSignal(
-                action="HOLD",
-                confidence=0,
-                reasoning="Invalid market data format"
+            return StrategyEvaluation(
+                combined_signal=TradingSignal(
+                    action="HOLD",
+                    confidence=0,
+                    reasoning="Invalid market data format"
+                ),
+                market_regime=self.current_market_regime
             )
         
         # Get signals from all strategies
@@ -210,7 +267,7 @@ class StrategyManager:
             current_price = market_data.get('price', 0)
             product_id = market_data.get('product_id', 'Unknown')
             
-            if current_price > 0 and product_id != 'Unknown':
+            if not self._in_dry_run() and current_price > 0 and product_id != 'Unknown':
                 self.performance_tracker.record_decision(
                     product_id=product_id,
                     strategy_signals=strategy_signals,
@@ -223,7 +280,41 @@ class StrategyManager:
         except Exception as e:
             self.logger.warning(f"Failed to record decision for performance tracking: {e}")
         
-        return combined_signal
+        return StrategyEvaluation(
+            combined_signal=combined_signal,
+            strategy_signals=strategy_signals,
+            market_regime=self.current_market_regime,
+            strategy_weights=adjusted_weights
+        )
+    
+    @contextmanager
+    def dry_run(self):
+        """
+        Evaluate without side effects (backtests, simulations)
+        
+        Inside the block decisions are not recorded in the performance tracker, so
+        nothing is written to data/performance, and INFO logging of the manager and
+        the tracker is suppressed. Warnings and errors are still logged. The context
+        only applies to the calling thread: other threads evaluating on the same
+        manager keep recording and logging. dry_run() does not change where the
+        tracker lives: construct the manager with an in-memory tracker so that
+        creating it does not open the live data either.
+        
+        Usage:
+            with strategy_manager.dry_run():
+                signal = strategy_manager.get_combined_signal(market_data, indicators, {})
+        """
+        self._dry_run_state.depth = getattr(self._dry_run_state, 'depth', 0) + 1
+        _dry_run_threads.depth = getattr(_dry_run_threads, 'depth', 0) + 1
+        try:
+            yield self
+        finally:
+            self._dry_run_state.depth -= 1
+            _dry_run_threads.depth -= 1
+    
+    def _in_dry_run(self) -> bool:
+        """Whether the calling thread is evaluating inside dry_run()"""
+        return getattr(self._dry_run_state, 'depth', 0) > 0
     
     def _update_market_regime(self, technical_indicators: Dict, market_data: Dict):
         """Update current market regime assessment"""
@@ -3,15 +3,26 @@ Trend Following Strategy
 Identifies and follows strong market trends using multiple timeframes
 """
 
-from .base_strategy import BaseStrategy, TradingSignal
+from .base_strategy import BaseStrategy, TradingSignal, BatchSignals, batch_column, HOLD, BUY, SELL
 from typing import Dict, List
 import numpy as np
+import pandas as pd
 
 class TrendFollowingStrategy(BaseStrategy):
     """
     Trend following strategy using moving averages and momentum indicators
     """
     
+    # Reason codes of analyze_batch
+    BATCH_REASONS = (
+        "Strong uptrend detected",
+        "Uptrend detected but RSI overbought",
+        "Strong downtrend detected",
+        "Downtrend detected but RSI oversold",
+        "Weak trend",
+        "Analysis error"
+    )
+    
     def __init__(self, config):
         super().__init__("TrendFollowing", config)
         
@@ -116,6 +127,83 @@ class TrendFollowingStrategy(BaseStrategy):
                 reasoning=f"Analysis error: {str(e)}"
             )
     
+    def analyze_batch(self, frame: pd.DataFrame) -> BatchSignals:
+        """Evaluate analyze() for every row of a frame (see BaseStrategy.analyze_batch)"""
+        rsi = batch_column(frame, 'rsi', 50)
+        histogram = batch_column(frame, 'macd_histogram', 0)
+        indicator_price = batch_column(frame, 'current_price', 0)
+        market_price = batch_column(frame, 'price', 0)
+        bb_upper = batch_column(frame, 'bb_upper', 0)
+        bb_lower = batch_column(frame, 'bb_lower', 0)
+        bb_middle = batch_column(frame, 'bb_middle', 0)
+        change_24h = batch_column(frame, 'change_24h', 0)
+        change_5d = batch_column(frame, 'change_5d', 0)
+        
+        # Trend strength (_calculate_trend_strength)
+        abs_histogram = np.abs(histogram)
+        macd_factor = np.select([abs_histogram > 0.5, abs_histogram > 0.2], [0.8, 0.6], 0.3)
+        rsi_factor = np.select([(rsi > 60) | (rsi < 40), (rsi > 55) | (rsi < 45)], [0.7, 0.5], 0.2)
+        
+        has_bands = (indicator_price != 0) & (bb_upper != 0) & (bb_lower != 0)
+        band_range = bb_upper - bb_lower
+        # Flat bands divide by zero in analyze(), which then returns an error signal
+        errors = has_bands & (band_range == 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            band_position = (indicator_price - bb_lower) / band_range
+        band_factor = np.select([(band_position > 0.8) | (band_position < 0.2),
+                                 (band_position > 0.7) | (band_position < 0.3)], [0.8, 0.6], 0.4)
+        
+        trend_strength = np.where(has_bands, (macd_factor + rsi_factor + band_factor) / 3,
+                                  (macd_factor + rsi_factor) / 2)
+        
+        # Trend direction (_determine_trend_direction): average of the direction votes
+        momentum_votes = np.select(
+            [(change_24h > 2) & (change_5d > 5), (change_24h > 1) & (change_5d > 2),
+             (change_24h < -2) & (change_5d < -5), (change_24h < -1) & (change_5d < -2)],
+            [2, 1, -2, -1], 0)
+        momentum_count = np.where(np.abs(momentum_votes) == 2, 2, 1)
+        rsi_vote = np.select([rsi > 60, rsi < 40], [1, -1], 0)
+        macd_vote = np.select([histogram > 1.0, histogram < -1.0], [1, -1], 0)
+        
+        direction_price = np.where(market_price != 0, market_price, indicator_price)
+        has_middle = (direction_price != 0) & (bb_middle != 0)
+        middle_vote = np.where(has_middle, np.select([direction_price > bb_middle * 1.01,
+                                                      direction_price < bb_middle * 0.99], [1, -1], 0), 0)
+        
+        votes = momentum_votes + rsi_vote + macd_vote + middle_vote
+        average_vote = votes / (momentum_count + 2 + has_middle)
+        up = average_vote > 0.3
+        down = average_vote < -0.3
+        
+        # Base confidence (_calculate_base_confidence)
+        alignment = np.where(up, ((rsi > 40) & (rsi < 70)).astype(int) + (histogram > 0),
+                             np.where(down, ((rsi > 30) & (rsi < 60)).astype(int) + (histogram < 0), 0))
+        confidence = trend_strength * 60
+        confidence = np.where(up | down, confidence + 20, confidence)
+        confidence = confidence + alignment * 5
+        base_confidence = np.minimum(95, np.maximum(20, confidence))
+        
+        strong = trend_strength > self.trend_strength_threshold
+        buy = up & strong & (rsi < 70)
+        overbought = up & strong & ~(rsi < 70)
+        sell = down & strong & (rsi > 30)
+        oversold = down & strong & ~(rsi > 30)
+        
+        action = np.select([buy, sell], [BUY, SELL], HOLD)
+        confidence = np.select([buy | sell, overbought | oversold],
+                               [np.minimum(95, base_confidence + 10), base_confidence * 0.7],
+                               np.maximum(30, base_confidence * 0.5))
+        reason_code = np.select([buy, overbought, sell, oversold], [0, 1, 2, 3], 4)
+        multiplier = np.minimum(1.5, 0.5 + trend_strength)
+        
+        return BatchSignals(
+            action=np.where(errors, HOLD, action).astype(np.int8),
+            confidence=np.where(errors, 0.0, confidence),
+            reason_code=np.where(errors, 5, reason_code).astype(np.int8),
+            position_size_multiplier=np.where(errors, 1.0, multiplier),
+            reasons=self.BATCH_REASONS
+        )
+    
     def _calculate_trend_strength(self, indicators: Dict) -> float:
         """Calculate trend strength (0-1)"""
         
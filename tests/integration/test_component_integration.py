@@ -30,6 +30,7 @@ from coinbase_client import CoinbaseClient
 from llm_analyzer import LLMAnalyzer
 from utils.trading.portfolio import Portfolio
 from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
+from strategies.performance_tracker import HybridPerformanceTracker
 from utils.performance.performance_tracker import PerformanceTracker
 from utils.performance.performance_calculator import PerformanceCalculator
 
@@ -100,7 +101,8 @@ class TestDataFlowIntegration:
         from unittest.mock import MagicMock
         mock_config = MagicMock()
         mock_config.get.return_value = 55  # Default confidence threshold
-        strategy_manager = AdaptiveStrategyManager(mock_config)
+        strategy_manager = AdaptiveStrategyManager(
+            mock_config, performance_tracker=HybridPerformanceTracker(data_dir=temp_dir))
         
         # Test portfolio integration
         allocations = portfolio.get_asset_allocation()
@@ -411,7 +413,8 @@ class TestCrossComponentValidation:
         from unittest.mock import MagicMock
         mock_config = MagicMock()
         mock_config.get.return_value = 55
-        strategy_manager = AdaptiveStrategyManager(mock_config)
+        strategy_manager = AdaptiveStrategyManager(
+            mock_config, performance_tracker=HybridPerformanceTracker(data_dir=temp_dir))
         
         # Mock a BUY decision
         mock_decision = {
@@ -538,7 +541,8 @@ class TestComponentIntegrationWorkflows:
             from unittest.mock import MagicMock
             mock_config = MagicMock()
             mock_config.get.return_value = 55
-            strategy_manager = AdaptiveStrategyManager(mock_config)
+            strategy_manager = AdaptiveStrategyManager(
+                mock_config, performance_tracker=HybridPerformanceTracker(data_dir=temp_dir))
             
             # 3. Check if decision is executable
             btc_amount = portfolio.get_asset_amount('BTC')
@@ -423,6 +423,48 @@ class TestPerformanceBenchmarks:
         
         print(f"Data processing: {elapsed*1000:.2f}ms for {data_size} points")
     
+    def test_period_metrics_benchmark(self):
+        """Benchmark multi-period metrics on a year of 15-minute snapshots"""
+        import numpy as np
+        from datetime import datetime, timedelta, timezone
+        from utils.performance.performance_calculator import PerformanceCalculator
+        
+        calculator = PerformanceCalculator()
+        now = datetime.now(timezone.utc)
+        count = 365 * 24 * 4
+        rng = np.random.default_rng(7)
+        values = 1000.0 * np.cumprod(1 + rng.normal(0, 0.002, count))
+        timestamps = now.timestamp() - (count - 1 - np.arange(count)) * 900.0
+        snapshots = [
+            {"timestamp": datetime.fromtimestamp(ts, timezone.utc).isoformat(), "total_value_eur": float(v)}
+            for ts, v in zip(timestamps, values)
+        ]
+        periods = {"7d": 7, "30d": 30, "90d": 90, "1y": 366}
+        
+        # Per-period path: filter dicts, then compute metrics for each period
+        start_time = time.time()
+        per_period = {}
+        for period, days in periods.items():
+            cutoff = (now - timedelta(days=days)).isoformat()
+            period_snapshots = [s for s in snapshots if s["timestamp"] >= cutoff]
+            per_period[period] = calculator.calculate_risk_metrics(period_snapshots)
+        per_period_elapsed = time.time() - start_time
+        
+        start_time = time.time()
+        results = calculator.calculate_period_metrics(timestamps, values, tuple(periods), now=now)
+        vectorized_elapsed = time.time() - start_time
+        
+        for period in periods:
+            assert results[period]["risk_metrics"]["max_drawdown"] == pytest.approx(
+                per_period[period]["max_drawdown"])
+            assert results[period]["risk_metrics"]["sharpe_ratio"] == pytest.approx(
+                per_period[period]["sharpe_ratio"], rel=1e-6)
+        
+        speedup = per_period_elapsed / max(vectorized_elapsed, 1e-9)
+        print(f"Period metrics: {per_period_elapsed*1000:.1f}ms per-period vs "
+              f"{vectorized_elapsed*1000:.1f}ms vectorized ({speedup:.0f}x) for {count} snapshots")
+        assert vectorized_elapsed < per_period_elapsed
+    
     def test_file_io_performance(self):
         """Benchmark file I/O operations"""
         portfolio = Portfolio()
@@ -226,6 +226,18 @@ class TestAdaptiveStrategyManagerInitialization:
             assert bear_thresholds['llm_strategy']['buy'] == 60  # More conservative
             assert bear_thresholds['llm_strategy']['sell'] == 40
 
+    def test_injected_performance_tracker(self, mock_config, tmp_path, monkeypatch):
+        """Test an injected in-memory tracker replaces the live data/performance tracker"""
+        from strategies.performance_tracker import HybridPerformanceTracker
+
+        monkeypatch.chdir(tmp_path)
+        tracker = HybridPerformanceTracker(data_dir=None)
+
+        manager = AdaptiveStrategyManager(mock_config, performance_tracker=tracker)
+
+        assert manager.performance_tracker is tracker
+        assert not (tmp_path / "data" / "performance").exists()
+
 class TestMarketRegimeDetection:
     """Test market regime detection logic"""
     
@@ -613,6 +625,22 @@ class TestGetCombinedSignal:
                 assert result.confidence == 80
                 assert 'Adaptive' in result.reasoning
     
+    def test_evaluate_strategies_returns_weights_used(self, mock_config, mock_analyzers, sample_market_data, sample_technical_indicators):
+        """Test the evaluation keeps the weights it combined with when the manager's weights change"""
+        with patch('strategies.adaptive_strategy_manager.StrategyManager.__init__'), \
+             patch.object(AdaptiveStrategyManager, 'analyze_all_strategies') as mock_analyze:
+            
+            manager = AdaptiveStrategyManager(mock_config, **mock_analyzers)
+            manager.performance_tracker = Mock()
+            manager.strategy_weights = {'trend_following': 0.5, 'momentum': 0.5}
+            manager.strategies = {}
+            mock_analyze.return_value = {'momentum': TradingSignal('BUY', 65, 'Positive momentum', 1.1)}
+            
+            evaluation = manager.evaluate_strategies(sample_market_data, sample_technical_indicators)
+            manager.strategy_weights['momentum'] = 0.9
+            
+            assert evaluation.strategy_weights == {'trend_following': 0.5, 'momentum': 0.5}
+    
     def test_get_combined_signal_invalid_inputs(self, mock_config, mock_analyzers):
         """Test error handling with invalid inputs"""
         with patch('strategies.adaptive_strategy_manager.StrategyManager.__init__'):
@@ -0,0 +1,129 @@
+"""
+Unit tests for the backtest result cache
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.backtest.result_cache import BacktestResultCache
+
+
+def _frames(seed=0, rows=300):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-01", periods=rows, freq="h")
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    data = pd.DataFrame({'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0}, index=index)
+    signals = pd.DataFrame({'buy': rng.random(rows) < 0.05, 'sell': rng.random(rows) < 0.05}, index=index)
+    return data, signals
+
+
+class TestBacktestResultCache:
+    """Test keys, storage and LRU eviction"""
+
+    @pytest.fixture(autouse=True)
+    def cache(self, tmp_path):
+        self.cache = BacktestResultCache(str(tmp_path / "backtests"))
+
+    def test_key_depends_on_content(self):
+        """Test equal inputs share a key and any change produces a new one"""
+        data, signals = _frames()
+        key = BacktestResultCache.make_key(data, signals, {'fees': 0.006})
+
+        assert BacktestResultCache.make_key(data.copy(), signals.copy(), {'fees': 0.006}) == key
+        assert BacktestResultCache.make_key(data, signals, {'fees': 0.005}) != key
+        changed = signals.copy()
+        changed.iloc[10, 0] = not changed.iloc[10, 0]
+        assert BacktestResultCache.make_key(data, changed, {'fees': 0.006}) != key
+
+    def test_put_and_get_numpy_values(self):
+        """Test results with numpy scalars round-trip as plain values"""
+        self.cache.put("abc", {'total_return': np.float64(1.5), 'total_trades': np.int64(3)})
+
+        assert self.cache.get("abc") == {'total_return': 1.5, 'total_trades': 3}
+        assert self.cache.get("missing") is None
+        assert (self.cache.hits, self.cache.misses) == (1, 1)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test the oldest unused entries go first when over max_entries"""
+        cache = BacktestResultCache(self.cache.cache_dir, max_entries=3)
+        for key in ("a", "b", "c"):
+            cache.put(key, {'key': key})
+        past = time.time() - 60
+        os.utime(cache._path("a"), (past, past))
+        os.utime(cache._path("b"), (past - 10, past - 10))
+        os.utime(cache._path("c"), (past - 5, past - 5))
+        cache.get("b")  # b becomes most recently used
+
+        cache.put("d", {'key': 'd'})
+
+        # Eviction frees headroom below the limit, least recently used first
+        assert cache.get("a") is None
+        assert cache.get("c") is None
+        assert cache.get("b") == {'key': 'b'}
+        assert cache.get("d") == {'key': 'd'}
+
+    def test_puts_below_the_limits_do_not_scan(self):
+        """Test sizes are tracked incrementally and the directory is scanned only to evict"""
+        cache = BacktestResultCache(self.cache.cache_dir, max_entries=10)
+        with patch.object(cache, '_scan', wraps=cache._scan) as scan:
+            for i in range(10):
+                cache.put(str(i), {'n': i})
+            cache.put("0", {'n': 0})  # overwrite keeps the count
+            assert scan.call_count == 0
+
+            cache.put("10", {'n': 10})
+            assert scan.call_count == 1
+
+        assert len(os.listdir(cache.cache_dir)) == 9
+        assert cache._entry_count == 9
+        assert cache._total_bytes == sum(entry.stat().st_size for entry in os.scandir(cache.cache_dir))
+
+    def test_totals_are_loaded_on_open(self):
+        """Test a reopened cache starts from the entries already on disk"""
+        self.cache.put("a", {'n': 1})
+        self.cache.put("b", {'n': 2})
+
+        reopened = BacktestResultCache(self.cache.cache_dir)
+
+        assert reopened._entry_count == 2
+        assert reopened._total_bytes == self.cache._total_bytes
+
+
+class TestBacktestEngineCache:
+    """Test BacktestEngine reuses cached results"""
+
+    def test_cache_is_off_unless_configured(self, tmp_path, monkeypatch):
+        """Test engines only cache when given a directory or BACKTEST_CACHE_DIR"""
+        from utils.backtest.backtest_engine import BacktestEngine
+
+        monkeypatch.delenv("BACKTEST_CACHE_DIR", raising=False)
+        assert BacktestEngine().result_cache is None
+
+        monkeypatch.setenv("BACKTEST_CACHE_DIR", str(tmp_path / "configured"))
+        assert BacktestEngine().result_cache.cache_dir == tmp_path / "configured"
+
+    def test_identical_backtest_hits_cache(self, tmp_path):
+        """Test a repeated backtest returns the stored results without simulating"""
+        from utils.backtest.backtest_engine import BacktestEngine
+
+        data, signals = _frames()
+        cache_dir = str(tmp_path / "backtests")
+        first = BacktestEngine(cache_dir=cache_dir).run_backtest(data, signals, "BTC-EUR")
+
+        engine = BacktestEngine(cache_dir=cache_dir)
+        with patch.object(engine, '_create_portfolio', side_effect=AssertionError("simulated again")):
+            cached = engine.run_backtest(data, signals, "ETH-EUR")
+
+        assert cached['product_id'] == "ETH-EUR"
+        assert cached['total_return'] == pytest.approx(first['total_return'])
+        assert cached['total_trades'] == first['total_trades']
+
+        other = BacktestEngine(fees=0.001, cache_dir=cache_dir)
+        with patch.object(other, '_create_portfolio', wraps=other._create_portfolio) as create:
+            other.run_backtest(data, signals, "BTC-EUR")
+        create.assert_called_once()
@@ -265,6 +265,7 @@ class TestDeprecatedDatetimeUsage:
                 usd_value=50.0,
                 reason="Test"
             )
+            logger.compact()
             
             # Read the log
             with open(log_file, 'r') as f:
@@ -0,0 +1,132 @@
+"""
+Unit tests for the incremental candle store
+"""
+
+import pandas as pd
+
+from utils.candle_store import CandleStore
+
+HOUR = 3600
+NOW = 1_700_000_000 + 1800  # half way through an hourly candle
+
+
+class FakeExchange:
+    """Serves hourly candles whose close is the candle start time, records requested ranges"""
+
+    def __init__(self):
+        self.requests = []
+        self.forming_close_offset = 0.0
+
+    def fetch(self, start, end):
+        self.requests.append((start, end))
+        first = -(-start // HOUR) * HOUR
+        starts = list(range(first, end + 1, HOUR))
+        if not starts:
+            return pd.DataFrame()
+        closes = [float(s) for s in starts]
+        # The candle containing `end` is still forming
+        closes[-1] += self.forming_close_offset
+        df = pd.DataFrame({
+            'time': pd.to_datetime(starts, unit='s'),
+            'low': closes, 'high': closes, 'open': closes, 'close': closes,
+            'volume': [1.0] * len(starts)
+        })
+        return df.set_index('time')
+
+
+class TestCandleStore:
+    """Test full and incremental candle fetches"""
+
+    def test_first_request_fetches_full_window(self):
+        """An empty cache downloads the whole lookback window"""
+        store = CandleStore()
+        exchange = FakeExchange()
+
+        df = store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+
+        assert exchange.requests == [(NOW - 7 * 86400, NOW)]
+        assert len(df) == 168
+        assert store.get_metrics()['full_fetches'] == 1
+
+    def test_next_cycle_fetches_only_tail(self):
+        """A later request downloads from the last cached candle onwards"""
+        store = CandleStore()
+        exchange = FakeExchange()
+        store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+
+        later = NOW + HOUR
+        df = store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=later)
+
+        forming_start = (NOW // HOUR) * HOUR
+        assert exchange.requests[-1] == (forming_start, later)
+        assert store.get_metrics()['incremental_fetches'] == 1
+
+        # Same result as downloading the whole window again
+        expected = FakeExchange().fetch(later - 7 * 86400, later)
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    def test_forming_candle_is_replaced(self):
+        """The still-forming last bar is overwritten with its updated values"""
+        store = CandleStore()
+        exchange = FakeExchange()
+        exchange.forming_close_offset = -50.0
+        store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+
+        exchange.forming_close_offset = 0.0
+        df = store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW + 600)
+
+        forming_start = (NOW // HOUR) * HOUR
+        assert df.index.is_unique
+        assert df['close'].iloc[-1] == float(forming_start)
+
+    def test_empty_tail_keeps_forming_candle_pending(self):
+        """An empty tail fetch serves the cache and re-requests the forming bar next time"""
+        store = CandleStore()
+        exchange = FakeExchange()
+        exchange.forming_close_offset = -50.0
+        store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+
+        later = NOW + HOUR
+        df = store.get_candles('BTC-EUR', 'ONE_HOUR', 7, lambda start, end: pd.DataFrame(), now=later)
+
+        forming_start = (NOW // HOUR) * HOUR
+        assert df['close'].iloc[-1] == float(forming_start) - 50.0
+
+        exchange.forming_close_offset = 0.0
+        df = store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=later + 60)
+
+        assert exchange.requests[-1] == (forming_start, later + 60)
+        expected = FakeExchange().fetch(later + 60 - 7 * 86400, later + 60)
+        pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    def test_keys_are_independent(self):
+        """Products and granularities are cached separately"""
+        store = CandleStore()
+        exchange = FakeExchange()
+        store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+        store.get_candles('ETH-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+
+        assert store.get_metrics()['full_fetches'] == 2
+        assert store.get_metrics()['cached_series'] == 2
+
+    def test_wider_window_refetches_everything(self):
+        """A lookback longer than the cached one triggers a full download"""
+        store = CandleStore()
+        exchange = FakeExchange()
+        store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+
+        df = store.get_candles('BTC-EUR', 'ONE_HOUR', 10, exchange.fetch, now=NOW)
+
+        assert exchange.requests[-1] == (NOW - 10 * 86400, NOW)
+        assert len(df) == 240
+
+    def test_returned_frame_is_a_copy(self):
+        """Callers can modify the result without corrupting the cache"""
+        store = CandleStore()
+        exchange = FakeExchange()
+        df = store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+        df['close'] = 0.0
+
+        cached = store.get_candles('BTC-EUR', 'ONE_HOUR', 7, exchange.fetch, now=NOW)
+
+        assert (cached['close'] > 0).all()
@@ -259,6 +259,87 @@ class TestCoinbaseClientBasic:
             # Should not raise exception
             assert True
     
+    def test_rate_limited_request_is_retried(self):
+        """Test HTTP 429 responses are retried after Retry-After instead of a fixed sleep"""
+        with patch('coinbase_client.RESTClient') as mock_rest_client:
+            
+            rate_limit_error = Exception("429 Too Many Requests")
+            rate_limit_error.response = Mock(status_code=429, headers={'Retry-After': '0.01'})
+            
+            mock_client = Mock()
+            mock_client.get_best_bid_ask.side_effect = [rate_limit_error, {
+                'pricebooks': [{'product_id': 'BTC-EUR', 'bids': [{'price': '49990'}], 'asks': [{'price': '50010'}]}]
+            }]
+            mock_rest_client.return_value = mock_client
+            
+            client = CoinbaseClient()
+            client.client = mock_client
+            client.backoff_base = 0.01
+            price_data = client.get_product_price('BTC-EUR')
+            
+            assert price_data['price'] == 50000.0
+            assert mock_client.get_best_bid_ask.call_count == 2
+            
+            metrics = client.get_rate_limit_metrics()
+            assert metrics['public']['throttles'] == 1
+            assert metrics['public']['permits_granted'] == 2
+            assert metrics['private']['permits_granted'] == 0
+    
+    def test_rate_limit_retries_exhausted(self):
+        """Test persistent rate limiting gives up after max_retries"""
+        with patch('coinbase_client.RESTClient') as mock_rest_client:
+            
+            mock_client = Mock()
+            mock_client.get_candles.side_effect = Exception("Rate limit exceeded")
+            mock_rest_client.return_value = mock_client
+            
+            client = CoinbaseClient()
+            client.client = mock_client
+            client.backoff_base = 0.001
+            client.backoff_max = 0.001
+            market_data = client.get_market_data('BTC-EUR', 'ONE_HOUR', '2024-01-01T00:00:00Z', '2024-01-02T00:00:00Z')
+            
+            assert market_data == []
+            assert mock_client.get_candles.call_count == client.max_retries + 1
+    
+    def test_get_best_bid_ask_bulk(self):
+        """Test bid/ask for several products is parsed from one request"""
+        client = CoinbaseClient()
+        client.client = Mock()
+        client.client.get_best_bid_ask.return_value = Mock(pricebooks=[
+            Mock(product_id='BTC-EUR', bids=[Mock(price='100')], asks=[Mock(price='102')]),
+            Mock(product_id='ETH-EUR', bids=[Mock(price='10')], asks=[])
+        ])
+        
+        quotes = client.get_best_bid_ask_bulk(['BTC-EUR', 'ETH-EUR'])
+        
+        assert quotes['BTC-EUR'] == {'bid': 100.0, 'ask': 102.0, 'price': 101.0}
+        assert quotes['ETH-EUR']['price'] == 10.0
+        client.client.get_best_bid_ask.assert_called_once_with(product_ids=['BTC-EUR', 'ETH-EUR'])
+    
+    def test_prices_served_from_snapshot(self):
+        """Test one bulk request prices every pair until the snapshot expires"""
+        client = CoinbaseClient()
+        client.client = Mock()
+        client.client.get_best_bid_ask.return_value = {'pricebooks': [
+            {'product_id': 'BTC-EUR', 'bids': [{'price': '100'}], 'asks': [{'price': '100'}]},
+            {'product_id': 'ETH-EUR', 'bids': [{'price': '10'}], 'asks': [{'price': '10'}]}
+        ]}
+        
+        prices = client.get_prices_bulk(['BTC-EUR', 'ETH-EUR'])
+        assert prices == {'BTC-EUR': 100.0, 'ETH-EUR': 10.0}
+        
+        assert client.get_product_price('ETH-EUR') == {'price': 10.0}
+        assert client.get_product_price('BTC-EUR') == {'price': 100.0}
+        assert client.client.get_best_bid_ask.call_count == 1
+        client.client.get_product.assert_not_called()
+        
+        # Expired snapshot refreshes all known pairs together
+        client.price_snapshot_ttl = -1
+        client.get_product_price('BTC-EUR')
+        assert client.client.get_best_bid_ask.call_count == 2
+        assert set(client.client.get_best_bid_ask.call_args[1]['product_ids']) == {'BTC-EUR', 'ETH-EUR'}
+    
     def test_simulation_mode_behavior(self):
         """Test behavior in simulation mode"""
         with patch('coinbase_client.RESTClient', create_ultra_safe_rest_client), \
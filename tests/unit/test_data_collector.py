@@ -19,13 +19,14 @@ import pandas as pd
 import tempfile
 import shutil
 from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from data_collector import DataCollector
+from utils.candle_store import CandleStore
 
 @pytest.fixture
 def mock_coinbase_client():
@@ -189,6 +190,31 @@ class TestHistoricalDataRetrieval:
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 0
 
+    def test_get_historical_data_fetches_only_new_candles(self, mock_coinbase_client):
+        """Test repeated calls reuse cached candles and request only the tail"""
+        now = int(datetime.now().timestamp()) // 3600 * 3600
+        candles = [
+            {'start': now - hours * 3600, 'low': 1, 'high': 2, 'open': 1, 'close': 1.5, 'volume': 10}
+            for hours in range(167, -1, -1)
+        ]
+        mock_coinbase_client.get_market_data.return_value = candles
+
+        collector = DataCollector(mock_coinbase_client, candle_store=CandleStore(min_refresh_seconds=0))
+        first = collector.get_historical_data('BTC-EUR', 'ONE_HOUR', 7)
+
+        mock_coinbase_client.get_market_data.return_value = [
+            {'start': now, 'low': 1, 'high': 3, 'open': 1, 'close': 2.5, 'volume': 20}
+        ]
+        second = collector.get_historical_data('BTC-EUR', 'ONE_HOUR', 7)
+
+        assert len(first) == len(second) == 168
+        assert second['close'].iloc[-1] == 2.5
+
+        # Second request only covers the candle that was still forming
+        tail_start = mock_coinbase_client.get_market_data.call_args[1]['start_time']
+        assert tail_start == datetime.fromtimestamp(now, tz=timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        assert collector.candle_store.get_metrics()['incremental_fetches'] == 1
+
 class TestMarketDataCollection:
     """Test current market data collection"""
     
@@ -213,6 +239,50 @@ class TestMarketDataCollection:
         assert result['price'] == 45000.0
         assert result['product_id'] == 'BTC-EUR'
     
+    def test_get_market_data_price_changes_from_cached_candles(self, mock_coinbase_client):
+        """Test price changes come from one candle download and one ticker call"""
+        now = int(datetime.now().timestamp()) // 3600 * 3600
+        mock_coinbase_client.get_market_data.return_value = [
+            {'start': now - hours * 3600, 'low': 90, 'high': 110, 'open': 100.0 + hours, 'close': 100, 'volume': 10}
+            for hours in range(167, -1, -1)
+        ]
+        mock_coinbase_client.get_product_price.return_value = {'price': 110.0}
+
+        collector = DataCollector(mock_coinbase_client)
+        result = collector.get_market_data('BTC-EUR')
+        historical = collector.get_historical_data('BTC-EUR', 'ONE_HOUR', 7)
+
+        assert result['price'] == 110.0
+        assert set(result['price_changes']) == {'1h', '4h', '24h', '5d'}
+        assert all(change != 0.0 for change in result['price_changes'].values())
+        assert len(historical) == 168
+        mock_coinbase_client.get_product_price.assert_called_once()
+        mock_coinbase_client.get_market_data.assert_called_once()
+
+    def test_calculate_price_changes(self, mock_coinbase_client):
+        """Test each horizon uses the open of the first candle inside the period"""
+        now = datetime(2024, 1, 10, 12, 30)
+        index = pd.date_range(end=datetime(2024, 1, 10, 12), periods=168, freq='h', name='time')
+        historical = pd.DataFrame({'open': [100.0] * 168}, index=index)
+        historical.loc[datetime(2024, 1, 10, 12), 'open'] = 105.0
+        historical.loc[datetime(2024, 1, 9, 13), 'open'] = 50.0
+
+        collector = DataCollector(mock_coinbase_client)
+        changes = collector.calculate_price_changes(historical, 110.0, now=now)
+
+        assert changes['1h'] == round((110.0 - 105.0) / 105.0 * 100, 2)
+        assert changes['4h'] == 10.0
+        assert changes['24h'] == 120.0
+        assert changes['5d'] == 10.0
+
+    def test_calculate_price_changes_without_history(self, mock_coinbase_client):
+        """Test missing candles give zero changes"""
+        collector = DataCollector(mock_coinbase_client)
+
+        changes = collector.calculate_price_changes(pd.DataFrame(), 110.0)
+
+        assert changes == {'1h': 0.0, '4h': 0.0, '24h': 0.0, '5d': 0.0}
+
     def test_get_current_price_success(self, mock_coinbase_client):
         """Test successful current price retrieval"""
         mock_coinbase_client.get_product_price.return_value = {'price': '45000.0'}
@@ -0,0 +1,123 @@
+"""
+Unit tests for DecisionRegistry
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+from utils.dashboard.decision_registry import DecisionRegistry
+
+
+def _result(action, volatility=None, price_changes=None):
+    result = {
+        "timestamp": "2026-01-01T12:00:00",
+        "action": action,
+        "confidence": 70,
+        "reason": f"{action} reasoning",
+        "strategy_details": {"market_regime": "trending"},
+        "market_data": {"price_changes": price_changes or {"1h": 0.5, "4h": 1.0, "24h": 2.0}}
+    }
+    if volatility:
+        result["ai_analysis"] = {"market_conditions": {"volatility": volatility}}
+    return result
+
+
+class TestDecisionRegistry:
+    """Test recording, persistence and migration of the decision index"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.temp_dir, "cache", "decision_index.json")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _registry(self, **kwargs):
+        return DecisionRegistry(index_file=self.index_file, data_dir=self.temp_dir, **kwargs)
+
+    def test_record_and_get_latest(self):
+        """Test the newest recorded decision per product is returned"""
+        registry = self._registry()
+        registry.record("BTC-EUR", _result("BUY"))
+        registry.record("BTC-EUR", _result("SELL"))
+        registry.record("ETH-EUR", _result("HOLD"))
+
+        assert registry.get_latest("BTC-EUR")["action"] == "SELL"
+        assert registry.get_latest("BTC-EUR")["reasoning"] == "SELL reasoning"
+        assert registry.get_latest("ETH-EUR")["action"] == "HOLD"
+        assert registry.get_latest("SOL-EUR") is None
+
+    def test_index_persists_across_instances(self):
+        """Test a second instance sees decisions recorded by the first"""
+        writer = self._registry()
+        reader = self._registry()
+
+        writer.record("BTC-EUR", _result("BUY", volatility="high"))
+
+        assert reader.get_latest("BTC-EUR")["market_conditions"] == {"volatility": "high"}
+        assert len(reader.get_recent()) == 1
+
+    def test_recent_window_and_age_filter(self):
+        """Test the rolling window is bounded and filtered by age"""
+        registry = self._registry(window=3)
+        now = time.time()
+        for i in range(5):
+            registry.record("BTC-EUR", _result("HOLD"), recorded_at=now - 3600 * (4 - i))
+
+        assert len(registry.get_recent()) == 3
+        assert len(registry.get_recent(max_age_seconds=2 * 3600 - 60)) == 2
+
+    def test_rebuild_from_existing_result_files(self):
+        """Test the first start indexes result files already on disk"""
+        for name, action in [("BTC_EUR_20260101_120000", "BUY"), ("BTC_EUR_20260101_130000", "SELL"),
+                             ("ETH_EUR_20260101_110000", "HOLD")]:
+            with open(os.path.join(self.temp_dir, f"{name}.json"), "w") as f:
+                json.dump(_result(action), f)
+        with open(os.path.join(self.temp_dir, "BTC_EUR_latest.json"), "w") as f:
+            json.dump(_result("BUY"), f)
+
+        registry = self._registry()
+
+        assert registry.get_latest("BTC-EUR")["action"] == "SELL"
+        assert registry.get_latest("ETH-EUR")["action"] == "HOLD"
+        assert [e["product_id"] for e in registry.get_recent()] == ["ETH-EUR", "BTC-EUR", "BTC-EUR"]
+        assert os.path.exists(self.index_file)
+
+
+class TestDashboardUpdaterRegistry:
+    """Test DashboardUpdater reads decisions from the registry"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+    def teardown_method(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_latest_decisions_and_volatility_without_scanning(self):
+        """Test latest decisions and volatility come from the index, not a glob"""
+        from utils.dashboard.dashboard_updater import DashboardUpdater
+
+        registry = DecisionRegistry()
+        registry.record("BTC-EUR", _result("BUY", price_changes={"1h": 4.0, "4h": 5.0, "24h": 6.0}))
+        registry.record("ETH-EUR", _result("HOLD", volatility="high"))
+        updater = DashboardUpdater(decision_registry=registry)
+
+        with patch("glob.glob", side_effect=AssertionError("data directory scanned")), \
+             patch("utils.dashboard.dashboard_updater.config") as mock_config:
+            mock_config.TRADING_PAIRS = ["BTC-EUR", "ETH-EUR"]
+            updater._update_latest_decisions({})
+            volatility = updater._get_current_market_volatility()
+
+        with open("data/cache/latest_decisions.json") as f:
+            decisions = {d["asset"]: d for d in json.load(f)}
+        assert decisions["BTC"]["action"] == "BUY"
+        assert decisions["BTC"]["market_regime"] == "trending"
+        assert decisions["ETH"]["reasoning"] == "HOLD reasoning"
+        assert volatility == "high"
@@ -8,6 +8,8 @@ import json
 import os
 import tempfile
 import shutil
+import numpy as np
+import pandas as pd
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 from strategies.performance_tracker import HybridPerformanceTracker, DecisionRecord, StrategyPerformance
@@ -47,7 +49,24 @@ class TestHybridPerformanceTrackerInitialization:
         # Files are created on first save, not on initialization
         assert tracker.performance_file == os.path.join(data_dir, "strategy_performance.json")
         assert tracker.decisions_file == os.path.join(data_dir, "decision_records.json")
-    
+
+    def test_in_memory_tracker_touches_no_files(self, temp_data_dir, mock_data_collector, monkeypatch):
+        """Test data_dir=None records in memory and leaves data/performance alone"""
+        monkeypatch.chdir(temp_data_dir)
+        os.makedirs("data/performance")
+        with open("data/performance/decision_records.json", "w") as f:
+            json.dump([], f)
+
+        tracker = HybridPerformanceTracker(data_dir=None)
+        tracker.record_decision("BTC-EUR", {"momentum": {"action": "BUY", "confidence": 70.0}},
+                                {"action": "BUY", "confidence": 70.0}, 50000.0)
+        tracker.update_decision_outcomes(data_collector=mock_data_collector)
+
+        assert tracker.store.count() == 2
+        assert tracker.strategy_performance["momentum"].total_decisions == 1
+        assert tracker.flush() is False
+        assert os.listdir("data/performance") == ["decision_records.json"]
+
     def test_initialization_loads_existing_data(self, temp_data_dir):
         """Test that initialization loads existing data"""
         # Create existing data
@@ -98,7 +117,9 @@ class TestHybridPerformanceTrackerInitialization:
         assert len(tracker.strategy_performance) == 1
         assert "test_strategy" in tracker.strategy_performance
         assert tracker.strategy_performance["test_strategy"].total_decisions == 10
-        assert len(tracker.decision_records) == 1
+        assert tracker.total_records == 1
+        assert tracker.store.records()[0].strategy_name == "test_strategy"
+        assert not os.path.exists(decisions_file)
 
 
 class TestDecisionRecording:
@@ -121,16 +142,18 @@ class TestDecisionRecording:
         )
         
         # Should have 3 records: 2 strategies + 1 combined
-        assert len(tracker.decision_records) == 3
+        records = tracker.store.records()
+        assert len(records) == 3
+        assert tracker.total_records == 3
         
         # Check individual strategy records
-        momentum_record = [r for r in tracker.decision_records if r.strategy_name == "momentum"][0]
+        momentum_record = [r for r in records if r.strategy_name == "momentum"][0]
         assert momentum_record.action == "BUY"
         assert momentum_record.confidence == 75.0
         assert momentum_record.price_at_decision == 50000.0
         
         # Check combined record
-        combined_record = [r for r in tracker.decision_records if r.strategy_name == "combined_hybrid"][0]
+        combined_record = [r for r in records if r.strategy_name == "combined_hybrid"][0]
         assert combined_record.action == "BUY"
         assert combined_record.confidence == 70.0
     
@@ -171,13 +194,14 @@ class TestOutcomeTracking:
             confidence=75.0,
             price_at_decision=50000.0
         )
-        tracker.decision_records.append(record)
+        tracker.store.append([record])
         
         # Mock current price higher (profitable BUY)
         mock_data_collector.get_current_price.return_value = 51000.0
         
         # Update outcomes
         tracker.update_decision_outcomes(data_collector=mock_data_collector)
+        record = tracker.store.records()[0]
         
         # Check 1h outcome updated
         assert record.price_after_1h == 51000.0
@@ -195,13 +219,14 @@ class TestOutcomeTracking:
             confidence=75.0,
             price_at_decision=50000.0
         )
-        tracker.decision_records.append(record)
+        tracker.store.append([record])
         
         # Mock current price higher (profitable BUY)
         mock_data_collector.get_current_price.return_value = 52000.0
         
         # Update outcomes
         tracker.update_decision_outcomes(data_collector=mock_data_collector)
+        record = tracker.store.records()[0]
         
         # Check 24h outcome and correctness
         assert record.price_after_24h == 52000.0
@@ -220,13 +245,14 @@ class TestOutcomeTracking:
             confidence=75.0,
             price_at_decision=50000.0
         )
-        tracker.decision_records.append(record)
+        tracker.store.append([record])
         
         # Mock current price lower (unprofitable BUY)
         mock_data_collector.get_current_price.return_value = 48000.0
         
         # Update outcomes
         tracker.update_decision_outcomes(data_collector=mock_data_collector)
+        record = tracker.store.records()[0]
         
         # Check correctness
         assert record.was_correct is False  # BUY was incorrect (price went down)
@@ -242,13 +268,14 @@ class TestOutcomeTracking:
             confidence=75.0,
             price_at_decision=50000.0
         )
-        tracker.decision_records.append(record)
+        tracker.store.append([record])
         
         # Mock current price lower (good SELL)
         mock_data_collector.get_current_price.return_value = 48000.0
         
         # Update outcomes
         tracker.update_decision_outcomes(data_collector=mock_data_collector)
+        record = tracker.store.records()[0]
         
         # Check correctness
         assert record.was_correct is True  # SELL was correct (price went down)
@@ -264,13 +291,14 @@ class TestOutcomeTracking:
             confidence=75.0,
             price_at_decision=50000.0
         )
-        tracker.decision_records.append(record)
+        tracker.store.append([record])
         
         # Mock current price stable (within 2%)
         mock_data_collector.get_current_price.return_value = 50500.0  # 1% change
         
         # Update outcomes
         tracker.update_decision_outcomes(data_collector=mock_data_collector)
+        record = tracker.store.records()[0]
         
         # Check correctness
         assert record.was_correct is True  # HOLD was correct (price stable)
@@ -287,7 +315,7 @@ class TestOutcomeTracking:
             price_at_decision=50000.0,
             was_correct=True  # Already evaluated
         )
-        tracker.decision_records.append(record)
+        tracker.store.append([record])
         
         # Update outcomes
         tracker.update_decision_outcomes(data_collector=mock_data_collector)
@@ -312,7 +340,7 @@ class TestAccuracyCalculation:
                 price_at_decision=50000.0,
                 was_correct=(i < 7)  # 7 correct, 3 incorrect
             )
-            tracker.decision_records.append(record)
+            tracker.store.append([record])
         
         # Initialize strategy performance
         tracker.strategy_performance["test_strategy"] = StrategyPerformance(
@@ -366,14 +394,14 @@ class TestDataPersistence:
             confidence=75.0,
             price_at_decision=50000.0
         )
-        tracker1.decision_records.append(record)
-        tracker1._save_decision_records()
+        tracker1.store.append([record])
         
         # Load in new tracker
         tracker2 = HybridPerformanceTracker(data_dir=temp_data_dir)
         
-        assert len(tracker2.decision_records) == 1
-        assert tracker2.decision_records[0].action == "BUY"
+        records = tracker2.store.records()
+        assert len(records) == 1
+        assert records[0].action == "BUY"
     
     def test_save_and_load_performance_data(self, temp_data_dir):
         """Test saving and loading performance data"""
@@ -393,6 +421,214 @@ class TestDataPersistence:
         
         assert "test_strategy" in tracker2.strategy_performance
         assert tracker2.strategy_performance["test_strategy"].accuracy_rate == 0.7
+    
+    def test_decisions_only_append_until_flush(self, tracker, mock_data_collector):
+        """Recording decisions leaves the summary JSON untouched until the cycle flush"""
+        signals = {"momentum": {"action": "BUY", "confidence": 70.0}}
+        for _ in range(3):
+            tracker.record_decision("BTC-EUR", signals, {"action": "BUY", "confidence": 70.0}, 50000.0)
+        
+        assert tracker.store.count() == 6
+        assert not os.path.exists(tracker.performance_file)
+        
+        assert tracker.flush() is True
+        with open(tracker.performance_file) as f:
+            assert json.load(f)["momentum"]["total_decisions"] == 3
+        assert tracker.flush() is False
+        
+        tracker.record_decision("BTC-EUR", signals, {"action": "HOLD", "confidence": 50.0}, 50000.0)
+        tracker.update_decision_outcomes(data_collector=mock_data_collector)
+        with open(tracker.performance_file) as f:
+            assert json.load(f)["momentum"]["total_decisions"] == 4
+
+
+class TestDecisionRecordStore:
+    """Test the append-only decision record store"""
+    
+    def make_record(self, hours_ago, **kwargs):
+        return DecisionRecord(
+            timestamp=(datetime.now() - timedelta(hours=hours_ago)).isoformat(),
+            product_id=kwargs.pop("product_id", "BTC-EUR"),
+            strategy_name="momentum",
+            action="BUY",
+            confidence=70.0,
+            price_at_decision=50000.0,
+            **kwargs
+        )
+    
+    def test_pending_returns_only_due_unevaluated_records(self, tracker):
+        """Records younger than 1h, evaluated records and filled horizons are skipped"""
+        tracker.store.append([
+            self.make_record(0.5),
+            self.make_record(2),
+            self.make_record(2, price_after_1h=50100.0),
+            self.make_record(30, was_correct=True),
+            self.make_record(25, product_id="ETH-EUR", price_after_1h=1.0, price_after_4h=1.0)
+        ])
+        
+        pending = tracker.store.pending(datetime.now().timestamp())
+        
+        assert [(record.product_id, record.price_after_1h) for _, record in pending] == [
+            ("BTC-EUR", None), ("ETH-EUR", 1.0)
+        ]
+    
+    def test_outcome_updates_are_written_back(self, tracker, mock_data_collector):
+        """A 1h update persists and the record stays pending until its 24h outcome"""
+        tracker.store.append([self.make_record(2)])
+        mock_data_collector.get_current_price.return_value = 51000.0
+        
+        tracker.update_decision_outcomes(data_collector=mock_data_collector)
+        reopened = HybridPerformanceTracker(data_dir=tracker.data_dir)
+        
+        record = reopened.store.records()[0]
+        assert record.price_after_1h == 51000.0
+        assert record.price_after_4h is None
+        assert reopened.store.pending(datetime.now().timestamp()) == []
+        assert len(reopened.store.pending((datetime.now() + timedelta(hours=3)).timestamp())) == 1
+    
+    def test_recent_records_are_filtered_in_the_store(self, tracker):
+        tracker.store.append([self.make_record(30), self.make_record(1)])
+        
+        recent = tracker.get_recent_performance(hours=24)
+        
+        assert recent["total_recent_decisions"] == 1
+        assert recent["strategies"]["momentum"]["actions"]["BUY"] == 1
+
+
+class TestCandleOutcomes:
+    """Test outcome resolution from historical candles"""
+    
+    NOW = datetime(2026, 3, 2, 12, 30)
+    
+    @pytest.fixture
+    def candle_collector(self):
+        """Hourly candles up to the one still forming at NOW; close = 50000 + hour number"""
+        first = int((self.NOW - timedelta(days=3)).timestamp()) // 3600 * 3600
+        starts = np.arange(first, int(self.NOW.timestamp()) + 1, 3600)
+        candles = pd.DataFrame({'close': 50000.0 + (starts - first) // 3600},
+                               index=pd.to_datetime(starts, unit='s'))
+        collector = Mock()
+        collector.get_historical_data = Mock(return_value=candles)
+        collector.get_current_price = Mock(return_value=1.0)
+        collector.first_start = first
+        return collector
+    
+    def close_at(self, collector, moment):
+        """Close of the candle containing moment"""
+        return 50000.0 + (int(moment.timestamp()) - collector.first_start) // 3600
+    
+    def record(self, decision_time, action="BUY"):
+        return DecisionRecord(
+            timestamp=decision_time.isoformat(),
+            product_id="BTC-EUR",
+            strategy_name="momentum",
+            action=action,
+            confidence=70.0,
+            price_at_decision=50000.0
+        )
+    
+    def test_prices_come_from_candles_at_each_horizon(self, tracker, candle_collector):
+        decision_time = self.NOW - timedelta(hours=26, minutes=10)
+        tracker.store.append([self.record(decision_time)])
+        
+        tracker.update_decision_outcomes(data_collector=candle_collector, now=self.NOW)
+        
+        record = tracker.store.records()[0]
+        for suffix, hours in [('1h', 1), ('4h', 4), ('24h', 24)]:
+            expected = self.close_at(candle_collector, decision_time + timedelta(hours=hours))
+            assert getattr(record, f'price_after_{suffix}') == expected
+            assert getattr(record, f'profit_loss_{suffix}') == pytest.approx((expected - 50000.0) / 500.0)
+        assert record.was_correct is True
+        candle_collector.get_historical_data.assert_called_once_with("BTC-EUR", "ONE_HOUR", days_back=7)
+        candle_collector.get_current_price.assert_not_called()
+    
+    def test_horizon_in_forming_candle_waits(self, tracker, candle_collector):
+        """A horizon whose candle has not closed yet stays pending"""
+        tracker.store.append([self.record(self.NOW - timedelta(hours=1, minutes=10))])
+        
+        tracker.update_decision_outcomes(data_collector=candle_collector, now=self.NOW)
+        
+        record = tracker.store.records()[0]
+        assert record.price_after_1h is None
+        assert len(tracker.store.pending(self.NOW.timestamp())) == 1
+    
+    def test_records_before_candle_window_use_current_price(self, tracker, candle_collector):
+        tracker.store.append([self.record(self.NOW - timedelta(days=5)),
+                              self.record(self.NOW - timedelta(hours=2))])
+        
+        tracker.update_decision_outcomes(data_collector=candle_collector, now=self.NOW)
+        
+        old, recent = tracker.store.records()
+        assert old.price_after_24h == 1.0
+        assert recent.price_after_1h == self.close_at(candle_collector, self.NOW - timedelta(hours=1))
+        candle_collector.get_current_price.assert_called_once_with("BTC-EUR")
+
+
+class TestRollingAggregates:
+    """Test the incremental counters behind adaptive weights and accuracy"""
+    
+    def record_decisions(self, tracker, count):
+        for i in range(count):
+            tracker.record_decision(
+                product_id=["BTC-EUR", "ETH-EUR"][i % 2],
+                strategy_signals={
+                    "momentum": {"action": "BUY", "confidence": 60.0 + i},
+                    "mean_reversion": {"action": "HOLD", "confidence": 40.0}
+                },
+                final_decision={"action": "BUY", "confidence": 55.0},
+                current_price=50000.0
+            )
+    
+    def test_recent_metrics_match_store_scan(self, tracker, temp_data_dir):
+        tracker.store.append([DecisionRecord(
+            timestamp=(datetime.now() - timedelta(days=2, hours=i)).isoformat(),
+            product_id="BTC-EUR", strategy_name="momentum", action="BUY",
+            confidence=50.0 + i, price_at_decision=50000.0, was_correct=(i % 3 == 0)
+        ) for i in range(30)] + [DecisionRecord(
+            timestamp=(datetime.now() - timedelta(days=9)).isoformat(),
+            product_id="BTC-EUR", strategy_name="momentum", action="BUY",
+            confidence=90.0, price_at_decision=50000.0, was_correct=True
+        )])
+        reopened = HybridPerformanceTracker(data_dir=temp_data_dir)
+        self.record_decisions(reopened, 5)
+        
+        since = (datetime.now() - timedelta(days=7)).timestamp()
+        rolling = reopened._get_recent_performance_metrics(days=7)
+        
+        scanned = reopened._get_performance_metrics_from_store(since)
+        assert rolling.keys() == scanned.keys()
+        for strategy, metrics in scanned.items():
+            assert rolling[strategy] == pytest.approx(metrics)
+        assert rolling["momentum"]["total_decisions"] == 35
+        assert rolling["momentum"]["correct_decisions"] == 10
+    
+    def test_adaptive_weights_do_not_scan_history(self, tracker):
+        self.record_decisions(tracker, 4)
+        tracker.store.records = Mock(side_effect=AssertionError("history scanned"))
+        
+        weights = tracker.get_adaptive_weights({"momentum": 0.5, "mean_reversion": 0.5})
+        
+        assert sum(weights.values()) == pytest.approx(1.0)
+        assert weights["momentum"] > weights["mean_reversion"]
+    
+    def test_outcomes_update_accuracy_incrementally(self, temp_data_dir):
+        HybridPerformanceTracker(data_dir=temp_data_dir).store.append([DecisionRecord(
+            timestamp=(datetime.now() - timedelta(hours=25)).isoformat(),
+            product_id="BTC-EUR", strategy_name="momentum", action=action,
+            confidence=70.0, price_at_decision=50000.0
+        ) for action in ["BUY", "BUY", "SELL", "BUY"]])
+        tracker = HybridPerformanceTracker(data_dir=temp_data_dir)
+        tracker.strategy_performance["momentum"] = StrategyPerformance(strategy_name="momentum")
+        collector = Mock()
+        collector.get_historical_data = Mock(return_value=pd.DataFrame())
+        collector.get_current_price = Mock(return_value=51000.0)
+        tracker.store.accuracy_counts = Mock(side_effect=AssertionError("history scanned"))
+        
+        tracker.update_decision_outcomes(data_collector=collector)
+        
+        assert tracker.strategy_performance["momentum"].accuracy_rate == 0.75
+        assert tracker.strategy_performance["momentum"].correct_decisions == 3
+        assert tracker._get_recent_performance_metrics()["momentum"]["correct_decisions"] == 3
 
 
 if __name__ == "__main__":
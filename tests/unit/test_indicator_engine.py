@@ -0,0 +1,179 @@
+"""
+Unit tests for the incremental indicator engine
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_collector import DataCollector
+from utils.indicator_engine import (ExponentialMean, IndicatorEngine, RollingMean, RollingMinMax,
+                                    RollingStd, RollingSum)
+
+
+def make_candles(n=240, seed=7):
+    """Random-walk hourly candles with a few flat stretches"""
+    rng = np.random.default_rng(seed)
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    close[40:48] = close[40]
+    close[120:123] = close[120]
+    return pd.DataFrame({
+        'low': close * 0.99, 'high': close * 1.01, 'open': close, 'close': close,
+        'volume': rng.uniform(1, 100, n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='h', name='time'))
+
+
+def assert_same_indicators(actual, expected):
+    """Bit-for-bit equality (NaN matches NaN)"""
+    assert list(actual) == list(expected)
+    for key, value in expected.items():
+        if key == '_metadata':
+            assert actual[key] == value
+        else:
+            np.testing.assert_array_equal(actual[key], value, err_msg=key)
+
+
+class TestRollingPrimitives:
+    """Each primitive reproduces the pandas rolling/ewm result exactly"""
+
+    @pytest.mark.parametrize("window", [4, 14, 20])
+    def test_rolling_statistics_match_pandas(self, window):
+        series = make_candles()['close'].copy()
+        series.iloc[60] = np.nan
+        values = series.tolist()
+
+        for primitive, expected in ((RollingMean(window), series.rolling(window).mean()),
+                                    (RollingSum(window), series.rolling(window).sum()),
+                                    (RollingStd(window), series.rolling(window).std())):
+            result = [primitive.update(value) for value in values]
+            np.testing.assert_array_equal(result, expected.to_numpy())
+
+        min_max = RollingMinMax(window)
+        result = np.array([min_max.update(value) for value in values])
+        np.testing.assert_array_equal(result[:, 0], series.rolling(window).min().to_numpy())
+        np.testing.assert_array_equal(result[:, 1], series.rolling(window).max().to_numpy())
+
+    @pytest.mark.parametrize("span", [8, 17, 26])
+    def test_exponential_mean_matches_pandas(self, span):
+        series = make_candles()['close']
+        ema = ExponentialMean(span)
+
+        result = [ema.update(value) for value in series.tolist()]
+
+        np.testing.assert_array_equal(result, series.ewm(span=span).mean().to_numpy())
+
+
+class TestIndicatorEngine:
+    """Test incremental updates against the full recomputation"""
+
+    @pytest.fixture
+    def collector(self, mock_coinbase_client):
+        return DataCollector(mock_coinbase_client)
+
+    @pytest.mark.parametrize("trading_style", ["day_trading", "swing_trading", "long_term"])
+    def test_growing_history_matches_full_recalculation(self, collector, trading_style):
+        """Appending candles one at a time gives the same values as recomputing"""
+        candles = make_candles()
+        engine = IndicatorEngine()
+
+        for end in range(1, len(candles) + 1):
+            frame = candles.iloc[:end]
+            assert_same_indicators(engine.get_indicators('BTC-EUR', trading_style, frame),
+                                   collector._calculate_indicators_full(frame, trading_style))
+
+        assert engine.get_metrics()['incremental_updates'] > 0
+
+    def test_forming_candle_is_not_committed(self, collector):
+        """Updates to the last candle replace it instead of being applied twice"""
+        candles = make_candles()
+        engine = IndicatorEngine()
+        engine.get_indicators('BTC-EUR', 'day_trading', candles)
+        applied = engine.get_metrics()['candles_applied']
+
+        updated = candles.copy()
+        updated.iloc[-1, updated.columns.get_loc('close')] *= 1.02
+
+        assert_same_indicators(engine.get_indicators('BTC-EUR', 'day_trading', updated),
+                               collector._calculate_indicators_full(updated, 'day_trading'))
+        assert engine.get_metrics()['candles_applied'] == applied
+
+    def test_new_candle_applies_only_the_tail(self):
+        """A cycle with one new candle applies one candle, not the whole lookback"""
+        candles = make_candles()
+        engine = IndicatorEngine()
+        engine.get_indicators('BTC-EUR', 'day_trading', candles.iloc[:-1])
+        applied = engine.get_metrics()['candles_applied']
+
+        engine.get_indicators('BTC-EUR', 'day_trading', candles)
+
+        assert engine.get_metrics()['candles_applied'] == applied + 1
+        assert engine.get_metrics()['seeds'] == 1
+
+    def test_revised_history_reseeds(self, collector):
+        """A changed candle that was already applied triggers a rebuild"""
+        candles = make_candles()
+        engine = IndicatorEngine()
+        engine.get_indicators('BTC-EUR', 'day_trading', candles)
+
+        revised = candles.copy()
+        revised.iloc[-2, revised.columns.get_loc('close')] += 10
+
+        assert_same_indicators(engine.get_indicators('BTC-EUR', 'day_trading', revised),
+                               collector._calculate_indicators_full(revised, 'day_trading'))
+        assert engine.get_metrics()['seeds'] == 2
+
+    @pytest.mark.parametrize("trading_style", ["day_trading", "swing_trading", "long_term"])
+    def test_sliding_window_advances_incrementally(self, collector, trading_style):
+        """Consecutive 7-day lookbacks advance one state anchored at the first frame"""
+        candles = make_candles(n=400)
+        engine = IndicatorEngine()
+        window = 168
+
+        for end in range(window, len(candles) + 1):
+            frame = candles.iloc[end - window:end]
+            actual = engine.get_indicators('BTC-EUR', trading_style, frame)
+            # Same indicators as recomputing the frame, with the values of the history since the anchor
+            history = collector._calculate_indicators_full(candles.iloc[:end], trading_style)
+            expected = collector._calculate_indicators_full(frame, trading_style)
+            assert_same_indicators(actual, {key: history[key] for key in expected})
+
+        metrics = engine.get_metrics()
+        assert metrics['seeds'] == 1
+        assert metrics['incremental_updates'] == len(candles) - window
+        assert metrics['candles_applied'] == len(candles) - 1
+
+    def test_sliding_window_matches_frame_recalculation(self, collector):
+        """Rolling-window indicators of a slid frame agree with recomputing that frame"""
+        candles = make_candles(n=400)
+        engine = IndicatorEngine()
+
+        for end in range(168, len(candles) + 1, 8):
+            frame = candles.iloc[end - 168:end]
+            actual = engine.get_indicators('BTC-EUR', 'day_trading', frame)
+            expected = collector._calculate_indicators_full(frame, 'day_trading')
+
+            assert list(actual) == list(expected)
+            for key in ('sma_short', 'sma_long', 'rsi', 'bb_upper', 'bb_lower', 'stoch_rsi', 'vwap'):
+                assert actual[key] == pytest.approx(expected[key], rel=1e-9), key
+        assert engine.get_metrics()['seeds'] == 1
+
+    def test_longer_lookback_reseeds(self, collector):
+        """A frame reaching back before the anchored candle is rebuilt"""
+        candles = make_candles()
+        engine = IndicatorEngine()
+        engine.get_indicators('BTC-EUR', 'swing_trading', candles.iloc[24:192])
+
+        frame = candles.iloc[:193]
+        assert_same_indicators(engine.get_indicators('BTC-EUR', 'swing_trading', frame),
+                               collector._calculate_indicators_full(frame, 'swing_trading'))
+        assert engine.get_metrics()['seeds'] == 2
+
+    def test_collector_uses_engine_with_product_id(self, collector):
+        """calculate_indicators returns the same dictionary with and without the engine"""
+        candles = make_candles()
+        collector.calculate_indicators(candles.iloc[:-1], product_id='BTC-EUR')
+
+        incremental = collector.calculate_indicators(candles, product_id='BTC-EUR')
+
+        assert_same_indicators(incremental, collector.calculate_indicators(candles))
+        assert collector.indicator_engine.get_metrics()['incremental_updates'] == 1
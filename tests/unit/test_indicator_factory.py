@@ -0,0 +1,155 @@
+"""
+Unit tests for the vectorized indicator factory
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.indicator_engine import IndicatorEngine
+from utils.performance.indicator_factory import IndicatorFactory, SeriesCache, calculate_indicators, rsi, sma
+
+
+def make_candles(n=300, seed=11):
+    """Random-walk hourly candles with a flat stretch"""
+    rng = np.random.default_rng(seed)
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    close[50:60] = close[50]
+    return pd.DataFrame({
+        'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+        'volume': rng.uniform(1, 100, n)
+    }, index=pd.date_range('2024-01-01', periods=n, freq='h', name='time'))
+
+
+class TestIndicatorColumns:
+    """Columns match the pandas formulas used across the codebase"""
+
+    def test_columns_match_pandas_formulas(self):
+        candles = make_candles()
+        result = IndicatorFactory().calculate_all_indicators(candles, 'BTC-EUR')
+        close = candles['close']
+
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+        true_range = pd.concat([candles['high'] - candles['low'],
+                                np.abs(candles['high'] - close.shift()),
+                                np.abs(candles['low'] - close.shift())], axis=1).max(axis=1)
+        low_14 = candles['low'].rolling(14).min()
+        high_14 = candles['high'].rolling(14).max()
+        stoch_k = 100 * ((close - low_14) / (high_14 - low_14))
+        typical_price = (candles['high'] + candles['low'] + close) / 3
+
+        expected = {
+            'sma_20': close.rolling(20).mean(),
+            'sma_200': close.rolling(200).mean(),
+            'ema_12': close.ewm(span=12).mean(),
+            'rsi_14': 100 - (100 / (1 + gain / loss)),
+            'macd': macd,
+            'macd_signal': macd.ewm(span=9).mean(),
+            'bb_upper_20': close.rolling(20).mean() + close.rolling(20).std() * 2,
+            'bb_lower_20': close.rolling(20).mean() - close.rolling(20).std() * 2,
+            'volume_sma_20': candles['volume'].rolling(20).mean(),
+            'atr': true_range.rolling(14).mean(),
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_k.rolling(3).mean(),
+            'vwap': (typical_price * candles['volume']).rolling(20).sum() / candles['volume'].rolling(20).sum()
+        }
+        for column, values in expected.items():
+            np.testing.assert_array_equal(result[column].to_numpy(), values.to_numpy(), err_msg=column)
+
+    def test_frame_is_copied_and_columns_replaced(self):
+        """Recomputing over a frame with indicators replaces them instead of duplicating"""
+        candles = make_candles()
+        first = calculate_indicators(candles)
+        second = calculate_indicators(first)
+
+        assert list(candles.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert not second.columns.duplicated().any()
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_market_regime_codes(self):
+        result = calculate_indicators(make_candles(n=500))
+
+        assert result['market_regime'].dtype == np.int8
+        assert set(result['market_regime'].unique()) <= {0, 1, 2}
+
+    def test_empty_frame(self):
+        assert calculate_indicators(pd.DataFrame()).empty
+
+
+class TestMemoization:
+    """Shared intermediate series are computed once per frame"""
+
+    def test_shared_inputs_computed_once(self):
+        cache = SeriesCache(make_candles())
+        rsi(cache, 14)
+        misses = cache.misses
+
+        rsi(cache, 21)  # Reuses the diff, gains and losses
+        sma(cache, 20)
+        sma(cache, 20)
+
+        # RSI 21: two rolling means and the RSI; SMA 20: one rolling mean
+        assert cache.misses == misses + 4
+        assert cache.hits > 0
+
+    def test_summary_groups(self):
+        factory = IndicatorFactory()
+        summary = factory.get_indicator_summary(factory.calculate_all_indicators(make_candles()))
+
+        assert 'rsi_14' in summary['indicator_groups']['momentum']
+        assert 'bb_position_20' in summary['indicator_groups']['volatility']
+        assert summary['indicator_groups']['regime'] == ['market_regime']
+        assert summary['total_indicators'] == sum(len(group) for group in summary['indicator_groups'].values())
+        assert factory.get_metrics()['frames_processed'] == 1
+
+
+class TestLatestIndicators:
+    """Live snapshots come from the same columns"""
+
+    @pytest.mark.parametrize("trading_style", ["day_trading", "swing_trading", "long_term"])
+    def test_latest_matches_columns(self, trading_style):
+        candles = make_candles()
+        factory = IndicatorFactory()
+
+        latest = factory.calculate_latest(candles, trading_style)
+        columns = factory.calculate_all_indicators(candles)
+
+        assert latest['sma_20'] == columns['sma_20'].iloc[-1]
+        if trading_style != 'long_term':
+            assert latest['rsi'] == columns['rsi_14'].iloc[-1]
+        if trading_style == 'swing_trading':
+            assert latest['macd'] == columns['macd'].iloc[-1]
+            assert latest['bb_upper'] == columns['bb_upper_20'].iloc[-1]
+        if trading_style == 'day_trading':
+            assert latest['vwap'] == columns['vwap'].iloc[-1]
+            assert 0 <= latest['stoch_rsi'] <= 100
+
+    @pytest.mark.parametrize("trading_style", ["day_trading", "swing_trading", "long_term"])
+    def test_incremental_engine_matches_latest(self, trading_style):
+        """The live incremental engine reproduces calculate_latest on growing and sliding frames"""
+        candles = make_candles()
+        factory = IndicatorFactory()
+        engine = IndicatorEngine()
+
+        for end in range(2, len(candles) + 1):
+            # Growing frames up to 200 rows, then a sliding 168-row lookback
+            frame = candles.iloc[:end] if end < 200 else candles.iloc[end - 168:end]
+            # The engine stays anchored at the first candle: its values are those of the whole history
+            history = factory.calculate_latest(candles.iloc[:end], trading_style)
+            expected = {key: history[key] for key in factory.calculate_latest(frame, trading_style)}
+            actual = engine.get_indicators('BTC-EUR', trading_style, frame)
+            assert list(actual) == list(expected)
+            for key, value in expected.items():
+                np.testing.assert_array_equal(actual[key], value, err_msg=key)
+
+        assert engine.get_metrics()['seeds'] == 1
+
+    def test_short_history_skips_indicators(self):
+        latest = IndicatorFactory().calculate_latest(make_candles().iloc[:15], 'swing_trading')
+
+        assert 'rsi' in latest
+        assert 'sma_20' not in latest
+        assert 'macd' not in latest
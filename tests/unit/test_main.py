@@ -27,6 +27,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 # Mock required modules before importing main
+_real_schedule = sys.modules.get('schedule')
 sys.modules['schedule'] = Mock()
 sys.modules['google.genai'] = Mock()
 sys.modules['google.genai.types'] = Mock()
@@ -39,6 +40,26 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 # Import the module under test
 import main
 from main import TradingBot, ensure_single_instance
+from strategies.base_strategy import StrategyEvaluation
+
+# main keeps its schedule Mock; other test modules (e.g. the vectorbt-based
+# backtest tests) import the real package
+if _real_schedule is not None:
+    sys.modules['schedule'] = _real_schedule
+else:
+    del sys.modules['schedule']
+
+
+@pytest.fixture(autouse=True, scope="module")
+def mocked_schedule_module():
+    """Install main's schedule Mock as the schedule module while these tests run"""
+    previous = sys.modules.get('schedule')
+    sys.modules['schedule'] = main.schedule
+    yield
+    if previous is not None:
+        sys.modules['schedule'] = previous
+    else:
+        sys.modules.pop('schedule', None)
 
 # Test configuration
 @pytest.fixture
@@ -87,6 +108,7 @@ def mock_components():
         CapitalManager=Mock(),
         OpportunityManager=Mock(),
         DashboardUpdater=Mock(),
+        DecisionRegistry=Mock(),
         WebServerSync=Mock(),
         TaxReportGenerator=Mock(),
         NotificationService=Mock(),
@@ -318,8 +340,13 @@ class TestMultiStrategyAnalysis:
             bot.data_collector.get_market_data.return_value = mock_market_data
             bot.data_collector.get_historical_data.return_value = mock_historical_data
             bot.data_collector.calculate_indicators.return_value = mock_indicators
-            bot.strategy_manager.get_combined_signal.return_value = mock_signal
-            bot.strategy_manager.analyze_all_strategies.return_value = {'momentum': mock_signal}
+            bot.strategy_manager.evaluate_strategies.return_value = StrategyEvaluation(
+                combined_signal=mock_signal,
+                strategy_signals={'momentum': mock_signal},
+                market_regime='trending',
+                strategy_weights={'momentum': 1.0}
+            )
+            bot.strategy_manager.strategy_weights = {'momentum': 0.3}
             bot.portfolio.to_dict.return_value = {'EUR': {'amount': 1000}}
             
             result = bot._execute_multi_strategy_analysis('BTC-EUR')
@@ -329,6 +356,14 @@ class TestMultiStrategyAnalysis:
             assert result['product_id'] == 'BTC-EUR'
             assert 'reasoning' in result
             assert 'timestamp' in result
+            assert result['strategy_details']['market_regime'] == 'trending'
+            assert result['strategy_details']['strategy_weights'] == {'momentum': 1.0}
+            assert result['strategy_details']['individual_strategies']['momentum']['action'] == 'BUY'
+            
+            # Strategies are evaluated exactly once per pair
+            bot.strategy_manager.evaluate_strategies.assert_called_once()
+            bot.strategy_manager.analyze_all_strategies.assert_not_called()
+            bot.strategy_manager.get_combined_signal.assert_not_called()
     
     def test_execute_multi_strategy_analysis_error_handling(self, test_env_vars, mock_components):
         """Test error handling in multi-strategy analysis"""
@@ -530,6 +565,63 @@ class TestTradingCycle:
             # Verify fallback was called
             bot._run_legacy_trading_cycle.assert_called_once()
 
+class TestConcurrentAnalysis:
+    """Test the concurrent per-pair analysis phase"""
+    
+    def _make_bot(self):
+        bot = TradingBot()
+        
+        def analyze(product_id):
+            # Deterministic per-pair result with uneven latency so workers finish out of order
+            time.sleep(0.01 * (len(product_id) % 3))
+            return {'action': 'BUY' if product_id.startswith('B') else 'HOLD',
+                    'confidence': float(len(product_id)), 'product_id': product_id}
+        
+        bot._execute_multi_strategy_analysis = Mock(side_effect=analyze)
+        return bot
+    
+    def test_concurrent_results_match_sequential(self, test_env_vars, mock_components):
+        """Concurrent fan-out returns the same decisions, in pair order, as the sequential path"""
+        pairs = ['BTC-EUR', 'ETH-EUR', 'SOL-EUR', 'DOGE-EUR', 'BNB-EUR']
+        with patch('os.makedirs'), \
+             patch('main.Config') as mock_config, \
+             patch('signal.signal'):
+            
+            mock_config.return_value = Mock()
+            bot = self._make_bot()
+            bot.analysis_rate_limiter = main.TokenBucket(rate=1000, capacity=10)
+            
+            with patch('main.CONCURRENT_ANALYSIS_ENABLED', False):
+                sequential = bot._analyze_all_pairs(pairs)
+            with patch('main.CONCURRENT_ANALYSIS_ENABLED', True), \
+                 patch('main.ANALYSIS_MAX_WORKERS', 4):
+                concurrent = bot._analyze_all_pairs(pairs)
+            
+            assert list(concurrent.keys()) == pairs
+            assert concurrent == sequential
+            assert set(bot.last_analysis_latencies.keys()) == set(pairs)
+            assert bot.analysis_rate_limiter.permits_granted == 2 * len(pairs)
+    
+    def test_concurrent_analysis_error_falls_back_to_hold(self, test_env_vars, mock_components):
+        """A failing pair yields a HOLD result without affecting the others"""
+        with patch('os.makedirs'), \
+             patch('main.Config') as mock_config, \
+             patch('signal.signal'), \
+             patch('main.CONCURRENT_ANALYSIS_ENABLED', True):
+            
+            mock_config.return_value = Mock()
+            bot = TradingBot()
+            bot._execute_multi_strategy_analysis = Mock(
+                side_effect=lambda pid: (_ for _ in ()).throw(Exception("boom")) if pid == 'ETH-EUR'
+                else {'action': 'BUY', 'confidence': 80, 'product_id': pid}
+            )
+            
+            results = bot._analyze_all_pairs(['BTC-EUR', 'ETH-EUR'])
+            
+            assert results['BTC-EUR']['action'] == 'BUY'
+            assert results['ETH-EUR']['action'] == 'HOLD'
+            assert results['ETH-EUR']['execution_status'] == 'error'
+    
 class TestScheduledTasks:
     """Test scheduled task management"""
     
@@ -818,7 +910,7 @@ class TestFileOperations:
             
             # Mock market data
             bot.data_collector.client.get_product_price.return_value = {'price': '45000.0'}
-            bot._calculate_price_changes = Mock(return_value={'1h': 2.5, '24h': 5.0})
+            bot.data_collector.get_price_changes.return_value = {'1h': 2.5, '24h': 5.0}
             
             result = {'action': 'BUY', 'confidence': 75}
             
@@ -831,6 +923,8 @@ class TestFileOperations:
             # Verify market data was added to the result file (second call)
             saved_data = mock_json_dump.call_args_list[1][0][0]
             assert 'market_data' in saved_data
+            assert saved_data['market_data']['price_changes'] == {'1h': 2.5, '24h': 5.0}
+            bot.data_collector.get_price_changes.assert_called_once_with('BTC-EUR', 45000.0)
 
 # Integration test for main execution
 class TestMainExecution:
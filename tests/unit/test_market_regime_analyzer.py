@@ -0,0 +1,125 @@
+"""
+Unit tests for MarketRegimeAnalyzer regime detection and validation
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.backtest.market_regime_analyzer import MarketRegimeAnalyzer, REGIMES
+
+
+@pytest.fixture
+def analyzer():
+    return MarketRegimeAnalyzer()
+
+
+def _market_data(seed, rows=600):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-01", periods=rows, freq="h")
+    close = pd.Series(50000 * np.exp(np.cumsum(rng.normal(0, 0.02, rows))), index=index)
+    middle = close.rolling(20).mean()
+    width = close * rng.uniform(0.002, 0.04, rows)
+    return pd.DataFrame({
+        'close': close,
+        'bb_upper': middle + width,
+        'bb_middle': middle,
+        'bb_lower': middle - width
+    })
+
+
+def _reference_regimes(analyzer, data):
+    """Per-row classification as the loop implementation computed it"""
+    price_changes = analyzer._calculate_price_changes(data)
+    bb_width_pct = analyzer._calculate_bb_width_percentage(data)
+    thresholds = analyzer.regime_thresholds
+    regimes = []
+    for timestamp in data.index:
+        change_24h = abs(price_changes.loc[timestamp, '24h'])
+        change_5d = abs(price_changes.loc[timestamp, '5d'])
+        bb_width = bb_width_pct.loc[timestamp]
+        if change_24h > thresholds['trending_price_change_24h'] or \
+           change_5d > thresholds['trending_price_change_5d']:
+            regime = "volatile" if bb_width > thresholds['volatile_bb_width'] else "trending"
+        elif change_24h < thresholds['ranging_price_change_24h'] and \
+             bb_width < thresholds['ranging_bb_width']:
+            regime = "ranging"
+        elif bb_width > thresholds['extreme_volatile_bb_width']:
+            regime = "volatile"
+        else:
+            regime = "ranging"
+        regimes.append(regime)
+    return pd.Series(regimes, index=data.index)
+
+
+class TestDetectMarketRegimes:
+    """Test vectorized regime detection"""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_per_row_logic(self, analyzer, seed):
+        data = _market_data(seed)
+        regimes = analyzer.detect_market_regimes(data)
+
+        assert isinstance(regimes.dtype, pd.CategoricalDtype)
+        assert tuple(regimes.cat.categories) == REGIMES
+        assert regimes.astype(str).tolist() == _reference_regimes(analyzer, data).tolist()
+
+    def test_missing_bollinger_bands_defaults_to_moderate_width(self, analyzer):
+        data = _market_data(0)[['close']]
+        regimes = analyzer.detect_market_regimes(data)
+
+        assert regimes.astype(str).tolist() == _reference_regimes(analyzer, data).tolist()
+
+
+class TestRegimeTransitions:
+    """Test transition counting on integer codes"""
+
+    def test_counts_transitions_in_first_seen_order(self, analyzer):
+        regimes = pd.Series(['ranging', 'ranging', 'trending', 'volatile', 'trending', 'ranging', 'trending'])
+        result = analyzer._analyze_regime_transitions(regimes.astype('category'))
+
+        assert result['total_transitions'] == 5
+        assert result['transition_frequency'] == pytest.approx(5 / 7)
+        assert list(result['transition_types'].items()) == [
+            ('ranging_to_trending', 2),
+            ('trending_to_volatile', 1),
+            ('volatile_to_trending', 1),
+            ('trending_to_ranging', 1)
+        ]
+
+    def test_string_and_categorical_inputs_agree(self, analyzer):
+        regimes = analyzer.detect_market_regimes(_market_data(1))
+
+        assert analyzer._analyze_regime_transitions(regimes) == \
+            analyzer._analyze_regime_transitions(regimes.astype(str))
+
+
+class TestValidateRegimeDetection:
+    """Test accuracy and confusion matrix from integer codes"""
+
+    def test_accuracy_and_confusion_matrix(self, analyzer):
+        data = _market_data(2)
+        detected = analyzer.detect_market_regimes(data).astype(str)
+        manual = detected.copy()
+        manual.iloc[:50] = np.where(detected.iloc[:50] == 'ranging', 'volatile', 'ranging')
+
+        result = analyzer.validate_regime_detection_accuracy(data, manual)
+
+        assert result['total_periods'] == len(data)
+        assert result['correct_classifications'] == len(data) - 50
+        assert result['overall_accuracy'] == pytest.approx((len(data) - 50) / len(data))
+        matrix = result['confusion_matrix']
+        assert sum(matrix.values()) == len(data)
+        for true_regime in REGIMES:
+            for pred_regime in REGIMES:
+                expected = int(((manual == true_regime) & (detected == pred_regime)).sum())
+                assert matrix[f'{true_regime}_predicted_as_{pred_regime}'] == expected
+
+    def test_unknown_manual_labels_are_never_correct(self, analyzer):
+        data = _market_data(0, rows=200)
+        manual = pd.Series('sideways', index=data.index)
+
+        result = analyzer.validate_regime_detection_accuracy(data, manual)
+
+        assert result['correct_classifications'] == 0
+        assert sum(result['confusion_matrix'].values()) == 0
@@ -0,0 +1,160 @@
+"""
+Unit tests for streaming market data and the offline replay server
+"""
+
+import json
+import sys
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from data_collector import DataCollector
+from market_stream import MarketStateStore, MarketStream, ReplayServer
+
+BASE = 1_700_000_020  # 40s into a minute
+
+
+def ticker_message(product_id, price):
+    return {
+        "channel": "ticker",
+        "timestamp": "2023-11-14T22:14:00.123456789Z",
+        "events": [{"type": "update", "tickers": [{
+            "type": "ticker", "product_id": product_id, "price": str(price),
+            "best_bid": str(price - 1), "best_ask": str(price + 1), "volume_24_h": "123.4"
+        }]}]
+    }
+
+
+def trades_message(product_id, trades, event_type="update"):
+    return {
+        "channel": "market_trades",
+        "timestamp": "2023-11-14T22:14:00Z",
+        "events": [{"type": event_type, "trades": [
+            {"trade_id": str(i), "product_id": product_id, "price": str(price), "size": str(size),
+             "side": "BUY", "time": str(trade_time)}
+            for i, (trade_time, price, size) in enumerate(trades)
+        ]}]
+    }
+
+
+class TestMarketStateStore:
+    """Test ticker and candle state built from feed messages"""
+
+    def test_ticker_updates_price(self):
+        """Ticker messages set the live price, bid and ask"""
+        store = MarketStateStore()
+        store.handle_message(json.dumps(ticker_message("BTC-EUR", 50000)))
+
+        ticker = store.get_ticker("BTC-EUR")
+        assert ticker["price"] == 50000.0
+        assert ticker["best_bid"] == 49999.0
+        assert store.get_price("BTC-EUR", max_age=5) == 50000.0
+        assert store.get_price("ETH-EUR") is None
+
+    def test_trades_aggregate_into_minute_candles(self):
+        """Trades fold into OHLCV candles, resampled on request"""
+        store = MarketStateStore()
+        store.handle_message(trades_message("BTC-EUR", [
+            (BASE, 100, 1), (BASE + 10, 105, 2), (BASE + 15, 98, 1),  # minute 0 (partial)
+            (BASE + 30, 101, 1), (BASE + 70, 99, 3),                    # minute 1
+            (BASE + 100, 102, 1)                                       # minute 2
+        ]))
+
+        minutes = store.get_candles("BTC-EUR", "ONE_MINUTE")
+        assert list(minutes['open']) == [100.0, 101.0, 102.0]
+        assert minutes.iloc[0]['high'] == 105.0
+        assert minutes.iloc[0]['low'] == 98.0
+        assert minutes.iloc[0]['close'] == 98.0
+        assert minutes.iloc[1]['volume'] == 4.0
+
+        five_minutes = store.get_candles("BTC-EUR", "FIVE_MINUTE")
+        assert five_minutes['volume'].sum() == 9.0
+        assert five_minutes.iloc[-1]['close'] == 102.0
+
+    def test_coverage_starts_after_first_live_minute(self):
+        """Snapshot trades and the partial first minute are not treated as complete"""
+        store = MarketStateStore()
+        store.handle_message(trades_message("BTC-EUR", [(BASE - 600, 90, 1)], event_type="snapshot"))
+        assert not store.covers("BTC-EUR", BASE)
+
+        store.handle_message(trades_message("BTC-EUR", [(BASE, 100, 1)]))
+        first_full_minute = (BASE // 60) * 60 + 60
+
+        assert not store.covers("BTC-EUR", first_full_minute - 60)
+        assert store.covers("BTC-EUR", first_full_minute)
+
+    def test_malformed_message_is_ignored(self):
+        """Unparseable messages do not raise"""
+        store = MarketStateStore()
+        store.handle_message("not json")
+
+        assert store.get_metrics()['messages_processed'] == 0
+
+
+class TestDataCollectorStreaming:
+    """Test DataCollector reads streamed state instead of REST"""
+
+    def test_current_price_from_stream(self):
+        """A fresh streamed ticker avoids the REST price call"""
+        client = Mock()
+        store = MarketStateStore()
+        store.handle_message(ticker_message("BTC-EUR", 50000))
+
+        collector = DataCollector(client, market_state=store)
+
+        assert collector.get_current_price("BTC-EUR") == 50000.0
+        client.get_product_price.assert_not_called()
+
+    def test_candles_from_stream_when_covered(self):
+        """Candle ranges fully seen by the stream are served locally"""
+        client = Mock()
+        store = MarketStateStore()
+        store.handle_message(trades_message("BTC-EUR", [(BASE + i * 60, 100 + i, 1) for i in range(10)]))
+        collector = DataCollector(client, market_state=store)
+
+        covered_start = (BASE // 60) * 60 + 60
+        candles = collector._fetch_candles_local_first("BTC-EUR", "ONE_MINUTE", covered_start, BASE + 600)
+
+        assert len(candles) == 9
+        client.get_market_data.assert_not_called()
+
+        client.get_market_data.return_value = []
+        collector._fetch_candles_local_first("BTC-EUR", "ONE_MINUTE", covered_start - 3600, BASE + 600)
+        client.get_market_data.assert_called_once()
+
+
+class TestReplayServer:
+    """Test the offline feed end to end through the WebSocket client"""
+
+    def test_stream_from_replay_file(self, tmp_path, monkeypatch):
+        """Recorded messages replayed over a local socket update the store"""
+        # Other test modules replace the coinbase package with mocks
+        for name in [name for name in sys.modules if name == 'coinbase' or name.startswith('coinbase.')]:
+            monkeypatch.delitem(sys.modules, name)
+
+        replay_file = tmp_path / "feed.jsonl"
+        messages = [ticker_message("BTC-EUR", 50000), trades_message("BTC-EUR", [(BASE, 100, 1), (BASE + 60, 101, 2)])]
+        replay_file.write_text("\n".join(json.dumps(message) for message in messages) + "\n")
+
+        server = ReplayServer(str(replay_file))
+        url = server.start()
+        stream = MarketStream(["BTC-EUR"], url=url, record_path=str(tmp_path / "recorded.jsonl"))
+        try:
+            stream.start()
+            deadline = time.time() + 10
+            while stream.store.trades_processed < 2 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            stream.stop()
+            server.stop()
+
+        assert server.messages_sent == 2
+        assert stream.store.get_price("BTC-EUR") == 50000.0
+        assert len(stream.store.get_candles("BTC-EUR", "ONE_MINUTE")) == 2
+        assert len((tmp_path / "recorded.jsonl").read_text().splitlines()) == 2
+
+    def test_missing_replay_file(self, tmp_path):
+        """Starting without a recording fails fast"""
+        with pytest.raises(FileNotFoundError):
+            ReplayServer(str(tmp_path / "missing.jsonl")).start()
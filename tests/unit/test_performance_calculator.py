@@ -304,6 +304,69 @@ class TestRiskMetrics:
         assert "Insufficient data" in result["error"]
 
 
+class TestPeriodMetrics:
+    """Test the multi-period vectorized metrics engine"""
+    
+    def setup_method(self):
+        """Set up a 120-day history with a drawdown in the last month"""
+        self.calculator = PerformanceCalculator()
+        self.now = datetime.now(timezone.utc)
+        values = [1000.0 + 5 * i for i in range(100)] + [1400.0 - 20 * i for i in range(20)]
+        self.snapshots = [
+            {
+                "timestamp": (self.now - timedelta(days=len(values) - 1 - i)).isoformat(),
+                "total_value_eur": value
+            }
+            for i, value in enumerate(values)
+        ]
+        self.timestamps = [datetime.fromisoformat(s["timestamp"]).timestamp() for s in self.snapshots]
+        self.values = values
+    
+    def _period_snapshots(self, days):
+        cutoff = self.now - timedelta(days=days)
+        return [s for s in self.snapshots if datetime.fromisoformat(s["timestamp"]) >= cutoff]
+    
+    def test_period_metrics_match_single_period_calculations(self):
+        """Test each period agrees with the per-period dict calculations"""
+        results = self.calculator.calculate_period_metrics(
+            self.timestamps, self.values, ("7d", "30d", "90d", "all"), now=self.now)
+        
+        for period, days in (("7d", 7), ("30d", 30), ("90d", 90), ("all", 1000)):
+            period_snapshots = self._period_snapshots(days)
+            expected_risk = self.calculator.calculate_risk_metrics(period_snapshots)
+            expected_return = self.calculator.calculate_total_return(period_snapshots, period)
+            
+            risk = results[period]["risk_metrics"]
+            total_return = results[period]["total_return"]
+            for key, value in expected_risk.items():
+                assert risk[key] == pytest.approx(value, rel=1e-6, abs=1e-9), (period, key)
+            assert total_return["percentage_return"] == pytest.approx(expected_return["percentage_return"])
+            assert total_return["snapshots_used"] == expected_return["snapshots_used"]
+    
+    def test_period_metrics_win_rate(self):
+        """Test trade win rate is split by period"""
+        trades = [
+            {"timestamp": (self.now - timedelta(days=40)).isoformat()},
+            {"timestamp": (self.now - timedelta(days=3)).isoformat()},
+            {"timestamp": (self.now - timedelta(days=1)).isoformat()},
+        ]
+        with patch.object(self.calculator, '_calculate_trade_pnl', side_effect=[-5.0, 10.0, 8.0]):
+            results = self.calculator.calculate_period_metrics(
+                self.timestamps, self.values, ("7d", "all"), trade_history=trades, now=self.now)
+        
+        assert results["7d"]["trading"]["win_rate"] == 100.0
+        assert results["all"]["trading"]["win_rate"] == pytest.approx(200 / 3)
+    
+    def test_period_metrics_insufficient_data(self):
+        """Test periods without enough snapshots report errors"""
+        results = self.calculator.calculate_period_metrics(
+            self.timestamps[:2], self.values[:2], ("7d",), now=self.now)
+        
+        assert "error" in results["7d"]["total_return"]
+        assert "error" in results["7d"]["risk_metrics"]
+        assert "error" in results["7d"]["trading"]
+
+
 class TestMarketPerformanceCalculations:
     """Test market performance calculation functionality"""
     
@@ -290,6 +290,57 @@ class TestPortfolioSaving:
         
         # Should not raise exception
         portfolio.save()  # Should handle error gracefully
+    
+    def test_price_updates_coalesce_until_flush(self):
+        """Test price updates mark the portfolio dirty and are written once on flush."""
+        portfolio = Portfolio(portfolio_file=self.portfolio_file)
+        portfolio.save()
+        
+        with patch.object(portfolio, 'save', wraps=portfolio.save) as save:
+            portfolio.update_prices({"BTC": 50000.0})
+            portfolio.update_asset_price("BTC", 51000.0, 47000.0)
+            portfolio.update_asset_amount("EUR", 10.0)
+            assert save.call_count == 0
+            assert portfolio.dirty
+            
+            assert portfolio.flush() is True
+            assert portfolio.flush() is False
+            assert save.call_count == 1
+        
+        with open(self.portfolio_file, 'r') as f:
+            saved_data = json.load(f)
+        assert saved_data["BTC"]["last_price_usd"] == 51000.0
+        assert not portfolio.dirty
+    
+    def test_executed_trade_is_written_through(self):
+        """Test an executed trade is on disk without an explicit flush."""
+        portfolio = Portfolio(portfolio_file=self.portfolio_file)
+        portfolio.data["USD"] = {"amount": 1000.0, "initial_amount": 1000.0}
+        portfolio.data["BTC"] = {"amount": 0.0, "initial_amount": 0.0, "last_price_usd": 50000.0}
+        
+        portfolio.execute_trade("BTC", "buy", 0.01, 50000.0, log_trade=False)
+        
+        with open(self.portfolio_file, 'r') as f:
+            saved_data = json.load(f)
+        assert saved_data["BTC"]["amount"] == 0.01
+        assert not portfolio.dirty
+    
+    def test_failed_save_keeps_previous_file(self):
+        """Test a failed write leaves the previous portfolio file intact."""
+        portfolio = Portfolio(portfolio_file=self.portfolio_file)
+        portfolio.data["trades_executed"] = 3
+        portfolio.save()
+        
+        portfolio.data["trades_executed"] = 4
+        portfolio._mark_dirty()
+        with patch('json.dump', side_effect=OSError("Disk full")):
+            portfolio.save()
+        
+        with open(self.portfolio_file, 'r') as f:
+            saved_data = json.load(f)
+        assert saved_data["trades_executed"] == 3
+        assert portfolio.dirty
+        assert not os.path.exists(f"{self.portfolio_file}.tmp")
 
 
 class TestPortfolioValueCalculations:
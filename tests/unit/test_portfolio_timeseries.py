@@ -0,0 +1,225 @@
+"""
+Unit tests for PortfolioTimeSeries columnar store
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from utils.performance.portfolio_timeseries import PortfolioTimeSeries
+from utils.performance.performance_tracker import PerformanceTracker
+from utils.performance.performance_calculator import PerformanceCalculator
+
+
+class TestPortfolioTimeSeries:
+    """Test appends, columnar reads and maintenance of the store"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = PortfolioTimeSeries(os.path.join(self.temp_dir, "history"))
+        self.start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_append_and_read_arrays(self):
+        """Test appended rows come back as aligned column arrays"""
+        for i in range(3):
+            self.store.append(self.start + timedelta(hours=i), 1000.0 + i,
+                              assets={"BTC": {"amount": 0.01, "price": 90000.0 + i}})
+
+        arrays = self.store.arrays()
+
+        assert len(self.store) == 3
+        np.testing.assert_array_equal(arrays["total_value_eur"], [1000.0, 1001.0, 1002.0])
+        np.testing.assert_array_equal(arrays["BTC_price"], [90000.0, 90001.0, 90002.0])
+
+    def test_new_asset_adds_column(self):
+        """Test an asset seen for the first time gets a NaN-backfilled column"""
+        self.store.append(self.start, 1000.0, assets={"BTC": {"amount": 0.01}})
+        self.store.append(self.start + timedelta(hours=1), 1010.0,
+                          assets={"BTC": {"amount": 0.01}, "SOL": {"amount": 2.0}})
+
+        sol = self.store.column("SOL_amount")
+
+        assert np.isnan(sol[0])
+        assert sol[1] == 2.0
+        reopened = PortfolioTimeSeries(self.store.directory)
+        assert reopened.columns == self.store.columns
+
+    def test_window_uses_time_range(self):
+        """Test window() selects rows by timestamp"""
+        for i in range(10):
+            self.store.append(self.start + timedelta(days=i), 1000.0 + i)
+
+        rows = self.store.window(since=self.start + timedelta(days=7))
+
+        assert (rows.start, rows.stop) == (7, 10)
+        np.testing.assert_array_equal(self.store.column("total_value_eur", rows), [1007.0, 1008.0, 1009.0])
+
+    def test_out_of_order_append_is_sorted(self):
+        """Test a late row is placed in timestamp order"""
+        self.store.append(self.start + timedelta(hours=2), 1002.0, meta={"n": 2})
+        self.store.append(self.start, 1000.0, meta={"n": 0})
+
+        assert list(self.store.column("total_value_eur")) == [1000.0, 1002.0]
+        assert [m["n"] for m in self.store.metadata()] == [0, 2]
+
+    def test_trim_before(self):
+        """Test expired rows are dropped together with their metadata"""
+        for i in range(5):
+            self.store.append(self.start + timedelta(days=i), 1000.0 + i, meta={"n": i})
+
+        removed = self.store.trim_before(self.start + timedelta(days=3))
+
+        assert removed == 3
+        assert [m["n"] for m in self.store.metadata()] == [3, 4]
+
+    def test_partial_row_is_repaired(self):
+        """Test an interrupted append does not corrupt later reads"""
+        self.store.append(self.start, 1000.0, meta={"n": 0})
+        with open(self.store.data_file, 'ab') as f:
+            f.write(b"\x00" * 5)
+        with open(self.store.meta_file, 'a') as f:
+            f.write('{"n": 1}\n')
+
+        reopened = PortfolioTimeSeries(self.store.directory)
+        reopened.append(self.start + timedelta(hours=1), 1001.0, meta={"n": 2})
+
+        assert list(reopened.column("total_value_eur")) == [1000.0, 1001.0]
+        assert [m["n"] for m in reopened.metadata()] == [0, 2]
+
+    def test_new_asset_does_not_rewrite_rows(self):
+        """Test a new column starts a wider segment after the existing rows"""
+        for i in range(3):
+            self.store.append(self.start + timedelta(hours=i), 1000.0 + i, assets={"BTC": {"amount": 0.01}})
+        with open(self.store.data_file, 'rb') as f:
+            before = f.read()
+
+        self.store.append(self.start + timedelta(hours=3), 1003.0,
+                          assets={"BTC": {"amount": 0.02}, "SOL": {"amount": 2.0}})
+
+        with open(self.store.data_file, 'rb') as f:
+            assert f.read(len(before)) == before
+        reopened = PortfolioTimeSeries(self.store.directory)
+        arrays = reopened.arrays()
+        np.testing.assert_array_equal(arrays["BTC_amount"], [0.01, 0.01, 0.01, 0.02])
+        np.testing.assert_array_equal(arrays["SOL_amount"], [np.nan, np.nan, np.nan, 2.0])
+        assert reopened.read(slice(2, 4))[1][0]["SOL_amount"] == 2.0
+
+    def test_out_of_order_append_rewrites_only_later_rows(self):
+        """Test a late row keeps the data before its position in place"""
+        for i in (0, 1, 3, 4):
+            self.store.append(self.start + timedelta(hours=i), 1000.0 + i, meta={"n": i})
+        with open(self.store.data_file, 'rb') as f:
+            before = f.read()
+
+        self.store.append(self.start + timedelta(hours=2), 1002.0, meta={"n": 2})
+
+        with open(self.store.data_file, 'rb') as f:
+            assert f.read(len(before) // 2) == before[:len(before) // 2]
+        assert list(self.store.column("total_value_eur")) == [1000.0, 1001.0, 1002.0, 1003.0, 1004.0]
+        assert [m["n"] for m in PortfolioTimeSeries(self.store.directory).metadata()] == [0, 1, 2, 3, 4]
+
+    def test_metadata_reads_only_the_window(self):
+        """Test metadata for a time range is sliced out of meta.jsonl by offset"""
+        for i in range(10):
+            self.store.append(self.start + timedelta(days=i), 1000.0 + i, meta={"n": i})
+        # Corrupt a line outside the window: it must not be read
+        ends = self.store._meta_ends()
+        with open(self.store.meta_file, 'r+b') as f:
+            f.seek(int(ends[0]))
+            f.write(b"X")
+
+        assert [m["n"] for m in self.store.metadata(since=self.start + timedelta(days=7))] == [7, 8, 9]
+        assert [m["n"] for m in self.store.metadata_at([2, 9])] == [2, 9]
+
+    def test_legacy_store_gets_meta_index(self):
+        """Test a store without meta.idx or segments is read as one segment"""
+        for i in range(3):
+            self.store.append(self.start + timedelta(hours=i), 1000.0 + i, meta={"n": i})
+        os.remove(self.store.index_file)
+        with open(self.store.columns_file, 'w') as f:
+            json.dump(self.store.columns, f)
+
+        reopened = PortfolioTimeSeries(self.store.directory)
+
+        assert reopened.index_file.exists()
+        assert list(reopened.column("total_value_eur")) == [1000.0, 1001.0, 1002.0]
+        assert [m["n"] for m in reopened.metadata(since=self.start + timedelta(hours=1))] == [1, 2]
+
+
+class TestTrackerSnapshotStore:
+    """Test PerformanceTracker on top of the columnar store"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.temp_dir, "performance")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _snapshots(self, count):
+        now = datetime.now(timezone.utc)
+        return [{
+            "timestamp": (now - timedelta(days=count - 1 - i)).isoformat(),
+            "total_value_eur": 1000.0 + 10 * i,
+            "portfolio_composition": {"BTC": 0.01},
+            "snapshot_type": "scheduled"
+        } for i in range(count)]
+
+    def test_migrates_legacy_snapshot_file(self):
+        """Test portfolio_snapshots.json is imported and set aside"""
+        os.makedirs(self.config_path)
+        legacy = self._snapshots(5)
+        with open(os.path.join(self.config_path, "portfolio_snapshots.json"), 'w') as f:
+            json.dump(legacy, f)
+
+        tracker = PerformanceTracker(self.config_path)
+
+        assert tracker._load_snapshots() == legacy
+        assert not tracker.snapshots_file.exists()
+        assert os.path.exists(os.path.join(self.config_path, "portfolio_snapshots.json.migrated"))
+
+    def test_snapshot_arrays_match_dict_metrics(self):
+        """Test risk metrics agree between columnar arrays and snapshot dicts"""
+        tracker = PerformanceTracker(self.config_path)
+        tracker._save_snapshots(self._snapshots(40))
+        calculator = PerformanceCalculator()
+
+        arrays = tracker.get_snapshot_arrays("30d")
+        dicts = tracker._filter_snapshots_by_period(tracker._load_snapshots(), "30d")
+
+        assert len(arrays["total_value_eur"]) == len(dicts)
+        assert calculator.calculate_risk_metrics(arrays) == pytest.approx(calculator.calculate_risk_metrics(dicts))
+        np.testing.assert_array_equal(arrays["BTC_amount"], np.full(len(dicts), 0.01))
+
+    def test_snapshot_retention_trims_store(self):
+        """Test snapshots beyond retention are removed from the store"""
+        tracker = PerformanceTracker(self.config_path)
+        tracker.config["retention_days"] = 10
+        tracker._save_snapshots(self._snapshots(30))
+
+        tracker.config["snapshot_frequency"] = "manual"
+        assert tracker.take_portfolio_snapshot({"total_value_eur": 2000.0})
+
+        assert len(tracker.store) == tracker.get_snapshots_count() == 11
+
+    def test_performance_metrics_for_all_periods(self):
+        """Test get_performance_metrics() reports every period with enough data"""
+        tracker = PerformanceTracker(self.config_path)
+        tracker._save_snapshots(self._snapshots(40))
+
+        metrics = tracker.get_performance_metrics()
+
+        assert set(metrics["periods"]) == {"7d", "30d", "90d", "1y", "all"}
+        assert metrics["periods"]["all"]["snapshots_used"] == 40
+        assert metrics["periods"]["7d"]["total_return"] > 0
+        exported = tracker.get_portfolio_snapshots()["snapshots"]
+        assert exported[0]["holdings"] == {"BTC": 0.01}
+        assert exported[-1]["total_value"] == 1390.0
@@ -0,0 +1,117 @@
+"""
+Unit tests for the prepared-dataset store
+"""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from utils.backtest.prepared_dataset import PreparedDatasetStore
+from utils.performance.indicator_factory import IndicatorFactory, calculate_indicators
+
+
+def _ohlcv(rows=500, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-01", periods=rows, freq="h", tz="UTC", name="timestamp")
+    close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    return pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99,
+                         'close': close, 'volume': rng.uniform(1, 5, rows)}, index=index)
+
+
+class TestPreparedDatasetStore:
+    """Test preparing, reusing and invalidating indicator frames"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "prepared")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_prepared_frame_matches_factory(self):
+        """Test the mapped frame equals calculate_indicators() output"""
+        ohlcv = _ohlcv()
+
+        prepared = PreparedDatasetStore(self.cache_dir).prepare(ohlcv, "BTC-EUR")
+
+        pd.testing.assert_frame_equal(prepared, calculate_indicators(ohlcv), check_freq=False)
+
+    def test_other_store_reuses_file_without_recomputing(self):
+        """Test a second store (e.g. another script) maps the file instead of recomputing"""
+        ohlcv = _ohlcv()
+        PreparedDatasetStore(self.cache_dir).prepare(ohlcv, "BTC-EUR")
+        store = PreparedDatasetStore(self.cache_dir)
+
+        with patch.object(IndicatorFactory, 'calculate_all_indicators',
+                          side_effect=AssertionError("recomputed")):
+            first = store.prepare(ohlcv, "BTC-EUR")
+            second = store.prepare(ohlcv, "BTC-EUR")
+
+        assert (store.hits, store.misses) == (2, 0)
+        assert not first['close'].to_numpy().flags.writeable
+        first['sma_20'] = 0.0
+        assert second['sma_20'].iloc[-1] != 0.0
+
+    def test_changed_candles_are_recomputed(self):
+        """Test refreshed OHLCV for the same range invalidates the prepared file"""
+        store = PreparedDatasetStore(self.cache_dir)
+        ohlcv = _ohlcv()
+        store.prepare(ohlcv, "BTC-EUR")
+
+        revised = ohlcv.copy()
+        revised.iloc[-1, revised.columns.get_loc('close')] *= 1.05
+        prepared = PreparedDatasetStore(self.cache_dir).prepare(revised, "BTC-EUR")
+
+        assert prepared['close'].iloc[-1] == revised['close'].iloc[-1]
+        pd.testing.assert_frame_equal(prepared, calculate_indicators(revised), check_freq=False)
+
+    def test_indicator_set_and_granularity_are_separate_entries(self):
+        """Test factory settings and granularity select different files"""
+        ohlcv = _ohlcv()
+        PreparedDatasetStore(self.cache_dir).prepare(ohlcv, "BTC-EUR")
+        PreparedDatasetStore(self.cache_dir).prepare(ohlcv, "BTC-EUR", "15MIN")
+        custom = PreparedDatasetStore(self.cache_dir, IndicatorFactory(sma_periods=(5,)))
+
+        prepared = custom.prepare(ohlcv, "BTC-EUR")
+
+        assert 'sma_5' in prepared.columns and 'sma_200' not in prepared.columns
+        assert len(os.listdir(self.cache_dir)) == 3
+
+    def test_least_recently_used_files_are_evicted(self):
+        """Test the store stays within max_files, keeping recently used frames"""
+        ohlcv = _ohlcv()
+        store = PreparedDatasetStore(self.cache_dir, max_files=3)
+        frames = [ohlcv.iloc[start:] for start in (0, 24, 48, 72)]
+        for frame in frames[:3]:
+            store.prepare(frame, "BTC-EUR")
+        paths = [store._path("BTC-EUR", "ONE_HOUR", frame) for frame in frames]
+        for age, path in enumerate(paths[:3]):
+            os.utime(path, ns=(age * 10**9, age * 10**9))
+
+        store.prepare(frames[0], "BTC-EUR")  # hit: now the most recently used
+        store.prepare(frames[3], "BTC-EUR")
+
+        assert sorted(os.listdir(self.cache_dir)) == sorted([paths[0].name, paths[3].name])
+        assert store._file_count == 2
+        pd.testing.assert_frame_equal(store.prepare(frames[1], "BTC-EUR"),
+                                      calculate_indicators(frames[1]), check_freq=False)
+
+    def test_columns_are_writable_without_copy_on_write(self):
+        """Test in-place edits work when pandas does not copy on write (pandas 2 default)"""
+        ohlcv = _ohlcv()
+        store = PreparedDatasetStore(self.cache_dir)
+        store.prepare(ohlcv, "BTC-EUR")
+
+        with patch('utils.backtest.prepared_dataset._copy_on_write', return_value=False):
+            edited = store.prepare(ohlcv, "BTC-EUR")
+            mapped = store._mapped[store._path("BTC-EUR", "ONE_HOUR", ohlcv)]
+            assert not np.shares_memory(edited['close'].to_numpy(), mapped['close'].to_numpy())
+            edited.loc[edited.index[-1], 'close'] = 0.0
+            edited.fillna(0.0, inplace=True)
+
+        assert edited['close'].iloc[-1] == 0.0
+        assert store.prepare(ohlcv, "BTC-EUR")['close'].iloc[-1] == ohlcv['close'].iloc[-1]
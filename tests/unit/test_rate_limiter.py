@@ -0,0 +1,122 @@
+"""
+Unit tests for the shared token-bucket rate limiter
+"""
+
+import asyncio
+import pytest
+import threading
+import time
+
+from utils.rate_limiter import EndpointRateLimiter, TokenBucket, backoff_delay
+
+
+class TestTokenBucket:
+    """Test TokenBucket permits, waiting and metrics"""
+    
+    def test_burst_up_to_capacity_without_waiting(self):
+        """Capacity permits are granted immediately"""
+        bucket = TokenBucket(rate=1, capacity=3)
+        
+        assert all(bucket.try_acquire() for _ in range(3))
+        assert bucket.try_acquire() is False
+        assert bucket.permits_granted == 3
+    
+    def test_acquire_waits_for_refill(self):
+        """Acquire blocks roughly 1/rate seconds once the bucket is empty"""
+        bucket = TokenBucket(rate=20, capacity=1)
+        bucket.acquire()
+        
+        waited = bucket.acquire()
+        
+        assert 0.02 <= waited < 0.5
+        assert bucket.get_metrics()['total_wait_time'] >= 0.02
+    
+    def test_acquire_timeout(self):
+        """Acquire raises TimeoutError when the permit cannot arrive in time"""
+        bucket = TokenBucket(rate=0.1, capacity=1)
+        bucket.acquire()
+        
+        with pytest.raises(TimeoutError):
+            bucket.acquire(timeout=0.05)
+    
+    def test_thread_safe_permit_count(self):
+        """Concurrent acquirers never receive more permits than the bucket allows"""
+        bucket = TokenBucket(rate=1000, capacity=5)
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(20)]
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert bucket.permits_granted == 20
+    
+    def test_invalid_configuration(self):
+        """Rate and capacity are validated"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, capacity=0)
+
+    def test_throttle_pauses_permits(self):
+        """A throttled bucket grants nothing until the delay has passed"""
+        bucket = TokenBucket(rate=1000, capacity=5)
+        bucket.throttle(0.05)
+        
+        assert bucket.try_acquire() is False
+        waited = bucket.acquire()
+        
+        assert waited >= 0.04
+        assert bucket.get_metrics()['throttles'] == 1
+    
+    def test_acquire_async(self):
+        """The asyncio variant waits without blocking and records permits"""
+        bucket = TokenBucket(rate=50, capacity=1)
+        
+        async def acquire_twice():
+            await bucket.acquire_async()
+            return await bucket.acquire_async()
+        
+        waited = asyncio.run(acquire_twice())
+        
+        assert waited > 0
+        assert bucket.permits_granted == 2
+
+
+class TestBackoffDelay:
+    """Test jittered exponential backoff"""
+    
+    def test_backoff_is_capped_and_jittered(self):
+        """Delays stay within [0, min(cap, base * 2**attempt)]"""
+        delays = [backoff_delay(attempt, base=0.5, cap=4.0) for attempt in range(10) for _ in range(20)]
+        
+        assert all(0 <= delay <= 4.0 for delay in delays)
+        assert len(set(delays)) > 1
+    
+    def test_retry_after_is_honored(self):
+        """Retry-After is the minimum delay"""
+        assert backoff_delay(0, base=0.5, cap=4.0, retry_after=7.0) >= 7.0
+
+
+class TestEndpointRateLimiter:
+    """Test per-endpoint budgets"""
+    
+    def test_endpoints_have_separate_budgets(self):
+        """Exhausting one endpoint class does not delay the other"""
+        limiter = EndpointRateLimiter({'public': 2, 'private': 5})
+        
+        assert limiter.buckets['public'].capacity == 2
+        assert all(limiter.buckets['public'].try_acquire() for _ in range(2))
+        assert limiter.buckets['public'].try_acquire() is False
+        assert limiter.acquire('private') < 0.01
+        
+        metrics = limiter.get_metrics()
+        assert metrics['public']['permits_granted'] == 2
+        assert metrics['private']['permits_granted'] == 1
+    
+    def test_unknown_endpoint(self):
+        """Unknown endpoint classes are rejected"""
+        limiter = EndpointRateLimiter({'public': 2})
+        
+        with pytest.raises(ValueError):
+            limiter.acquire('private')
@@ -0,0 +1,170 @@
+"""
+Unit tests for the compiled risk-management kernel
+"""
+
+import sys
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.backtest.risk_kernel import (
+    simulate_risk_management, APPROVED, REBALANCE_REQUIRED, NOTHING_TO_SELL
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    # test_main replaces the schedule module with a Mock, which vectorbt cannot import
+    mocked_schedule = sys.modules.get('schedule')
+    if isinstance(mocked_schedule, Mock):
+        del sys.modules['schedule']
+    try:
+        from utils.backtest.adaptive_backtest_engine import AdaptiveBacktestEngine
+    finally:
+        if isinstance(mocked_schedule, Mock):
+            sys.modules['schedule'] = mocked_schedule
+    return AdaptiveBacktestEngine(initial_capital=1000.0)
+
+
+def _signals(seed, rows=400, multiplier=True):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-01", periods=rows, freq="h")
+    data = pd.DataFrame({'close': 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))}, index=index)
+    action = rng.choice([0, 1, -1], size=rows, p=[0.6, 0.25, 0.15])
+    signals = pd.DataFrame({
+        'buy': action == 1,
+        'sell': action == -1,
+        'confidence': rng.uniform(0, 100, rows),
+        'market_regime': 'ranging'
+    }, index=index)
+    if multiplier:
+        signals['position_multiplier'] = rng.choice([0.5, 1.0, 1.5], size=rows)
+    return data, signals
+
+
+def _reference_risk_management(engine, data, signals_df, product_id):
+    """Per-row CapitalManager path the compiled kernel replaced, kept as the parity reference"""
+    risk_adjusted = signals_df.copy()
+    risk_adjusted['original_action'] = 'HOLD'
+    risk_adjusted['risk_adjustment'] = ''
+    risk_adjusted['position_size'] = 0.0
+
+    current_portfolio_value = engine.initial_capital
+    current_eur_balance = engine.initial_capital
+    current_crypto_balance = 0.0
+    asset = product_id.split('-')[0]
+    min_trade_amount = engine.config.MIN_TRADE_AMOUNT
+
+    for timestamp, row in risk_adjusted.iterrows():
+        if not (row['buy'] or row['sell']):
+            continue
+
+        current_price = float(data.loc[timestamp, 'close'])
+        action = 'BUY' if row['buy'] else 'SELL'
+        column = action.lower()
+        risk_adjusted.loc[timestamp, 'original_action'] = action
+
+        portfolio = {
+            'EUR': {'amount': current_eur_balance},
+            asset: {'amount': current_crypto_balance},
+            'portfolio_value_eur': {'amount': current_portfolio_value}
+        }
+        base_trade_percentage = 0.10 + (row['confidence'] / 100.0 * 0.15)
+        position_multiplier = row.get('position_multiplier', 1.0)
+        if action == 'BUY':
+            requested = current_eur_balance * base_trade_percentage * position_multiplier
+        else:
+            requested = current_crypto_balance * base_trade_percentage * position_multiplier * current_price
+
+        safe_size, capital_reason = engine.capital_manager.calculate_safe_trade_size(
+            action, asset, portfolio, requested
+        )
+
+        if safe_size <= 0:
+            risk_adjusted.loc[timestamp, column] = False
+            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Blocked: {capital_reason}'
+        elif safe_size < min_trade_amount:
+            risk_adjusted.loc[timestamp, column] = False
+            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Too small: €{safe_size:.2f} < €{min_trade_amount}'
+        else:
+            risk_adjusted.loc[timestamp, 'position_size'] = safe_size / current_portfolio_value
+            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Approved: €{safe_size:.2f}'
+            crypto_amount = safe_size / current_price
+            if action == 'BUY':
+                current_eur_balance -= safe_size
+                current_crypto_balance += crypto_amount
+            else:
+                current_eur_balance += safe_size
+                current_crypto_balance -= crypto_amount
+            current_portfolio_value = current_eur_balance + (current_crypto_balance * current_price)
+
+    return risk_adjusted
+
+
+class TestRiskKernelParity:
+    """Test the compiled kernel reproduces the per-row CapitalManager path"""
+
+    @pytest.mark.parametrize("seed,multiplier", [(0, True), (1, False), (2, True)])
+    def test_matches_python_path(self, engine, seed, multiplier):
+        """Test sizes, flags and reasons are identical to the per-row CapitalManager path"""
+        data, signals = _signals(seed, multiplier=multiplier)
+
+        compiled = engine._apply_risk_management(data, signals, "BTC-EUR")
+        rows = _reference_risk_management(engine, data, signals, "BTC-EUR")
+
+        pd.testing.assert_frame_equal(compiled, rows)
+        assert compiled['risk_adjustment'].str.startswith('Approved').any()
+        assert compiled['risk_adjustment'].str.contains('Rebalancing needed').any()
+
+    def test_matches_python_path_with_daily_limits(self, engine):
+        """Test today's recorded trading volume is applied the same way"""
+        data, signals = _signals(3)
+        engine.capital_manager.record_trade("ETH", 250.0, 1000.0)
+        try:
+            compiled = engine._apply_risk_management(data, signals, "ETH-EUR")
+            rows = _reference_risk_management(engine, data, signals, "ETH-EUR")
+        finally:
+            engine.capital_manager.daily_trades.clear()
+            engine.capital_manager.last_trade_time.clear()
+
+        pd.testing.assert_frame_equal(compiled, rows)
+        assert compiled['risk_adjustment'].str.contains('Daily trading limits exceeded').any()
+
+
+class TestRiskKernel:
+    """Test the kernel on hand-built sequences"""
+
+    def _run(self, prices, actions, confidence):
+        n = len(prices)
+        return simulate_risk_management(
+            np.asarray(prices, dtype=float), np.asarray(actions, dtype=np.int8),
+            np.asarray(confidence, dtype=float), np.ones(n), 1000.0,
+            min_eur_reserve=50.0, max_eur_usage_per_trade=0.3, max_position_size_percent=0.35,
+            min_position_size_eur=40.0, rebalance_trigger_eur_percent=0.15, max_crypto_allocation=0.8,
+            min_trade_amount=10.0, limits_blocked=False, daily_volume=0.0, max_daily_trading_volume=0.3
+        )
+
+    def test_buy_is_sized_from_eur_balance(self):
+        """Test a BUY uses the confidence-scaled share of the EUR balance"""
+        sizes, position_sizes, codes, _ = self._run([100.0, 100.0], [1, 0], [100.0, 0.0])
+
+        assert codes[0] == APPROVED
+        assert sizes[0] == pytest.approx(min(1000.0 * 0.25, 950.0 * 0.3))
+        assert position_sizes[0] == pytest.approx(sizes[0] / 1000.0)
+        assert codes[1] == 0
+
+    def test_repeated_buys_trigger_rebalancing(self):
+        """Test buying until EUR drops below the trigger blocks further BUYs"""
+        _, _, codes, _ = self._run([100.0] * 12, [1] * 12, [100.0] * 12)
+
+        assert codes[0] == APPROVED
+        assert REBALANCE_REQUIRED in codes
+
+    def test_sell_without_valued_position(self):
+        """Test SELLs are blocked like CapitalManager does without a position price"""
+        _, _, codes, details = self._run([100.0, 100.0], [1, -1], [50.0, 50.0])
+
+        assert codes[1] == NOTHING_TO_SELL
+        assert details[1] == 0.0
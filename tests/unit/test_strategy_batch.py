@@ -0,0 +1,183 @@
+"""
+Parity tests for columnar strategy evaluation (analyze_batch vs analyze)
+"""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.base_strategy import ACTIONS
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.momentum import MomentumStrategy
+from strategies.trend_following import TrendFollowingStrategy
+from utils.backtest.strategy_vectorizer import VectorizedStrategyAdapter
+from utils.performance.indicator_factory import calculate_indicators
+
+STRATEGIES = [TrendFollowingStrategy, MeanReversionStrategy, MomentumStrategy]
+
+
+def make_batch_frame(n=3000, seed=3):
+    """Random analyze() inputs, including threshold values, flat bands and missing keys"""
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(90, 110, n)
+    middle = price * rng.uniform(0.97, 1.03, n)
+    half_width = price * rng.uniform(0, 0.05, n)
+    half_width[rng.random(n) < 0.05] = 0  # Flat bands
+    frame = pd.DataFrame({
+        'price': price,
+        'current_price': price,
+        'rsi': rng.uniform(0, 100, n),
+        'macd': rng.normal(0, 2, n),
+        'macd_histogram': rng.normal(0, 1, n),
+        'bb_upper': middle + half_width,
+        'bb_lower': middle - half_width,
+        'bb_middle': middle,
+        'change_1h': rng.normal(0, 4, n),
+        'change_4h': rng.normal(0, 6, n),
+        'change_24h': rng.normal(0, 8, n),
+        'change_5d': rng.normal(0, 10, n),
+        'volume': rng.uniform(0, 300, n),
+        'volume_average': rng.uniform(0, 100, n)
+    })
+    frame.loc[rng.random(n) < 0.05, 'rsi'] = np.nan
+    frame.loc[::7, 'rsi'] = rng.choice([15.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 85.0], size=len(frame.loc[::7]))
+    for column in ['change_1h', 'change_4h', 'change_24h', 'change_5d', 'volume_average', 'bb_upper', 'macd_histogram']:
+        frame.loc[rng.random(n) < 0.1, column] = np.nan
+    frame.loc[rng.random(n) < 0.05, ['change_1h', 'change_4h', 'change_24h', 'change_5d']] = np.nan
+    frame.loc[rng.random(n) < 0.05, 'volume_average'] = 0.0
+    return frame
+
+
+def row_inputs(row):
+    """market_data and technical_indicators dictionaries for one batch row (NaN = absent key)"""
+    def present(*names):
+        return {name: float(row[name]) for name in names if not np.isnan(row[name])}
+
+    changes = present('change_1h', 'change_4h', 'change_24h', 'change_5d')
+    market_data = {
+        'product_id': 'BTC-EUR',
+        **present('price'),
+        'price_changes': {period[len('change_'):]: value for period, value in changes.items()},
+        'volume': {('current' if name == 'volume' else 'average'): value
+                   for name, value in present('volume', 'volume_average').items()}
+    }
+    indicators = present('current_price', 'rsi', 'macd', 'macd_histogram', 'bb_upper', 'bb_lower', 'bb_middle')
+    return market_data, indicators
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_analyze_batch_matches_analyze(strategy_class):
+    """Every row gets the same action, confidence and position size as analyze()"""
+    strategy = strategy_class({})
+    frame = make_batch_frame()
+
+    batch = strategy.analyze_batch(frame)
+    reasoning = batch.reasoning()
+
+    for i, row in enumerate(frame.itertuples(index=False)):
+        market_data, indicators = row_inputs(row._asdict())
+        signal = strategy.analyze(market_data, indicators, {})
+
+        assert ACTIONS[batch.action[i]] == signal.action, i
+        assert batch.confidence[i] == signal.confidence, i
+        assert batch.position_size_multiplier[i] == signal.position_size_multiplier, i
+        assert signal.reasoning.startswith(reasoning[i]), (i, signal.reasoning, reasoning[i])
+
+    # The random inputs exercise every decision branch
+    assert set(batch.reason_code) == set(range(len(strategy.BATCH_REASONS)))
+
+
+class TestVectorizerUsesBatch:
+    """The adapter evaluates rule strategies column-wise"""
+
+    @pytest.fixture
+    def candles(self):
+        rng = np.random.default_rng(5)
+        close = 50000 * np.exp(np.cumsum(rng.normal(0, 0.01, 400)))
+        close[100:110] = close[100]
+        candles = pd.DataFrame({
+            'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+            'volume': rng.uniform(1, 100, 400)
+        }, index=pd.date_range('2024-01-01', periods=400, freq='h'))
+        return calculate_indicators(candles)
+
+    @pytest.mark.parametrize("strategy_name", ['trend_following', 'mean_reversion', 'momentum'])
+    def test_batch_matches_row_loop(self, candles, strategy_name):
+        adapter = VectorizedStrategyAdapter()
+        strategy = adapter.live_strategies[strategy_name]
+
+        batch = adapter.vectorize_strategy(strategy_name, candles, 'BTC-EUR')
+        rows = adapter._vectorize_rows(strategy, candles, 'BTC-EUR')
+
+        pd.testing.assert_series_equal(batch['buy'], rows['buy'])
+        pd.testing.assert_series_equal(batch['sell'], rows['sell'])
+        np.testing.assert_allclose(batch['confidence'], rows['confidence'], rtol=1e-12)
+        np.testing.assert_allclose(batch['position_size_multiplier'], rows['position_size_multiplier'], rtol=1e-12)
+        assert all(full.startswith(reason) for full, reason in zip(rows['reasoning'], batch['reasoning']))
+        assert (batch['strategy'] == strategy_name).all()
+
+    def test_strategy_without_batch_uses_row_loop(self, candles):
+        adapter = VectorizedStrategyAdapter()
+        strategy = adapter.live_strategies['momentum']
+        strategy.analyze_batch = lambda frame: None
+
+        signals = adapter.vectorize_strategy('momentum', candles.iloc[:50], 'BTC-EUR')
+
+        assert len(signals) == 50
+        assert signals['reasoning'].str.len().min() > len("Weak momentum")
+
+
+class TestAdaptiveBatch:
+    """AdaptiveStrategyManager.evaluate_batch matches evaluate_strategies row by row"""
+
+    @pytest.fixture
+    def manager(self):
+        from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
+        from strategies.performance_tracker import HybridPerformanceTracker
+        manager = AdaptiveStrategyManager(Mock(), performance_tracker=HybridPerformanceTracker(data_dir=None))
+        manager.performance_tracker = Mock()
+        return manager
+
+    def test_regime_batch_matches_row_detection(self, manager):
+        frame = make_batch_frame(seed=11)
+        rng = np.random.default_rng(11)
+        frame['change_7d'] = rng.normal(0, 6, len(frame))
+        frame.loc[::9, 'change_7d'] = -5.0
+
+        regimes = manager.detect_market_regime_batch(frame)
+
+        for i, row in enumerate(frame.itertuples(index=False)):
+            market_data, indicators = row_inputs(row._asdict())
+            if not np.isnan(row.change_7d):
+                market_data['price_changes']['7d'] = row.change_7d
+            assert regimes[i] == manager.detect_market_regime_enhanced(indicators, market_data), i
+        assert set(regimes) == {"trending", "ranging", "volatile", "bear_ranging"}
+
+    def test_evaluate_batch_matches_evaluate_strategies(self, manager):
+        frame = make_batch_frame(n=2000, seed=13)
+
+        evaluation = manager.evaluate_batch(frame)
+        combined = evaluation.combined_signal
+        reasoning = combined.reasoning()
+
+        for i, row in enumerate(frame.itertuples(index=False)):
+            market_data, indicators = row_inputs(row._asdict())
+            row_evaluation = manager.evaluate_strategies(market_data, indicators, {})
+            signal = row_evaluation.combined_signal
+
+            assert evaluation.market_regime[i] == row_evaluation.market_regime, i
+            assert ACTIONS[combined.action[i]] == signal.action, i
+            assert combined.confidence[i] == pytest.approx(signal.confidence, rel=1e-12), i
+            assert combined.position_size_multiplier[i] == signal.position_size_multiplier, i
+            assert signal.reasoning.startswith(reasoning[i]), (i, signal.reasoning, reasoning[i])
+            if evaluation.primary_strategy[i]:
+                assert signal.reasoning.startswith(f"{reasoning[i]} ("), i
+                assert reasoning[i].endswith(f": {evaluation.primary_strategy[i]}"), i
+
+        assert (combined.action != 0).any() and (evaluation.primary_strategy == "").any()
+
+    def test_strategy_without_batch_returns_none(self, manager):
+        manager.strategies['momentum'].analyze_batch = lambda frame: None
+        assert manager.evaluate_batch(make_batch_frame(n=10)) is None
@@ -13,13 +13,22 @@ Tests the strategy manager that coordinates multiple trading strategies:
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import logging
+import threading
 
 # Import the strategy manager and related classes
 from strategies.strategy_manager import StrategyManager
+from strategies.performance_tracker import HybridPerformanceTracker
 from strategies.base_strategy import TradingSignal
 from config import Config
 
 
+@pytest.fixture(autouse=True)
+def performance_data_in_tmp_path(tmp_path, monkeypatch):
+    """Create StrategyManager's default performance tracker under tmp_path instead of data/performance"""
+    monkeypatch.setattr("strategies.strategy_manager.HybridPerformanceTracker",
+                        lambda: HybridPerformanceTracker(data_dir=str(tmp_path / "performance")))
+
+
 class TestStrategyManagerInitialization:
     """Test strategy manager initialization and configuration."""
     
@@ -336,6 +345,35 @@ class TestStrategyAnalysis:
         assert signals['mean_reversion'].confidence > 0
         assert signals['momentum'].confidence >= 0
 
+    def test_evaluate_strategies_runs_each_strategy_once(self):
+        """Test one evaluation runs every strategy once and exposes its signals."""
+        market_data = {"price": 50000.0, "product_id": "BTC-EUR"}
+        technical_indicators = {
+            'rsi': 60,
+            'current_price': 50000.0,
+            'bb_upper': 52000,
+            'bb_lower': 48000,
+            'bb_middle': 50000
+        }
+        portfolio = {"EUR": {"amount": 1000.0}}
+
+        for strategy in self.manager.strategies.values():
+            strategy.analyze = Mock(wraps=strategy.analyze)
+
+        evaluation = self.manager.evaluate_strategies(
+            market_data, technical_indicators, portfolio
+        )
+
+        assert isinstance(evaluation.combined_signal, TradingSignal)
+        assert set(evaluation.strategy_signals) == set(self.manager.strategies)
+        assert evaluation.market_regime == self.manager.current_market_regime
+        assert set(evaluation.strategy_weights) == set(self.manager.strategies)
+        assert sum(evaluation.strategy_weights.values()) == pytest.approx(1.0)
+
+        for name, strategy in self.manager.strategies.items():
+            strategy.analyze.assert_called_once()
+            assert self.manager.strategy_run_counts[name] == 1
+
 
 class TestSignalCombination:
     """Test combination of multiple strategy signals."""
@@ -558,6 +596,52 @@ class TestCombinedSignalGeneration:
         assert self.manager.current_market_regime == "bull"
         assert isinstance(combined_signal, TradingSignal)
 
+    def test_dry_run_skips_performance_tracking(self, caplog):
+        """Evaluations inside dry_run() record nothing and log no INFO lines"""
+        market_data = {
+            "product_id": "BTC-EUR",
+            "price": 50000.0,
+            "price_changes": {"24h": 5.0, "5d": 8.0}
+        }
+        technical_indicators = {'rsi': 65, 'current_price': 50000.0}
+        self.manager.performance_tracker = Mock()
+        self.manager.performance_tracker.get_adaptive_weights.side_effect = lambda weights: weights.copy()
+        logger = self.manager.logger
+        
+        with caplog.at_level(logging.INFO), self.manager.dry_run():
+            self.manager.get_combined_signal(market_data, technical_indicators, {})
+            self.manager.logger.info("suppressed")
+            self.manager.logger.warning("kept")
+        
+        self.manager.performance_tracker.record_decision.assert_not_called()
+        assert [record.getMessage() for record in caplog.records] == ["kept"]
+        assert self.manager.logger is logger
+        
+        self.manager.get_combined_signal(market_data, technical_indicators, {})
+        self.manager.performance_tracker.record_decision.assert_called_once()
+
+    def test_dry_run_does_not_affect_other_threads(self, caplog):
+        """A live evaluation on another thread records and logs while one thread is in dry_run()"""
+        market_data = {"product_id": "BTC-EUR", "price": 50000.0}
+        technical_indicators = {'rsi': 65, 'current_price': 50000.0}
+        self.manager.performance_tracker = Mock()
+        self.manager.performance_tracker.get_adaptive_weights.side_effect = lambda weights: weights.copy()
+        
+        def live_evaluation():
+            self.manager.get_combined_signal(market_data, technical_indicators, {})
+            self.manager.logger.info("live")
+        
+        with caplog.at_level(logging.INFO), self.manager.dry_run():
+            worker = threading.Thread(target=live_evaluation)
+            worker.start()
+            worker.join()
+            self.manager.get_combined_signal(market_data, technical_indicators, {})
+            self.manager.logger.info("suppressed")
+        
+        self.manager.performance_tracker.record_decision.assert_called_once()
+        messages = [record.getMessage() for record in caplog.records]
+        assert "live" in messages
+        assert "suppressed" not in messages
 
 class TestStrategyPerformanceMetrics:
     """Test strategy performance and monitoring methods."""
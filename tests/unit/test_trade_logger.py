@@ -385,4 +385,106 @@ class TestPerformanceMetrics:
         assert 'failed_trades' in stats
         assert stats['total_trades'] == 4
         assert stats['successful_trades'] == 2  # 2 executed trades
-        assert stats['failed_trades'] == 2     # 1 failed + 1 hold
\ No newline at end of file
+        assert stats['failed_trades'] == 2     # 1 failed + 1 hold
+
+class TestTradeJournal:
+    """Test the JSONL journal and snapshot compaction."""
+    
+    def setup_method(self):
+        """Set up a temporary directory for the snapshot and journal."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, 'trade_history.json')
+    
+    def teardown_method(self):
+        """Clean up temporary files."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _log(self, trade_logger, product_id='BTC-EUR', confidence=70.0):
+        decision = {'action': 'BUY', 'confidence': confidence}
+        result = {'execution_price': 1000.0, 'action': 'BUY', 'status': 'executed'}
+        trade_logger.log_trade(product_id, decision, result)
+    
+    def _read_snapshot(self):
+        with open(self.log_file, 'r') as f:
+            return json.load(f)
+    
+    def test_trades_are_journaled_until_compaction(self):
+        """Test appends go to the journal and compact() folds them into the snapshot."""
+        trade_logger = TradeLogger(self.log_file)
+        self._log(trade_logger)
+        self._log(trade_logger)
+        
+        assert self._read_snapshot() == []
+        with open(trade_logger.journal_file, 'r') as f:
+            assert len(f.readlines()) == 2
+        
+        trade_logger.compact()
+        
+        assert len(self._read_snapshot()) == 2
+        assert os.path.getsize(trade_logger.journal_file) == 0
+    
+    def test_compacts_after_threshold(self):
+        """Test the snapshot is rewritten every compact_every appends."""
+        trade_logger = TradeLogger(self.log_file, compact_every=3)
+        for _ in range(4):
+            self._log(trade_logger)
+        
+        assert len(self._read_snapshot()) == 3
+        assert len(trade_logger.get_recent_trades(10)) == 4
+    
+    def test_journal_replayed_on_restart(self):
+        """Test a journal left by a previous run is replayed and compacted."""
+        trade_logger = TradeLogger(self.log_file)
+        self._log(trade_logger, confidence=71.0)
+        with open(trade_logger.journal_file, 'a') as f:
+            f.write('{"timestamp": "2099-01-01T00:00')  # torn final write
+        
+        reopened = TradeLogger(self.log_file)
+        
+        trades = reopened.get_recent_trades(10)
+        assert len(trades) == 1
+        assert trades[0]['confidence'] == 71.0
+        assert len(self._read_snapshot()) == 1
+        assert os.path.getsize(reopened.journal_file) == 0
+    
+    def test_migrates_existing_json_history(self):
+        """Test an existing JSON trade history is indexed by product and time."""
+        legacy = [
+            {'timestamp': '2026-01-03T00:00:00+00:00', 'product_id': 'ETH-EUR', 'action': 'SELL'},
+            {'timestamp': '2026-01-01T00:00:00+00:00', 'product_id': 'BTC-EUR', 'action': 'BUY'},
+            {'timestamp': '2026-01-02T00:00:00+00:00', 'product_id': 'BTC-EUR', 'action': 'SELL'},
+        ]
+        with open(self.log_file, 'w') as f:
+            json.dump(legacy, f)
+        
+        trade_logger = TradeLogger(self.log_file)
+        
+        recent = trade_logger.get_recent_trades(2)
+        assert [t['timestamp'][:10] for t in recent] == ['2026-01-03', '2026-01-02']
+        btc = trade_logger.get_trades_by_product('BTC-EUR')
+        assert [t['action'] for t in btc] == ['SELL', 'BUY']
+        since = trade_logger.get_trades_since('2026-01-02T00:00:00+00:00')
+        assert len(since) == 2
+    
+    def test_compaction_keeps_external_trim(self):
+        """Test compaction reloads a snapshot trimmed by another process."""
+        trade_logger = TradeLogger(self.log_file)
+        self._log(trade_logger, confidence=1.0)
+        trade_logger.compact()
+        
+        with open(self.log_file, 'w') as f:
+            json.dump([], f, indent=2)
+        self._log(trade_logger, confidence=2.0)
+        trade_logger.compact()
+        
+        assert [t['confidence'] for t in self._read_snapshot()] == [2.0]
+    
+    def test_returned_trades_are_copies(self):
+        """Test callers cannot mutate the in-memory index."""
+        trade_logger = TradeLogger(self.log_file)
+        self._log(trade_logger)
+        
+        trade_logger.get_recent_trades(1)[0]['price'] = 0
+        
+        assert trade_logger.get_recent_trades(1)[0]['price'] == 1000.0
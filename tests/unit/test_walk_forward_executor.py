@@ -0,0 +1,61 @@
+"""
+Unit tests for walk-forward period execution
+"""
+
+import shutil
+import tempfile
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.backtest.walk_forward_executor import run_walk_forward_periods
+
+
+class FakeSuite:
+    """Minimal suite: 'optimizes' by averaging the training closes"""
+
+    def __init__(self, initial_capital=10000.0, fees=0.006, slippage=0.0005, results_dir="."):
+        self.initial_capital = initial_capital
+        self.fees = fees
+        self.slippage = slippage
+        self.results_dir = results_dir
+        self.optimization_results = {}
+
+    def _run_walk_forward_period(self, data_with_indicators, i, period, strategy_name, param_grid, product_id):
+        train_start, train_end, test_start, test_end = period
+        if i == 1:
+            return None
+        train = data_with_indicators.loc[train_start:train_end]
+        self.optimization_results[f"{product_id}_wf_train_{i}_{strategy_name}"] = {'rows': len(train)}
+        return {'period_id': i, 'train_mean': float(train['close'].mean()),
+                'test_rows': len(data_with_indicators.loc[test_start:test_end])}
+
+
+class TestWalkForwardExecutor:
+    """Test serial and process-pool execution give the same ordered results"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        index = pd.date_range("2026-01-01", periods=24 * 40, freq="h")
+        self.data = pd.DataFrame({'close': np.arange(len(index), dtype=float)}, index=index)
+        start = index[0]
+        self.periods = [(start + timedelta(days=5 * i), start + timedelta(days=5 * i + 10),
+                         start + timedelta(days=5 * i + 10, hours=1), start + timedelta(days=5 * i + 15))
+                        for i in range(5)]
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_parallel_matches_serial(self):
+        """Test worker processes return the serial results in period order"""
+        serial_suite = FakeSuite(results_dir=self.temp_dir)
+        parallel_suite = FakeSuite(results_dir=self.temp_dir)
+
+        serial = run_walk_forward_periods(serial_suite, self.data, self.periods, "momentum", {}, "BTC-EUR")
+        parallel = run_walk_forward_periods(parallel_suite, self.data, self.periods, "momentum", {}, "BTC-EUR",
+                                            max_workers=2)
+
+        assert [r['period_id'] for r in parallel] == [0, 2, 3, 4]
+        assert parallel == serial
+        assert parallel_suite.optimization_results == serial_suite.optimization_results
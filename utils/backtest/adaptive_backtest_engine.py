@@ -19,8 +19,14 @@ import os
 sys.path.append('.')
 
 from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
+from strategies.performance_tracker import HybridPerformanceTracker
+from strategies.base_strategy import BatchEvaluation, BUY, SELL
 from utils.backtest.backtest_engine import BacktestEngine
 from utils.trading.capital_manager import CapitalManager
+from utils.backtest.risk_kernel import (
+    simulate_risk_management, capital_rule_parameters, risk_adjustment_reason,
+    HOLD_ACTION, BUY_ACTION, SELL_ACTION, APPROVED, SKIPPED
+)
 from config import Config
 
 # Suppress VectorBT warnings
@@ -98,6 +104,10 @@ class AdaptiveBacktestEngine(BacktestEngine):
                             'risk_assessment': 'HIGH',
                             'simulated': True
                         }
+                
+                def analyze_market_batch(self, frame):
+                    """Simulated decisions for every row of a batch frame"""
+                    return self.simulator.analyze_market_batch(frame)
             
             # Mock other analyzers that aren't needed for backtesting
             mock_news_analyzer = Mock()
@@ -124,7 +134,8 @@ class AdaptiveBacktestEngine(BacktestEngine):
                 self.config,
                 llm_analyzer=llm_analyzer_wrapper,
                 news_sentiment_analyzer=mock_news_analyzer,
-                volatility_analyzer=mock_volatility_analyzer
+                volatility_analyzer=mock_volatility_analyzer,
+                performance_tracker=HybridPerformanceTracker(data_dir=None)
             )
             logger.info("✅ AdaptiveStrategyManager initialized with LLM simulator for backtesting")
         except Exception as e:
@@ -196,70 +207,16 @@ class AdaptiveBacktestEngine(BacktestEngine):
         try:
             logger.info("🧠 Generating signals using AdaptiveStrategyManager...")
             
-            # Initialize signals DataFrame
-            signals_df = pd.DataFrame(index=data.index)
-            signals_df['buy'] = False
-            signals_df['sell'] = False
-            signals_df['confidence'] = 0.0
-            signals_df['reasoning'] = ""
-            signals_df['market_regime'] = "ranging"
-            signals_df['primary_strategy'] = ""
-            signals_df['position_multiplier'] = 1.0
-            
-            # Process each row using the actual AdaptiveStrategyManager
-            for i, (timestamp, row) in enumerate(data.iterrows()):
-                try:
-                    # Prepare market data (same format as live bot)
-                    market_data = self._prepare_market_data_for_adaptive(row, product_id, i, data)
-                    
-                    # Prepare technical indicators (same format as live bot)
-                    technical_indicators = self._prepare_technical_indicators_for_adaptive(row)
-                    
-                    # Get decision from AdaptiveStrategyManager (SAME AS LIVE BOT)
-                    signal = self.adaptive_manager.get_combined_signal(
-                        market_data, technical_indicators, {}
-                    )
-                    
-                    # Extract market regime and primary strategy
-                    market_regime = getattr(self.adaptive_manager, 'current_market_regime', 'ranging')
-                    primary_strategy = self._extract_primary_strategy_from_reasoning(signal.reasoning)
-                    
-                    # Store signal data
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
-                    signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
-                    signals_df.loc[timestamp, 'position_multiplier'] = float(getattr(signal, 'position_size_multiplier', 1.0))
-                    
-                    # Log decision for analysis
-                    self.decision_log.append({
-                        'timestamp': timestamp,
-                        'action': signal.action,
-                        'confidence': signal.confidence,
-                        'market_regime': market_regime,
-                        'primary_strategy': primary_strategy,
-                        'reasoning': signal.reasoning
-                    })
-                    
-                    # Log regime for analysis
-                    self.regime_log.append({
-                        'timestamp': timestamp,
-                        'regime': market_regime
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing row {i}: {e}")
-                    # Set safe defaults
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 0.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'market_regime'] = "ranging"
-                    signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
-                    signals_df.loc[timestamp, 'position_multiplier'] = 1.0
-                    continue
+            # Evaluate all candles at once; fall back to one get_combined_signal() per candle.
+            # dry_run keeps backtest decisions out of the live performance data.
+            batch_frame = self._prepare_batch_frame_for_adaptive(data)
+            batch_frame.attrs['product_id'] = product_id
+            with self.adaptive_manager.dry_run():
+                evaluation = self.adaptive_manager.evaluate_batch(batch_frame)
+                if evaluation is not None:
+                    signals_df = self._signals_from_evaluation(evaluation, data.index)
+                else:
+                    signals_df = self._generate_adaptive_signals_rows(data, product_id)
             
             # Log signal statistics
             buy_count = signals_df['buy'].sum()
@@ -277,6 +234,127 @@ class AdaptiveBacktestEngine(BacktestEngine):
             logger.error(f"Error generating adaptive signals: {e}")
             return pd.DataFrame()
     
+    def _generate_adaptive_signals_rows(self, data: pd.DataFrame, product_id: str) -> pd.DataFrame:
+        """Generate signals by calling get_combined_signal() for each candle"""
+        # Initialize signals DataFrame
+        signals_df = pd.DataFrame(index=data.index)
+        signals_df['buy'] = False
+        signals_df['sell'] = False
+        signals_df['confidence'] = 0.0
+        signals_df['reasoning'] = ""
+        signals_df['market_regime'] = "ranging"
+        signals_df['primary_strategy'] = ""
+        signals_df['position_multiplier'] = 1.0
+        
+        # Process each row using the actual AdaptiveStrategyManager
+        for i, (timestamp, row) in enumerate(data.iterrows()):
+            try:
+                # Prepare market data (same format as live bot)
+                market_data = self._prepare_market_data_for_adaptive(row, product_id, i, data)
+                
+                # Prepare technical indicators (same format as live bot)
+                technical_indicators = self._prepare_technical_indicators_for_adaptive(row)
+                
+                # Get decision from AdaptiveStrategyManager (SAME AS LIVE BOT)
+                signal = self.adaptive_manager.get_combined_signal(
+                    market_data, technical_indicators, {}
+                )
+                
+                # Extract market regime and primary strategy
+                market_regime = getattr(self.adaptive_manager, 'current_market_regime', 'ranging')
+                primary_strategy = self._extract_primary_strategy_from_reasoning(signal.reasoning)
+                
+                # Store signal data
+                signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
+                signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
+                signals_df.loc[timestamp, 'position_multiplier'] = float(getattr(signal, 'position_size_multiplier', 1.0))
+                
+                # Log decision for analysis
+                self.decision_log.append({
+                    'timestamp': timestamp,
+                    'action': signal.action,
+                    'confidence': signal.confidence,
+                    'market_regime': market_regime,
+                    'primary_strategy': primary_strategy,
+                    'reasoning': signal.reasoning
+                })
+                
+                # Log regime for analysis
+                self.regime_log.append({
+                    'timestamp': timestamp,
+                    'regime': market_regime
+                })
+                
+            except Exception as e:
+                logger.warning(f"Error processing row {i}: {e}")
+                # Set safe defaults
+                signals_df.loc[timestamp, 'buy'] = False
+                signals_df.loc[timestamp, 'sell'] = False
+                signals_df.loc[timestamp, 'confidence'] = 0.0
+                signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                signals_df.loc[timestamp, 'market_regime'] = "ranging"
+                signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
+                signals_df.loc[timestamp, 'position_multiplier'] = 1.0
+                continue
+        
+        return signals_df
+    
+    def _signals_from_evaluation(self, evaluation: BatchEvaluation, index: pd.Index) -> pd.DataFrame:
+        """Signals DataFrame and decision/regime logs from a batch evaluation"""
+        combined = evaluation.combined_signal
+        # Rows no strategy decided carry the "adaptive" label, as the reasoning-based extraction gives them
+        primary_strategy = np.where(evaluation.primary_strategy == "", 'adaptive', evaluation.primary_strategy)
+        
+        signals_df = pd.DataFrame(index=index)
+        signals_df['buy'] = combined.action == BUY
+        signals_df['sell'] = combined.action == SELL
+        signals_df['confidence'] = combined.confidence.astype(float)
+        signals_df['reasoning'] = combined.reasoning()
+        signals_df['market_regime'] = evaluation.market_regime
+        signals_df['primary_strategy'] = primary_strategy
+        signals_df['position_multiplier'] = combined.position_size_multiplier.astype(float)
+        
+        decisions = pd.DataFrame({
+            'timestamp': index,
+            'action': combined.action_labels(),
+            'confidence': signals_df['confidence'].to_numpy(),
+            'market_regime': evaluation.market_regime,
+            'primary_strategy': primary_strategy,
+            'reasoning': signals_df['reasoning'].to_numpy()
+        })
+        self.decision_log.extend(decisions.to_dict('records'))
+        self.regime_log.extend(decisions[['timestamp', 'market_regime']]
+                               .rename(columns={'market_regime': 'regime'}).to_dict('records'))
+        
+        return signals_df
+    
+    def _prepare_batch_frame_for_adaptive(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Columnar equivalent of _prepare_market_data_for_adaptive and
+        _prepare_technical_indicators_for_adaptive (NaN = indicator not available)
+        """
+        close = data['close'].to_numpy(dtype=np.float64)
+        batch = pd.DataFrame({'price': close, 'current_price': close}, index=data.index)
+        
+        # Price changes, 0.0 until enough history is available
+        row_numbers = np.arange(len(data))
+        for period, lag in [('1h', 1), ('24h', 24), ('5d', 120)]:
+            previous = data['close'].shift(lag).to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                batch[f'change_{period}'] = np.where(row_numbers >= lag, ((close - previous) / previous) * 100, 0.0)
+        
+        # Indicators the strategies read (volume is passed as a number, which momentum treats as unavailable)
+        for column, name in [('rsi_14', 'rsi'), ('bb_upper_20', 'bb_upper'), ('bb_lower_20', 'bb_lower'),
+                             ('bb_middle_20', 'bb_middle'), ('macd', 'macd'), ('macd_signal', 'macd_signal')]:
+            if column in data.columns:
+                batch[name] = pd.to_numeric(data[column], errors='coerce').to_numpy(dtype=np.float64)
+        
+        return batch
+    
     def _prepare_market_data_for_adaptive(self, row: pd.Series, product_id: str, 
                                         index: int, full_data: pd.DataFrame) -> Dict:
         """
@@ -388,110 +466,46 @@ class AdaptiveBacktestEngine(BacktestEngine):
                              product_id: str) -> pd.DataFrame:
         """
         Apply risk management rules to signals (same as live bot)
+        
+        Runs the CapitalManager rules in the compiled risk kernel
         """
         try:
             logger.info("🛡️ Applying risk management to signals...")
             
-            # Create risk-adjusted signals DataFrame
-            risk_adjusted = signals_df.copy()
-            risk_adjusted['original_action'] = 'HOLD'
-            risk_adjusted['risk_adjustment'] = ''
-            risk_adjusted['position_size'] = 0.0
-            
-            # Simulate portfolio state for risk management
-            current_portfolio_value = self.initial_capital
-            current_eur_balance = self.initial_capital
-            current_crypto_balance = 0.0
-            
             asset = product_id.split('-')[0]  # Extract BTC, ETH, etc.
+            buy = signals_df['buy'].to_numpy(dtype=bool)
+            sell = signals_df['sell'].to_numpy(dtype=bool)
+            actions = np.where(buy, BUY_ACTION, np.where(sell, SELL_ACTION, HOLD_ACTION)).astype(np.int8)
+            if 'position_multiplier' in signals_df.columns:
+                multipliers = signals_df['position_multiplier'].to_numpy(dtype=float)
+            else:
+                multipliers = np.ones(len(signals_df))
+            
+            trade_sizes, position_sizes, codes, details = simulate_risk_management(
+                data['close'].reindex(signals_df.index).to_numpy(dtype=float),
+                actions,
+                signals_df['confidence'].to_numpy(dtype=float),
+                multipliers,
+                float(self.initial_capital),
+                **capital_rule_parameters(self.capital_manager, asset, self.config.MIN_TRADE_AMOUNT)
+            )
             
-            for i, (timestamp, row) in enumerate(risk_adjusted.iterrows()):
-                try:
-                    if not (row['buy'] or row['sell']):
-                        continue  # Skip HOLD signals
-                    
-                    current_price = float(data.loc[timestamp, 'close'])
-                    confidence = row['confidence']
-                    action = 'BUY' if row['buy'] else 'SELL'
-                    
-                    # Store original action
-                    risk_adjusted.loc[timestamp, 'original_action'] = action
-                    
-                    # Simulate portfolio state
-                    portfolio = {
-                        'EUR': {'amount': current_eur_balance},
-                        asset: {'amount': current_crypto_balance},
-                        'portfolio_value_eur': {'amount': current_portfolio_value}
-                    }
-                    
-                    if action == 'BUY':
-                        # Calculate trade size using same logic as live bot
-                        base_trade_percentage = 0.10 + (confidence / 100.0 * 0.15)  # 10% to 25%
-                        position_multiplier = row.get('position_multiplier', 1.0)
-                        original_trade_size = current_eur_balance * base_trade_percentage * position_multiplier
-                        
-                        # Apply capital management
-                        safe_trade_size, capital_reason = self.capital_manager.calculate_safe_trade_size(
-                            "BUY", asset, portfolio, original_trade_size
-                        )
-                        
-                        if safe_trade_size <= 0:
-                            # Risk management blocked the trade
-                            risk_adjusted.loc[timestamp, 'buy'] = False
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Blocked: {capital_reason}'
-                            risk_adjusted.loc[timestamp, 'position_size'] = 0.0
-                        elif safe_trade_size < self.config.MIN_TRADE_AMOUNT:
-                            # Trade size too small
-                            risk_adjusted.loc[timestamp, 'buy'] = False
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Too small: €{safe_trade_size:.2f} < €{self.config.MIN_TRADE_AMOUNT}'
-                            risk_adjusted.loc[timestamp, 'position_size'] = 0.0
-                        else:
-                            # Trade approved
-                            risk_adjusted.loc[timestamp, 'position_size'] = safe_trade_size / current_portfolio_value
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Approved: €{safe_trade_size:.2f}'
-                            
-                            # Update simulated portfolio
-                            crypto_amount = safe_trade_size / current_price
-                            current_eur_balance -= safe_trade_size
-                            current_crypto_balance += crypto_amount
-                            current_portfolio_value = current_eur_balance + (current_crypto_balance * current_price)
-                    
-                    elif action == 'SELL':
-                        # Calculate sell amount
-                        base_trade_percentage = 0.10 + (confidence / 100.0 * 0.15)
-                        position_multiplier = row.get('position_multiplier', 1.0)
-                        max_crypto_amount = current_crypto_balance * base_trade_percentage * position_multiplier
-                        original_trade_value = max_crypto_amount * current_price
-                        
-                        # Apply capital management
-                        safe_trade_value, capital_reason = self.capital_manager.calculate_safe_trade_size(
-                            "SELL", asset, portfolio, original_trade_value
-                        )
-                        
-                        if safe_trade_value <= 0:
-                            # Risk management blocked the trade
-                            risk_adjusted.loc[timestamp, 'sell'] = False
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Blocked: {capital_reason}'
-                            risk_adjusted.loc[timestamp, 'position_size'] = 0.0
-                        elif safe_trade_value < self.config.MIN_TRADE_AMOUNT:
-                            # Trade size too small
-                            risk_adjusted.loc[timestamp, 'sell'] = False
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Too small: €{safe_trade_value:.2f} < €{self.config.MIN_TRADE_AMOUNT}'
-                            risk_adjusted.loc[timestamp, 'position_size'] = 0.0
-                        else:
-                            # Trade approved
-                            crypto_amount = safe_trade_value / current_price
-                            risk_adjusted.loc[timestamp, 'position_size'] = safe_trade_value / current_portfolio_value
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Approved: €{safe_trade_value:.2f}'
-                            
-                            # Update simulated portfolio
-                            current_crypto_balance -= crypto_amount
-                            current_eur_balance += safe_trade_value
-                            current_portfolio_value = current_eur_balance + (current_crypto_balance * current_price)
-                
-                except Exception as e:
-                    logger.warning(f"Error applying risk management to row {i}: {e}")
-                    continue
+            # Create risk-adjusted signals DataFrame
+            risk_adjusted = signals_df.copy()
+            evaluated = (actions != HOLD_ACTION) & (codes != SKIPPED)
+            blocked = evaluated & (codes != APPROVED)
+            risk_adjusted['buy'] = buy & ~(blocked & (actions == BUY_ACTION))
+            risk_adjusted['sell'] = sell & ~(blocked & (actions == SELL_ACTION))
+            risk_adjusted['original_action'] = np.where(
+                evaluated, np.where(actions == BUY_ACTION, 'BUY', 'SELL'), 'HOLD'
+            ).astype(object)
+            risk_adjusted['risk_adjustment'] = [
+                risk_adjustment_reason(code, size, detail, asset,
+                                       self.capital_manager.min_eur_reserve, self.config.MIN_TRADE_AMOUNT)
+                if is_evaluated else ''
+                for code, size, detail, is_evaluated in zip(codes, trade_sizes, details, evaluated)
+            ]
+            risk_adjusted['position_size'] = position_sizes
             
             # Log risk management statistics
             original_buys = signals_df['buy'].sum()
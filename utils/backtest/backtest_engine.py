@@ -15,6 +15,9 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import warnings
 
+from config import Config
+from .result_cache import BacktestResultCache
+
 # Suppress VectorBT warnings for cleaner output
 warnings.filterwarnings('ignore', category=UserWarning, module='vectorbt')
 
@@ -24,7 +27,7 @@ class BacktestEngine:
     """Comprehensive backtesting engine using VectorBT"""
     
     def __init__(self, initial_capital: float = 10000.0, fees: float = 0.006, 
-                 slippage: float = 0.0005):
+                 slippage: float = 0.0005, cache_dir: Optional[str] = None):
         """
         Initialize the backtest engine
         
@@ -32,11 +35,18 @@ class BacktestEngine:
             initial_capital: Starting capital in USD
             fees: Trading fees as decimal (0.006 = 0.6%)
             slippage: Slippage as decimal (0.0005 = 0.05%)
+            cache_dir: Directory of the backtest result cache (None uses BACKTEST_CACHE_DIR;
+                caching is disabled when neither is set)
         """
         self.initial_capital = initial_capital
         self.fees = fees
         self.slippage = slippage
         
+        # Results of identical backtests are reused across runs and scripts
+        if cache_dir is None:
+            cache_dir = Config().BACKTEST_CACHE_DIR
+        self.result_cache = BacktestResultCache(cache_dir) if cache_dir else None
+        
         # Capital management constraints (from existing bot)
         self.min_eur_reserve = 50.0  # Minimum EUR reserve
         self.max_position_size_percent = 0.35  # Maximum 35% position size
@@ -70,6 +80,16 @@ class BacktestEngine:
                 logger.error("No aligned data after processing")
                 return self._empty_results()
             
+            # Return cached results for identical data, signals and settings
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self._cache_key(aligned_data, aligned_signals)
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    cached['product_id'] = product_id
+                    logger.info(f"Backtest cache hit for {product_id}")
+                    return cached
+            
             # Apply capital management constraints
             position_sizes = self._calculate_position_sizes(aligned_data, aligned_signals)
             
@@ -93,6 +113,9 @@ class BacktestEngine:
             if 'market_regime' in aligned_data.columns:
                 results.update(self._analyze_by_regime(portfolio, aligned_data))
             
+            if cache_key is not None and 'error' not in results:
+                self.result_cache.put(cache_key, results)
+            
             logger.info(f"Backtest completed: {results['total_return']:.2f}% return, {results['sharpe_ratio']:.2f} Sharpe")
             return results
             
@@ -100,6 +123,18 @@ class BacktestEngine:
             logger.error(f"Error in backtest: {e}")
             return self._empty_results()
     
+    def _cache_key(self, data: pd.DataFrame, signals: pd.DataFrame) -> str:
+        """Cache key over the inputs a backtest reads: prices, regimes, signals and engine settings"""
+        data_columns = [c for c in ('close', 'market_regime') if c in data.columns]
+        settings = {
+            'engine': type(self).__name__,
+            'initial_capital': self.initial_capital,
+            'fees': self.fees,
+            'slippage': self.slippage,
+            'max_position_size_percent': self.max_position_size_percent
+        }
+        return BacktestResultCache.make_key(data[data_columns], signals[['buy', 'sell']], settings)
+    
     def _align_data_signals(self, data: pd.DataFrame, signals: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Align data and signals by index"""
         try:
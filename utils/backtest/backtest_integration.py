@@ -18,7 +18,8 @@ from itertools import product
 
 from .backtest_engine import BacktestEngine
 from .strategy_vectorizer import VectorizedStrategyAdapter, vectorize_all_strategies_for_backtest
-from .indicator_factory import calculate_indicators
+from .walk_forward_executor import run_walk_forward_periods
+from utils.performance.indicator_factory import calculate_indicators
 
 logger = logging.getLogger(__name__)
 
@@ -247,7 +248,8 @@ class StrategyBacktestSuite:
                                 product_id: str = "BTC-USD",
                                 train_period_days: int = 180,
                                 test_period_days: int = 30,
-                                step_days: int = 30) -> Dict[str, Any]:
+                                step_days: int = 30,
+                                max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Run walk-forward analysis to test parameter stability
         
@@ -259,6 +261,7 @@ class StrategyBacktestSuite:
             train_period_days: Days for training/optimization period
             test_period_days: Days for out-of-sample testing
             step_days: Days to step forward between tests
+            max_workers: Worker processes for the periods (None or 1 runs them serially)
             
         Returns:
             Dictionary with walk-forward analysis results
@@ -282,70 +285,9 @@ class StrategyBacktestSuite:
             
             logger.info(f"Generated {len(periods)} walk-forward periods")
             
-            results = []
-            
-            for i, (train_start, train_end, test_start, test_end) in enumerate(periods):
-                try:
-                    logger.info(f"Period {i+1}/{len(periods)}: Train {train_start.date()} to {train_end.date()}, "
-                              f"Test {test_start.date()} to {test_end.date()}")
-                    
-                    # Split data
-                    train_data = data_with_indicators.loc[train_start:train_end]
-                    test_data = data_with_indicators.loc[test_start:test_end]
-                    
-                    if len(train_data) < 50 or len(test_data) < 10:
-                        logger.warning(f"Insufficient data in period {i+1}, skipping")
-                        continue
-                    
-                    # Optimize on training data
-                    optimization_results = self.optimize_strategy_parameters(
-                        train_data, strategy_name, param_grid, 
-                        f"{product_id}_wf_train_{i}", "sortino_ratio"
-                    )
-                    
-                    if optimization_results.empty:
-                        logger.warning(f"No optimization results for period {i+1}")
-                        continue
-                    
-                    # Get best parameters
-                    best_params = optimization_results.iloc[0][list(param_grid.keys())].to_dict()
-                    
-                    # Test on out-of-sample data
-                    test_signals = self._generate_strategy_signals_with_params(
-                        test_data, strategy_name, best_params, f"{product_id}_wf_test_{i}"
-                    )
-                    
-                    if test_signals is None or test_signals.empty:
-                        logger.warning(f"No test signals for period {i+1}")
-                        continue
-                    
-                    # Run backtest on test data
-                    test_result = self.backtest_engine.run_backtest(
-                        test_data, test_signals, f"{product_id}_wf_test_{i}"
-                    )
-                    
-                    # Store period result
-                    period_result = {
-                        'period_id': i,
-                        'train_start': train_start.isoformat(),
-                        'train_end': train_end.isoformat(),
-                        'test_start': test_start.isoformat(),
-                        'test_end': test_end.isoformat(),
-                        'train_days': len(train_data),
-                        'test_days': len(test_data),
-                        'best_params': best_params,
-                        'train_performance': optimization_results.iloc[0]['sortino_ratio'],
-                        'test_performance': test_result
-                    }
-                    
-                    results.append(period_result)
-                    
-                    logger.info(f"  Period {i+1} complete: Train Sortino {period_result['train_performance']:.3f}, "
-                              f"Test Return {test_result['total_return']:.2f}%")
-                
-                except Exception as e:
-                    logger.error(f"Error in walk-forward period {i+1}: {e}")
-                    continue
+            results = run_walk_forward_periods(
+                self, data_with_indicators, periods, strategy_name, param_grid, product_id, max_workers
+            )
             
             if not results:
                 logger.error("No successful walk-forward periods")
@@ -382,6 +324,73 @@ class StrategyBacktestSuite:
             logger.error(f"Error in walk-forward analysis: {e}")
             return {'error': str(e)}
     
+    def _run_walk_forward_period(self, data_with_indicators: pd.DataFrame, i: int, period: Tuple,
+                                 strategy_name: str, param_grid: Dict[str, List],
+                                 product_id: str) -> Optional[Dict[str, Any]]:
+        """Optimize on one walk-forward training window and test on the following window"""
+        train_start, train_end, test_start, test_end = period
+        try:
+            logger.info(f"Period {i+1}: Train {train_start.date()} to {train_end.date()}, "
+                      f"Test {test_start.date()} to {test_end.date()}")
+            
+            # Split data
+            train_data = data_with_indicators.loc[train_start:train_end]
+            test_data = data_with_indicators.loc[test_start:test_end]
+            
+            if len(train_data) < 50 or len(test_data) < 10:
+                logger.warning(f"Insufficient data in period {i+1}, skipping")
+                return None
+            
+            # Optimize on training data
+            optimization_results = self.optimize_strategy_parameters(
+                train_data, strategy_name, param_grid, 
+                f"{product_id}_wf_train_{i}", "sortino_ratio"
+            )
+            
+            if optimization_results.empty:
+                logger.warning(f"No optimization results for period {i+1}")
+                return None
+            
+            # Get best parameters
+            best_params = optimization_results.iloc[0][list(param_grid.keys())].to_dict()
+            
+            # Test on out-of-sample data
+            test_signals = self._generate_strategy_signals_with_params(
+                test_data, strategy_name, best_params, f"{product_id}_wf_test_{i}"
+            )
+            
+            if test_signals is None or test_signals.empty:
+                logger.warning(f"No test signals for period {i+1}")
+                return None
+            
+            # Run backtest on test data
+            test_result = self.backtest_engine.run_backtest(
+                test_data, test_signals, f"{product_id}_wf_test_{i}"
+            )
+            
+            # Store period result
+            period_result = {
+                'period_id': i,
+                'train_start': train_start.isoformat(),
+                'train_end': train_end.isoformat(),
+                'test_start': test_start.isoformat(),
+                'test_end': test_end.isoformat(),
+                'train_days': len(train_data),
+                'test_days': len(test_data),
+                'best_params': best_params,
+                'train_performance': optimization_results.iloc[0]['sortino_ratio'],
+                'test_performance': test_result
+            }
+            
+            logger.info(f"  Period {i+1} complete: Train Sortino {period_result['train_performance']:.3f}, "
+                      f"Test Return {test_result['total_return']:.2f}%")
+            
+            return period_result
+        
+        except Exception as e:
+            logger.error(f"Error in walk-forward period {i+1}: {e}")
+            return None
+    
     def _generate_strategy_signals_with_params(self, data: pd.DataFrame, strategy_name: str,
                                              params: Dict[str, Any], product_id: str) -> Optional[pd.DataFrame]:
         """Generate strategy signals with specific parameters"""
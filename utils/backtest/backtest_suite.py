@@ -17,6 +17,7 @@ from itertools import product
 
 from .backtest_engine import BacktestEngine
 from .strategy_vectorizer import VectorizedStrategyAdapter, vectorize_all_strategies_for_backtest
+from .walk_forward_executor import run_walk_forward_periods
 
 logger = logging.getLogger(__name__)
 
@@ -424,7 +425,8 @@ class ComprehensiveBacktestSuite:
                                 product_id: str = "BTC-USD",
                                 train_period_days: int = 180,
                                 test_period_days: int = 30,
-                                step_days: int = 30) -> Dict[str, Any]:
+                                step_days: int = 30,
+                                max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Run walk-forward analysis to test parameter stability
         
@@ -436,6 +438,7 @@ class ComprehensiveBacktestSuite:
             train_period_days: Days for training/optimization period
             test_period_days: Days for out-of-sample testing
             step_days: Days to step forward between tests
+            max_workers: Worker processes for the periods (None or 1 runs them serially)
             
         Returns:
             Dictionary with walk-forward analysis results
@@ -459,63 +462,9 @@ class ComprehensiveBacktestSuite:
             
             logger.info(f"Generated {len(periods)} walk-forward periods")
             
-            results = []
-            
-            for i, (train_start, train_end, test_start, test_end) in enumerate(periods):
-                try:
-                    logger.info(f"Period {i+1}/{len(periods)}: Train {train_start.date()} to {train_end.date()}, "
-                              f"Test {test_start.date()} to {test_end.date()}")
-                    
-                    # Split data
-                    train_data = data_with_indicators.loc[train_start:train_end]
-                    test_data = data_with_indicators.loc[test_start:test_end]
-                    
-                    if len(train_data) < 50 or len(test_data) < 10:
-                        logger.warning(f"Insufficient data in period {i+1}, skipping")
-                        continue
-                    
-                    # Optimize on training data
-                    optimization_results = self.optimize_strategy_parameters(
-                        train_data, strategy_name, param_grid, 
-                        f"{product_id}_wf_train_{i}", "sortino_ratio"
-                    )
-                    
-                    if optimization_results.empty:
-                        logger.warning(f"No optimization results for period {i+1}")
-                        continue
-                    
-                    # Get best parameters
-                    best_params = optimization_results.iloc[0][list(param_grid.keys())].to_dict()
-                    
-                    # Test on out-of-sample data (using default strategy for now)
-                    test_result = self.run_single_strategy(test_data, strategy_name, f"{product_id}_wf_test_{i}")
-                    
-                    if 'error' in test_result:
-                        logger.warning(f"No test results for period {i+1}: {test_result['error']}")
-                        continue
-                    
-                    # Store period result
-                    period_result = {
-                        'period_id': i,
-                        'train_start': train_start.isoformat(),
-                        'train_end': train_end.isoformat(),
-                        'test_start': test_start.isoformat(),
-                        'test_end': test_end.isoformat(),
-                        'train_days': len(train_data),
-                        'test_days': len(test_data),
-                        'best_params': best_params,
-                        'train_performance': optimization_results.iloc[0]['sortino_ratio'],
-                        'test_performance': test_result
-                    }
-                    
-                    results.append(period_result)
-                    
-                    logger.info(f"  Period {i+1} complete: Train Sortino {period_result['train_performance']:.3f}, "
-                              f"Test Return {test_result['total_return']:.2f}%")
-                
-                except Exception as e:
-                    logger.error(f"Error in walk-forward period {i+1}: {e}")
-                    continue
+            results = run_walk_forward_periods(
+                self, data_with_indicators, periods, strategy_name, param_grid, product_id, max_workers
+            )
             
             if not results:
                 logger.error("No successful walk-forward periods")
@@ -552,6 +501,66 @@ class ComprehensiveBacktestSuite:
             logger.error(f"Error in walk-forward analysis: {e}")
             return {'error': str(e)}
     
+    def _run_walk_forward_period(self, data_with_indicators: pd.DataFrame, i: int, period: Tuple,
+                                 strategy_name: str, param_grid: Dict[str, List],
+                                 product_id: str) -> Optional[Dict[str, Any]]:
+        """Optimize on one walk-forward training window and test on the following window"""
+        train_start, train_end, test_start, test_end = period
+        try:
+            logger.info(f"Period {i+1}: Train {train_start.date()} to {train_end.date()}, "
+                      f"Test {test_start.date()} to {test_end.date()}")
+            
+            # Split data
+            train_data = data_with_indicators.loc[train_start:train_end]
+            test_data = data_with_indicators.loc[test_start:test_end]
+            
+            if len(train_data) < 50 or len(test_data) < 10:
+                logger.warning(f"Insufficient data in period {i+1}, skipping")
+                return None
+            
+            # Optimize on training data
+            optimization_results = self.optimize_strategy_parameters(
+                train_data, strategy_name, param_grid, 
+                f"{product_id}_wf_train_{i}", "sortino_ratio"
+            )
+            
+            if optimization_results.empty:
+                logger.warning(f"No optimization results for period {i+1}")
+                return None
+            
+            # Get best parameters
+            best_params = optimization_results.iloc[0][list(param_grid.keys())].to_dict()
+            
+            # Test on out-of-sample data (using default strategy for now)
+            test_result = self.run_single_strategy(test_data, strategy_name, f"{product_id}_wf_test_{i}")
+            
+            if 'error' in test_result:
+                logger.warning(f"No test results for period {i+1}: {test_result['error']}")
+                return None
+            
+            # Store period result
+            period_result = {
+                'period_id': i,
+                'train_start': train_start.isoformat(),
+                'train_end': train_end.isoformat(),
+                'test_start': test_start.isoformat(),
+                'test_end': test_end.isoformat(),
+                'train_days': len(train_data),
+                'test_days': len(test_data),
+                'best_params': best_params,
+                'train_performance': optimization_results.iloc[0]['sortino_ratio'],
+                'test_performance': test_result
+            }
+            
+            logger.info(f"  Period {i+1} complete: Train Sortino {period_result['train_performance']:.3f}, "
+                      f"Test Return {test_result['total_return']:.2f}%")
+            
+            return period_result
+        
+        except Exception as e:
+            logger.error(f"Error in walk-forward period {i+1}: {e}")
+            return None
+    
     def _generate_walk_forward_periods(self, index: pd.DatetimeIndex, 
                                      train_days: int, test_days: int, step_days: int) -> List[Tuple]:
         """Generate walk-forward analysis periods"""
@@ -21,6 +21,7 @@ from strategies.mean_reversion import MeanReversionStrategy
 from strategies.momentum import MomentumStrategy
 from strategies.trend_following import TrendFollowingStrategy
 from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
+from strategies.performance_tracker import HybridPerformanceTracker
 
 logger = logging.getLogger(__name__)
 
@@ -228,8 +229,9 @@ class EnhancedVectorizedStrategyAdapter:
         try:
             logger.info(f"Vectorizing enhanced adaptive strategy for {len(data_with_indicators)} rows")
             
-            # Initialize adaptive strategy manager (read-only)
-            adaptive_manager = AdaptiveStrategyManager(self.config)
+            # Initialize adaptive strategy manager (read-only, in-memory tracker)
+            adaptive_manager = AdaptiveStrategyManager(self.config,
+                                                       performance_tracker=HybridPerformanceTracker(data_dir=None))
             
             # CRITICAL FIX: Remove duplicate columns
             data_clean = data_with_indicators.loc[:, ~data_with_indicators.columns.duplicated()]
@@ -249,40 +251,41 @@ class EnhancedVectorizedStrategyAdapter:
             signals_df['primary_strategy'] = ""
             signals_df['market_filter_passed'] = market_filter
             
-            # Process each row
-            for i, (timestamp, row) in enumerate(data_clean.iterrows()):
-                try:
-                    # Prepare data for adaptive manager
-                    market_data = self._prepare_market_data(row, product_id, i, data_clean)
-                    technical_indicators = self._prepare_technical_indicators(row)
-                    
-                    # Get combined signal from adaptive manager
-                    signal = adaptive_manager.get_combined_signal(market_data, technical_indicators, {})
-                    
-                    # Extract market regime and primary strategy info
-                    market_regime = getattr(adaptive_manager, 'current_market_regime', 'ranging')
-                    primary_strategy = self._extract_primary_strategy(signal.reasoning)
-                    
-                    # Store results with safe conversion
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
-                    signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
-                    signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing adaptive strategy row {i}: {e}")
-                    # Set safe defaults
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 50.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
-                    signals_df.loc[timestamp, 'market_regime'] = "ranging"
-                    signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
-                    continue
+            # Process each row (dry_run: no performance tracking writes)
+            with adaptive_manager.dry_run():
+                for i, (timestamp, row) in enumerate(data_clean.iterrows()):
+                    try:
+                        # Prepare data for adaptive manager
+                        market_data = self._prepare_market_data(row, product_id, i, data_clean)
+                        technical_indicators = self._prepare_technical_indicators(row)
+                        
+                        # Get combined signal from adaptive manager
+                        signal = adaptive_manager.get_combined_signal(market_data, technical_indicators, {})
+                        
+                        # Extract market regime and primary strategy info
+                        market_regime = getattr(adaptive_manager, 'current_market_regime', 'ranging')
+                        primary_strategy = self._extract_primary_strategy(signal.reasoning)
+                        
+                        # Store results with safe conversion
+                        signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                        signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                        signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                        signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
+                        signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
+                        signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
+                        
+                    except Exception as e:
+                        logger.warning(f"Error processing adaptive strategy row {i}: {e}")
+                        # Set safe defaults
+                        signals_df.loc[timestamp, 'buy'] = False
+                        signals_df.loc[timestamp, 'sell'] = False
+                        signals_df.loc[timestamp, 'confidence'] = 50.0
+                        signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
+                        signals_df.loc[timestamp, 'market_regime'] = "ranging"
+                        signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
+                        continue
             
             # Apply confidence thresholds for adaptive strategy
             signals_df = self._apply_confidence_threshold(signals_df, 'adaptive')
@@ -13,6 +13,24 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Regime labels; a label's position is its integer code
+REGIMES = ('trending', 'ranging', 'volatile')
+TRENDING, RANGING, VOLATILE = range(len(REGIMES))
+
+
+def regime_codes(regimes: pd.Series) -> np.ndarray:
+    """Integer codes of a regime Series (categorical or string); -1 for unknown labels"""
+    if isinstance(regimes.dtype, pd.CategoricalDtype) and tuple(regimes.cat.categories) == REGIMES:
+        return regimes.cat.codes.to_numpy()
+    return pd.Index(REGIMES).get_indexer(regimes.to_numpy(dtype=object))
+
+
+def _regime_distribution(regimes: pd.Series) -> Dict[str, int]:
+    """Counts of the regimes that occur"""
+    counts = regimes.value_counts()
+    return counts[counts > 0].to_dict()
+
+
 class MarketRegimeAnalyzer:
     """
     Market regime analyzer that uses the same logic as AdaptiveStrategyManager
@@ -71,7 +89,7 @@ class MarketRegimeAnalyzer:
             data: DataFrame with OHLCV data and technical indicators
             
         Returns:
-            Series with regime classifications ('trending', 'ranging', 'volatile')
+            Categorical Series with regime classifications ('trending', 'ranging', 'volatile')
         """
         try:
             logger.info(f"🔍 Detecting market regimes for {len(data)} periods...")
@@ -82,38 +100,27 @@ class MarketRegimeAnalyzer:
             # Calculate Bollinger Band width
             bb_width_pct = self._calculate_bb_width_percentage(data)
             
-            # Apply regime detection logic (same as AdaptiveStrategyManager)
-            regimes = pd.Series(index=data.index, dtype=str)
-            
-            for i, timestamp in enumerate(data.index):
-                try:
-                    change_24h = abs(price_changes.loc[timestamp, '24h'])
-                    change_5d = abs(price_changes.loc[timestamp, '5d'])
-                    bb_width = bb_width_pct.loc[timestamp]
-                    
-                    # Apply same logic as AdaptiveStrategyManager.detect_market_regime_enhanced
-                    if change_24h > self.regime_thresholds['trending_price_change_24h'] or \
-                       change_5d > self.regime_thresholds['trending_price_change_5d']:
-                        if bb_width > self.regime_thresholds['volatile_bb_width']:
-                            regime = "volatile"  # High movement + high volatility
-                        else:
-                            regime = "trending"  # High movement + low volatility = trend
-                    elif change_24h < self.regime_thresholds['ranging_price_change_24h'] and \
-                         bb_width < self.regime_thresholds['ranging_bb_width']:
-                        regime = "ranging"   # Low movement + low volatility = range
-                    elif bb_width > self.regime_thresholds['extreme_volatile_bb_width']:
-                        regime = "volatile"  # High volatility regardless of movement
-                    else:
-                        regime = "ranging"   # Default to ranging
-                    
-                    regimes.loc[timestamp] = regime
-                    
-                except Exception as e:
-                    logger.warning(f"Error detecting regime for timestamp {timestamp}: {e}")
-                    regimes.loc[timestamp] = "ranging"  # Safe default
+            change_24h = price_changes['24h'].abs().to_numpy()
+            change_5d = price_changes['5d'].abs().to_numpy()
+            bb_width = bb_width_pct.to_numpy()
+            
+            # Apply same logic as AdaptiveStrategyManager.detect_market_regime_enhanced
+            high_movement = (change_24h > self.regime_thresholds['trending_price_change_24h']) | \
+                            (change_5d > self.regime_thresholds['trending_price_change_5d'])
+            conditions = [
+                high_movement & (bb_width > self.regime_thresholds['volatile_bb_width']),  # High movement + high volatility
+                high_movement,                                                              # High movement + low volatility = trend
+                (change_24h < self.regime_thresholds['ranging_price_change_24h']) &
+                (bb_width < self.regime_thresholds['ranging_bb_width']),                   # Low movement + low volatility = range
+                bb_width > self.regime_thresholds['extreme_volatile_bb_width']              # High volatility regardless of movement
+            ]
+            codes = np.select(conditions, [VOLATILE, TRENDING, RANGING, VOLATILE], default=RANGING).astype(np.int8)
+            
+            regimes = pd.Series(pd.Categorical.from_codes(codes, categories=REGIMES),
+                                index=data.index)
             
             # Log regime distribution
-            regime_counts = regimes.value_counts().to_dict()
+            regime_counts = _regime_distribution(regimes)
             regime_percentages = {k: f"{v/len(regimes)*100:.1f}%" for k, v in regime_counts.items()}
             
             logger.info(f"🔍 Regime distribution: {regime_counts}")
@@ -124,7 +131,8 @@ class MarketRegimeAnalyzer:
         except Exception as e:
             logger.error(f"Error detecting market regimes: {e}")
             # Return all 'ranging' as safe default
-            return pd.Series('ranging', index=data.index)
+            return pd.Series(pd.Categorical(['ranging'] * len(data), categories=REGIMES),
+                             index=data.index)
     
     def _calculate_price_changes(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate price changes for regime detection"""
@@ -253,7 +261,7 @@ class MarketRegimeAnalyzer:
                 regime_analysis[regime] = regime_metrics
             
             # Add overall regime distribution
-            regime_distribution = signals_df['market_regime'].value_counts().to_dict()
+            regime_distribution = _regime_distribution(signals_df['market_regime'])
             regime_analysis['regime_distribution'] = regime_distribution
             
             # Calculate regime transition analysis
@@ -325,18 +333,21 @@ class MarketRegimeAnalyzer:
     def _analyze_regime_transitions(self, regimes: pd.Series) -> Dict[str, Any]:
         """Analyze transitions between market regimes"""
         try:
-            transitions = {}
-            transition_count = 0
+            codes, labels = pd.factorize(regimes, use_na_sentinel=False)
+            codes = codes.astype(np.int64)
             
-            # Count transitions
-            for i in range(1, len(regimes)):
-                prev_regime = regimes.iloc[i-1]
-                curr_regime = regimes.iloc[i]
-                
-                if prev_regime != curr_regime:
-                    transition_count += 1
-                    transition_key = f"{prev_regime}_to_{curr_regime}"
-                    transitions[transition_key] = transitions.get(transition_key, 0) + 1
+            # Count transitions between consecutive periods
+            changed = codes[1:] != codes[:-1]
+            transition_count = int(changed.sum())
+            
+            # Encode each transition as prev * n_labels + curr and count them,
+            # keeping the order in which transition types first occur
+            pairs = codes[:-1][changed] * len(labels) + codes[1:][changed]
+            unique_pairs, first_seen, counts = np.unique(pairs, return_index=True, return_counts=True)
+            transitions = {}
+            for order in np.argsort(first_seen):
+                prev_code, curr_code = divmod(int(unique_pairs[order]), len(labels))
+                transitions[f"{labels[prev_code]}_to_{labels[curr_code]}"] = int(counts[order])
             
             # Calculate transition frequency
             total_periods = len(regimes)
@@ -381,25 +392,31 @@ class MarketRegimeAnalyzer:
                 logger.error("No common periods for regime validation")
                 return {}
             
+            auto_codes = regime_codes(auto_aligned)
+            manual_codes = regime_codes(manual_aligned)
+            known = manual_codes >= 0
+            
             # Calculate accuracy metrics
             total_periods = len(common_index)
-            correct_classifications = (auto_aligned == manual_aligned).sum()
+            correct = known & (auto_codes == manual_codes)
+            correct_classifications = int(correct.sum())
             accuracy = correct_classifications / total_periods
             
             # Per-regime accuracy
+            manual_counts = np.bincount(manual_codes[known], minlength=len(REGIMES))
+            correct_counts = np.bincount(manual_codes[correct], minlength=len(REGIMES))
             regime_accuracy = {}
-            for regime in ['trending', 'ranging', 'volatile']:
-                regime_mask = manual_aligned == regime
-                if regime_mask.sum() > 0:
-                    regime_correct = (auto_aligned[regime_mask] == manual_aligned[regime_mask]).sum()
-                    regime_accuracy[f'{regime}_accuracy'] = regime_correct / regime_mask.sum()
+            for code, regime in enumerate(REGIMES):
+                if manual_counts[code] > 0:
+                    regime_accuracy[f'{regime}_accuracy'] = correct_counts[code] / manual_counts[code]
             
             # Confusion matrix
+            confusion_counts = np.bincount(manual_codes[known] * len(REGIMES) + auto_codes[known],
+                                           minlength=len(REGIMES) ** 2).reshape(len(REGIMES), len(REGIMES))
             confusion_matrix = {}
-            for true_regime in ['trending', 'ranging', 'volatile']:
-                for pred_regime in ['trending', 'ranging', 'volatile']:
-                    mask = (manual_aligned == true_regime) & (auto_aligned == pred_regime)
-                    confusion_matrix[f'{true_regime}_predicted_as_{pred_regime}'] = mask.sum()
+            for true_code, true_regime in enumerate(REGIMES):
+                for pred_code, pred_regime in enumerate(REGIMES):
+                    confusion_matrix[f'{true_regime}_predicted_as_{pred_regime}'] = int(confusion_counts[true_code, pred_code])
             
             validation_results = {
                 'total_periods': total_periods,
@@ -437,7 +454,7 @@ def analyze_market_regimes(data: pd.DataFrame, signals_df: pd.DataFrame = None,
     
     results = {
         'regimes': regimes,
-        'regime_distribution': regimes.value_counts().to_dict()
+        'regime_distribution': _regime_distribution(regimes)
     }
     
     # Add performance analysis if data provided
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Prepared Datasets - OHLCV plus indicator columns materialized once per product
+
+Backtesting scripts load the same historical candles and compute the same
+indicator columns over and over. PreparedDatasetStore computes them once per
+(product, granularity, date range, indicator set) and keeps the result as an
+uncompressed Arrow IPC file. Later requests - from the same script or any
+other - memory-map that file and get DataFrames whose numeric columns are
+zero-copy views of the mapped pages. Each file records a hash of the OHLCV it
+was built from, so refreshed candles for the same range are recomputed.
+Scripts that fetch "the last N days" write a new file per run, so the least
+recently used files are evicted once the store exceeds its file or size limit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from utils.performance.indicator_factory import IndicatorFactory, OHLCV_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+INDEX_COLUMN = '__index__'
+SOURCE_HASH_KEY = b'source_hash'
+
+# Fraction of the limits freed by each eviction (see result_cache.EVICTION_HEADROOM)
+EVICTION_HEADROOM = 0.1
+
+
+def _copy_on_write() -> bool:
+    """Whether pandas copies shared column data before writing to it"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+
+def _source_hash(ohlcv: pd.DataFrame) -> str:
+    """Hash of the candles (index and OHLCV columns) a prepared frame is built from"""
+    columns = [c for c in OHLCV_COLUMNS if c in ohlcv.columns]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(columns).encode())
+    digest.update(pd.util.hash_pandas_object(ohlcv[columns], index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _to_arrow(frame: pd.DataFrame, source_hash: str) -> pa.Table:
+    """Arrow table keeping NaN as values (not nulls) so numeric columns map without copies"""
+    arrays = {INDEX_COLUMN: pa.array(frame.index)}
+    for name, series in frame.items():
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            arrays[str(name)] = pa.array(series.to_numpy(), from_pandas=False)
+        else:
+            arrays[str(name)] = pa.array(series, from_pandas=True)
+    table = pa.table(arrays)
+    metadata = {SOURCE_HASH_KEY: source_hash.encode(), b'index_name': json.dumps(frame.index.name).encode()}
+    return table.replace_schema_metadata(metadata)
+
+
+class PreparedDatasetStore:
+    """Memory-mapped OHLCV + indicator frames shared across backtesting scripts"""
+
+    def __init__(self, cache_dir: str = "data/cache/prepared", factory: Optional[IndicatorFactory] = None,
+                 max_files: int = 200, max_bytes: int = 2 * 1024 * 1024 * 1024):
+        """
+        Initialize the store
+
+        Args:
+            cache_dir: Directory holding the prepared Arrow files
+            factory: Indicator factory (default column set when omitted)
+            max_files: Maximum number of prepared files
+            max_bytes: Maximum total size of prepared files
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.factory = factory or IndicatorFactory()
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.signature = hashlib.blake2b(
+            json.dumps(self.factory.signature(), sort_keys=True).encode(), digest_size=6
+        ).hexdigest()
+
+        # Frames already mapped by this process, keyed by file path
+        self._mapped: Dict[Path, pd.DataFrame] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+        # Running totals: counted once here, then maintained by _write/_evict
+        files = self._scan()
+        self._file_count = len(files)
+        self._total_bytes = sum(size for _, size, _ in files)
+
+    def _path(self, product_id: str, granularity: str, ohlcv: pd.DataFrame) -> Path:
+        start = ohlcv.index[0].strftime('%Y%m%d%H%M')
+        end = ohlcv.index[-1].strftime('%Y%m%d%H%M')
+        return self.cache_dir / f"{product_id}_{granularity}_{start}_{end}_{self.signature}.arrow"
+
+    def prepare(self, ohlcv: pd.DataFrame, product_id: str, granularity: str = "ONE_HOUR") -> pd.DataFrame:
+        """
+        OHLCV frame with indicator columns, computed once and then memory-mapped
+
+        Args:
+            ohlcv: Candles indexed by timestamp
+            product_id: Trading pair
+            granularity: Candle granularity label (e.g. 'ONE_HOUR', '15MIN')
+
+        Returns:
+            DataFrame equal to factory.calculate_all_indicators(ohlcv). With
+            copy-on-write (pandas >= 3, or enabled in pandas 2) numeric columns
+            are views of the mapped file that pandas copies before any edit;
+            otherwise the columns are writable copies
+        """
+        if ohlcv.empty:
+            return self.factory.calculate_all_indicators(ohlcv, product_id)
+
+        path = self._path(product_id, granularity, ohlcv)
+        source_hash = _source_hash(ohlcv)
+
+        frame = self._mapped.get(path)
+        if frame is None or frame.attrs.get('source_hash') != source_hash:
+            frame = self._map(path)
+            if frame is None or frame.attrs.get('source_hash') != source_hash:
+                self.misses += 1
+                self._write(path, self.factory.calculate_all_indicators(ohlcv, product_id), source_hash)
+                frame = self._map(path)
+                logger.info(f"Prepared {product_id} {granularity} indicators ({len(ohlcv)} rows) -> {path.name}")
+            else:
+                self.hits += 1
+            self._mapped[path] = frame
+        else:
+            self.hits += 1
+            try:
+                os.utime(path)  # mark as recently used
+            except FileNotFoundError:
+                pass
+
+        if not _copy_on_write():
+            # In-place edits would write into the read-only mapped columns
+            return frame.copy(deep=True)
+        # Shallow copy: callers share the mapped columns but not the column set
+        return frame.copy(deep=False)
+
+    def _write(self, path: Path, frame: pd.DataFrame, source_hash: str) -> None:
+        """Atomically write a prepared frame as an uncompressed Arrow IPC file"""
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            previous_size = path.stat().st_size
+        except FileNotFoundError:
+            previous_size = None
+        table = _to_arrow(frame, source_hash)
+        with pa.OSFile(str(temp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        size = temp_path.stat().st_size
+        os.replace(temp_path, path)
+
+        if previous_size is None:
+            self._file_count += 1
+        self._total_bytes += size - (previous_size or 0)
+        if self._file_count > self.max_files or self._total_bytes > self.max_bytes:
+            self._evict(keep=path)
+
+    def _scan(self) -> List[Tuple[int, int, str]]:
+        """(mtime_ns, size, path) of every prepared file"""
+        files = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".arrow"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return files
+
+    def _evict(self, keep: Path) -> None:
+        """Delete least recently used files (never keep) until below the limits by the headroom"""
+        files = self._scan()
+        remaining = len(files)
+        total_bytes = sum(size for _, size, _ in files)
+
+        if remaining > self.max_files or total_bytes > self.max_bytes:
+            target_files = self.max_files - max(1, int(self.max_files * EVICTION_HEADROOM))
+            target_bytes = self.max_bytes * (1 - EVICTION_HEADROOM)
+            files.sort()
+            for _, size, path in files:
+                if remaining <= target_files and total_bytes <= target_bytes:
+                    break
+                if Path(path) == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    # Still mapped elsewhere on platforms that lock mapped files
+                    logger.debug(f"Could not evict prepared dataset {path}: {e}")
+                    continue
+                self._mapped.pop(Path(path), None)
+                remaining -= 1
+                total_bytes -= size
+
+        self._file_count = remaining
+        self._total_bytes = total_bytes
+
+    def _map(self, path: Path) -> Optional[pd.DataFrame]:
+        """Memory-map a prepared file as a DataFrame, or None if missing/unreadable"""
+        if not path.exists():
+            return None
+        try:
+            table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+            os.utime(path)  # mark as recently used
+            metadata = table.schema.metadata or {}
+            frame = table.to_pandas(split_blocks=True)
+            index_name = json.loads(metadata.get(b'index_name', b'null'))
+            frame = frame.set_index(INDEX_COLUMN)
+            frame.index.name = index_name
+            frame.attrs['source_hash'] = metadata.get(SOURCE_HASH_KEY, b'').decode()
+            return frame
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable prepared dataset {path.name}: {e}")
+            return None
+
+
+_default_store: Optional[PreparedDatasetStore] = None
+
+
+def prepared_indicators(ohlcv: pd.DataFrame, product_id: str, granularity: str = "ONE_HOUR") -> pd.DataFrame:
+    """OHLCV plus the default indicator columns from the shared prepared-dataset store"""
+    global _default_store
+    if _default_store is None:
+        _default_store = PreparedDatasetStore()
+    return _default_store.prepare(ohlcv, product_id, granularity)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Backtest Result Cache - Content-addressed storage of backtest results
+
+Results are keyed by a hash of everything that determines them: the price
+data and signals a backtest consumes and the engine settings (capital, fees,
+slippage, position limits). Identical inputs therefore hit the same entry no
+matter which script, strategy run or parameter combination produced them.
+Entries are small JSON files; the least recently used ones are evicted once
+the cache exceeds its entry or size limit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the result format or engine logic changes to invalidate old entries
+CACHE_VERSION = 1
+
+# Fraction of the limits freed by each eviction, so the directory scan it needs
+# happens once per many puts rather than on every put at capacity
+EVICTION_HEADROOM = 0.1
+
+
+def _json_default(value):
+    """Convert numpy scalars and timestamps for JSON"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return value.isoformat()
+    return str(value)
+
+
+class BacktestResultCache:
+    """LRU-bounded on-disk cache of backtest results"""
+
+    def __init__(self, cache_dir: str = "data/cache/backtests", max_entries: int = 20000,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the result cache
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached result
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total size of cached results
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # Running totals: counted once here, then maintained by put/evict. Entries
+        # written by other processes are picked up at the next eviction scan.
+        entries = self._scan()
+        self._entry_count = len(entries)
+        self._total_bytes = sum(size for _, size, _ in entries)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Hash the inputs of a backtest into a cache key
+
+        Args:
+            parts: DataFrames/Series (hashed by index, columns and values) and
+                JSON-serializable settings
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"v{CACHE_VERSION}".encode())
+        for part in parts:
+            if isinstance(part, (pd.DataFrame, pd.Series)):
+                columns = list(part.columns) if isinstance(part, pd.DataFrame) else [part.name]
+                digest.update(json.dumps([str(c) for c in columns]).encode())
+                digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            else:
+                digest.update(json.dumps(part, sort_keys=True, default=_json_default).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached results for a key (a fresh dict), or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                results = json.load(f)
+            os.utime(path)  # mark as recently used
+            self.hits += 1
+            return results
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable backtest cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, results: Dict[str, Any]) -> None:
+        """Store results under a key and evict least recently used entries over the limits"""
+        path = self._path(key)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            previous_size = path.stat().st_size
+        except FileNotFoundError:
+            previous_size = None
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(results, f, separators=(',', ':'), default=_json_default)
+            size = temp_path.stat().st_size
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not cache backtest results: {e}")
+            temp_path.unlink(missing_ok=True)
+            return
+
+        if previous_size is None:
+            self._entry_count += 1
+        self._total_bytes += size - (previous_size or 0)
+        if self._entry_count > self.max_entries or self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all cached results"""
+        for entry in self.cache_dir.glob("*.json"):
+            entry.unlink(missing_ok=True)
+        self._entry_count = 0
+        self._total_bytes = 0
+
+    def _scan(self) -> List[Tuple[int, int, str]]:
+        """(mtime_ns, size, path) of every cached entry"""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until below max_entries and max_bytes by the headroom"""
+        entries = self._scan()
+        remaining = len(entries)
+        total_bytes = sum(size for _, size, _ in entries)
+
+        if remaining > self.max_entries or total_bytes > self.max_bytes:
+            target_entries = self.max_entries - max(1, int(self.max_entries * EVICTION_HEADROOM))
+            target_bytes = self.max_bytes * (1 - EVICTION_HEADROOM)
+            entries.sort()
+            for _, size, path in entries:
+                if remaining <= target_entries and total_bytes <= target_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                remaining -= 1
+                total_bytes -= size
+
+        self._entry_count = remaining
+        self._total_bytes = total_bytes
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Risk Management Kernel - CapitalManager rules as a compiled sequential simulation
+
+The simulated portfolio is path dependent (every approved trade changes the EUR
+and crypto balances the next signal is sized against), so the rules cannot be
+vectorized. This module runs them as a numba-compiled loop over price, action,
+confidence and position-multiplier arrays and returns the approved trade sizes
+together with reason codes. The rules mirror CapitalManager.calculate_safe_trade_size
+as AdaptiveBacktestEngine applies it, so results match the per-row Python path.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, Tuple
+
+import numpy as np
+from numba import njit
+
+# Signal actions
+HOLD_ACTION = 0
+BUY_ACTION = 1
+SELL_ACTION = -1
+
+# Reason codes
+NO_SIGNAL = 0
+APPROVED = 1
+SKIPPED = 2             # no price for the signal's timestamp
+INVALID_PORTFOLIO = 3
+REBALANCE_REQUIRED = 4
+BELOW_RESERVE = 5
+LIMITS_EXCEEDED = 6
+BELOW_MINIMUM = 7       # CapitalManager minimum trade size
+NOTHING_TO_SELL = 8
+POSITION_TOO_SMALL = 9
+TOO_SMALL = 10          # engine minimum trade amount
+
+
+@njit(cache=True)
+def _limits_exceeded(trade_size, total_value, limits_blocked, daily_volume, max_daily_trading_volume):
+    """CapitalManager._check_trading_limits with the day's count/cooldown state folded into limits_blocked"""
+    if limits_blocked:
+        return True
+    return daily_volume / total_value + trade_size / total_value > max_daily_trading_volume
+
+
+@njit(cache=True)
+def simulate_risk_management(prices, actions, confidence, multipliers, initial_capital,
+                             min_eur_reserve, max_eur_usage_per_trade, max_position_size_percent,
+                             min_position_size_eur, rebalance_trigger_eur_percent, max_crypto_allocation,
+                             min_trade_amount, limits_blocked, daily_volume, max_daily_trading_volume):
+    """
+    Size every BUY/SELL signal against the simulated portfolio
+
+    Returns:
+        (trade_sizes_eur, position_sizes, reason_codes, details) where position_sizes are
+        the trade sizes as a fraction of portfolio value and details holds the value
+        quoted in a blocked signal's reason
+    """
+    n = len(prices)
+    trade_sizes = np.zeros(n)
+    position_sizes = np.zeros(n)
+    codes = np.zeros(n, dtype=np.int8)
+    details = np.zeros(n)
+
+    portfolio_value = initial_capital
+    eur_balance = initial_capital
+    crypto_balance = 0.0
+
+    for i in range(n):
+        action = actions[i]
+        if action == HOLD_ACTION:
+            continue
+        price = prices[i]
+        if np.isnan(price):
+            codes[i] = SKIPPED
+            continue
+
+        base_trade_percentage = 0.10 + (confidence[i] / 100.0 * 0.15)  # 10% to 25%
+        total_value = portfolio_value
+
+        if total_value <= 0:
+            codes[i] = INVALID_PORTFOLIO
+            continue
+
+        # The simulated portfolio carries no last_price_eur for the asset, so
+        # CapitalManager values the existing position at zero
+        current_asset_value = 0.0
+
+        if action == BUY_ACTION:
+            original_trade_size = eur_balance * base_trade_percentage * multipliers[i]
+
+            eur_percent = eur_balance / total_value
+            if eur_percent < rebalance_trigger_eur_percent or 1 - eur_percent > max_crypto_allocation:
+                codes[i] = REBALANCE_REQUIRED
+                continue
+            if eur_balance <= min_eur_reserve:
+                codes[i] = BELOW_RESERVE
+                details[i] = eur_balance
+                continue
+
+            max_trade_from_available = (eur_balance - min_eur_reserve) * max_eur_usage_per_trade
+            potential_position_value = current_asset_value + min(original_trade_size, max_trade_from_available)
+            if potential_position_value / total_value > max_position_size_percent:
+                max_trade_from_position = max(0.0, (max_position_size_percent * total_value) - current_asset_value)
+                safe_size = min(max_trade_from_available, max_trade_from_position, original_trade_size)
+            else:
+                safe_size = min(max_trade_from_available, original_trade_size)
+
+            if _limits_exceeded(safe_size, total_value, limits_blocked, daily_volume, max_daily_trading_volume):
+                codes[i] = LIMITS_EXCEEDED
+                continue
+            if safe_size < min_trade_amount:
+                codes[i] = BELOW_MINIMUM
+                details[i] = safe_size
+                continue
+
+            codes[i] = APPROVED
+            trade_sizes[i] = safe_size
+            position_sizes[i] = safe_size / portfolio_value
+
+            eur_balance -= safe_size
+            crypto_balance += safe_size / price
+            portfolio_value = eur_balance + (crypto_balance * price)
+
+        else:
+            max_crypto_amount = crypto_balance * base_trade_percentage * multipliers[i]
+            original_trade_value = max_crypto_amount * price
+
+            remaining_value_after_sell = current_asset_value - original_trade_value
+            if remaining_value_after_sell > 0 and remaining_value_after_sell < min_position_size_eur:
+                if current_asset_value >= min_trade_amount:
+                    safe_value = current_asset_value  # Sell entire position
+                else:
+                    codes[i] = POSITION_TOO_SMALL
+                    details[i] = current_asset_value
+                    continue
+            else:
+                safe_value = min(original_trade_value, current_asset_value)
+
+            if _limits_exceeded(safe_value, total_value, limits_blocked, daily_volume, max_daily_trading_volume):
+                codes[i] = LIMITS_EXCEEDED
+                continue
+            if safe_value <= 0:
+                codes[i] = NOTHING_TO_SELL
+                details[i] = safe_value
+                continue
+            if safe_value < min_trade_amount:
+                codes[i] = TOO_SMALL
+                details[i] = safe_value
+                continue
+
+            codes[i] = APPROVED
+            trade_sizes[i] = safe_value
+            position_sizes[i] = safe_value / portfolio_value
+
+            crypto_balance -= safe_value / price
+            eur_balance += safe_value
+            portfolio_value = eur_balance + (crypto_balance * price)
+
+    return trade_sizes, position_sizes, codes, details
+
+
+def capital_rule_parameters(capital_manager, asset: str, min_trade_amount: float) -> Dict[str, Any]:
+    """Keyword arguments for simulate_risk_management from a CapitalManager's settings and today's trade state"""
+    now = datetime.now()
+    today = now.date()
+    daily = capital_manager.daily_trades.get(today, {"count": 0, "volume": 0.0})
+    last_trade = capital_manager.last_trade_time.get(f"{asset}_{today}")
+    cooling_down = (last_trade is not None and
+                    (now - last_trade).total_seconds() < capital_manager.min_time_between_trades * 60)
+
+    return {
+        'min_eur_reserve': capital_manager.min_eur_reserve,
+        'max_eur_usage_per_trade': capital_manager.max_eur_usage_per_trade,
+        'max_position_size_percent': capital_manager.max_position_size_percent,
+        'min_position_size_eur': capital_manager.min_position_size_eur,
+        'rebalance_trigger_eur_percent': capital_manager.rebalance_trigger_eur_percent,
+        'max_crypto_allocation': capital_manager.max_crypto_allocation,
+        'min_trade_amount': float(min_trade_amount),
+        'limits_blocked': daily["count"] >= capital_manager.max_trades_per_day or cooling_down,
+        'daily_volume': float(daily["volume"]),
+        'max_daily_trading_volume': capital_manager.max_daily_trading_volume
+    }
+
+
+def risk_adjustment_reason(code: int, trade_size: float, detail: float, asset: str,
+                           min_eur_reserve: float, min_trade_amount: Any) -> str:
+    """The risk_adjustment text AdaptiveBacktestEngine records for a reason code"""
+    if code == APPROVED:
+        return f'Approved: €{trade_size:.2f}'
+    if code == TOO_SMALL:
+        return f'Too small: €{detail:.2f} < €{min_trade_amount}'
+    if code == INVALID_PORTFOLIO:
+        reason = "Invalid portfolio value"
+    elif code == REBALANCE_REQUIRED:
+        reason = "Rebalancing needed: FORCE_SELL required, but signal is BUY"
+    elif code == BELOW_RESERVE:
+        reason = f"EUR balance (€{detail:.2f}) at or below minimum reserve (€{min_eur_reserve})"
+    elif code == LIMITS_EXCEEDED:
+        reason = "Daily trading limits exceeded"
+    elif code == BELOW_MINIMUM:
+        reason = f"Safe trade size (€{detail:.2f}) below minimum (€{min_trade_amount})"
+    elif code == NOTHING_TO_SELL:
+        reason = f"Safe SELL: €{detail:.2f} from {asset} position"
+    elif code == POSITION_TOO_SMALL:
+        reason = f"Position too small to sell (€{detail:.2f})"
+    else:
+        return ''
+    return f'Blocked: {reason}'
@@ -21,6 +21,8 @@ from strategies.mean_reversion import MeanReversionStrategy
 from strategies.momentum import MomentumStrategy
 from strategies.trend_following import TrendFollowingStrategy
 from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
+from strategies.performance_tracker import HybridPerformanceTracker
+from strategies.base_strategy import BatchSignals, BUY, SELL
 
 logger = logging.getLogger(__name__)
 
@@ -82,42 +84,12 @@ class VectorizedStrategyAdapter:
             data_clean = data_with_indicators.loc[:, ~data_with_indicators.columns.duplicated()]
             logger.info(f"Cleaned data: {len(data_clean.columns)} columns (removed duplicates)")
             
-            # Create signals DataFrame
-            signals_df = pd.DataFrame(index=data_clean.index)
-            signals_df['buy'] = False
-            signals_df['sell'] = False
-            signals_df['confidence'] = 50.0
-            signals_df['reasoning'] = ""
-            signals_df['position_size_multiplier'] = 1.0
-            
-            # Process each row (vectorized where possible)
-            for i, (timestamp, row) in enumerate(data_clean.iterrows()):
-                try:
-                    # FIXED: Prepare market data for this timestamp
-                    market_data = self._prepare_market_data(row, product_id, i, data_clean)
-                    
-                    # FIXED: Prepare technical indicators for this timestamp
-                    technical_indicators = self._prepare_technical_indicators(row)
-                    
-                    # Get signal from live strategy
-                    signal = strategy.analyze(market_data, technical_indicators, {})
-                    
-                    # Convert to vectorized format with safe conversion
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing row {i} for {strategy_name}: {e}")
-                    # Set safe default values for this row
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 50.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
-                    continue
+            # Rule strategies evaluate every row at once; others fall back to one analyze() per row
+            batch = strategy.analyze_batch(self._prepare_batch_frame(data_clean))
+            if batch is not None:
+                signals_df = self._signals_from_batch(batch, data_clean.index)
+            else:
+                signals_df = self._vectorize_rows(strategy, data_clean, product_id)
             
             # Add metadata
             signals_df['strategy'] = strategy_name
@@ -132,6 +104,121 @@ class VectorizedStrategyAdapter:
             logger.error(f"Error vectorizing {strategy_name}: {e}")
             return self._empty_signals_dataframe(data_with_indicators.index)
     
+    def _vectorize_rows(self, strategy, data_clean: pd.DataFrame, product_id: str) -> pd.DataFrame:
+        """Generate signals by calling strategy.analyze() for each row"""
+        # Create signals DataFrame
+        signals_df = pd.DataFrame(index=data_clean.index)
+        signals_df['buy'] = False
+        signals_df['sell'] = False
+        signals_df['confidence'] = 50.0
+        signals_df['reasoning'] = ""
+        signals_df['position_size_multiplier'] = 1.0
+        
+        # Process each row (vectorized where possible)
+        for i, (timestamp, row) in enumerate(data_clean.iterrows()):
+            try:
+                # FIXED: Prepare market data for this timestamp
+                market_data = self._prepare_market_data(row, product_id, i, data_clean)
+                
+                # FIXED: Prepare technical indicators for this timestamp
+                technical_indicators = self._prepare_technical_indicators(row)
+                
+                # Get signal from live strategy
+                signal = strategy.analyze(market_data, technical_indicators, {})
+                
+                # Convert to vectorized format with safe conversion
+                signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
+                
+            except Exception as e:
+                logger.warning(f"Error processing row {i} for {strategy.name}: {e}")
+                # Set safe default values for this row
+                signals_df.loc[timestamp, 'buy'] = False
+                signals_df.loc[timestamp, 'sell'] = False
+                signals_df.loc[timestamp, 'confidence'] = 50.0
+                signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
+                continue
+        
+        return signals_df
+    
+    def _signals_from_batch(self, batch: BatchSignals, index: pd.Index) -> pd.DataFrame:
+        """Convert analyze_batch arrays into the signals DataFrame layout"""
+        signals_df = pd.DataFrame(index=index)
+        signals_df['buy'] = batch.action == BUY
+        signals_df['sell'] = batch.action == SELL
+        signals_df['confidence'] = batch.confidence.astype(float)
+        signals_df['reasoning'] = batch.reasoning()
+        signals_df['position_size_multiplier'] = batch.position_size_multiplier.astype(float)
+        return signals_df
+    
+    def _prepare_batch_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Columnar equivalent of _prepare_market_data and _prepare_technical_indicators
+        
+        Produces the analyze_batch inputs for every row; NaN marks a key the row
+        dictionaries would not contain.
+        """
+        def column(name, default=0.0):
+            if name not in data.columns:
+                return np.full(len(data), default)
+            values = pd.to_numeric(data[name], errors='coerce').to_numpy(dtype=np.float64)
+            return np.where(np.isnan(values), default, values)
+        
+        row_numbers = np.arange(len(data))
+        
+        # Current price: close, or the first positive price column when close is 0
+        close = column('close')
+        price = close.copy()
+        found = close > 0
+        for price_col in ['open', 'high', 'low']:
+            if price_col in data.columns:
+                values = column(price_col)
+                price = np.where(found, price, values)
+                found |= values > 0
+        price = np.where(close == 0, price, close)
+        
+        batch = pd.DataFrame({'price': price, 'current_price': price}, index=data.index)
+        
+        # Price changes against the close 1h/24h/5d earlier (missing closes count as no change)
+        raw_close = pd.to_numeric(data['close'], errors='coerce') if 'close' in data.columns else pd.Series(np.nan, index=data.index)
+        for period, lag in [('1h', 1), ('24h', 24), ('5d', 120)]:
+            previous = raw_close.shift(lag).to_numpy(dtype=np.float64)
+            previous = np.where(np.isnan(previous), price, previous)
+            valid = (row_numbers >= lag) & (price > 0) & (previous > 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                batch[f'change_{period}'] = np.where(valid, (price - previous) / previous * 100, np.nan)
+        
+        # Volume against the mean of the last 25 candles (from 24 candles of history on)
+        current_volume = column('volume')
+        average_volume = current_volume
+        if 'volume' in data.columns and len(data) >= 25:
+            raw_volume = pd.to_numeric(data['volume'], errors='coerce').to_numpy(dtype=np.float64)
+            windows = np.lib.stride_tricks.sliding_window_view(raw_volume, 25)
+            counts = (~np.isnan(windows)).sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                means = np.nansum(windows, axis=1) / counts
+            means = np.concatenate([np.full(24, np.nan), means])
+            average_volume = np.where(np.isnan(means), current_volume, means)
+        batch['volume'] = current_volume
+        batch['volume_average'] = np.maximum(average_volume, 1.0)
+        
+        # Indicators, under the names the strategies read
+        if 'rsi_14' in data.columns:
+            batch['rsi'] = column('rsi_14', 50.0)
+        for name in ['macd', 'macd_signal', 'macd_histogram']:
+            if name in data.columns:
+                batch[name] = column(name)
+        if all(col in data.columns for col in ['bb_upper_20', 'bb_lower_20', 'bb_middle_20']):
+            batch['bb_upper'] = column('bb_upper_20')
+            batch['bb_lower'] = column('bb_lower_20')
+            batch['bb_middle'] = column('bb_middle_20')
+        
+        return batch
+    
     def vectorize_adaptive_strategy(self, data_with_indicators: pd.DataFrame, 
                                   product_id: str = "BTC-USD") -> pd.DataFrame:
         """
@@ -147,57 +234,27 @@ class VectorizedStrategyAdapter:
         try:
             logger.info(f"Vectorizing adaptive strategy for {len(data_with_indicators)} rows")
             
-            # Initialize adaptive strategy manager (read-only)
-            adaptive_manager = AdaptiveStrategyManager(self.config)
+            # Initialize adaptive strategy manager (in-memory tracker, evaluated in dry_run)
+            adaptive_manager = AdaptiveStrategyManager(self.config,
+                                                       performance_tracker=HybridPerformanceTracker(data_dir=None))
             
             # CRITICAL FIX: Remove duplicate columns to avoid pandas Series issues
             data_clean = data_with_indicators.loc[:, ~data_with_indicators.columns.duplicated()]
             logger.info(f"Cleaned data: {len(data_clean.columns)} columns (removed duplicates)")
             
-            # Create signals DataFrame
-            signals_df = pd.DataFrame(index=data_clean.index)
-            signals_df['buy'] = False
-            signals_df['sell'] = False
-            signals_df['confidence'] = 50.0
-            signals_df['reasoning'] = ""
-            signals_df['position_size_multiplier'] = 1.0
-            signals_df['market_regime'] = "ranging"
-            signals_df['primary_strategy'] = ""
-            
-            # Process each row
-            for i, (timestamp, row) in enumerate(data_clean.iterrows()):
-                try:
-                    # Prepare data for adaptive manager
-                    market_data = self._prepare_market_data(row, product_id, i, data_clean)
-                    technical_indicators = self._prepare_technical_indicators(row)
-                    
-                    # Get combined signal from adaptive manager
-                    signal = adaptive_manager.get_combined_signal(market_data, technical_indicators, {})
-                    
-                    # Extract market regime and primary strategy info
-                    market_regime = getattr(adaptive_manager, 'current_market_regime', 'ranging')
-                    primary_strategy = self._extract_primary_strategy(signal.reasoning)
-                    
-                    # Store results with safe conversion
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
-                    signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
-                    signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
-                    
-                except Exception as e:
-                    logger.warning(f"Error processing adaptive strategy row {i}: {e}")
-                    # Set safe defaults
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 50.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
-                    signals_df.loc[timestamp, 'market_regime'] = "ranging"
-                    signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
-                    continue
+            # Evaluate every row at once; strategies without a batch form need one evaluation per row
+            batch_frame = self._prepare_batch_frame(data_clean)
+            batch_frame.attrs['product_id'] = product_id
+            with adaptive_manager.dry_run():
+                evaluation = adaptive_manager.evaluate_batch(batch_frame)
+                if evaluation is not None:
+                    signals_df = self._signals_from_batch(evaluation.combined_signal, data_clean.index)
+                    signals_df['market_regime'] = evaluation.market_regime
+                    # Rows no strategy decided are labelled like unmatched reasoning in _extract_primary_strategy
+                    signals_df['primary_strategy'] = np.where(evaluation.primary_strategy == "", "unknown",
+                                                              evaluation.primary_strategy)
+                else:
+                    signals_df = self._vectorize_adaptive_rows(adaptive_manager, data_clean, product_id)
             
             # Add metadata
             signals_df['strategy'] = 'adaptive'
@@ -214,6 +271,56 @@ class VectorizedStrategyAdapter:
             logger.error(f"Error vectorizing adaptive strategy: {e}")
             return self._empty_signals_dataframe(data_with_indicators.index)
     
+    def _vectorize_adaptive_rows(self, adaptive_manager: AdaptiveStrategyManager,
+                                 data_clean: pd.DataFrame, product_id: str) -> pd.DataFrame:
+        """Generate adaptive signals by calling get_combined_signal() for each row"""
+        # Create signals DataFrame
+        signals_df = pd.DataFrame(index=data_clean.index)
+        signals_df['buy'] = False
+        signals_df['sell'] = False
+        signals_df['confidence'] = 50.0
+        signals_df['reasoning'] = ""
+        signals_df['position_size_multiplier'] = 1.0
+        signals_df['market_regime'] = "ranging"
+        signals_df['primary_strategy'] = ""
+        
+        # Process each row
+        for i, (timestamp, row) in enumerate(data_clean.iterrows()):
+            try:
+                # Prepare data for adaptive manager
+                market_data = self._prepare_market_data(row, product_id, i, data_clean)
+                technical_indicators = self._prepare_technical_indicators(row)
+                
+                # Get combined signal from adaptive manager
+                signal = adaptive_manager.get_combined_signal(market_data, technical_indicators, {})
+                
+                # Extract market regime and primary strategy info
+                market_regime = getattr(adaptive_manager, 'current_market_regime', 'ranging')
+                primary_strategy = self._extract_primary_strategy(signal.reasoning)
+                
+                # Store results with safe conversion
+                signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
+                signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
+                signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
+                
+            except Exception as e:
+                logger.warning(f"Error processing adaptive strategy row {i}: {e}")
+                # Set safe defaults
+                signals_df.loc[timestamp, 'buy'] = False
+                signals_df.loc[timestamp, 'sell'] = False
+                signals_df.loc[timestamp, 'confidence'] = 50.0
+                signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
+                signals_df.loc[timestamp, 'market_regime'] = "ranging"
+                signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
+                continue
+        
+        return signals_df
+    
     def _prepare_market_data(self, row: pd.Series, product_id: str, 
                            index: int, full_data: pd.DataFrame) -> Dict:
         """FIXED: Prepare market data dictionary from DataFrame row"""
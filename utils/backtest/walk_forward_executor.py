@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Executor - Serial or process-pool execution of walk-forward windows
+
+Walk-forward windows are independent: each one optimizes on its training slice
+and tests on the following slice. With more than one worker the windows run in
+a ProcessPoolExecutor. The indicator frame is written once to a Parquet file
+that every worker memory-maps on start-up, so tasks only carry the window
+bounds instead of a pickled copy of the data. Results come back in window
+order, identical to a serial run.
+"""
+
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Per-process state set up by _init_worker
+_worker_suite = None
+_worker_data: Optional[pd.DataFrame] = None
+
+
+def _init_worker(suite_class, suite_kwargs: Dict[str, Any], data_path: str) -> None:
+    """Load the shared indicator frame and build a suite once per worker process"""
+    global _worker_suite, _worker_data
+    _worker_data = pd.read_parquet(data_path, memory_map=True)
+    _worker_suite = suite_class(**suite_kwargs)
+
+
+def _run_period(task: Tuple) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """Run one walk-forward window in a worker process"""
+    period_id, period, strategy_name, param_grid, product_id = task
+    period_result = _worker_suite._run_walk_forward_period(
+        _worker_data, period_id, period, strategy_name, param_grid, product_id
+    )
+    # Hand the window's optimization records back to the parent suite
+    optimization_results = dict(_worker_suite.optimization_results)
+    _worker_suite.optimization_results.clear()
+    return period_result, optimization_results
+
+
+def run_walk_forward_periods(suite, data_with_indicators: pd.DataFrame, periods: List[Tuple],
+                             strategy_name: str, param_grid: Dict[str, List], product_id: str,
+                             max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Run walk-forward windows for a backtest suite
+
+    Args:
+        suite: StrategyBacktestSuite or ComprehensiveBacktestSuite
+        data_with_indicators: DataFrame with OHLCV data and indicators
+        periods: (train_start, train_end, test_start, test_end) tuples
+        strategy_name: Name of strategy to analyze
+        param_grid: Dictionary of parameter names and values to test
+        product_id: Trading pair identifier
+        max_workers: Worker processes; None or 1 runs the windows serially
+
+    Returns:
+        Successful period results in window order
+    """
+    tasks = [(i, period, strategy_name, param_grid, product_id) for i, period in enumerate(periods)]
+
+    if not max_workers or max_workers <= 1 or len(tasks) <= 1:
+        results = [suite._run_walk_forward_period(data_with_indicators, *task)
+                   for task in tasks]
+        return [result for result in results if result is not None]
+
+    workers = min(max_workers, len(tasks))
+    suite_kwargs = {
+        'initial_capital': suite.initial_capital,
+        'fees': suite.fees,
+        'slippage': suite.slippage,
+        'results_dir': str(suite.results_dir)
+    }
+
+    with tempfile.TemporaryDirectory(prefix="walk_forward_") as temp_dir:
+        data_path = os.path.join(temp_dir, "data_with_indicators.parquet")
+        data_with_indicators.to_parquet(data_path)
+
+        logger.info(f"Running {len(tasks)} walk-forward periods on {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(type(suite), suite_kwargs, data_path)) as executor:
+            outcomes = list(executor.map(_run_period, tasks))
+
+    results = []
+    for period_result, optimization_results in outcomes:
+        suite.optimization_results.update(optimization_results)
+        if period_result is not None:
+            results.append(period_result)
+    return results
@@ -0,0 +1,157 @@
+"""
+In-process candle store with incremental tail fetches
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Candle length in seconds for each Coinbase granularity
+GRANULARITY_SECONDS = {
+    'ONE_MINUTE': 60,
+    'FIVE_MINUTE': 300,
+    'FIFTEEN_MINUTE': 900,
+    'THIRTY_MINUTE': 1800,
+    'ONE_HOUR': 3600,
+    'TWO_HOUR': 7200,
+    'SIX_HOUR': 21600,
+    'ONE_DAY': 86400
+}
+
+# Coinbase returns at most 300 candles per request
+MAX_CANDLES_PER_REQUEST = 300
+
+# fetch(start_epoch, end_epoch) -> DataFrame indexed by candle start time
+CandleFetcher = Callable[[int, int], pd.DataFrame]
+
+class CandleStore:
+    """
+    Thread-safe candle cache keyed by (product, granularity)
+
+    The first request for a key downloads the whole lookback window. Later
+    requests only download the tail starting at the last cached candle, which
+    may still have been forming during the previous fetch, so that bar is
+    replaced by its final values and any newly opened bars are appended.
+    Requests within `min_refresh_seconds` of the last successful fetch are
+    served from memory; an empty tail does not count as one.
+    """
+
+    def __init__(self, min_refresh_seconds: float = 30.0):
+        self.min_refresh_seconds = min_refresh_seconds
+        self._frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._fetched_at: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.cache_hits = 0
+        self.full_fetches = 0
+        self.incremental_fetches = 0
+        self.candles_fetched = 0
+
+    def get_candles(self, product_id: str, granularity: str, days_back: int,
+                    fetch: CandleFetcher, now: Optional[float] = None) -> pd.DataFrame:
+        """
+        Get the lookback window of candles, fetching only what is missing
+
+        Args:
+            product_id: Trading pair (e.g., 'BTC-EUR')
+            granularity: Candle granularity (e.g., 'ONE_HOUR')
+            days_back: Lookback window in days
+            fetch: Callable downloading candles between two unix timestamps
+            now: Current unix time (defaults to time.time())
+
+        Returns:
+            DataFrame with OHLCV columns indexed by candle start time
+        """
+        now = time.time() if now is None else now
+        window_start = now - days_back * 86400
+        candle_seconds = GRANULARITY_SECONDS.get(granularity)
+
+        if candle_seconds is None:
+            # Unknown granularity: cannot align candles, always fetch the full window
+            return fetch(int(window_start), int(now))
+
+        key = (product_id, granularity)
+        with self._lock:
+            cached = self._frames.get(key)
+            fetched_at = self._fetched_at.get(key)
+
+        tail_start = None
+        if cached is not None and not cached.empty:
+            # Re-fetch from the last cached candle: it may have been forming
+            tail_start = int(cached.index[-1].timestamp())
+            first_start = int(cached.index[0].timestamp())
+
+            if first_start > window_start + candle_seconds:
+                # Cached frame does not cover the requested lookback
+                tail_start = None
+            elif (now - tail_start) / candle_seconds > MAX_CANDLES_PER_REQUEST:
+                # Too far behind for a single request
+                tail_start = None
+            elif 0 <= now - fetched_at < self.min_refresh_seconds:
+                # Fetched moments ago (e.g. price changes and indicators in the same cycle)
+                with self._lock:
+                    self.cache_hits += 1
+                window = cached[cached.index >= pd.Timestamp(int(window_start), unit='s')]
+                return window.copy()
+
+        if tail_start is None:
+            frame = fetch(int(window_start), int(now))
+            with self._lock:
+                self.full_fetches += 1
+                self.candles_fetched += len(frame)
+                if not frame.empty:
+                    self._frames[key] = frame
+                    self._fetched_at[key] = now
+            return frame.copy()
+
+        tail = fetch(int(tail_start), int(now))
+        if tail.empty:
+            # Nothing new (or the request failed): keep the cached bars, including the
+            # possibly forming last one, and retry the same tail on the next request
+            with self._lock:
+                self.incremental_fetches += 1
+            logger.debug(f"Candle cache {product_id} {granularity}: empty tail fetch, serving cached candles")
+            window = cached[cached.index >= pd.Timestamp(int(window_start), unit='s')]
+            return window.copy()
+
+        # Replace the re-fetched bars, append new ones, drop bars that left the window
+        tail_start_ts = pd.Timestamp(tail_start, unit='s')
+        kept = cached[cached.index < tail_start_ts]
+        frame = pd.concat([kept, tail])
+        frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+        frame = frame[frame.index >= pd.Timestamp(int(window_start), unit='s')]
+
+        with self._lock:
+            self.incremental_fetches += 1
+            self.candles_fetched += len(tail)
+            self._frames[key] = frame
+            self._fetched_at[key] = now
+
+        logger.debug(f"Candle cache {product_id} {granularity}: fetched {len(tail)} new candles, "
+                     f"{len(frame)} in window")
+        return frame.copy()
+
+    def invalidate(self, product_id: Optional[str] = None):
+        """Drop cached candles for one product, or for all products"""
+        with self._lock:
+            for key in list(self._frames):
+                if product_id is None or key[0] == product_id:
+                    self._frames.pop(key, None)
+                    self._fetched_at.pop(key, None)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get cache metrics"""
+        with self._lock:
+            return {
+                "cached_series": len(self._frames),
+                "cache_hits": self.cache_hits,
+                "full_fetches": self.full_fetches,
+                "incremental_fetches": self.incremental_fetches,
+                "candles_fetched": self.candles_fetched
+            }
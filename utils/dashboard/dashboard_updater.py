@@ -2,9 +2,10 @@ import logging
 import json
 import os
 from datetime import datetime, timezone
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import pandas as pd
 from config import config
+from utils.dashboard.decision_registry import DecisionRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +20,14 @@ except ImportError:
 class DashboardUpdater:
     """Updates local dashboard data files - web server sync handled separately"""
     
-    def __init__(self):
-        """Initialize the dashboard updater for local data management only"""
+    def __init__(self, decision_registry: Optional[DecisionRegistry] = None):
+        """
+        Initialize the dashboard updater for local data management only
+        
+        Args:
+            decision_registry: Registry the bot records decisions in; a registry
+                reading the persisted index is created when omitted
+        """
         # Create directories if they don't exist
         os.makedirs("data/portfolio", exist_ok=True)
         os.makedirs("data/cache", exist_ok=True)
@@ -28,6 +35,9 @@ class DashboardUpdater:
         os.makedirs("data/dashboard", exist_ok=True)  # For performance data
         os.makedirs("dashboard/images", exist_ok=True)
         
+        # Latest decision per product, maintained by the bot when results are saved
+        self.decision_registry = decision_registry or DecisionRegistry()
+        
         # Initialize performance dashboard updater if available
         self.performance_updater = None
         if PERFORMANCE_TRACKING_AVAILABLE:
@@ -262,27 +272,13 @@ class DashboardUpdater:
         """Update latest trading decisions cache with multi-strategy data"""
         try:
             latest_decisions = []
-            # Get assets from trading pairs
-            assets = [pair.split('-')[0] for pair in config.TRADING_PAIRS]
-            
-            # Get latest decision data for each asset
-            for asset in assets:
+            # Get latest decision data for each trading pair from the registry
+            for product_id in config.TRADING_PAIRS:
+                asset = product_id.split('-')[0]
                 try:
-                    # Read the latest decision file directly, excluding *_latest.json files
-                    import glob
-                    import os
-                    pattern = f"data/{asset}_EUR_*.json"  # Updated to EUR
-                    files = glob.glob(pattern)
-                    
-                    # Filter out *_latest.json files as they may contain stale data
-                    files = [f for f in files if not f.endswith('_latest.json')]
+                    decision_data = self.decision_registry.get_latest(product_id)
                     
-                    if files:
-                        # Sort by modification time to get the truly latest file
-                        latest_file = max(files, key=os.path.getmtime)
-                        with open(latest_file, "r") as f:
-                            decision_data = json.load(f)
-                        
+                    if decision_data:
                         # Extract strategy details if available
                         strategy_details = decision_data.get("strategy_details", {})
                         
@@ -291,7 +287,7 @@ class DashboardUpdater:
                             "asset": asset,
                             "action": decision_data.get("action", "unknown"),
                             "confidence": decision_data.get("confidence", 0),
-                            "reasoning": decision_data.get("reason", decision_data.get("reasoning", "No reasoning provided")),
+                            "reasoning": decision_data.get("reasoning", "No reasoning provided"),
                             "strategy_details": strategy_details
                         }
                         
@@ -316,7 +312,7 @@ class DashboardUpdater:
                         
                         latest_decisions.append(decision)
                     else:
-                        logger.warning(f"No decision files found for {asset}")
+                        logger.warning(f"No decisions recorded for {product_id}")
                         
                 except Exception as e:
                     logger.error(f"Error reading latest decision data for {asset}: {e}")
@@ -418,71 +414,38 @@ class DashboardUpdater:
     def _get_current_market_volatility(self) -> str:
         """Get current market volatility from recent analysis files"""
         try:
-            import glob
-            from datetime import datetime, timedelta
-            
-            # Get recent analysis files (last 2 hours)
-            cutoff_time = datetime.now() - timedelta(hours=2)
-            recent_files = []
-            
-            for pattern in ["data/*_EUR_*.json", "data/*_USD_*.json"]:
-                files = glob.glob(pattern)
-                for file in files:
-                    try:
-                        # Extract timestamp from filename - format: ASSET_CURRENCY_YYYYMMDD_HHMMSS.json
-                        parts = file.split('_')
-                        if len(parts) >= 4:
-                            date_part = parts[-2]  # YYYYMMDD
-                            time_part = parts[-1].replace('.json', '')  # HHMMSS
-                            timestamp_str = f"{date_part}_{time_part}"
-                            file_time = datetime.strptime(timestamp_str, '%Y%m%d_%H%M%S')
-                            if file_time > cutoff_time:
-                                recent_files.append(file)
-                    except Exception as e:
-                        logger.debug(f"Error parsing timestamp from {file}: {e}")
-                        continue
-            
-            logger.debug(f"Found {len(recent_files)} recent analysis files for volatility calculation")
-            
-            # Analyze volatility from recent files
+            # Decisions from the last 2 hours, newest 6 only
+            recent_decisions = self.decision_registry.get_recent(max_age_seconds=2 * 3600)[-6:]
+            logger.debug(f"Found {len(recent_decisions)} recent decisions for volatility calculation")
+            
+            # Analyze volatility from recent decisions
             volatility_levels = []
-            for file in recent_files[-6:]:  # Last 6 files
-                try:
-                    with open(file, 'r') as f:
-                        data = json.load(f)
-                        
-                        # Try to get volatility from ai_analysis first (legacy format)
-                        market_conditions = data.get('ai_analysis', {}).get('market_conditions', {})
-                        volatility = market_conditions.get('volatility', 'unknown')
+            for decision in recent_decisions:
+                # Try to get volatility from ai_analysis first (legacy format)
+                volatility = decision.get('market_conditions', {}).get('volatility', 'unknown')
+                
+                # If not found, calculate from price changes (current format)
+                if volatility == 'unknown':
+                    price_changes = decision.get('price_changes', {})
+                    
+                    if price_changes:
+                        # Calculate volatility based on price changes
+                        changes = [abs(price_changes.get('1h', 0)), 
+                                  abs(price_changes.get('4h', 0)), 
+                                  abs(price_changes.get('24h', 0))]
+                        avg_change = sum(changes) / len(changes) if changes else 0
                         
-                        # If not found, calculate from price changes (current format)
-                        if volatility == 'unknown':
-                            market_data = data.get('market_data', {})
-                            price_changes = market_data.get('price_changes', {})
-                            
-                            if price_changes:
-                                # Calculate volatility based on price changes
-                                changes = [abs(price_changes.get('1h', 0)), 
-                                          abs(price_changes.get('4h', 0)), 
-                                          abs(price_changes.get('24h', 0))]
-                                avg_change = sum(changes) / len(changes) if changes else 0
-                                
-                                if avg_change > 3.0:  # >3% average change = high volatility
-                                    volatility = 'high'
-                                elif avg_change > 1.5:  # >1.5% average change = medium volatility
-                                    volatility = 'medium'
-                                else:
-                                    volatility = 'low'
-                                
-                                logger.debug(f"Calculated volatility '{volatility}' from price changes {changes} in {file}")
+                        if avg_change > 3.0:  # >3% average change = high volatility
+                            volatility = 'high'
+                        elif avg_change > 1.5:  # >1.5% average change = medium volatility
+                            volatility = 'medium'
+                        else:
+                            volatility = 'low'
                         
-                        if volatility != 'unknown':
-                            volatility_levels.append(volatility)
-                            logger.debug(f"Found volatility '{volatility}' in {file}")
-                            
-                except Exception as e:
-                    logger.debug(f"Error reading volatility from {file}: {e}")
-                    continue
+                        logger.debug(f"Calculated volatility '{volatility}' from price changes {changes} for {decision['product_id']}")
+                
+                if volatility != 'unknown':
+                    volatility_levels.append(volatility)
             
             if not volatility_levels:
                 logger.debug("No volatility data found in recent files")
@@ -0,0 +1,156 @@
+"""
+Decision Registry - Index of the latest trading decision per product
+
+Keeps the newest decision for each product and a rolling window of recent
+decisions in memory, persisted as a small JSON index. The bot records each
+decision when it saves the result file, so the dashboard can read decisions
+without scanning the data directory.
+"""
+
+import glob
+import json
+import os
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Decisions kept in the rolling window (several cycles for every pair)
+RECENT_WINDOW = 60
+
+
+class DecisionRegistry:
+    """Latest decision per product plus a rolling window of recent decisions"""
+
+    def __init__(self, index_file: str = "data/cache/decision_index.json",
+                 data_dir: str = "data", window: int = RECENT_WINDOW):
+        self.index_file = index_file
+        self.data_dir = data_dir
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.recent: deque = deque(maxlen=window)
+        self._index_mtime: Optional[float] = None
+
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        if os.path.exists(index_file):
+            self._load()
+        else:
+            self._rebuild_from_directory()
+
+    @staticmethod
+    def _entry(product_id: str, result: Dict[str, Any], recorded_at: float,
+               file_path: Optional[str] = None) -> Dict[str, Any]:
+        """The fields of a decision result that the dashboard reads"""
+        return {
+            "product_id": product_id,
+            "recorded_at": recorded_at,
+            "file": file_path,
+            "timestamp": result.get("timestamp", ""),
+            "action": result.get("action", "unknown"),
+            "confidence": result.get("confidence", 0),
+            "reasoning": result.get("reason", result.get("reasoning", "No reasoning provided")),
+            "strategy_details": result.get("strategy_details", {}),
+            "market_conditions": result.get("ai_analysis", {}).get("market_conditions", {}),
+            "price_changes": result.get("market_data", {}).get("price_changes", {})
+        }
+
+    def record(self, product_id: str, result: Dict[str, Any],
+               file_path: Optional[str] = None, recorded_at: Optional[float] = None) -> None:
+        """
+        Register a saved decision result and persist the index
+
+        Args:
+            product_id: Trading pair (e.g., 'BTC-EUR')
+            result: Decision result as written to the result file
+            file_path: Path of the saved result file
+            recorded_at: Epoch seconds of the decision (defaults to now)
+        """
+        entry = self._entry(product_id, result, recorded_at or time.time(), file_path)
+        self.latest[product_id] = entry
+        self.recent.append({key: entry[key] for key in
+                            ("product_id", "recorded_at", "market_conditions", "price_changes")})
+        self._save()
+
+    def get_latest(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """Latest decision for a product, or None"""
+        self._refresh()
+        return self.latest.get(product_id)
+
+    def get_recent(self, max_age_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Recent decisions (oldest first), optionally limited by age"""
+        self._refresh()
+        if max_age_seconds is None:
+            return list(self.recent)
+        cutoff = time.time() - max_age_seconds
+        return [entry for entry in self.recent if entry["recorded_at"] >= cutoff]
+
+    def _save(self) -> None:
+        """Atomically write the index"""
+        try:
+            temp_file = f"{self.index_file}.tmp"
+            with open(temp_file, "w") as f:
+                json.dump({"latest": self.latest, "recent": list(self.recent)}, f, default=str)
+            os.replace(temp_file, self.index_file)
+            self._index_mtime = os.path.getmtime(self.index_file)
+        except Exception as e:
+            logger.error(f"Error saving decision index: {e}")
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_file, "r") as f:
+                index = json.load(f)
+            self.latest = index.get("latest", {})
+            self.recent.clear()
+            self.recent.extend(index.get("recent", []))
+            self._index_mtime = os.path.getmtime(self.index_file)
+        except Exception as e:
+            logger.error(f"Error loading decision index: {e}")
+
+    def _refresh(self) -> None:
+        """Reload the index if another process (or instance) has rewritten it"""
+        try:
+            mtime = os.path.getmtime(self.index_file)
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            self._load()
+
+    def _rebuild_from_directory(self) -> None:
+        """One-time migration: index the result files already in the data directory"""
+        files = []
+        for file_path in glob.glob(os.path.join(self.data_dir, "*_*_*_*.json")):
+            name = os.path.basename(file_path)[:-len(".json")]
+            parts = name.split("_")
+            if len(parts) != 4 or name.endswith("_latest"):
+                continue
+            try:
+                recorded_at = datetime.strptime(f"{parts[2]}_{parts[3]}", "%Y%m%d_%H%M%S").timestamp()
+            except ValueError:
+                continue
+            files.append((recorded_at, f"{parts[0]}-{parts[1]}", file_path))
+
+        if not files:
+            return
+
+        files.sort()
+        newest = {product_id: (recorded_at, file_path) for recorded_at, product_id, file_path in files}
+        to_read = set(newest.values()) | {(recorded_at, file_path) for recorded_at, _, file_path in files[-self.recent.maxlen:]}
+        for recorded_at, product_id, file_path in files:
+            if (recorded_at, file_path) not in to_read:
+                continue
+            try:
+                with open(file_path, "r") as f:
+                    result = json.load(f)
+            except Exception as e:
+                logger.debug(f"Skipping unreadable decision file {file_path}: {e}")
+                continue
+            entry = self._entry(product_id, result, recorded_at, file_path)
+            if newest[product_id][1] == file_path:
+                self.latest[product_id] = entry
+            self.recent.append({key: entry[key] for key in
+                                ("product_id", "recorded_at", "market_conditions", "price_changes")})
+
+        logger.info(f"Indexed latest decisions for {len(self.latest)} products from {self.data_dir}")
+        self._save()
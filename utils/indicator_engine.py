@@ -0,0 +1,534 @@
+"""
+Incremental technical indicators updated one candle at a time
+
+The indicator formulas are those of utils.performance.indicator_factory,
+evaluated on a SeriesCache that holds only the current candle. Its rolling
+statistics keep the same running state pandas keeps internally
+(Kahan-compensated running sums, Welford variance, adjusted EWM weights,
+monotonic min/max deques) and apply the same add/remove steps, so feeding a
+series bar by bar from its first candle yields exactly the values
+IndicatorFactory.calculate_latest computes over the whole series, at constant
+cost per bar.
+
+State is anchored at the candle it was seeded from. A lookback that slides
+forward keeps advancing the same state: the rolling windows (no longer than the
+frame) agree with a recomputation of the frame up to rounding, and the EWMs
+(MACD) also carry the candles that have left the frame, with weights that decay
+geometrically.
+"""
+
+import copy
+import logging
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.performance.indicator_factory import (SeriesCache, get_indicator_periods, live_indicator_series,
+                                                 live_indicator_snapshot)
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+class RollingMean:
+    """Series.rolling(window).mean(), one value at a time"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        # Run of identical trailing values (pandas returns the value itself for constant windows)
+        self.same_count = 0
+        self.prev_value = NAN
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        self._add(value)
+        return self.result()
+
+    def _add(self, value: float):
+        if value != value:
+            return
+        self.nobs += 1
+        y = value - self.compensation_add
+        t = self.sum_x + y
+        self.compensation_add = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct += 1
+        self.same_count = self.same_count + 1 if value == self.prev_value else 1
+        self.prev_value = value
+
+    def _remove(self, value: float):
+        if value != value:
+            return
+        self.nobs -= 1
+        y = -value - self.compensation_remove
+        t = self.sum_x + y
+        self.compensation_remove = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct -= 1
+
+    def result(self) -> float:
+        if self.nobs < self.window or self.nobs == 0:
+            return NAN
+        if self.same_count >= self.nobs:
+            return self.prev_value
+        result = self.sum_x / self.nobs
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+    def copy(self) -> "RollingMean":
+        clone = copy.copy(self)
+        clone.values = self.values.copy()
+        return clone
+
+class RollingSum(RollingMean):
+    """Series.rolling(window).sum(), one value at a time"""
+
+    def result(self) -> float:
+        if self.nobs < self.window:
+            return NAN
+        if self.same_count >= self.nobs:
+            return self.prev_value * self.nobs
+        return self.sum_x
+
+class RollingStd:
+    """Series.rolling(window).std() (ddof=1), one value at a time"""
+
+    # A removal shrinking the sum of squares by more than this factor lost its precision
+    CANCELLATION_RATIO = 1000 * np.finfo(float).eps
+
+    def __init__(self, window: int, ddof: int = 1):
+        self.window = window
+        self.ddof = ddof
+        self.values = deque()
+        self.nobs = 0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        self._add(value)
+        return self.result()
+
+    def _add(self, value: float):
+        if value != value:
+            return
+        self.nobs += 1
+        # Welford's online variance with Kahan-compensated mean
+        prev_mean = self.mean_x - self.compensation_add
+        y = value - self.compensation_add
+        t = y - self.mean_x
+        self.compensation_add = t + self.mean_x - y
+        self.mean_x = self.mean_x + t / self.nobs
+        self.ssqdm_x = self.ssqdm_x + (value - prev_mean) * (value - self.mean_x)
+
+    def _remove(self, value: float):
+        if value != value:
+            return
+        self.nobs -= 1
+        if self.nobs:
+            prev_ssqdm = self.ssqdm_x
+            prev_mean = self.mean_x - self.compensation_remove
+            y = value - self.compensation_remove
+            t = y - self.mean_x
+            self.compensation_remove = t + self.mean_x - y
+            self.mean_x = self.mean_x - t / self.nobs
+            self.ssqdm_x = self.ssqdm_x - (value - prev_mean) * (value - self.mean_x)
+            if self.ssqdm_x < self.CANCELLATION_RATIO * prev_ssqdm:
+                self._recompute()
+        else:
+            self.mean_x = 0.0
+            self.ssqdm_x = 0.0
+
+    def _recompute(self):
+        """Rebuild mean and sum of squares from the remaining window values"""
+        nobs, mean_x, ssqdm_x = 0, 0.0, 0.0
+        for value in list(self.values)[:-1]:
+            if value != value:
+                continue
+            nobs += 1
+            prev_mean = mean_x
+            mean_x = mean_x + (value - mean_x) / nobs
+            ssqdm_x = ssqdm_x + (value - prev_mean) * (value - mean_x)
+        self.nobs, self.mean_x, self.ssqdm_x = nobs, mean_x, ssqdm_x
+
+    def result(self) -> float:
+        if self.nobs < self.window or self.nobs <= self.ddof:
+            return NAN
+        if self.nobs == 1:
+            return 0.0
+        variance = self.ssqdm_x / (self.nobs - self.ddof)
+        return 0.0 if variance < 0 else math.sqrt(variance)
+
+    def copy(self) -> "RollingStd":
+        clone = copy.copy(self)
+        clone.values = self.values.copy()
+        return clone
+
+class RollingMinMax:
+    """Series.rolling(window).min() and .max(), one value at a time (monotonic deques)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.index = 0
+        self.observed = deque()
+        self.nobs = 0
+        self.mins = deque()
+        self.maxs = deque()
+
+    def update(self, value: float) -> Tuple[float, float]:
+        index = self.index
+        self.index += 1
+
+        is_observation = value == value
+        self.observed.append(is_observation)
+        self.nobs += is_observation
+        if len(self.observed) > self.window:
+            self.nobs -= self.observed.popleft()
+
+        if is_observation:
+            while self.mins and self.mins[-1][1] >= value:
+                self.mins.pop()
+            self.mins.append((index, value))
+            while self.maxs and self.maxs[-1][1] <= value:
+                self.maxs.pop()
+            self.maxs.append((index, value))
+
+        oldest = index - self.window
+        while self.mins and self.mins[0][0] <= oldest:
+            self.mins.popleft()
+        while self.maxs and self.maxs[0][0] <= oldest:
+            self.maxs.popleft()
+
+        if self.nobs < self.window:
+            return NAN, NAN
+        return self.mins[0][1], self.maxs[0][1]
+
+    def copy(self) -> "RollingMinMax":
+        clone = copy.copy(self)
+        clone.observed = self.observed.copy()
+        clone.mins = self.mins.copy()
+        clone.maxs = self.maxs.copy()
+        return clone
+
+class ExponentialMean:
+    """Series.ewm(span=span).mean() (adjust=True), one value at a time"""
+
+    def __init__(self, span: int):
+        com = (span - 1) / 2.0
+        alpha = 1. / (1. + com)
+        self.old_wt_factor = 1. - alpha
+        self.new_wt = 1.
+        self.weighted = None
+        self.old_wt = 1.
+        self.nobs = 0
+
+    def update(self, value: float) -> float:
+        is_observation = value == value
+        if self.weighted is None:
+            self.weighted = value
+            self.nobs = int(is_observation)
+        else:
+            self.nobs += is_observation
+            if self.weighted == self.weighted:
+                self.old_wt *= self.old_wt_factor
+                if is_observation:
+                    # Constant series keep their exact value
+                    if self.weighted != value:
+                        self.weighted = self.old_wt * self.weighted + self.new_wt * value
+                        self.weighted /= (self.old_wt + self.new_wt)
+                    self.old_wt += self.new_wt
+            elif is_observation:
+                self.weighted = value
+        return self.weighted if self.nobs >= 1 else NAN
+
+    def copy(self) -> "ExponentialMean":
+        return copy.copy(self)
+
+class IncrementalSeriesCache(SeriesCache):
+    """
+    SeriesCache over the current candle only, for the indicator factory's formulas
+
+    Base and derived series are one-element arrays memoized for the candle being
+    applied. Diffs, rolling statistics and EWMs keep running state across
+    candles, so each of them must be requested exactly once per candle.
+    """
+
+    ROLLING = {'mean': RollingMean, 'sum': RollingSum, 'std': RollingStd,
+               'min': RollingMinMax, 'max': RollingMinMax}
+
+    def __init__(self):
+        super().__init__(pd.DataFrame())
+        self._state: Dict[Hashable, Any] = {}
+        self._previous: Dict[Hashable, float] = {}
+
+    def start(self, candle: Dict[str, float]):
+        """Begin the next candle"""
+        self._series = {name: np.array([value], dtype=np.float64) for name, value in candle.items()}
+
+    def get(self, key: Hashable) -> np.ndarray:
+        return self._series[key]
+
+    def _step(self, state_key: Hashable, source: Hashable, create: Callable[[], Any],
+              step: Callable[[Any, float], float]) -> np.ndarray:
+        """Feed the current value of source to the running state stored under state_key"""
+        state = self._state.get(state_key)
+        if state is None:
+            state = self._state[state_key] = create()
+        return np.array([step(state, float(self.get(source)[0]))], dtype=np.float64)
+
+    def diff(self, key: Hashable = 'close') -> np.ndarray:
+        def compute():
+            value = float(self.get(key)[0])
+            previous = self._previous.get(key, NAN)
+            self._previous[key] = value
+            return np.array([value - previous], dtype=np.float64)
+        return self.memo(('diff', key), compute)
+
+    def rolling(self, key: Hashable, window: int, stat: str) -> np.ndarray:
+        primitive = self.ROLLING[stat]
+        if primitive is RollingMinMax:
+            position = 0 if stat == 'min' else 1
+            step = lambda state, value: state.update(value)[position]
+        else:
+            step = lambda state, value: state.update(value)
+        state_key = ('rolling', stat, window, key)
+        return self.memo(state_key, lambda: self._step(state_key, key, lambda: primitive(window), step))
+
+    def ewm(self, key: Hashable, span: int) -> np.ndarray:
+        state_key = ('ewm', span, key)
+        return self.memo(state_key, lambda: self._step(state_key, key, lambda: ExponentialMean(span),
+                                                       lambda state, value: state.update(value)))
+
+    def copy(self) -> "IncrementalSeriesCache":
+        """Independent copy of the running state (cost bounded by the longest window)"""
+        clone = copy.copy(self)
+        clone._state = {key: state.copy() for key, state in self._state.items()}
+        clone._previous = dict(self._previous)
+        clone._series = {}
+        return clone
+
+class IncrementalIndicators:
+    """Live indicator set for one series, advanced one candle at a time"""
+
+    def __init__(self, trading_style: str = "day_trading", has_volume: bool = True):
+        self.trading_style = trading_style
+        self.periods = get_indicator_periods(trading_style)
+        self.has_volume = has_volume
+        self.cache = IncrementalSeriesCache()
+        self.bars = 0
+        self.latest: Dict[str, np.ndarray] = {}
+
+    def update(self, close: float, high: float = NAN, low: float = NAN, volume: float = NAN):
+        """Apply the next candle"""
+        candle = {'close': close}
+        if self.has_volume:
+            candle.update(high=high, low=low, volume=volume)
+        self.cache.start(candle)
+        self.latest = live_indicator_series(self.cache, self.trading_style, self.has_volume)
+        self.bars += 1
+
+    def get_indicators(self, data_points: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Indicators for the latest candle, gated on data length like calculate_latest
+
+        Args:
+            data_points: Length of the frame the caller analysed (defaults to candles seen)
+
+        Returns:
+            Dictionary with calculated indicators (without current_price/_metadata)
+        """
+        if not self.latest:
+            return {}
+        return live_indicator_snapshot(self.latest, self.trading_style,
+                                       self.bars if data_points is None else data_points)
+
+    def copy(self) -> "IncrementalIndicators":
+        """Independent copy (cost bounded by the longest window, not the history)"""
+        clone = copy.copy(self)
+        clone.cache = self.cache.copy()
+        return clone
+
+class _Track:
+    """Committed indicator state for one (product, style) series"""
+
+    def __init__(self, indicators: IncrementalIndicators, anchor_time, last_time, last_close: float):
+        self.indicators = indicators
+        # First candle applied; frames may start later but not earlier
+        self.anchor_time = anchor_time
+        self.last_time = last_time
+        self.last_close = last_close
+
+class IndicatorEngine:
+    """
+    Thread-safe incremental indicators keyed by (product, trading style)
+
+    Every closed candle is applied once. The last candle of a frame may still be
+    forming, so it is applied to a copy of the committed state and replaced on the
+    next call. Frames that still contain the last committed candle are advanced
+    incrementally, whether they keep their first candle (the values match the full
+    calculation exactly) or slide forward (the values are those of the history
+    since the track was seeded). The state is re-seeded from the frame (batch mode)
+    when the frame reaches back before the seeded candle or no longer lines up
+    with what was applied.
+    """
+
+    def __init__(self):
+        self._tracks: Dict[Tuple[str, str], _Track] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.seeds = 0
+        self.incremental_updates = 0
+        self.candles_applied = 0
+
+    @staticmethod
+    def _columns(historical_data: pd.DataFrame) -> Tuple[list, list, list, list, bool]:
+        closes = historical_data['close'].to_numpy(dtype=float).tolist()
+        has_volume = 'volume' in historical_data.columns
+        if has_volume:
+            highs = historical_data['high'].to_numpy(dtype=float).tolist()
+            lows = historical_data['low'].to_numpy(dtype=float).tolist()
+            volumes = historical_data['volume'].to_numpy(dtype=float).tolist()
+        else:
+            highs = lows = volumes = [NAN] * len(closes)
+        return closes, highs, lows, volumes, has_volume
+
+    def seed(self, product_id: str, trading_style: str, historical_data: pd.DataFrame) -> _Track:
+        """
+        Batch mode: rebuild the state for a series from its history
+
+        Every candle but the last (possibly still forming) one is applied.
+
+        Args:
+            product_id: Trading pair (e.g., 'BTC-EUR')
+            trading_style: Trading style (day_trading, swing_trading, long_term)
+            historical_data: DataFrame with OHLCV data indexed by candle start time (at least 2 rows)
+
+        Returns:
+            The new track
+        """
+        closes, highs, lows, volumes, has_volume = self._columns(historical_data)
+        state = IncrementalIndicators(trading_style, has_volume)
+        committed = len(closes) - 1
+        for i in range(committed):
+            state.update(closes[i], highs[i], lows[i], volumes[i])
+
+        track = _Track(state, historical_data.index[0],
+                       historical_data.index[committed - 1], closes[committed - 1])
+        with self._lock:
+            self._tracks[(product_id, trading_style)] = track
+            self.seeds += 1
+            self.candles_applied += committed
+
+        logger.debug(f"Indicator state for {product_id} {trading_style} seeded from {committed} candles")
+        return track
+
+    def _advance(self, track: _Track, historical_data: pd.DataFrame) -> bool:
+        """Apply candles closed since the last call; False if the frame does not line up"""
+        index = historical_data.index
+        try:
+            if index[0] < track.anchor_time:
+                # Longer lookback than the state covers
+                return False
+            position = index.searchsorted(track.last_time)
+        except (TypeError, ValueError):
+            return False
+        if position >= len(index) or index[position] != track.last_time:
+            return False
+        if historical_data['close'].iloc[position] != track.last_close:
+            # Candles already applied were revised
+            return False
+
+        committed = len(index) - 1
+        if position == committed - 1:
+            # No candle closed since the last call
+            return True
+        if position >= committed:
+            return False
+
+        tail = historical_data.iloc[position + 1:committed]
+        closes, highs, lows, volumes, has_volume = self._columns(tail)
+        if has_volume != track.indicators.has_volume:
+            return False
+        for i in range(len(closes)):
+            track.indicators.update(closes[i], highs[i], lows[i], volumes[i])
+
+        track.last_time = index[committed - 1]
+        track.last_close = closes[-1]
+        with self._lock:
+            self.incremental_updates += 1
+            self.candles_applied += len(closes)
+        return True
+
+    def get_indicators(self, product_id: str, trading_style: str, historical_data: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Indicators for the last candle of a frame, applying only candles not seen before
+
+        Args:
+            product_id: Trading pair (e.g., 'BTC-EUR')
+            trading_style: Trading style (day_trading, swing_trading, long_term)
+            historical_data: DataFrame with OHLCV data indexed by candle start time
+
+        Returns:
+            Dictionary with calculated indicators (without current_price/_metadata)
+        """
+        if historical_data.empty:
+            return {}
+
+        if len(historical_data) < 2 or not isinstance(historical_data.index, pd.DatetimeIndex):
+            # Candles cannot be matched across calls: compute from scratch without keeping state
+            closes, highs, lows, volumes, has_volume = self._columns(historical_data)
+            state = IncrementalIndicators(trading_style, has_volume)
+            for i in range(len(closes)):
+                state.update(closes[i], highs[i], lows[i], volumes[i])
+            return state.get_indicators(len(historical_data))
+
+        with self._lock:
+            track = self._tracks.get((product_id, trading_style))
+
+        if track is None or not self._advance(track, historical_data):
+            track = self.seed(product_id, trading_style, historical_data)
+
+        # The last candle may still be forming: apply it to a copy
+        closes, highs, lows, volumes, _ = self._columns(historical_data.iloc[-1:])
+        state = track.indicators.copy()
+        state.update(closes[0], highs[0], lows[0], volumes[0])
+        return state.get_indicators(len(historical_data))
+
+    def invalidate(self, product_id: Optional[str] = None):
+        """Drop indicator state for one product, or for all products"""
+        with self._lock:
+            for key in list(self._tracks):
+                if product_id is None or key[0] == product_id:
+                    self._tracks.pop(key, None)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get engine metrics"""
+        with self._lock:
+            return {
+                "tracked_series": len(self._tracks),
+                "seeds": self.seeds,
+                "incremental_updates": self.incremental_updates,
+                "candles_applied": self.candles_applied
+            }
@@ -0,0 +1,469 @@
+"""
+Vectorized technical indicator factory
+
+Indicators are computed as whole columns over an OHLCV frame. Intermediate
+series (price diffs, gains/losses, true range, typical price, rolling
+statistics, EWMs) are memoized per frame, so indicators that share inputs -
+several SMA/RSI periods, Bollinger Bands and SMAs over the same window,
+stochastic ranges - only compute them once. The rolling and EWM primitives
+are pandas' compiled kernels applied to NumPy arrays.
+
+Backtests use the indicator columns. The live indicator set is defined once,
+by live_indicator_series and live_indicator_snapshot: calculate_latest
+evaluates it over a whole frame, and the incremental IndicatorEngine evaluates
+the same functions one candle at a time on a SeriesCache whose rolling and EWM
+primitives keep running state.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Stochastic RSI always uses a 14-period RSI and a 14-period range
+STOCH_RSI_PERIOD = 14
+
+# Rolling window of the VWAP approximation
+VWAP_PERIOD = 20
+
+# Default column set for backtests
+SMA_PERIODS = (10, 20, 50, 200)
+EMA_PERIODS = (12, 26, 50)
+RSI_PERIODS = (14, 21)
+BB_PERIODS = (20,)
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+ATR_PERIOD = 14
+STOCH_PERIOD = 14
+STOCH_SMOOTHING = 3
+VOLUME_SMA_PERIOD = 20
+
+# Market regime codes in the market_regime column
+REGIME_RANGING, REGIME_TRENDING, REGIME_VOLATILE = 0, 1, 2
+REGIME_NAMES = {REGIME_RANGING: 'ranging', REGIME_TRENDING: 'trending', REGIME_VOLATILE: 'volatile'}
+
+# Regime thresholds: SMA 20/50 spread for trends, volatility spike vs its recent average
+TREND_THRESHOLD = 0.02
+VOLATILITY_SPIKE = 1.5
+VOLATILITY_PERIOD = 20
+VOLATILITY_BASELINE_PERIOD = 100
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def get_indicator_periods(trading_style: str) -> Dict[str, int]:
+    """
+    Get indicator periods for a trading style
+
+    Args:
+        trading_style: Trading style (day_trading, swing_trading, long_term)
+
+    Returns:
+        Dictionary with rsi/bb/sma/macd periods
+    """
+    if trading_style == "day_trading":
+        # Day trading: Use shorter periods for faster signals
+        return {'rsi_period': 14, 'bb_period': 4, 'sma_short': 10, 'sma_long': 20,
+                'macd_fast': 8, 'macd_slow': 17, 'macd_signal': 9}
+    if trading_style == "swing_trading":
+        # Swing trading: Medium periods
+        return {'rsi_period': 14, 'bb_period': 20, 'sma_short': 20, 'sma_long': 50,
+                'macd_fast': 12, 'macd_slow': 26, 'macd_signal': 9}
+    # Long-term: Longer periods for smoother signals
+    return {'rsi_period': 21, 'bb_period': 50, 'sma_short': 50, 'sma_long': 200,
+            'macd_fast': 12, 'macd_slow': 26, 'macd_signal': 9}
+
+# Bump when an indicator formula or the default column set changes; prepared
+# indicator frames cached under an older version are then recomputed
+INDICATOR_SET_VERSION = 1
+
+
+class SeriesCache:
+    """Memoized intermediate series for one OHLCV frame"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._series: Dict[Hashable, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def memo(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Return the cached series for key, computing it on first use"""
+        series = self._series.get(key)
+        if series is None:
+            self.misses += 1
+            series = self._series[key] = compute()
+        else:
+            self.hits += 1
+        return series
+
+    def get(self, key: Hashable) -> np.ndarray:
+        """Get a base column ('close', ...) or a memoized series"""
+        if isinstance(key, str) and key in self.df.columns:
+            return self.memo(key, lambda: self.df[key].to_numpy(dtype=np.float64))
+        return self._series[key]
+
+    def diff(self, key: Hashable = 'close') -> np.ndarray:
+        return self.memo(('diff', key), lambda: pd.Series(self.get(key)).diff().to_numpy())
+
+    def gains(self, key: Hashable = 'close') -> np.ndarray:
+        delta = self.diff(key)
+        return self.memo(('gains', key), lambda: np.where(delta > 0, delta, 0.0))
+
+    def losses(self, key: Hashable = 'close') -> np.ndarray:
+        delta = self.diff(key)
+        return self.memo(('losses', key), lambda: -np.where(delta < 0, delta, 0.0))
+
+    def rolling(self, key: Hashable, window: int, stat: str) -> np.ndarray:
+        """Rolling mean/sum/std/min/max with pandas' default min_periods"""
+        return self.memo(('rolling', stat, window, key),
+                         lambda: getattr(pd.Series(self.get(key)).rolling(window=window), stat)().to_numpy())
+
+    def ewm(self, key: Hashable, span: int) -> np.ndarray:
+        return self.memo(('ewm', span, key), lambda: pd.Series(self.get(key)).ewm(span=span).mean().to_numpy())
+
+    def typical_price(self) -> np.ndarray:
+        return self.memo('typical_price',
+                         lambda: (self.get('high') + self.get('low') + self.get('close')) / 3)
+
+    def true_range(self) -> np.ndarray:
+        def compute():
+            high, low = self.get('high'), self.get('low')
+            previous_close = pd.Series(self.get('close')).shift().to_numpy()
+            ranges = np.column_stack([high - low, np.abs(high - previous_close), np.abs(low - previous_close)])
+            # Row max ignoring the NaN gaps of the first row, like DataFrame.max(axis=1)
+            return pd.DataFrame(ranges).max(axis=1).to_numpy()
+        return self.memo('true_range', compute)
+
+
+# ===== Column indicators =====
+
+def sma(cache: SeriesCache, period: int, key: Hashable = 'close') -> np.ndarray:
+    return cache.rolling(key, period, 'mean')
+
+
+def ema(cache: SeriesCache, span: int, key: Hashable = 'close') -> np.ndarray:
+    return cache.ewm(key, span)
+
+
+def rsi(cache: SeriesCache, period: int) -> np.ndarray:
+    """RSI from simple rolling means of gains and losses"""
+    def compute():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = cache.rolling(('gains', 'close'), period, 'mean') / cache.rolling(('losses', 'close'), period, 'mean')
+            return 100 - (100 / (1 + rs))
+    cache.gains()
+    cache.losses()
+    return cache.memo(('rsi', period), compute)
+
+
+def macd(cache: SeriesCache, fast: int, slow: int, signal: int) -> Dict[str, np.ndarray]:
+    """MACD line, signal line and histogram"""
+    line = cache.memo(('macd', fast, slow), lambda: ema(cache, fast) - ema(cache, slow))
+    signal_line = cache.ewm(('macd', fast, slow), signal)
+    return {'macd': line, 'macd_signal': signal_line, 'macd_histogram': line - signal_line}
+
+
+def bollinger_bands(cache: SeriesCache, period: int, num_std: float = 2) -> Dict[str, np.ndarray]:
+    """Bollinger Bands with width (% of the middle band) and price position (0 = lower, 1 = upper)"""
+    middle = cache.rolling('close', period, 'mean')
+    std = cache.rolling('close', period, 'std')
+    upper = middle + (std * num_std)
+    lower = middle - (std * num_std)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        width = ((upper - lower) / middle) * 100
+        position = (cache.get('close') - lower) / (upper - lower)
+    return {'upper': upper, 'middle': middle, 'lower': lower, 'width': width, 'position': position}
+
+
+def atr(cache: SeriesCache, period: int = ATR_PERIOD) -> np.ndarray:
+    """Average true range (simple rolling mean)"""
+    cache.true_range()
+    return cache.rolling('true_range', period, 'mean')
+
+
+def stochastic(cache: SeriesCache, period: int = STOCH_PERIOD,
+               smoothing: int = STOCH_SMOOTHING) -> Dict[str, np.ndarray]:
+    """Stochastic oscillator %K and %D"""
+    def compute_k():
+        low = cache.rolling('low', period, 'min')
+        high = cache.rolling('high', period, 'max')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 100 * ((cache.get('close') - low) / (high - low))
+    k = cache.memo(('stoch_k', period), compute_k)
+    return {'k': k, 'd': cache.rolling(('stoch_k', period), smoothing, 'mean')}
+
+
+def stoch_rsi(cache: SeriesCache, period: int = STOCH_RSI_PERIOD) -> np.ndarray:
+    """Stochastic RSI (0-100) over a rolling RSI range"""
+    rsi(cache, period)
+    def compute():
+        low = cache.rolling(('rsi', period), period, 'min')
+        high = cache.rolling(('rsi', period), period, 'max')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return ((cache.get(('rsi', period)) - low) / (high - low)) * 100
+    return cache.memo(('stoch_rsi', period), compute)
+
+
+def vwap(cache: SeriesCache, period: int = VWAP_PERIOD) -> np.ndarray:
+    """Rolling volume-weighted average of the typical price"""
+    cache.memo('price_volume', lambda: cache.typical_price() * cache.get('volume'))
+    def compute():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return cache.rolling('price_volume', period, 'sum') / cache.rolling('volume', period, 'sum')
+    return cache.memo(('vwap', period), compute)
+
+
+def market_regime(cache: SeriesCache) -> np.ndarray:
+    """
+    Classify each bar as ranging (0), trending (1) or volatile (2)
+
+    Volatile when return volatility spikes above its recent average, otherwise
+    trending when the 20/50 SMAs are more than TREND_THRESHOLD apart.
+    """
+    def compute():
+        close = pd.Series(cache.get('close'))
+        volatility = close.pct_change().rolling(VOLATILITY_PERIOD).std()
+        baseline = volatility.rolling(VOLATILITY_BASELINE_PERIOD, min_periods=VOLATILITY_PERIOD).mean()
+        slow = sma(cache, 50)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            trend_strength = np.abs(sma(cache, 20) - slow) / slow
+        volatile = (volatility > VOLATILITY_SPIKE * baseline).to_numpy()
+        trending = trend_strength > TREND_THRESHOLD
+        return np.select([volatile, trending], [REGIME_VOLATILE, REGIME_TRENDING],
+                         default=REGIME_RANGING).astype(np.int8)
+    return cache.memo('market_regime', compute)
+
+
+# ===== Live indicator set =====
+
+def live_indicator_series(cache: SeriesCache, trading_style: str, has_volume: bool) -> Dict[str, np.ndarray]:
+    """
+    Every series behind the live indicators of a trading style
+
+    All of them are evaluated whatever the length of the data, so a cache that
+    keeps running state sees each candle exactly once.
+
+    Args:
+        cache: Series of the frame (or of the current candle)
+        trading_style: Trading style selecting the indicator periods
+        has_volume: Whether high/low/volume are available for the VWAP
+    """
+    periods = get_indicator_periods(trading_style)
+    series = {'close': cache.get('close')}
+    for name in ('sma_short', 'sma_long'):
+        series[name] = sma(cache, periods[name])
+    # Legacy SMA values for backward compatibility
+    series['sma_20'] = sma(cache, 20)
+    series['sma_50'] = sma(cache, 50)
+    series['rsi'] = rsi(cache, periods['rsi_period'])
+    series.update(macd(cache, periods['macd_fast'], periods['macd_slow'], periods['macd_signal']))
+    bands = bollinger_bands(cache, periods['bb_period'])
+    series['bb_upper'], series['bb_lower'], series['bb_middle'] = bands['upper'], bands['lower'], bands['middle']
+    if trading_style == "day_trading":
+        series['stoch_rsi'] = stoch_rsi(cache)
+        if has_volume:
+            series['vwap'] = vwap(cache)
+    return series
+
+
+def live_indicator_snapshot(series: Dict[str, np.ndarray], trading_style: str, data_points: int) -> Dict[str, Any]:
+    """
+    Latest values in the live trading format, only those with enough history
+
+    Args:
+        series: Result of live_indicator_series
+        trading_style: Trading style selecting the indicator periods
+        data_points: Number of candles the caller analysed
+    """
+    periods = get_indicator_periods(trading_style)
+    indicators = {}
+
+    for name in ('sma_short', 'sma_long'):
+        if data_points >= periods[name]:
+            indicators[name] = series[name][-1]
+    if data_points >= 20:
+        indicators['sma_20'] = series['sma_20'][-1]
+    if data_points >= 50:
+        indicators['sma_50'] = series['sma_50'][-1]
+
+    if data_points >= periods['rsi_period'] + 1:
+        indicators['rsi'] = series['rsi'][-1]
+
+    if data_points >= periods['macd_slow']:
+        for name in ('macd', 'macd_signal', 'macd_histogram'):
+            indicators[name] = series[name][-1]
+
+    if data_points >= periods['bb_period']:
+        for name in ('bb_upper', 'bb_lower', 'bb_middle'):
+            indicators[name] = series[name][-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            indicators['bb_width'] = ((indicators['bb_upper'] - indicators['bb_lower']) / indicators['bb_middle']) * 100
+            indicators['bb_position'] = ((series['close'][-1] - indicators['bb_lower']) /
+                                         (indicators['bb_upper'] - indicators['bb_lower']))
+
+    if trading_style == "day_trading":
+        if 'rsi' in indicators and data_points >= STOCH_RSI_PERIOD:
+            indicators['stoch_rsi'] = series['stoch_rsi'][-1]
+        if 'vwap' in series and data_points >= VWAP_PERIOD:
+            indicators['vwap'] = series['vwap'][-1]
+
+    return indicators
+
+
+class IndicatorFactory:
+    """Computes indicator columns for backtests and full-frame indicator snapshots"""
+
+    def __init__(self, sma_periods: Sequence[int] = SMA_PERIODS, ema_periods: Sequence[int] = EMA_PERIODS,
+                 rsi_periods: Sequence[int] = RSI_PERIODS, bb_periods: Sequence[int] = BB_PERIODS):
+        """
+        Args:
+            sma_periods: SMA windows (sma_<period> columns)
+            ema_periods: EMA spans (ema_<period> columns)
+            rsi_periods: RSI periods (rsi_<period> columns)
+            bb_periods: Bollinger Band windows (bb_*_<period> columns)
+        """
+        self.sma_periods = tuple(sma_periods)
+        self.ema_periods = tuple(ema_periods)
+        self.rsi_periods = tuple(rsi_periods)
+        self.bb_periods = tuple(bb_periods)
+
+        # Metrics
+        self.frames_processed = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _track(self, cache: SeriesCache):
+        self.frames_processed += 1
+        self.cache_hits += cache.hits
+        self.cache_misses += cache.misses
+
+    def calculate_all_indicators(self, df: pd.DataFrame, product_id: Optional[str] = None) -> pd.DataFrame:
+        """
+        Add every indicator column to an OHLCV frame
+
+        Args:
+            df: DataFrame with open/high/low/close/volume columns
+            product_id: Trading pair (used for logging)
+
+        Returns:
+            Copy of df with the indicator columns appended
+        """
+        if df.empty:
+            return df.copy()
+
+        cache = SeriesCache(df)
+        columns: Dict[str, np.ndarray] = {}
+
+        for period in self.sma_periods:
+            columns[f'sma_{period}'] = sma(cache, period)
+        for span in self.ema_periods:
+            columns[f'ema_{span}'] = ema(cache, span)
+        for period in self.rsi_periods:
+            columns[f'rsi_{period}'] = rsi(cache, period)
+
+        columns.update(macd(cache, MACD_FAST, MACD_SLOW, MACD_SIGNAL))
+
+        for period in self.bb_periods:
+            for name, values in bollinger_bands(cache, period).items():
+                columns[f'bb_{name}_{period}'] = values
+
+        if 'high' in df.columns and 'low' in df.columns:
+            columns['atr'] = atr(cache)
+            stoch = stochastic(cache)
+            columns['stoch_k'], columns['stoch_d'] = stoch['k'], stoch['d']
+
+        if 'volume' in df.columns:
+            columns['volume_sma_20'] = sma(cache, VOLUME_SMA_PERIOD, 'volume')
+            if 'high' in df.columns and 'low' in df.columns:
+                columns['vwap'] = vwap(cache)
+
+        columns['market_regime'] = market_regime(cache)
+
+        # Replace stale indicator columns, append everything in one block
+        base = df.drop(columns=[name for name in columns if name in df.columns])
+        result = pd.concat([base, pd.DataFrame(columns, index=df.index)], axis=1)
+
+        self._track(cache)
+        logger.debug(f"Calculated {len(columns)} indicators for {product_id or 'frame'} "
+                     f"({len(df)} rows, {cache.hits} cache hits)")
+        return result
+
+    def calculate_latest(self, df: pd.DataFrame, trading_style: str = "day_trading") -> Dict[str, Any]:
+        """
+        Latest indicator values in the live trading format
+
+        Args:
+            df: Hourly OHLCV frame
+            trading_style: Trading style selecting the indicator periods
+
+        Returns:
+            Dictionary of indicator values for the last row (only those with enough history)
+        """
+        cache = SeriesCache(df)
+        series = live_indicator_series(cache, trading_style, 'volume' in df.columns)
+        indicators = live_indicator_snapshot(series, trading_style, len(df))
+        self._track(cache)
+        return indicators
+
+    def get_indicator_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Group the indicator columns of a frame
+
+        Args:
+            df: Frame returned by calculate_all_indicators
+
+        Returns:
+            Dictionary with total_indicators and indicator_groups (group -> column names)
+        """
+        groups: Dict[str, List[str]] = {
+            'moving_averages': [], 'momentum': [], 'trend': [], 'volatility': [], 'volume': [], 'regime': []
+        }
+        for column in df.columns:
+            if column in OHLCV_COLUMNS:
+                continue
+            if column.startswith(('sma_', 'ema_')):
+                groups['moving_averages'].append(column)
+            elif column.startswith(('rsi_', 'stoch_')):
+                groups['momentum'].append(column)
+            elif column.startswith('macd'):
+                groups['trend'].append(column)
+            elif column.startswith('bb_') or column == 'atr':
+                groups['volatility'].append(column)
+            elif column.startswith('volume_') or column == 'vwap':
+                groups['volume'].append(column)
+            elif column == 'market_regime':
+                groups['regime'].append(column)
+
+        return {
+            'total_indicators': sum(len(columns) for columns in groups.values()),
+            'indicator_groups': groups
+        }
+
+    def signature(self) -> Dict[str, Any]:
+        """Identifies the indicator columns this factory produces (for caching prepared frames)"""
+        return {
+            'version': INDICATOR_SET_VERSION,
+            'sma_periods': list(self.sma_periods),
+            'ema_periods': list(self.ema_periods),
+            'rsi_periods': list(self.rsi_periods),
+            'bb_periods': list(self.bb_periods)
+        }
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get factory usage metrics"""
+        return {
+            'frames_processed': self.frames_processed,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
+
+
+_default_factory = IndicatorFactory()
+
+
+def calculate_indicators(df: pd.DataFrame, product_id: Optional[str] = None) -> pd.DataFrame:
+    """Add the default indicator columns to an OHLCV frame"""
+    return _default_factory.calculate_all_indicators(df, product_id)
@@ -9,12 +9,15 @@ import json
 import logging
 import math
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional, Tuple
-from statistics import mean, stdev
+from typing import Dict, List, Any, Optional, Tuple, Union
 import numpy as np
 
+from utils.performance.portfolio_timeseries import as_float, to_epoch
+
 logger = logging.getLogger(__name__)
 
+PERIODS = ("7d", "30d", "90d", "1y", "all")
+
 
 class PerformanceCalculator:
     """
@@ -131,27 +134,16 @@ class PerformanceCalculator:
             if not filtered_trades:
                 return {"error": "No trades in specified period"}
             
-            # Calculate trading metrics
+            # Calculate trading metrics on arrays
+            trade_pnl = np.array([self._calculate_trade_pnl(trade) for trade in filtered_trades], dtype=np.float64)
+            fees = np.array([as_float(trade.get("total_fees", 0.0)) for trade in filtered_trades], dtype=np.float64)
+            
             total_trades = len(filtered_trades)
-            winning_trades = 0
-            losing_trades = 0
-            total_profit = 0.0
-            total_loss = 0.0
-            total_fees = 0.0
-            
-            for trade in filtered_trades:
-                # Calculate trade P&L
-                trade_pnl = self._calculate_trade_pnl(trade)
-                fees = trade.get("total_fees", 0.0)
-                
-                total_fees += fees
-                
-                if trade_pnl > 0:
-                    winning_trades += 1
-                    total_profit += trade_pnl
-                elif trade_pnl < 0:
-                    losing_trades += 1
-                    total_loss += abs(trade_pnl)
+            winning_trades = int(np.count_nonzero(trade_pnl > 0))
+            losing_trades = int(np.count_nonzero(trade_pnl < 0))
+            total_profit = float(trade_pnl[trade_pnl > 0].sum())
+            total_loss = float(-trade_pnl[trade_pnl < 0].sum())
+            total_fees = float(fees.sum())
             
             # Calculate performance metrics
             win_rate = (winning_trades / total_trades) * 100 if total_trades > 0 else 0
@@ -234,60 +226,62 @@ class PerformanceCalculator:
             logger.error(f"Error calculating market performance: {e}")
             return {"error": str(e)}
     
-    def calculate_risk_metrics(self, snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _snapshot_values(snapshots: Union[List[Dict[str, Any]], Dict[str, np.ndarray]],
+                         sort: bool = True) -> np.ndarray:
+        """
+        Portfolio values as an array, in time order unless ``sort`` is False
+        
+        Accepts either a list of snapshot dicts or the columnar arrays returned
+        by PerformanceTracker.get_snapshot_arrays().
+        """
+        if isinstance(snapshots, dict):
+            timestamps = np.asarray(snapshots.get("timestamp", []), dtype=np.float64)
+            values = np.asarray(snapshots.get("total_value_eur", []), dtype=np.float64)
+            if sort:
+                values = values[np.argsort(timestamps, kind='stable')]
+            return np.nan_to_num(values)
+        
+        ordered = sorted(snapshots, key=lambda x: x["timestamp"]) if sort else snapshots
+        return np.array([as_float(s["total_value_eur"]) for s in ordered], dtype=np.float64)
+    
+    def calculate_risk_metrics(self, snapshots: Union[List[Dict[str, Any]], Dict[str, np.ndarray]]) -> Dict[str, Any]:
         """
         Calculate risk metrics including volatility, Sharpe ratio, and max drawdown
         
         Args:
-            snapshots: Portfolio snapshots
+            snapshots: Portfolio snapshots, as dicts or columnar arrays
             
         Returns:
             Dict containing risk metrics
         """
         try:
-            if len(snapshots) < 3:
+            values = self._snapshot_values(snapshots)
+            if len(values) < 3:
                 return {"error": "Insufficient data for risk calculation"}
             
-            # Sort snapshots and calculate daily returns
-            sorted_snapshots = sorted(snapshots, key=lambda x: x["timestamp"])
-            daily_returns = []
-            
-            for i in range(1, len(sorted_snapshots)):
-                prev_value_raw = sorted_snapshots[i-1]["total_value_eur"]
-                curr_value_raw = sorted_snapshots[i]["total_value_eur"]
-                
-                # Handle both dict and float formats
-                if isinstance(prev_value_raw, dict):
-                    prev_value = float(prev_value_raw.get("amount", 0))
-                else:
-                    prev_value = float(prev_value_raw) if prev_value_raw else 0
-                    
-                if isinstance(curr_value_raw, dict):
-                    curr_value = float(curr_value_raw.get("amount", 0))
-                else:
-                    curr_value = float(curr_value_raw) if curr_value_raw else 0
-                
-                if prev_value > 0:
-                    daily_return = (curr_value - prev_value) / prev_value
-                    daily_returns.append(daily_return)
+            # Period-over-period returns, skipping intervals that start at zero
+            prev_values = values[:-1]
+            valid = prev_values > 0
+            daily_returns = (values[1:][valid] - prev_values[valid]) / prev_values[valid]
             
             if len(daily_returns) < 2:
                 return {"error": "Insufficient return data"}
             
             # Calculate volatility (standard deviation of returns)
-            volatility_daily = stdev(daily_returns) if len(daily_returns) > 1 else 0
+            volatility_daily = float(np.std(daily_returns, ddof=1))
             volatility_annualized = volatility_daily * math.sqrt(252)  # 252 trading days per year
             
             # Calculate Sharpe ratio (assuming 0% risk-free rate)
-            mean_return = mean(daily_returns)
+            mean_return = float(np.mean(daily_returns))
             sharpe_ratio = (mean_return / volatility_daily) * math.sqrt(252) if volatility_daily > 0 else 0
             
             # Calculate maximum drawdown
-            max_drawdown = self._calculate_max_drawdown(sorted_snapshots)
+            max_drawdown = self._max_drawdown(values)
             
             # Calculate downside deviation (for Sortino ratio)
-            negative_returns = [r for r in daily_returns if r < 0]
-            downside_deviation = stdev(negative_returns) if len(negative_returns) > 1 else 0
+            negative_returns = daily_returns[daily_returns < 0]
+            downside_deviation = float(np.std(negative_returns, ddof=1)) if len(negative_returns) > 1 else 0
             downside_deviation_annualized = downside_deviation * math.sqrt(252)
             
             # Calculate Sortino ratio
@@ -310,34 +304,20 @@ class PerformanceCalculator:
             logger.error(f"Error calculating risk metrics: {e}")
             return {"error": str(e)}
     
-    def _calculate_max_drawdown(self, snapshots: List[Dict[str, Any]]) -> float:
+    @staticmethod
+    def _max_drawdown(values: np.ndarray) -> float:
+        """Maximum peak-to-trough decline in percent, via a running maximum"""
+        if len(values) < 2:
+            return 0.0
+        peaks = np.maximum.accumulate(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(peaks > 0, (peaks - values) / peaks * 100, 0.0)
+        return float(max(drawdowns.max(), 0.0))
+    
+    def _calculate_max_drawdown(self, snapshots: Union[List[Dict[str, Any]], Dict[str, np.ndarray]]) -> float:
         """Calculate maximum drawdown from portfolio snapshots"""
         try:
-            if len(snapshots) < 2:
-                return 0.0
-            
-            # Handle both dict and float formats for total_value_eur
-            values = []
-            for s in snapshots:
-                value_raw = s["total_value_eur"]
-                if isinstance(value_raw, dict):
-                    value = float(value_raw.get("amount", 0))
-                else:
-                    value = float(value_raw) if value_raw else 0
-                values.append(value)
-            
-            peak = values[0]
-            max_drawdown = 0.0
-            
-            for value in values:
-                if value > peak:
-                    peak = value
-                
-                drawdown = ((peak - value) / peak) * 100 if peak > 0 else 0
-                max_drawdown = max(max_drawdown, drawdown)
-            
-            return max_drawdown
-            
+            return self._max_drawdown(self._snapshot_values(snapshots, sort=False))
         except Exception as e:
             logger.error(f"Error calculating max drawdown: {e}")
             return 0.0
@@ -358,6 +338,19 @@ class PerformanceCalculator:
             logger.error(f"Error calculating trade P&L: {e}")
             return 0.0
     
+    @staticmethod
+    def _timestamps_to_epoch(items: List[Dict[str, Any]]) -> np.ndarray:
+        """Parse each item's ISO timestamp once (NaN where missing or invalid)"""
+        epochs = np.full(len(items), np.nan, dtype=np.float64)
+        for i, item in enumerate(items):
+            timestamp = item.get("timestamp")
+            if timestamp:
+                try:
+                    epochs[i] = to_epoch(timestamp)
+                except (TypeError, ValueError):
+                    pass
+        return epochs
+    
     def _filter_trades_by_period(self, trades: List[Dict[str, Any]], 
                                start_date: Optional[str], 
                                end_date: Optional[str]) -> List[Dict[str, Any]]:
@@ -366,35 +359,182 @@ class PerformanceCalculator:
             if not start_date and not end_date:
                 return trades
             
-            filtered_trades = []
+            epochs = self._timestamps_to_epoch(trades)
+            mask = ~np.isnan(epochs)
+            if start_date:
+                mask &= epochs >= to_epoch(start_date)
+            if end_date:
+                mask &= epochs <= to_epoch(end_date)
             
-            for trade in trades:
-                trade_date = trade.get("timestamp")
-                if not trade_date:
-                    continue
-                
-                trade_datetime = datetime.fromisoformat(trade_date)
-                
-                # Check start date
-                if start_date:
-                    start_datetime = datetime.fromisoformat(start_date)
-                    if trade_datetime < start_datetime:
-                        continue
-                
-                # Check end date
-                if end_date:
-                    end_datetime = datetime.fromisoformat(end_date)
-                    if trade_datetime > end_datetime:
-                        continue
-                
-                filtered_trades.append(trade)
-            
-            return filtered_trades
+            return [trades[i] for i in np.flatnonzero(mask)]
             
         except Exception as e:
             logger.error(f"Error filtering trades by period: {e}")
             return trades
     
+    def calculate_period_metrics(self, timestamps: np.ndarray, values: np.ndarray,
+                                 periods: Tuple[str, ...] = PERIODS,
+                                 trade_history: Optional[List[Dict[str, Any]]] = None,
+                                 now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Return, risk and win-rate metrics for several periods in one pass
+        
+        Returns are computed once for the whole history; per-period mean and
+        (downside) deviation come from prefix sums over those returns, and max
+        drawdown from a running maximum over each period's slice. Trade
+        timestamps are parsed once and periods are selected by binary search.
+        
+        Args:
+            timestamps: Snapshot times in epoch seconds (any order)
+            values: Portfolio values aligned with ``timestamps``
+            periods: Periods such as "7d", "30d", "1y" or "all"
+            trade_history: Optional trades used for per-period win rate
+            now: Reference time for period windows (defaults to now, UTC)
+            
+        Returns:
+            Dict of period -> {"total_return": {...}, "risk_metrics": {...},
+            "trading": {...}}; sections with too little data hold {"error": ...}
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, values = timestamps[order], values[order]
+        now_epoch = (now or datetime.now(timezone.utc)).timestamp()
+        
+        # Returns between consecutive snapshots; return i ends at snapshot i + 1
+        prev_values = values[:-1]
+        valid = prev_values > 0
+        returns = np.zeros(len(prev_values))
+        np.divide(values[1:] - prev_values, prev_values, out=returns, where=valid)
+        negative = valid & (returns < 0)
+        
+        def prefix(x: np.ndarray) -> np.ndarray:
+            return np.concatenate(([0.0], np.cumsum(x)))
+        
+        count, total, squares = prefix(valid), prefix(np.where(valid, returns, 0.0)), prefix(np.where(valid, returns ** 2, 0.0))
+        neg_count, neg_total, neg_squares = (prefix(negative), prefix(np.where(negative, returns, 0.0)),
+                                             prefix(np.where(negative, returns ** 2, 0.0)))
+        
+        trades = self._trade_arrays(trade_history) if trade_history else None
+        
+        results = {}
+        for period in periods:
+            since = self._period_start_epoch(period, now_epoch)
+            start = 0 if since is None else int(np.searchsorted(timestamps, since, side='left'))
+            stop = len(values)
+            
+            results[period] = {
+                "total_return": self._window_total_return(timestamps, values, start, stop, period),
+                "risk_metrics": self._window_risk_metrics(values, start, stop, count, total, squares,
+                                                          neg_count, neg_total, neg_squares),
+                "trading": self._window_trading(trades, since)
+            }
+        return results
+    
+    @staticmethod
+    def _period_start_epoch(period: str, now_epoch: float) -> Optional[float]:
+        if period == "all":
+            return None
+        if period.endswith('d'):
+            return now_epoch - int(period[:-1]) * 86400
+        if period.endswith('y'):
+            return now_epoch - int(period[:-1]) * 365 * 86400
+        logger.warning(f"Unknown period format: {period}, using all data")
+        return None
+    
+    @staticmethod
+    def _window_total_return(timestamps: np.ndarray, values: np.ndarray,
+                             start: int, stop: int, period: str) -> Dict[str, Any]:
+        if stop - start < 2:
+            return {"error": "Insufficient data for return calculation"}
+        initial_value, final_value = float(values[start]), float(values[stop - 1])
+        if initial_value <= 0:
+            return {"error": "Invalid initial portfolio value"}
+        
+        absolute_return = final_value - initial_value
+        days_elapsed = int((timestamps[stop - 1] - timestamps[start]) // 86400)
+        annualized_return = 0.0
+        if days_elapsed > 0:
+            annualized_return = (((final_value / initial_value) ** (1 / (days_elapsed / 365.25))) - 1) * 100
+        
+        return {
+            "period": period,
+            "start_date": datetime.fromtimestamp(timestamps[start], timezone.utc).isoformat(),
+            "end_date": datetime.fromtimestamp(timestamps[stop - 1], timezone.utc).isoformat(),
+            "days_elapsed": days_elapsed,
+            "initial_value": initial_value,
+            "final_value": final_value,
+            "absolute_return": absolute_return,
+            "percentage_return": (absolute_return / initial_value) * 100,
+            "annualized_return": annualized_return,
+            "snapshots_used": stop - start
+        }
+    
+    def _window_risk_metrics(self, values: np.ndarray, start: int, stop: int,
+                             count, total, squares, neg_count, neg_total, neg_squares) -> Dict[str, Any]:
+        if stop - start < 3:
+            return {"error": "Insufficient data for risk calculation"}
+        
+        # Returns inside the window are those ending at snapshots start+1 .. stop-1
+        lo, hi = start, stop - 1
+        samples = int(count[hi] - count[lo])
+        if samples < 2:
+            return {"error": "Insufficient return data"}
+        
+        def sample_std(n, s1, s2):
+            return math.sqrt(max((s2 - s1 * s1 / n) / (n - 1), 0.0)) if n > 1 else 0.0
+        
+        mean_return = (total[hi] - total[lo]) / samples
+        volatility_daily = sample_std(samples, total[hi] - total[lo], squares[hi] - squares[lo])
+        neg_samples = int(neg_count[hi] - neg_count[lo])
+        downside_deviation = sample_std(neg_samples, neg_total[hi] - neg_total[lo], neg_squares[hi] - neg_squares[lo])
+        
+        return {
+            "volatility_daily": volatility_daily,
+            "volatility_annualized": volatility_daily * math.sqrt(252),
+            "sharpe_ratio": (mean_return / volatility_daily) * math.sqrt(252) if volatility_daily > 0 else 0,
+            "sortino_ratio": (mean_return / downside_deviation) * math.sqrt(252) if downside_deviation > 0 else 0,
+            "max_drawdown": self._max_drawdown(values[start:stop]),
+            "downside_deviation": downside_deviation * math.sqrt(252),
+            "return_samples": samples
+        }
+    
+    def _trade_arrays(self, trade_history: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Trade timestamps, P&L and fees as arrays sorted by time"""
+        epochs = self._timestamps_to_epoch(trade_history)
+        keep = np.flatnonzero(~np.isnan(epochs))
+        keep = keep[np.argsort(epochs[keep], kind='stable')]
+        trades = [trade_history[i] for i in keep]
+        return {
+            "timestamp": epochs[keep],
+            "pnl": np.array([self._calculate_trade_pnl(trade) for trade in trades], dtype=np.float64),
+            "fees": np.array([as_float(trade.get("total_fees", 0.0)) for trade in trades], dtype=np.float64)
+        }
+    
+    @staticmethod
+    def _window_trading(trades: Optional[Dict[str, np.ndarray]], since: Optional[float]) -> Dict[str, Any]:
+        if trades is None:
+            return {"error": "No trade history available"}
+        start = 0 if since is None else int(np.searchsorted(trades["timestamp"], since, side='left'))
+        pnl, fees = trades["pnl"][start:], trades["fees"][start:]
+        if len(pnl) == 0:
+            return {"error": "No trades in specified period"}
+        
+        winning_trades = int(np.count_nonzero(pnl > 0))
+        losing_trades = int(np.count_nonzero(pnl < 0))
+        total_profit = float(pnl[pnl > 0].sum())
+        total_loss = float(-pnl[pnl < 0].sum())
+        return {
+            "total_trades": len(pnl),
+            "winning_trades": winning_trades,
+            "losing_trades": losing_trades,
+            "win_rate": winning_trades / len(pnl) * 100,
+            "total_profit": total_profit,
+            "total_loss": total_loss,
+            "total_fees": float(fees.sum()),
+            "net_profit": total_profit - total_loss - float(fees.sum())
+        }
+    
     def calculate_annualized_return(self, snapshots: List[Dict[str, Any]], 
                                   period: str = "all") -> float:
         """
@@ -82,27 +82,15 @@ class PerformanceDashboardUpdater:
             # Get snapshots for analysis
             snapshots = self.tracker._load_snapshots()
             
-            # Generate data for different time periods
-            periods = ["7d", "30d", "90d", "1y", "all"]
+            # Generate data for different time periods from one pass over the history
+            periods = ("7d", "30d", "90d", "1y", "all")
+            period_metrics = self._calculate_period_metrics(periods)
             period_data = {}
             
             for period in periods:
                 period_summary = self.tracker.get_performance_summary(period)
                 if "error" not in period_summary:
-                    # Add calculated metrics
-                    period_snapshots = self.tracker._filter_snapshots_by_period(snapshots, period)
-                    if len(period_snapshots) >= 2:
-                        # Calculate additional metrics
-                        total_return_data = self.calculator.calculate_total_return(period_snapshots, period)
-                        risk_metrics = self.calculator.calculate_risk_metrics(period_snapshots)
-                        
-                        period_data[period] = {
-                            **period_summary,
-                            "total_return_data": total_return_data if "error" not in total_return_data else None,
-                            "risk_metrics": risk_metrics if "error" not in risk_metrics else None
-                        }
-                    else:
-                        period_data[period] = period_summary
+                    period_data[period] = {**period_summary, **period_metrics.get(period, {})}
                 else:
                     period_data[period] = {"error": period_summary["error"]}
             
@@ -136,6 +124,23 @@ class PerformanceDashboardUpdater:
                 "error": str(e)
             }
     
+    def _calculate_period_metrics(self, periods: tuple) -> Dict[str, Dict[str, Any]]:
+        """Return and risk metrics for each period with at least two snapshots"""
+        arrays = self.tracker.get_snapshot_arrays("all")
+        results = self.calculator.calculate_period_metrics(
+            arrays["timestamp"], arrays["total_value_eur"], periods)
+        
+        period_metrics = {}
+        for period, result in results.items():
+            total_return_data = result["total_return"]
+            risk_metrics = result["risk_metrics"]
+            if total_return_data.get("snapshots_used", 0) >= 2:
+                period_metrics[period] = {
+                    "total_return_data": total_return_data if "error" not in total_return_data else None,
+                    "risk_metrics": risk_metrics if "error" not in risk_metrics else None
+                }
+        return period_metrics
+    
     def _generate_chart_data(self, snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate chart data for dashboard visualization"""
         try:
@@ -366,20 +371,12 @@ class PerformanceDashboardUpdater:
             if "error" in summary:
                 return summary
             
-            # Get snapshots for the period
-            snapshots = self.tracker._load_snapshots()
-            period_snapshots = self.tracker._filter_snapshots_by_period(snapshots, period)
-            
-            if len(period_snapshots) >= 2:
-                # Calculate additional metrics
-                total_return_data = self.calculator.calculate_total_return(period_snapshots, period)
-                risk_metrics = self.calculator.calculate_risk_metrics(period_snapshots)
-                
+            metrics = self._calculate_period_metrics((period,)).get(period)
+            if metrics:
                 return {
                     **summary,
-                    "total_return_data": total_return_data if "error" not in total_return_data else None,
-                    "risk_metrics": risk_metrics if "error" not in risk_metrics else None,
-                    "snapshots_used": len(period_snapshots)
+                    **metrics,
+                    "snapshots_used": summary["snapshots_count"]
                 }
             else:
                 return summary
@@ -12,8 +12,17 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 
+import numpy as np
+
+from utils.performance.portfolio_timeseries import PortfolioTimeSeries, to_epoch, as_float
+from utils.performance.performance_calculator import PerformanceCalculator, PERIODS
+
 logger = logging.getLogger(__name__)
 
+# Expired snapshots are trimmed once they exceed retention by this fraction,
+# so the store is rewritten occasionally rather than on every snapshot
+RETENTION_TRIM_SLACK = 0.1
+
 
 class PerformanceTracker:
     """
@@ -42,6 +51,10 @@ class PerformanceTracker:
         # Load or initialize configuration
         self.config = self._load_or_create_config()
         
+        # Columnar snapshot history (replaces the portfolio_snapshots.json array)
+        self.store = PortfolioTimeSeries(self.config_path / "snapshots")
+        self._migrate_snapshots_file()
+        
         logger.info(f"Performance tracker initialized with config path: {config_path}")
     
     def _ensure_directory_structure(self) -> None:
@@ -193,33 +206,11 @@ class PerformanceTracker:
                 "trading_session_id": portfolio_data.get("trading_session_id", "unknown")
             }
             
-            # Load existing snapshots
-            snapshots = self._load_snapshots()
+            self.store.append(current_time, total_value_eur,
+                              assets=self._snapshot_assets(snapshot), meta=snapshot)
             
-            # Add new snapshot
-            snapshots.append(snapshot)
-            
-            # Keep only recent snapshots (configurable retention)
-            retention_days = self.config.get("retention_days", 365)
-            cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
-            
-            # Filter snapshots with timezone-aware comparison
-            filtered_snapshots = []
-            for s in snapshots:
-                try:
-                    snapshot_time = datetime.fromisoformat(s["timestamp"])
-                    # Make timezone-aware if naive
-                    if snapshot_time.tzinfo is None:
-                        snapshot_time = snapshot_time.replace(tzinfo=timezone.utc)
-                    if snapshot_time > cutoff_date:
-                        filtered_snapshots.append(s)
-                except Exception as e:
-                    logger.warning(f"Error parsing snapshot timestamp: {e}")
-                    # Keep snapshot if we can't parse timestamp
-                    filtered_snapshots.append(s)
-            
-            # Save snapshots
-            self._save_snapshots(filtered_snapshots)
+            # Drop snapshots past the configurable retention window
+            self._apply_retention()
             
             # Update last snapshot date in config
             self.config["last_snapshot_date"] = current_time
@@ -265,29 +256,164 @@ class PerformanceTracker:
             logger.error(f"Error checking snapshot frequency: {e}")
             return True  # Default to taking snapshot on error
     
+    def _migrate_snapshots_file(self) -> None:
+        """Import a legacy portfolio_snapshots.json into the columnar store"""
+        if not self.snapshots_file.exists() or len(self.store):
+            return
+        try:
+            with open(self.snapshots_file, 'r') as f:
+                snapshots = json.load(f)
+            if isinstance(snapshots, list):
+                self._save_snapshots(snapshots)
+            self.snapshots_file.rename(self.snapshots_file.with_suffix(".json.migrated"))
+            logger.info(f"Migrated {len(snapshots)} portfolio snapshots to {self.store.directory}")
+        except Exception as e:
+            logger.error(f"Error migrating portfolio snapshots: {e}")
+    
+    @staticmethod
+    def _snapshot_assets(snapshot: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """Numeric per-asset columns (amounts and prices) from a snapshot"""
+        assets: Dict[str, Dict[str, float]] = {}
+        composition = snapshot.get("portfolio_composition")
+        if isinstance(composition, dict):
+            for asset, value in composition.items():
+                if isinstance(value, (int, float, dict)):
+                    assets.setdefault(asset, {})["amount"] = as_float(value)
+        prices = snapshot.get("asset_prices")
+        if isinstance(prices, dict):
+            for asset, value in prices.items():
+                if isinstance(value, (int, float, dict)):
+                    assets.setdefault(asset, {})["price"] = as_float(value)
+        return assets
+    
+    def _apply_retention(self) -> None:
+        """Trim expired snapshots once enough of them have accumulated"""
+        retention_days = self.config.get("retention_days", 365)
+        now = datetime.now(timezone.utc)
+        oldest = self.store.first_timestamp()
+        slack = timedelta(days=retention_days * RETENTION_TRIM_SLACK)
+        if oldest is not None and oldest < (now - timedelta(days=retention_days) - slack).timestamp():
+            removed = self.store.trim_before(now - timedelta(days=retention_days))
+            logger.debug(f"Trimmed {removed} expired portfolio snapshots")
+    
+    def _retention_cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(days=self.config.get("retention_days", 365))
+    
     def _load_snapshots(self) -> List[Dict[str, Any]]:
-        """Load portfolio snapshots from file"""
+        """Load portfolio snapshots within retention (oldest first)"""
         try:
-            if self.snapshots_file.exists():
-                with open(self.snapshots_file, 'r') as f:
-                    snapshots = json.load(f)
-                return snapshots if isinstance(snapshots, list) else []
-            else:
-                return []
+            return self.store.metadata(since=self._retention_cutoff())
         except Exception as e:
             logger.error(f"Error loading portfolio snapshots: {e}")
             return []
     
     def _save_snapshots(self, snapshots: List[Dict[str, Any]]) -> None:
-        """Save portfolio snapshots to file"""
+        """Replace the stored snapshots with ``snapshots``"""
         try:
-            with open(self.snapshots_file, 'w') as f:
-                json.dump(snapshots, f, indent=2)
+            records = []
+            for snapshot in snapshots:
+                values = {"timestamp": to_epoch(snapshot["timestamp"]),
+                          "total_value_eur": as_float(snapshot.get("total_value_eur", 0.0))}
+                for asset, fields in self._snapshot_assets(snapshot).items():
+                    for field, value in fields.items():
+                        values[f"{asset}_{field}"] = value
+                records.append((values, snapshot))
+            self.store.replace(records)
             logger.debug(f"Saved {len(snapshots)} portfolio snapshots")
         except Exception as e:
             logger.error(f"Failed to save portfolio snapshots: {e}")
             raise
     
+    def get_snapshot_arrays(self, period: str = "all") -> Dict[str, np.ndarray]:
+        """
+        Snapshot history for a period as columnar arrays
+        
+        Args:
+            period: Time period ("7d", "30d", "90d", "1y", "all")
+            
+        Returns:
+            Dict of column name to array ("timestamp" in epoch seconds,
+            "total_value_eur", and "<asset>_amount"/"<asset>_price" columns)
+        """
+        return self.store.arrays(since=self._period_start(period))
+    
+    def get_performance_metrics(self, periods: tuple = PERIODS,
+                                trade_history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Performance metrics for several periods from one read of the history
+        
+        Args:
+            periods: Periods to report ("7d", "30d", "90d", "1y", "all")
+            trade_history: Optional trades for per-period win rate
+            
+        Returns:
+            Dict with "periods" mapping each period to flat metrics (percentages
+            for returns, drawdown and annualized volatility) and the full
+            "details" from PerformanceCalculator.calculate_period_metrics()
+        """
+        try:
+            arrays = self.get_snapshot_arrays("all")
+            details = PerformanceCalculator().calculate_period_metrics(
+                arrays["timestamp"], arrays["total_value_eur"], periods, trade_history=trade_history)
+            
+            metrics = {}
+            for period, result in details.items():
+                total_return = result["total_return"]
+                if "error" in total_return:
+                    continue
+                risk = result["risk_metrics"] if "error" not in result["risk_metrics"] else {}
+                trading = result["trading"] if "error" not in result["trading"] else {}
+                metrics[period] = {
+                    "total_return": total_return["percentage_return"],
+                    "annualized_return": total_return["annualized_return"],
+                    "absolute_return": total_return["absolute_return"],
+                    "sharpe_ratio": risk.get("sharpe_ratio", 0),
+                    "sortino_ratio": risk.get("sortino_ratio", 0),
+                    "max_drawdown": risk.get("max_drawdown", 0),
+                    "volatility": risk.get("volatility_annualized", 0) * 100,
+                    "win_rate": trading.get("win_rate", 0),
+                    "snapshots_used": total_return["snapshots_used"],
+                    "details": result
+                }
+            
+            return {
+                "calculated_at": datetime.now(timezone.utc).isoformat(),
+                "periods": metrics
+            }
+        except Exception as e:
+            logger.error(f"Error calculating performance metrics: {e}")
+            return {"error": str(e), "periods": {}}
+    
+    def get_portfolio_snapshots(self) -> Dict[str, Any]:
+        """Snapshots within retention in export format (timestamp, total_value, holdings)"""
+        snapshots = []
+        for snapshot in self._load_snapshots():
+            composition = snapshot.get("portfolio_composition")
+            holdings = {}
+            if isinstance(composition, dict):
+                holdings = {asset: as_float(value) for asset, value in composition.items()
+                            if isinstance(value, (int, float, dict))}
+            snapshots.append({
+                "timestamp": snapshot.get("timestamp"),
+                "total_value": as_float(snapshot.get("total_value_eur", 0.0)),
+                "holdings": holdings
+            })
+        return {"snapshots": snapshots}
+    
+    def _period_start(self, period: str) -> datetime:
+        """Start of a reporting period, bounded by the retention window"""
+        cutoff = self._retention_cutoff()
+        if period == "all":
+            return cutoff
+        if period.endswith('d'):
+            start = datetime.now(timezone.utc) - timedelta(days=int(period[:-1]))
+        elif period.endswith('y'):
+            start = datetime.now(timezone.utc) - timedelta(days=int(period[:-1]) * 365)
+        else:
+            logger.warning(f"Unknown period format: {period}, using all data")
+            return cutoff
+        return max(start, cutoff)
+    
     def reset_performance_tracking(self, current_portfolio_value: float,
                                  current_portfolio_composition: Dict[str, Any],
                                  reason: str = "user_request") -> bool:
@@ -359,42 +485,30 @@ class PerformanceTracker:
             if not self.config.get("tracking_enabled", False):
                 return {"error": "Performance tracking not enabled"}
             
-            snapshots = self._load_snapshots()
-            if len(snapshots) < 2:
+            if self.get_snapshots_count() < 2:
                 return {"error": "Insufficient data for performance calculation"}
             
-            # Filter snapshots by period
-            filtered_snapshots = self._filter_snapshots_by_period(snapshots, period)
-            
-            if len(filtered_snapshots) < 2:
+            # Binary-search the period window in the columnar store
+            rows = self.store.window(since=self._period_start(period))
+            if rows.stop - rows.start < 2:
                 return {"error": f"Insufficient data for {period} period"}
             
-            # Calculate basic performance metrics
-            initial_value_raw = filtered_snapshots[0]["total_value_eur"]
-            current_value_raw = filtered_snapshots[-1]["total_value_eur"]
-            
-            # Handle both dict and float formats for total_value_eur
-            if isinstance(initial_value_raw, dict):
-                initial_value = float(initial_value_raw.get("amount", 0))
-            else:
-                initial_value = float(initial_value_raw) if initial_value_raw else 0
-                
-            if isinstance(current_value_raw, dict):
-                current_value = float(current_value_raw.get("amount", 0))
-            else:
-                current_value = float(current_value_raw) if current_value_raw else 0
+            values = self.store.column("total_value_eur", rows)
+            initial_value = float(values[0])
+            current_value = float(values[-1])
+            first_snapshot, last_snapshot = self.store.metadata_at([rows.start, rows.stop - 1])
             
             total_return = ((current_value - initial_value) / initial_value) * 100 if initial_value > 0 else 0
             
             summary = {
                 "period": period,
-                "start_date": filtered_snapshots[0]["timestamp"],
-                "end_date": filtered_snapshots[-1]["timestamp"],
+                "start_date": first_snapshot["timestamp"],
+                "end_date": last_snapshot["timestamp"],
                 "initial_value": initial_value,
                 "current_value": current_value,
                 "absolute_change": current_value - initial_value,
                 "total_return_percent": total_return,
-                "snapshots_count": len(filtered_snapshots),
+                "snapshots_count": rows.stop - rows.start,
                 "tracking_enabled": True
             }
             
@@ -422,24 +536,20 @@ class PerformanceTracker:
                 logger.warning(f"Unknown period format: {period}, using all data")
                 return snapshots
             
-            # Filter snapshots - ensure both datetimes are timezone-aware
-            filtered = []
+            # Parse timestamps once, then filter and sort on the epoch array
+            valid = []
+            epochs = []
             for s in snapshots:
                 try:
-                    snapshot_time = datetime.fromisoformat(s["timestamp"])
-                    # Make timezone-aware if naive
-                    if snapshot_time.tzinfo is None:
-                        snapshot_time = snapshot_time.replace(tzinfo=timezone.utc)
-                    if snapshot_time >= cutoff_date:
-                        filtered.append(s)
+                    epochs.append(to_epoch(s["timestamp"]))
+                    valid.append(s)
                 except Exception as e:
                     logger.warning(f"Error parsing snapshot timestamp: {e}")
-                    continue
-            
-            # Sort by timestamp
-            filtered.sort(key=lambda x: x["timestamp"])
             
-            return filtered
+            epochs = np.asarray(epochs, dtype=np.float64)
+            order = np.argsort(epochs, kind='stable')
+            keep = order[epochs[order] >= cutoff_date.timestamp()]
+            return [valid[i] for i in keep]
             
         except Exception as e:
             logger.error(f"Error filtering snapshots by period {period}: {e}")
@@ -464,8 +574,8 @@ class PerformanceTracker:
     def get_snapshots_count(self) -> int:
         """Get total number of snapshots"""
         try:
-            snapshots = self._load_snapshots()
-            return len(snapshots)
+            rows = self.store.window(since=self._retention_cutoff())
+            return rows.stop - rows.start
         except Exception as e:
             logger.error(f"Error getting snapshots count: {e}")
             return 0
@@ -0,0 +1,404 @@
+"""
+Portfolio Time Series - Columnar append-only store for portfolio history
+
+Each row is a fixed-width record of float64 columns (timestamp, total value and
+one amount/price column per asset) appended to a flat binary file, so appends
+are O(1) and readers map the history into NumPy arrays without parsing. A new
+asset starts a wider segment of rows instead of rewriting earlier ones.
+Non-numeric fields (snapshot type, composition details, ISO timestamps) are
+kept alongside in a JSONL file with one line per row, indexed by byte offset
+so a row range is read without parsing the rest of the file.
+"""
+
+import json
+import os
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BASE_COLUMNS = ["timestamp", "total_value_eur"]
+
+
+def to_epoch(timestamp: Union[str, datetime, float, int]) -> float:
+    """Convert an ISO timestamp or datetime to UTC epoch seconds (naive values are UTC)"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def as_float(value: Any) -> float:
+    """Read a numeric portfolio value that may be stored as {"amount": x}"""
+    if isinstance(value, dict):
+        value = value.get("amount", 0)
+    try:
+        return float(value) if value else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PortfolioTimeSeries:
+    """
+    Append-only columnar time series of portfolio values
+
+    Files in ``directory``:
+        columns.json  - ordered column names and the row segments of data.f64
+        data.f64      - row-major float64 records, one per append
+        meta.jsonl    - one JSON object per row with non-numeric fields
+        meta.idx      - int64 end offset of each row's line in meta.jsonl
+
+    Columns are only ever added at the end. A segment is a run of rows with the
+    same width; when an asset column appears, later rows go into a new, wider
+    segment and earlier rows read the new column as NaN. A row older than the
+    last one rewrites only the rows after its position.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.columns_file = self.directory / "columns.json"
+        self.data_file = self.directory / "data.f64"
+        self.meta_file = self.directory / "meta.jsonl"
+        self.index_file = self.directory / "meta.idx"
+
+        self.columns: List[str] = list(BASE_COLUMNS)
+        # (first row, byte offset in data.f64, width) per segment
+        self.segments: List[Tuple[int, int, int]] = [(0, 0, len(self.columns))]
+        if self.columns_file.exists():
+            try:
+                with open(self.columns_file, 'r') as f:
+                    layout = json.load(f)
+                if isinstance(layout, list):
+                    # Single-width store written before segments existed
+                    self.columns = layout
+                    self.segments = [(0, 0, len(layout))]
+                else:
+                    self.columns = layout["columns"]
+                    self.segments = [tuple(segment) for segment in layout["segments"]]
+            except Exception as e:
+                logger.error(f"Error loading time series columns from {self.columns_file}: {e}")
+        self._repair()
+        self._last_timestamp = self._read_last_timestamp()
+
+    # ===== Layout =====
+
+    @property
+    def width(self) -> int:
+        return len(self.columns)
+
+    def _data_size(self) -> int:
+        try:
+            return self.data_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _segment_rows(self, data_size: Optional[int] = None) -> List[Tuple[int, int, int, int]]:
+        """(first row, row count, byte offset, width) of every segment"""
+        data_size = self._data_size() if data_size is None else data_size
+        spans = []
+        for i, (first_row, offset, width) in enumerate(self.segments):
+            if i + 1 < len(self.segments):
+                rows = self.segments[i + 1][0] - first_row
+            else:
+                rows = max(0, data_size - offset) // (8 * width)
+            spans.append((first_row, rows, offset, width))
+        return spans
+
+    def __len__(self) -> int:
+        first_row, rows, _, _ = self._segment_rows()[-1]
+        return first_row + rows
+
+    def _save_layout(self) -> None:
+        temp_file = self.columns_file.with_name(self.columns_file.name + ".tmp")
+        with open(temp_file, 'w') as f:
+            json.dump({"columns": self.columns, "segments": [list(segment) for segment in self.segments]}, f)
+        os.replace(temp_file, self.columns_file)
+
+    def _row_offset(self, row: int) -> int:
+        """Byte offset of ``row`` in data.f64 (or of the end of its segment)"""
+        for first_row, rows, offset, width in reversed(self._segment_rows()):
+            if row >= first_row:
+                return offset + (row - first_row) * 8 * width
+        return 0
+
+    def _repair(self) -> None:
+        """Drop a partial trailing row and realign metadata after an interrupted append"""
+        data_size = self._data_size()
+        # Segments started by an append that never wrote its row
+        while len(self.segments) > 1 and self.segments[-1][1] > data_size:
+            self.segments.pop()
+        first_row, rows, offset, width = self._segment_rows(data_size)[-1]
+        if data_size > offset + rows * 8 * width:
+            logger.warning(f"Truncating partial row in {self.data_file}")
+            with open(self.data_file, 'r+b') as f:
+                f.truncate(offset + rows * 8 * width)
+        rows += first_row
+
+        ends = self._meta_ends()
+        meta_size = self.meta_file.stat().st_size if self.meta_file.exists() else 0
+        if ends is not None and len(ends) == rows and meta_size == (int(ends[-1]) if rows else 0):
+            return
+
+        if ends is None:
+            # No index yet (store written before it existed): build it from the lines
+            ends = self._scan_meta_ends()
+        ends = [int(end) for end in ends[:rows]]
+        meta_end = ends[-1] if ends else 0
+        with open(self.meta_file, 'ab') as f:
+            f.truncate(meta_end)
+            while len(ends) < rows:
+                f.write(b"{}\n")
+                meta_end += 3
+                ends.append(meta_end)
+        with open(self.index_file, 'wb') as f:
+            f.write(np.asarray(ends, dtype=np.int64).tobytes())
+
+    def _meta_ends(self) -> Optional[np.ndarray]:
+        """End offsets of the indexed metadata lines, or None without an index"""
+        if not self.index_file.exists():
+            return None
+        count = self.index_file.stat().st_size // 8
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.memmap(self.index_file, dtype=np.int64, mode='r', shape=(count,))
+
+    def _scan_meta_ends(self) -> List[int]:
+        """End offsets of every complete line in meta.jsonl"""
+        ends = []
+        position = 0
+        try:
+            with open(self.meta_file, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    position += len(line)
+                    ends.append(position)
+        except FileNotFoundError:
+            pass
+        return ends
+
+    def _read_last_timestamp(self) -> Optional[float]:
+        rows = len(self)
+        if rows == 0:
+            return None
+        with open(self.data_file, 'rb') as f:
+            f.seek(self._row_offset(rows - 1))
+            return float(np.frombuffer(f.read(8), dtype=np.float64)[0])
+
+    # ===== Reads =====
+
+    def _segments_in(self, start: int, stop: int):
+        """Yield (segment array, row range within it, row range in the output) overlapping [start, stop)"""
+        for first_row, rows, offset, width in self._segment_rows():
+            lo, hi = max(start, first_row), min(stop, first_row + rows)
+            if lo >= hi:
+                continue
+            segment = np.memmap(self.data_file, dtype=np.float64, mode='r', offset=offset, shape=(rows, width))
+            yield segment, slice(lo - first_row, hi - first_row), slice(lo - start, hi - start)
+
+    def _matrix(self, rows: slice = slice(None)) -> np.ndarray:
+        """Complete rows as a (rows, columns) array; a read-only map when they share one full-width segment"""
+        start, stop, _ = rows.indices(len(self))
+        stop = max(start, stop)
+        parts = list(self._segments_in(start, stop))
+        if len(parts) == 1 and parts[0][0].shape[1] == self.width:
+            segment, segment_rows, _ = parts[0]
+            return segment[segment_rows]
+        matrix = np.full((stop - start, self.width), np.nan, dtype=np.float64)
+        for segment, segment_rows, out_rows in parts:
+            matrix[out_rows, :segment.shape[1]] = segment[segment_rows]
+        return matrix
+
+    def _row(self, values: Dict[str, float], width: int) -> np.ndarray:
+        row = np.full(width, np.nan, dtype=np.float64)
+        for name, value in values.items():
+            row[self.columns.index(name)] = value
+        return row
+
+    def append(self, timestamp: Union[str, datetime, float], total_value: float,
+               assets: Optional[Dict[str, Dict[str, float]]] = None,
+               meta: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Append one observation
+
+        Args:
+            timestamp: Observation time (ISO string, datetime or epoch seconds)
+            total_value: Total portfolio value in EUR
+            assets: Optional {asset: {"amount": x, "price": y}} for any assets
+            meta: Optional JSON-serialisable fields stored with the row
+        """
+        epoch = to_epoch(timestamp)
+        values = {"timestamp": epoch, "total_value_eur": float(total_value)}
+        for asset, fields in (assets or {}).items():
+            for field, value in fields.items():
+                values[f"{asset}_{field}"] = float(value)
+
+        if self._last_timestamp is not None and epoch < self._last_timestamp:
+            # Late row: rewrite only the rows that belong after it
+            position = int(np.searchsorted(self.column("timestamp"), epoch, side='right'))
+            later = self.read(slice(position, None))
+            self._truncate(position)
+            self._append_row(values, meta or {})
+            for later_values, later_meta in later:
+                self._append_row(later_values, later_meta)
+            return
+
+        self._append_row(values, meta or {})
+
+    def _append_row(self, values: Dict[str, float], meta: Dict[str, Any]) -> None:
+        """Write one row at the end (meta line, its index entry, then the data row)"""
+        new_columns = [name for name in values if name not in self.columns]
+        if new_columns or max(self.columns.index(name) for name in values) >= self.segments[-1][2]:
+            # Start a wider segment; earlier rows are left as they are
+            self.columns.extend(new_columns)
+            rows = len(self)
+            if self.segments[-1][0] == rows:
+                self.segments[-1] = (rows, self.segments[-1][1], self.width)
+            else:
+                self.segments.append((rows, self._data_size(), self.width))
+            self._save_layout()
+
+        line = (json.dumps(meta, default=str) + "\n").encode()
+        with open(self.meta_file, 'ab') as f:
+            f.write(line)
+            meta_end = f.tell()
+        with open(self.index_file, 'ab') as f:
+            f.write(np.int64(meta_end).tobytes())
+        with open(self.data_file, 'ab') as f:
+            f.write(self._row(values, self.segments[-1][2]).tobytes())
+        self._last_timestamp = values["timestamp"]
+
+    def _truncate(self, rows: int) -> None:
+        """Drop every row from ``rows`` onwards"""
+        if rows >= len(self):
+            return
+        ends = self._meta_ends()
+        meta_end = int(ends[rows - 1]) if rows else 0
+        data_end = self._row_offset(rows)
+        with open(self.data_file, 'r+b') as f:
+            f.truncate(data_end)
+        while len(self.segments) > 1 and self.segments[-1][0] >= rows:
+            self.segments.pop()
+        self._save_layout()
+        with open(self.index_file, 'r+b') as f:
+            f.truncate(rows * 8)
+        with open(self.meta_file, 'r+b') as f:
+            f.truncate(meta_end)
+        self._last_timestamp = self._read_last_timestamp()
+
+    def read(self, rows: slice = slice(None)) -> List[tuple]:
+        """Return rows as ({column: value}, meta) pairs (all rows by default)"""
+        matrix = self._matrix(rows)
+        start, stop, _ = rows.indices(len(self))
+        metas = self._read_meta(start, max(start, stop))
+        records = []
+        for row, meta in zip(matrix, metas):
+            values = {name: float(value) for name, value in zip(self.columns, row) if not np.isnan(value)}
+            records.append((values, meta))
+        return records
+
+    def _read_meta(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Metadata of rows [start, stop), reading only their byte range of meta.jsonl"""
+        if stop <= start:
+            return []
+        ends = self._meta_ends()
+        begin = int(ends[start - 1]) if start else 0
+        with open(self.meta_file, 'rb') as f:
+            f.seek(begin)
+            lines = f.read(int(ends[stop - 1]) - begin).splitlines()
+        metas = []
+        for line in lines:
+            try:
+                metas.append(json.loads(line))
+            except json.JSONDecodeError:
+                metas.append({})
+        return metas
+
+    def _write(self, records: List[tuple], columns: List[str]) -> None:
+        """Atomically replace the store with ``records`` sorted by timestamp"""
+        records = sorted(records, key=lambda record: record[0]["timestamp"])
+        self.columns = list(columns)
+        self.segments = [(0, 0, self.width)]
+        matrix = np.full((len(records), self.width), np.nan, dtype=np.float64)
+        for i, (values, _) in enumerate(records):
+            matrix[i] = self._row(values, self.width)
+        lines = [(json.dumps(meta, default=str) + "\n").encode() for _, meta in records]
+        ends = np.cumsum([len(line) for line in lines], dtype=np.int64)
+
+        for path, write in (
+            (self.data_file, lambda f: f.write(matrix.tobytes())),
+            (self.meta_file, lambda f: f.writelines(lines)),
+            (self.index_file, lambda f: f.write(ends.tobytes())),
+        ):
+            temp_file = path.with_name(path.name + ".tmp")
+            with open(temp_file, 'wb') as f:
+                write(f)
+            os.replace(temp_file, path)
+        self._save_layout()
+        self._last_timestamp = float(matrix[-1, 0]) if len(records) else None
+
+    def replace(self, records: List[tuple]) -> None:
+        """Replace the whole history with ({column: value}, meta) pairs"""
+        columns = list(BASE_COLUMNS)
+        for values, _ in records:
+            columns.extend(name for name in values if name not in columns)
+        self._write(records, columns)
+
+    def trim_before(self, timestamp: Union[str, datetime, float]) -> int:
+        """Drop rows older than ``timestamp``; returns the number of rows removed"""
+        cutoff = to_epoch(timestamp)
+        timestamps = self.column("timestamp")
+        start = int(np.searchsorted(timestamps, cutoff, side='left'))
+        if start == 0:
+            return 0
+        self._write(self.read(slice(start, None)), self.columns)
+        return start
+
+    def first_timestamp(self) -> Optional[float]:
+        if len(self) == 0:
+            return None
+        return float(self._matrix(slice(0, 1))[0, 0])
+
+    def window(self, since: Union[str, datetime, float, None] = None,
+               until: Union[str, datetime, float, None] = None) -> slice:
+        """Row slice covering [since, until] using binary search on timestamps"""
+        timestamps = self.column("timestamp")
+        start = 0 if since is None else int(np.searchsorted(timestamps, to_epoch(since), side='left'))
+        stop = len(timestamps) if until is None else int(np.searchsorted(timestamps, to_epoch(until), side='right'))
+        return slice(start, stop)
+
+    def column(self, name: str, rows: slice = slice(None)) -> np.ndarray:
+        """A single column as an array (NaN where the row has no value)"""
+        start, stop, _ = rows.indices(len(self))
+        stop = max(start, stop)
+        values = np.full(stop - start, np.nan)
+        if name in self.columns:
+            index = self.columns.index(name)
+            for segment, segment_rows, out_rows in self._segments_in(start, stop):
+                if index < segment.shape[1]:
+                    values[out_rows] = segment[segment_rows, index]
+        return values
+
+    def arrays(self, since: Union[str, datetime, float, None] = None,
+               until: Union[str, datetime, float, None] = None) -> Dict[str, np.ndarray]:
+        """All columns for the requested time range as {column: array}"""
+        matrix = np.array(self._matrix(self.window(since, until)))
+        return {name: matrix[:, i] for i, name in enumerate(self.columns)}
+
+    def metadata(self, since: Union[str, datetime, float, None] = None,
+                 until: Union[str, datetime, float, None] = None) -> List[Dict[str, Any]]:
+        """Per-row metadata for the requested time range"""
+        rows = self.window(since, until)
+        return self._read_meta(rows.start, rows.stop)
+
+    def metadata_at(self, indices: List[int]) -> List[Dict[str, Any]]:
+        """Metadata for specific row indices"""
+        return [self._read_meta(i, i + 1)[0] for i in indices]
@@ -0,0 +1,191 @@
+"""
+Token-bucket rate limiter shared by concurrent workers
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` permits per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float, name: str = "default"):
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive")
+        if capacity < 1:
+            raise ValueError("Token bucket capacity must be at least 1")
+
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.permits_granted = 0
+        self.total_wait_time = 0.0
+        self.throttles = 0
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last refill (caller holds the lock)"""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._last_refill = now
+
+    def _reserve(self, tokens: float, start: float) -> float:
+        """Take tokens if possible and return 0, otherwise return seconds to wait before retrying"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                self.permits_granted += 1
+                self.total_wait_time += now - start
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def _check_tokens(self, tokens: float):
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from bucket with capacity {self.capacity}")
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now, without waiting"""
+        return self._reserve(tokens, time.monotonic()) == 0.0
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """
+        Block until tokens are available
+
+        Args:
+            tokens: Number of tokens to take
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Seconds spent waiting for the permit
+
+        Raises:
+            TimeoutError: If the permit could not be obtained within timeout
+        """
+        self._check_tokens(tokens)
+
+        start = time.monotonic()
+        while True:
+            sleep_time = self._reserve(tokens, start)
+            if sleep_time == 0.0:
+                return time.monotonic() - start
+
+            if timeout is not None and (time.monotonic() - start) + sleep_time > timeout:
+                raise TimeoutError(f"Rate limiter '{self.name}' could not grant permit within {timeout}s")
+
+            time.sleep(sleep_time)
+
+    async def acquire_async(self, tokens: float = 1.0, timeout: Optional[float] = None) -> float:
+        """Asyncio variant of acquire that yields to the event loop while waiting"""
+        self._check_tokens(tokens)
+
+        start = time.monotonic()
+        while True:
+            sleep_time = self._reserve(tokens, start)
+            if sleep_time == 0.0:
+                return time.monotonic() - start
+
+            if timeout is not None and (time.monotonic() - start) + sleep_time > timeout:
+                raise TimeoutError(f"Rate limiter '{self.name}' could not grant permit within {timeout}s")
+
+            await asyncio.sleep(sleep_time)
+
+    def throttle(self, delay: float):
+        """
+        Stop granting permits for `delay` seconds after the server rejected a request
+
+        The bucket is also emptied so traffic resumes at the sustained rate instead of a burst.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + max(0.0, delay))
+            self._tokens = 0.0
+            self._last_refill = max(self._last_refill, self._blocked_until)
+            self.throttles += 1
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Get limiter metrics"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "name": self.name,
+                "rate_per_second": self.rate,
+                "capacity": self.capacity,
+                "available_tokens": round(self._tokens, 3),
+                "permits_granted": self.permits_granted,
+                "total_wait_time": round(self.total_wait_time, 3),
+                "throttles": self.throttles
+            }
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None) -> float:
+    """
+    Delay before retrying a throttled request
+
+    Uses "full jitter" exponential backoff (uniform between 0 and base * 2**attempt,
+    capped at `cap`). A server-provided Retry-After is honored as the minimum delay.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay scale in seconds
+        cap: Maximum backoff in seconds
+        retry_after: Seconds requested by the server, if any
+
+    Returns:
+        Seconds to wait
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class EndpointRateLimiter:
+    """Separate token buckets per endpoint class (e.g. public market data vs private account calls)"""
+
+    def __init__(self, budgets: Dict[str, float], burst_seconds: float = 1.0):
+        """
+        Args:
+            budgets: Requests per second for each endpoint class
+            burst_seconds: Bucket capacity expressed as seconds of sustained traffic
+        """
+        self.buckets = {
+            endpoint: TokenBucket(rate=rate, capacity=max(1, rate * burst_seconds), name=endpoint)
+            for endpoint, rate in budgets.items()
+        }
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        if endpoint not in self.buckets:
+            raise ValueError(f"Unknown rate limit endpoint class: {endpoint}")
+        return self.buckets[endpoint]
+
+    def acquire(self, endpoint: str, timeout: Optional[float] = None) -> float:
+        """Block until a request to this endpoint class is allowed"""
+        return self._bucket(endpoint).acquire(timeout=timeout)
+
+    async def acquire_async(self, endpoint: str, timeout: Optional[float] = None) -> float:
+        """Wait (without blocking the event loop) until a request is allowed"""
+        return await self._bucket(endpoint).acquire_async(timeout=timeout)
+
+    def throttle(self, endpoint: str, delay: float):
+        """Pause an endpoint class after the server rejected a request"""
+        self._bucket(endpoint).throttle(delay)
+        logger.warning(f"⏳ Rate limiter '{endpoint}' throttled for {delay:.2f}s")
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Get metrics for every endpoint class"""
+        return {endpoint: bucket.get_metrics() for endpoint, bucket in self.buckets.items()}
@@ -29,6 +29,7 @@ class Portfolio:
         self.initial_btc = initial_btc
         self.initial_eth = initial_eth
         self.initial_usd = initial_usd
+        self._dirty = False
         self.data = self._load_portfolio()
         
     def _load_portfolio(self) -> Dict[str, Any]:
@@ -224,8 +225,39 @@ class Portfolio:
         
         return validated
     
+    def _mark_dirty(self) -> None:
+        """Record an in-memory change that has not been written to disk yet"""
+        self._dirty = True
+    
+    @property
+    def dirty(self) -> bool:
+        """Whether the portfolio has changes that are not yet on disk"""
+        return self._dirty
+    
+    def flush(self) -> bool:
+        """
+        Write pending changes to disk, if any.
+        
+        Price refreshes and exchange syncs only mark the portfolio dirty, so
+        several updates within a cycle coalesce into a single write here.
+        
+        Returns:
+            True if a write happened
+        """
+        if not self._dirty:
+            return False
+        self.save()
+        return not self._dirty
+    
     def save(self) -> None:
-        """Save portfolio data to file"""
+        """
+        Save portfolio data to file immediately.
+        
+        Used at trade boundaries: the file is written to a temporary path,
+        fsynced and swapped in with os.replace, so a crash leaves either the
+        previous or the new portfolio on disk, never a partial file.
+        """
+        temp_file = f"{self.portfolio_file}.tmp"
         try:
             # Update last updated timestamp
             self.data["last_updated"] = datetime.datetime.now().isoformat()
@@ -233,12 +265,23 @@ class Portfolio:
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.portfolio_file), exist_ok=True)
             
-            with open(self.portfolio_file, 'w') as f:
+            with open(temp_file, 'w') as f:
                 json.dump(self.data, f, indent=2, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            # Keep the permissions of the file being replaced
+            if os.path.exists(self.portfolio_file):
+                os.chmod(temp_file, os.stat(self.portfolio_file).st_mode & 0o777)
+            os.replace(temp_file, self.portfolio_file)
+            self._dirty = False
                 
             logger.info(f"Portfolio saved to {self.portfolio_file}")
         except Exception as e:
             logger.error(f"Error saving portfolio to {self.portfolio_file}: {e}")
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
     
     def update_prices(self, prices: Dict[str, float]) -> None:
         """
@@ -255,8 +298,8 @@ class Portfolio:
         # Recalculate portfolio value
         self._calculate_portfolio_value()
         
-        # Save changes
-        self.save()
+        # Written on the next flush()
+        self._mark_dirty()
         
     def _calculate_portfolio_value(self) -> float:
         """
@@ -443,7 +486,7 @@ class Portfolio:
         # Recalculate portfolio value
         self._calculate_portfolio_value()
         
-        # Save changes
+        # Executed trades are written through immediately
         self.save()
         
         # Log the trade to trade history (only if requested)
@@ -535,8 +578,8 @@ class Portfolio:
             # Recalculate portfolio value to ensure consistency
             self._calculate_portfolio_value()
             
-            # Save changes
-            self.save()
+            # Written on the next flush()
+            self._mark_dirty()
             
             return {
                 "status": "success",
@@ -615,6 +658,7 @@ class Portfolio:
         current_amount = self.data[asset].get("amount", 0.0)
         new_amount = current_amount + amount_change
         self.data[asset]["amount"] = max(0.0, new_amount)  # Prevent negative amounts
+        self._mark_dirty()
         
         logger.debug(f"Updated {asset} amount: {current_amount} + {amount_change} = {self.data[asset]['amount']}")
     
@@ -637,6 +681,7 @@ class Portfolio:
         else:
             # Assume EUR/USD rate of ~0.85 if not provided
             self.data[asset]["last_price_eur"] = price_usd * 0.85
+        self._mark_dirty()
         
         logger.debug(f"Updated {asset} price: ${price_usd:.2f} USD, €{self.data[asset]['last_price_eur']:.2f} EUR")
     
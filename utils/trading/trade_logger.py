@@ -1,23 +1,175 @@
+import bisect
 import json
 import os
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Journal entries are folded back into the JSON snapshot after this many appends
+COMPACT_EVERY = 50
+
+
 class TradeLogger:
-    """Logs and retrieves trade history"""
+    """Logs and retrieves trade history
+
+    Trades are appended to a JSONL journal next to ``log_file`` and fsynced one
+    line at a time, so logging a trade no longer rewrites the whole history.
+    ``log_file`` stays a plain JSON array (the dashboard and maintenance scripts
+    read it directly) and is rewritten atomically by ``compact()``, which runs
+    every ``COMPACT_EVERY`` appends and whenever the dashboard is refreshed.
+    Reads are served from an in-memory, time-ordered index by product.
+    """
     
-    def __init__(self, log_file="data/trades/trade_history.json"):
+    def __init__(self, log_file="data/trades/trade_history.json", compact_every: int = COMPACT_EVERY):
         """Initialize the trade logger"""
         self.log_file = log_file
+        self.journal_file = os.path.splitext(log_file)[0] + ".journal.jsonl"
+        self.compact_every = compact_every
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
         
         # Create trade history file if it doesn't exist
         if not os.path.exists(log_file):
             with open(log_file, 'w') as f:
                 json.dump([], f)
+        
+        self._trades: List[Dict[str, Any]] = []
+        self._timestamps: List[str] = []
+        self._by_product: Dict[str, List[Dict[str, Any]]] = {}
+        self._journal_entries = 0
+        self._snapshot_stat: Optional[tuple] = None
+        self._load()
+        
+        # Fold a journal left behind by a previous run into the snapshot
+        if self._journal_entries:
+            self.compact()
+    
+    def _stat_snapshot(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.log_file)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
+    def _read_snapshot(self) -> List[Dict[str, Any]]:
+        """Read the JSON snapshot (the legacy trade history format)"""
+        try:
+            if os.path.getsize(self.log_file) == 0:
+                return []
+            with open(self.log_file, 'r') as f:
+                trades = json.load(f)
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding trade history JSON: {self.log_file}")
+            return []
+        except Exception as e:
+            logger.error(f"Error reading trade history: {e}")
+            return []
+        
+        if not isinstance(trades, list):
+            logger.warning(f"Trade history is not a list: {type(trades)}")
+            return []
+        return [trade for trade in trades if isinstance(trade, dict)]
+    
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        """Read journaled trades, skipping a torn final line from an interrupted write"""
+        entries = []
+        try:
+            with open(self.journal_file, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping unreadable trade journal entry in {self.journal_file}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error reading trade journal: {e}")
+        return entries
+    
+    def _load(self) -> None:
+        """Rebuild the in-memory index from the snapshot plus the journal"""
+        self._snapshot_stat = self._stat_snapshot()
+        trades = self._read_snapshot()
+        journal = self._read_journal()
+        self._journal_entries = len(journal)
+        
+        if journal:
+            # A crash between the snapshot swap and the journal truncation
+            # leaves entries that are already in the snapshot
+            earliest = min(entry.get("timestamp", "") for entry in journal)
+            compacted = {json.dumps(trade, sort_keys=True) for trade in trades
+                         if trade.get("timestamp", "") >= earliest}
+            journal = [entry for entry in journal
+                       if json.dumps(entry, sort_keys=True) not in compacted]
+        
+        trades.extend(journal)
+        trades.sort(key=lambda x: x.get("timestamp", ""))
+        
+        self._trades = trades
+        self._timestamps = [trade.get("timestamp", "") for trade in trades]
+        self._by_product = {}
+        for trade in trades:
+            self._by_product.setdefault(trade.get("product_id"), []).append(trade)
+    
+    def _index(self, trade: Dict[str, Any]) -> None:
+        timestamp = trade.get("timestamp", "")
+        position = bisect.bisect_right(self._timestamps, timestamp)
+        self._trades.insert(position, trade)
+        self._timestamps.insert(position, timestamp)
+        
+        product_trades = self._by_product.setdefault(trade.get("product_id"), [])
+        if not product_trades or product_trades[-1].get("timestamp", "") <= timestamp:
+            product_trades.append(trade)
+        else:
+            keys = [t.get("timestamp", "") for t in product_trades]
+            product_trades.insert(bisect.bisect_right(keys, timestamp), trade)
+    
+    def _append(self, trade: Dict[str, Any]) -> None:
+        """Durably journal a trade, index it, and compact when the journal grows"""
+        with open(self.journal_file, 'a') as f:
+            f.write(json.dumps(trade) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        
+        self._index(trade)
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_every:
+            self.compact()
+    
+    def compact(self) -> None:
+        """
+        Fold the journal into the JSON snapshot
+        
+        The snapshot is written to a temporary file and swapped in with
+        os.replace, then the journal is truncated. If the snapshot was edited
+        externally (e.g. trimmed by scripts/cleanup_old_data.sh) it is reloaded
+        first so the edit is not overwritten.
+        """
+        try:
+            if self._stat_snapshot() != self._snapshot_stat:
+                self._load()
+            if not self._journal_entries:
+                return
+            
+            temp_file = f"{self.log_file}.tmp"
+            with open(temp_file, 'w') as f:
+                json.dump(self._trades, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.log_file)
+            self._snapshot_stat = self._stat_snapshot()
+            
+            with open(self.journal_file, 'w'):
+                pass
+            self._journal_entries = 0
+        except Exception as e:
+            logger.error(f"Error compacting trade history: {e}")
     
     def log_rebalance_trade(self, product_id: str, action: str, amount: float, usd_value: float, reason: str = "portfolio_rebalancing") -> None:
         """
@@ -47,20 +199,7 @@ class TradeLogger:
                 "trade_executed": True
             }
             
-            # Load existing trades
-            trades = []
-            try:
-                with open(self.log_file, 'r') as f:
-                    trades = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                trades = []
-            
-            # Add new trade
-            trades.append(trade_record)
-            
-            # Save updated trades
-            with open(self.log_file, 'w') as f:
-                json.dump(trades, f, indent=2)
+            self._append(trade_record)
             
             logger.info(f"Rebalancing trade logged: {action} {amount:.6f} {product_id} for ${usd_value:.2f}")
             
@@ -77,14 +216,6 @@ class TradeLogger:
             result: Result of trade execution
         """
         try:
-            # Load existing trade history
-            trades = []
-            try:
-                with open(self.log_file, 'r') as f:
-                    trades = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                trades = []
-            
             # Ensure we have a valid price - check multiple possible fields
             price = result.get("price", 0) or result.get("execution_price", 0)
             if price == 0:
@@ -133,11 +264,7 @@ class TradeLogger:
                     trade["fee_percentage"] = (trade["total_fees"] / base_amount) * 100
             
             # Add trade to history
-            trades.append(trade)
-            
-            # Save updated trade history
-            with open(self.log_file, 'w') as f:
-                json.dump(trades, f, indent=2)
+            self._append(trade)
                 
             # Enhanced logging message with fee information
             log_msg = f"Trade logged: {trade['action']} {trade['crypto_amount']} {product_id.split('-')[0]} at €{trade['price']}"
@@ -156,40 +283,11 @@ class TradeLogger:
             limit: Maximum number of trades to return
             
         Returns:
-            List of recent trades
+            List of recent trades (newest first)
         """
-        try:
-            # Check if file exists
-            if not os.path.exists(self.log_file):
-                logger.warning(f"Trade history file not found: {self.log_file}")
-                return []
-                
-            # Check if file is empty
-            if os.path.getsize(self.log_file) == 0:
-                logger.warning(f"Trade history file is empty: {self.log_file}")
-                return []
-                
-            try:
-                with open(self.log_file, 'r') as f:
-                    trades = json.load(f)
-                
-                # Validate trades is a list
-                if not isinstance(trades, list):
-                    logger.warning(f"Trade history is not a list: {type(trades)}")
-                    return []
-                    
-                # Sort trades by timestamp (newest first)
-                trades.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-                
-                # Return limited number of trades
-                return trades[:limit]
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding trade history JSON: {self.log_file}")
-                return []
-            
-        except Exception as e:
-            logger.error(f"Error getting recent trades: {e}")
+        if limit <= 0:
             return []
+        return [dict(trade) for trade in self._trades[:-limit - 1:-1]]
     
     def get_trades_by_product(self, product_id: str) -> List[Dict[str, Any]]:
         """
@@ -199,20 +297,19 @@ class TradeLogger:
             product_id: Trading pair (e.g., 'BTC-USD')
             
         Returns:
-            List of trades for the specified product
+            List of trades for the specified product (newest first)
         """
-        try:
-            with open(self.log_file, 'r') as f:
-                trades = json.load(f)
-            
-            # Filter trades by product ID
-            filtered_trades = [trade for trade in trades if trade.get("product_id") == product_id]
-            
-            # Sort trades by timestamp (newest first)
-            filtered_trades.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-            
-            return filtered_trades
+        return [dict(trade) for trade in reversed(self._by_product.get(product_id, []))]
+    
+    def get_trades_since(self, since: str) -> List[Dict[str, Any]]:
+        """
+        Get trades with an ISO timestamp at or after ``since``
+        
+        Args:
+            since: ISO-8601 timestamp
             
-        except Exception as e:
-            logger.error(f"Error getting trades by product: {e}")
-            return []
+        Returns:
+            List of matching trades (newest first)
+        """
+        start = bisect.bisect_left(self._timestamps, since)
+        return [dict(trade) for trade in reversed(self._trades[start:])]